@@ -26,19 +26,15 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 import logging
-import random
-import string
 import sys
 import os
-import time
 
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 
 from starlette import status
 from starlette.middleware.cors import CORSMiddleware
-from starlette.requests import Request
-from starlette.responses import RedirectResponse, Response
+from starlette.responses import RedirectResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from utils.common import get_version
@@ -47,6 +43,7 @@ from utils.logging_utils import LOG
 sys.path.append(os.path.pardir)
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from .client_utils.middleware import LogRequestsMiddleware
 from .blueprints import (
     base as base_blueprint,
     chat as chat_blueprint,
@@ -72,27 +69,7 @@ def create_app() -> FastAPI:
     LOG.info(f"Starting Klatchat Client v{app_version}")
     chat_app = FastAPI(title="Klatchat Client", version=app_version)
 
-    @chat_app.middleware("http")
-    async def log_requests(request: Request, call_next):
-        """Logs requests and gracefully handles Internal Server Errors"""
-        idem = "".join(random.choices(string.ascii_uppercase + string.digits, k=6))
-        LOG.info(f"rid={idem} start request path={request.url.path}")
-        start_time = time.time()
-        try:
-            response = await call_next(request)
-            process_time = (time.time() - start_time) * 1000
-            formatted_process_time = "{0:.2f}".format(process_time)
-            LOG.info(
-                f"rid={idem} completed_in={formatted_process_time}ms status_code={response.status_code}"
-            )
-            return response
-        except ConnectionError as ex:
-            LOG.error(ex)
-
-            return Response("Error connecting to server", status_code=404)
-        except Exception as ex:
-            LOG.error(f"rid={idem} received an exception {ex}")
-        return Response(f"Chat server error occurred", status_code=500)
+    chat_app.add_middleware(LogRequestsMiddleware)
 
     # Redirects any not found pages to chats page
     @chat_app.exception_handler(StarletteHTTPException)
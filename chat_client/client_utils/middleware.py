@@ -0,0 +1,62 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from utils.http_utils import ASGIMiddleware, RequestTimer, generate_request_id
+from utils.logging_utils import LOG
+
+
+class LogRequestsMiddleware(ASGIMiddleware):
+    """Logs requests and gracefully handles Internal Server Errors"""
+
+    REQUEST_ID_HEADER = "X-Request-ID"
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send):
+        idem = generate_request_id()
+        LOG.info(f"rid={idem} start request path={scope['path']}")
+        request_timer = RequestTimer(
+            send=send, headers={self.REQUEST_ID_HEADER: idem}, server_timing=True
+        )
+        try:
+            await self.app(scope, receive, request_timer.send)
+            LOG.info(
+                f"rid={idem} completed_in={request_timer.elapsed_ms:.2f}ms "
+                f"status_code={request_timer.status_code}"
+            )
+            return
+        except Exception as ex:
+            if request_timer.response_started:
+                raise
+            if isinstance(ex, ConnectionError):
+                LOG.error(ex)
+                response = Response("Error connecting to server", status_code=404)
+            else:
+                LOG.error(f"rid={idem} received an exception {ex}")
+                response = Response("Chat server error occurred", status_code=500)
+        await response(scope, receive, request_timer.send)
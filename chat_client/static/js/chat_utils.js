@@ -279,6 +279,8 @@ async function buildConversation(conversationData, skin, remember=true,conversat
     conversationsBody.insertAdjacentHTML('afterbegin', newConversationHTML);
 
     resizeConversationContainers()
+    setConversationSequence(cid, conversationData['last_seq'] ?? 0);
+    joinConversation(cid);
 
     setChatState(cid, CHAT_STATES.UPDATING, "Loading messages...")
     initMessages(conversationData, skin).then(_ => setChatState(cid, CHAT_STATES.ACTIVE));
@@ -366,6 +368,7 @@ async function buildConversation(conversationData, skin, remember=true,conversat
        chatCloseButton.addEventListener('click', async (_) => {
            conversationHolder.removeChild(conversationParent);
            await removeConversation(cid);
+           leaveConversation(cid);
            clearStateCache(cid);
            resizeConversationContainers()
        });
@@ -415,6 +418,41 @@ async function getConversationDataByInput(input, skin, oldestMessageTS=null, max
     return conversationData;
 }
 
+/**
+ * Gets data of multiple conversations within a single request
+ * @param items - array of objects with conversation id ("cid"), skin ("skin") and optional oldest message timestamp ("creation_time_from")
+ * @param maxResults - max number of messages to fetch per conversation
+ * @returns {Promise<{}>} mapping of conversation id to its data, conversations which were not found are omitted
+ */
+async function getConversationsDataBatch(items, maxResults=10){
+    let conversationsData = {};
+    if (items.length > 0){
+        const body = {
+            'conversations': items.map(item => ({'cid': item.cid, 'skin': item.skin, 'creation_time_from': item?.creation_time_from})),
+            'limit_chat_history': maxResults
+        }
+        await fetchServer('chat_api/batch', REQUEST_METHODS.POST, body, true)
+            .then(response => {
+                if(response.ok){
+                    return response.json();
+                }else{
+                    throw response.statusText;
+                }
+            })
+            .then(responseJson => {
+                for (const data of responseJson['data']){
+                    if (getUserMessages(data, null).length === 0){
+                        setDefault(setDefault(conversationState, data['_id'], {}), 'all_messages_displayed', true);
+                    }
+                    conversationsData[data['_id']] = data;
+                }
+            }).catch(async err=> {
+                console.warn('Failed to fulfill request due to error:',err);
+            });
+    }
+    return conversationsData;
+}
+
 /**
  * Returns table representing chat alignment
  * @return {Table}
@@ -539,17 +577,19 @@ const restoreChatAlignmentFromCache = async () => {
     if (cachedItems.length === 0) {
         await displayLiveChat();
     }
+    // conversations and senders of their messages are fetched at once instead of request per conversation
+    const conversationsData = await getConversationsDataBatch(cachedItems);
+    await prefetchUsersData(Object.values(conversationsData).flatMap(conversationData => getUserMessages(conversationData).map(message => message['user_id'])));
     for (const item of cachedItems) {
-        await getConversationDataByInput(item.cid, item.skin).then(async conversationData=>{
-            if(conversationData && Object.keys(conversationData).length > 0) {
-                await buildConversation(conversationData, item.skin, false);
-            }else{
-                if (item.cid !== '1') {
-                    displayAlert(document.getElementById('conversationsBody'), 'No matching conversation found', 'danger', 'noRestoreConversationAlert', {'type': alertBehaviors.AUTO_EXPIRE});
-                }
-                await removeConversation(item.cid);
+        const conversationData = conversationsData[item.cid];
+        if(conversationData) {
+            await buildConversation(conversationData, item.skin, false);
+        }else{
+            if (item.cid !== '1') {
+                displayAlert(document.getElementById('conversationsBody'), 'No matching conversation found', 'danger', 'noRestoreConversationAlert', {'type': alertBehaviors.AUTO_EXPIRE});
             }
-        });
+            await removeConversation(item.cid);
+        }
     }
 }
 
@@ -36,11 +36,34 @@ async function setPreferredLanguage(cid, lang, inputType='incoming', updateDB=tr
             });
     } if ((isOk || !updateDB) && !updateDBOnly) {
         updateChatLanguageMapping(cid, inputType, lang);
+        if (inputType === 'incoming'){
+            joinConversation(cid);
+        }
         const shoutIds = getMessagesOfCID(cid, MESSAGE_REFER_TYPE.ALL, 'plain', true);
         await requestTranslation(cid, shoutIds, lang, inputType);
     }
 }
 
+/**
+ * Subscribes to the new messages of the conversation translated to the preferred language
+ * @param cid: target conversation id
+ */
+function joinConversation(cid){
+    if (socket) {
+        socket.emitAuthorized('join_conversation', {'cid': cid, 'lang': getPreferredLanguage(cid), 'user': currentUser?._id});
+    }
+}
+
+/**
+ * Unsubscribes from the new messages of the conversation
+ * @param cid: target conversation id
+ */
+function leaveConversation(cid){
+    if (socket) {
+        socket.emitAuthorized('leave_conversation', {'cid': cid});
+    }
+}
+
 /**
  * Fetches supported languages
  */
@@ -226,6 +249,9 @@ async function requestChatsLanguageRefresh(){
  */
 async function applyTranslations(data){
     const inputType = setDefault(data, 'input_type', 'incoming');
+    if (inputType === 'incoming'){
+        stashPendingTranslations(data['translations']);
+    }
     for (const [cid, messageTranslations] of Object.entries(data['translations'])) {
 
         if(!isDisplayed(cid)){
@@ -292,3 +318,39 @@ document.addEventListener('DOMContentLoaded', (_)=>{
         await fetchSupportedLanguages().then(_ => document.dispatchEvent(supportedLanguagesLoadedEvent));
     });
 });
+
+/**
+ * Translations of the incoming messages received before the messages got displayed
+ * @type {Object} mapping of message id to its translation
+ */
+const pendingTranslations = {};
+
+/**
+ * Stashes translations of the messages which are not displayed yet
+ * @param translations: mapping of cid to the received translations
+ */
+function stashPendingTranslations(translations){
+    for (const [cid, messageTranslations] of Object.entries(translations)) {
+        if (!isDisplayed(cid)){
+            continue;
+        }
+        for (const [messageID, translation] of Object.entries(messageTranslations['shouts'] || {})) {
+            if (!document.getElementById(messageID)){
+                pendingTranslations[messageID] = translation;
+            }
+        }
+    }
+}
+
+/**
+ * Applies translation stashed for the message before it got displayed
+ * @param cid: target conversation id
+ * @param messageID: target message id
+ */
+async function applyPendingTranslation(cid, messageID){
+    if (messageID in pendingTranslations) {
+        const translation = pendingTranslations[messageID];
+        delete pendingTranslations[messageID];
+        await applyTranslations({'translations': {[cid]: {'shouts': {[messageID]: translation}}}, 'input_type': 'incoming'});
+    }
+}
@@ -21,6 +21,10 @@ function initSIO(){
         {
             extraHeaders: {
                 "session": getSessionToken()
+            },
+            // audio is received as binary frames instead of base64 strings
+            auth: {
+                "binaryAudio": true
             }
         }
     );
@@ -37,57 +41,37 @@ function initSIO(){
         }
     });
 
+    let isReconnect = false;
+
     socket.on('connect', () => {
          console.info(`Socket IO Connected to Server: ${sioServerURL}`)
+         getOpenedChatIds().forEach(cid => {
+             joinConversation(cid);
+             // events emitted while disconnected are resumed instead of reloading the conversation
+             if (isReconnect) {
+                 requestConversationDelta(cid);
+             }
+         });
+         isReconnect = true;
     });
 
     socket.on("connect_error", (err) => {
       console.log(`connect_error due to ${err.message}`);
     });
 
-    socket.on('new_prompt_created', async (prompt) => {
-        const messageContainer = getMessageListContainer(prompt['cid']);
-        const promptID = prompt['_id'];
-        if (await getCurrentSkin(prompt['cid']) === CONVERSATION_SKINS.PROMPTS) {
-            if (!document.getElementById( promptID )) {
-                const messageHTML = await buildPromptHTML( prompt );
-                messageContainer.insertAdjacentHTML( 'beforeend', messageHTML );
-            }
-        }
+    Object.entries(conversationEventHandlers).forEach(([event, handler]) => {
+        socket.on(event, async (data) => {
+            trackConversationSequence(data['cid'], data?.seq);
+            await handler(data);
+        });
     });
 
-    socket.on('new_message', async (data) => {
-        if (await getCurrentSkin(data.cid) === CONVERSATION_SKINS.PROMPTS && data?.prompt_id){
-            console.debug('Skipping prompt-related message')
-            return
-        }
-        // console.debug('received new_message -> ', data)
-        const preferredLang = getPreferredLanguage(data['cid']);
-        if (data?.lang !== preferredLang) {
-            requestTranslation(data['cid'], data['messageID']).catch(err => console.error(`Failed to request translation of cid=${data['cid']} messageID=${data['messageID']}: ${err}`));
-        }
-        addNewMessage(data['cid'], data['userID'], data['messageID'], data['messageText'], data['timeCreated'], data['repliedMessage'], data['attachments'], data?.isAudio, data?.isAnnouncement)
-            .then(_=>addMessageTransformCallback(data['cid'], data['messageID'], data?.isAudio))
-            .catch(err => console.error('Error occurred while adding new message: ', err));
+    socket.on('conversation_seq', (data) => {
+        trackConversationSequence(data['cid'], data['seq']);
     });
 
-    socket.on('new_prompt_message', async (message) => {
-        await addPromptMessage(message['cid'], message['userID'], message['messageText'], message['promptID'], message['promptState'])
-                .catch(err => console.error('Error occurred while adding new prompt data: ', err));
-    });
-
-    socket.on('set_prompt_completed', async (data) => {
-        const promptID = data['prompt_id'];
-        const promptElem = document.getElementById(promptID);
-        console.info(`setting prompt_id=${promptID} as completed`);
-        if (promptElem){
-            const promptWinner = document.getElementById(`${promptID}_winner`);
-            const winner_response = document.getElementById(`${promptID}_${data['winner']}_resp`).innerText;
-            console.log("data:", data)
-            promptWinner.innerHTML = await buildPromptWinnerHTML(data['winner'], winner_response);
-        }else {
-            console.warn(`Failed to get HTML element from prompt_id=${promptID}`);
-        }
+    socket.on('conversation_delta', async (delta) => {
+        await applyConversationDelta(delta);
     });
 
     socket.on('translation_response', async (data) => {
@@ -105,6 +89,14 @@ function initSIO(){
         playTTS(data['cid'], data['lang'], data['audio_data']);
     });
 
+    socket.on('throttled', (data)=>{
+       console.warn(`Event "${data['event']}" was throttled, retry in ${data['retry_after']} seconds`);
+    });
+
+    socket.on('overloaded', (data)=>{
+       console.warn(`Event "${data['event']}" was rejected due to server overload, retry in ${data['retry_after']} seconds`);
+    });
+
     socket.on('incoming_stt', (data)=>{
        console.debug('received incoming stt response');
        showSTT(data['message_id'], data['lang'], data['message_text']);
@@ -121,3 +113,157 @@ function initSIO(){
 
     return socket;
 }
+
+/**
+ * Handles creation of the new prompt
+ * @param prompt - created prompt data
+ */
+const handleNewPromptCreated = async (prompt) => {
+    const messageContainer = getMessageListContainer(prompt['cid']);
+    const promptID = prompt['_id'];
+    if (await getCurrentSkin(prompt['cid']) === CONVERSATION_SKINS.PROMPTS) {
+        if (!document.getElementById( promptID )) {
+            const messageHTML = await buildPromptHTML( prompt );
+            messageContainer.insertAdjacentHTML( 'beforeend', messageHTML );
+        }
+    }
+}
+
+/**
+ * Handles new message of the conversation, messages which are already displayed are skipped
+ * @param data - message data
+ */
+const handleNewMessage = async (data) => {
+    if (await getCurrentSkin(data.cid) === CONVERSATION_SKINS.PROMPTS && data?.prompt_id){
+        console.debug('Skipping prompt-related message')
+        return
+    }
+    if (document.getElementById(data['messageID'])){
+        console.debug(`Skipping displayed message messageID=${data['messageID']}`);
+        return
+    }
+    // console.debug('received new_message -> ', data)
+    const preferredLang = getPreferredLanguage(data['cid']);
+    if (data?.lang !== preferredLang && !data?.translatedLangs?.includes(preferredLang)) {
+        requestTranslation(data['cid'], data['messageID']).catch(err => console.error(`Failed to request translation of cid=${data['cid']} messageID=${data['messageID']}: ${err}`));
+    }
+    addNewMessage(data['cid'], data['userID'], data['messageID'], data['messageText'], data['timeCreated'], data['repliedMessage'], data['attachments'], data?.isAudio, data?.isAnnouncement)
+        .then(_=>addMessageTransformCallback(data['cid'], data['messageID'], data?.isAudio))
+        .then(_=>applyPendingTranslation(data['cid'], data['messageID']))
+        .catch(err => console.error('Error occurred while adding new message: ', err));
+}
+
+/**
+ * Handles new message of the prompt
+ * @param message - prompt message data
+ */
+const handleNewPromptMessage = async (message) => {
+    await addPromptMessage(message['cid'], message['userID'], message['messageText'], message['promptID'], message['promptState'])
+            .catch(err => console.error('Error occurred while adding new prompt data: ', err));
+}
+
+/**
+ * Handles completion of the prompt
+ * @param data - completed prompt data
+ */
+const handlePromptCompleted = async (data) => {
+    const promptID = data['prompt_id'];
+    const promptElem = document.getElementById(promptID);
+    console.info(`setting prompt_id=${promptID} as completed`);
+    if (promptElem){
+        const promptWinner = document.getElementById(`${promptID}_winner`);
+        const winner_response = document.getElementById(`${promptID}_${data['winner']}_resp`).innerText;
+        console.log("data:", data)
+        promptWinner.innerHTML = await buildPromptWinnerHTML(data['winner'], winner_response);
+    }else {
+        console.warn(`Failed to get HTML element from prompt_id=${promptID}`);
+    }
+}
+
+/**
+ * Mapping of the conversation events to their handlers, these events are numbered with sequence number of the conversation
+ */
+const conversationEventHandlers = {
+    'new_prompt_created': handleNewPromptCreated,
+    'new_message': handleNewMessage,
+    'new_prompt_message': handleNewPromptMessage,
+    'set_prompt_completed': handlePromptCompleted,
+}
+
+/**
+ * Moves the last sequence number of the conversation forward to the provided one
+ * @param cid - target conversation id
+ * @param seq - sequence number all the events up to which are considered received
+ */
+const setConversationSequence = (cid, seq) => {
+    if (cid && Number.isInteger(seq)) {
+        const state = setDefault(conversationState, cid, {});
+        state['lastSeq'] = Math.max(state['lastSeq'] ?? 0, seq);
+        const receivedSeqs = setDefault(state, 'receivedSeqs', new Set());
+        receivedSeqs.forEach(receivedSeq => {
+            if (receivedSeq <= state['lastSeq']) {
+                receivedSeqs.delete(receivedSeq);
+            }
+        });
+        while (receivedSeqs.delete(state['lastSeq'] + 1)) {
+            state['lastSeq'] += 1;
+        }
+    }
+}
+
+/**
+ * Remembers sequence number received in the conversation,
+ * the last sequence number is moved forward only while received sequence numbers are contiguous
+ * @param cid - target conversation id
+ * @param seq - sequence number of the received event (optional)
+ */
+const trackConversationSequence = (cid, seq) => {
+    if (cid && Number.isInteger(seq)) {
+        const state = setDefault(conversationState, cid, {});
+        setDefault(state, 'receivedSeqs', new Set()).add(seq);
+        setConversationSequence(cid, state['lastSeq'] ?? 0);
+    }
+}
+
+/**
+ * Checks if event with provided sequence number was already received in the conversation
+ * @param cid - target conversation id
+ * @param seq - sequence number of the event
+ * @return true if event was received
+ */
+const isConversationSequenceReceived = (cid, seq) => {
+    const state = conversationState[cid];
+    return seq <= (state?.lastSeq ?? 0) || !!state?.receivedSeqs?.has(seq);
+}
+
+/**
+ * Requests events of the conversation emitted since the last received one
+ * @param cid - target conversation id
+ */
+const requestConversationDelta = (cid) => {
+    const lastSeq = conversationState[cid]?.lastSeq;
+    if (Number.isInteger(lastSeq)) {
+        socket.emitAuthorized('get_conversation_delta', {'cid': cid, 'seq': lastSeq});
+    }
+}
+
+/**
+ * Applies events of the conversation missed while disconnected
+ * @param delta - conversation delta data
+ */
+const applyConversationDelta = async (delta) => {
+    if (delta['reload']) {
+        console.info(`Too many events were missed in cid=${delta['cid']}, reloading...`);
+        location.reload();
+        return
+    }
+    for (const {seq, event, data} of delta['events']) {
+        const handler = conversationEventHandlers[event];
+        if (handler && !isConversationSequenceReceived(delta['cid'], seq)) {
+            trackConversationSequence(delta['cid'], seq);
+            await handler(data);
+        }
+    }
+    // sequence numbers allocated without emitted events should not hold the conversation back
+    setConversationSequence(delta['cid'], delta['seq']);
+}
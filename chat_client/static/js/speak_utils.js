@@ -1,12 +1,23 @@
 /**
- * Generic function to play base64 audio file (currently only .wav format is supported)
- * @param audio_data: base64 encoded audio data
+ * Generic function to play audio file (currently only .wav format is supported)
+ * @param audio_data: raw audio data (ArrayBuffer) or its base64 encoded string
  */
 function play(audio_data){
     const df = document.createDocumentFragment();
-    const audio = new Audio("data:audio/wav;base64," + audio_data);
+    let audioURL;
+    if (typeof audio_data === 'string'){
+        audioURL = "data:audio/wav;base64," + audio_data;
+    }else {
+        audioURL = URL.createObjectURL(new Blob([audio_data], {'type': 'audio/wav'}));
+    }
+    const audio = new Audio(audioURL);
     df.appendChild(audio);
-    audio.addEventListener('ended', function () {df.removeChild(audio);});
+    audio.addEventListener('ended', function () {
+        df.removeChild(audio);
+        if (audioURL.startsWith('blob:')){
+            URL.revokeObjectURL(audioURL);
+        }
+    });
     audio.play().catch(err=> console.warn(`Failed to play audio_data = ${err}`));
 }
 
@@ -138,11 +149,8 @@ async function addRecorder(conversationData) {
         recorderButton.onmouseup = async function () {
             if (recorder) {
                 recorder.stop().then(audio => {
-                    const audioBlob = toBase64(audio['audioBlob']);
-                    console.log('audioBlob=', audioBlob);
-                    return audioBlob;
-                }).then(encodedAudio => {
-                    emitUserMessage(encodedAudio, conversationData['_id'], null, [], '1', '0');
+                    // recorded audio is sent as binary frame
+                    emitUserMessage(audio['audioBlob'], conversationData['_id'], null, [], '1', '0');
                 });
             }
         };
@@ -156,6 +156,30 @@ async function getUserData(userID=null){
      return userData;
 }
 
+/**
+ * Fetches public profiles of the users missing in local cache within a single request
+ * @param userIDs - ids of the users to look-up
+ * @returns {Promise<void>} promise resolving caching of user data
+ */
+async function prefetchUsersData(userIDs){
+    const missingUserIDs = [...new Set(userIDs)].filter(userID => userID && userID !== currentUser?._id && !getUserDataFromCache(userID));
+    if (missingUserIDs.length === 0){
+        return;
+    }
+    const query = new URLSearchParams(missingUserIDs.map(userID => ['user_ids', userID]));
+    await fetchServer(`users_api/batch?${query}`)
+            .then(response => response.ok?response.json():{'data':{}})
+            .then(data => {
+                for (const [userID, userData] of Object.entries(data['data'])){
+                    USER_DATA_CACHE[userID] = {
+                        data: userData,
+                        ts: getCurrentTimestamp()
+                    }
+                }
+            })
+            .catch(err => console.warn(`Failed to prefetch users data: ${err}`));
+}
+
 /**
  * Method that handles fetching provided user data with valid login credentials
  * @returns {Promise<void>} promise resolving validity of user-entered data
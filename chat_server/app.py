@@ -79,6 +79,10 @@ def _init_blueprints(app: FastAPI):
 
 
 def _init_middleware(app: FastAPI):
+    for middleware_class in SUPPORTED_MIDDLEWARE:
+        app.add_middleware(middleware_class=middleware_class)
+    # CORS is registered last to be the outermost one,
+    # so responses produced by the middleware above carry CORS headers as well
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -86,5 +90,3 @@ def _init_middleware(app: FastAPI):
         allow_methods=["*"],
         allow_headers=["*"],
     )
-    for middleware_class in SUPPORTED_MIDDLEWARE:
-        app.add_middleware(middleware_class=middleware_class)
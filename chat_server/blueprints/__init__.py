@@ -37,4 +37,5 @@ from . import (
     preferences as preferences_blueprint,
     personas as personas_blueprint,
     configs as configs_blueprint,
+    metrics as metrics_blueprint,
 )
@@ -27,21 +27,29 @@
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 from fastapi import APIRouter
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, Response
 
 from chat_server.server_utils.api_dependencies import permitted_access
 from chat_server.server_utils.api_dependencies.models.admin import (
     RefreshServiceRequestModel,
     ChatsOverviewRequestModel,
+    SlowQueriesRequestModel,
+    ProfilesRequestModel,
+    ProfileRequestModel,
+    RouteProfilingRequestModel,
+    StorageGCRequestModel,
 )
 from chat_server.server_utils.enums import UserRoles, RequestModelType
 from utils.database_utils.mongo_utils.queries.wrapper import MongoDocumentsAPI
+from utils.database_utils.slow_query_log import SlowQueryLog
 from utils.logging_utils import LOG
 from utils.http_utils import respond
 
 from chat_server.server_config import server_config
 from chat_server.server_utils.k8s_utils import restart_deployment
 from chat_server.server_utils.admin_utils import run_mq_validation
+from chat_server.server_utils.storage import ContentAddressedStorage
+from chat_server.services.request_profiler import RequestProfiler, ProfileFormat
 
 router = APIRouter(
     prefix="/admin",
@@ -107,3 +115,119 @@ async def chats_overview(
     # TODO: sort it based on PopularityCounter.get_first_n_items
 
     return JSONResponse(content=dict(data=result_data))
+
+
+@router.get("/db/slow_queries")
+async def slow_queries(
+    model: SlowQueriesRequestModel = permitted_access(
+        SlowQueriesRequestModel, min_required_role=UserRoles.ADMIN
+    )
+):
+    """
+    Lists the most recent slow database queries
+
+    :param model: request data model
+
+    :returns JSON-formatted list of slow query records
+    """
+    return JSONResponse(
+        content=dict(
+            threshold_ms=SlowQueryLog.threshold_ms,
+            data=SlowQueryLog.get_records(limit=model.limit),
+        )
+    )
+
+
+@router.get("/profiling/profiles")
+async def list_profiles(
+    model: ProfilesRequestModel = permitted_access(
+        ProfilesRequestModel, min_required_role=UserRoles.ADMIN
+    )
+):
+    """
+    Lists the most recent stored request profiles
+
+    :param model: request data model
+
+    :returns JSON-formatted list of profiles metadata and active sampling rates
+    """
+    return JSONResponse(
+        content=dict(
+            sample_rates=RequestProfiler.get_sample_rates(),
+            data=RequestProfiler.list_profiles(limit=model.limit),
+        )
+    )
+
+
+@router.get("/profiling/profiles/{profile_id}")
+async def download_profile(
+    model: ProfileRequestModel = permitted_access(
+        ProfileRequestModel, min_required_role=UserRoles.ADMIN
+    )
+):
+    """
+    Downloads stored request profile
+
+    :param model: request data model
+
+    :returns profile rendered as speedscope JSON or HTML flamegraph
+    """
+    content = RequestProfiler.render_profile(
+        profile_id=model.profile_id, profile_format=model.format
+    )
+    if content is None:
+        return respond(f"Profile {model.profile_id!r} not found", 404)
+    if model.format == ProfileFormat.HTML:
+        return Response(content=content, media_type="text/html")
+    return Response(
+        content=content,
+        media_type="application/json",
+        headers={
+            "Content-Disposition": f'attachment; filename="{model.profile_id}.speedscope.json"'
+        },
+    )
+
+
+@router.post("/profiling/routes")
+async def set_route_profiling(
+    model: RouteProfilingRequestModel = permitted_access(
+        RouteProfilingRequestModel,
+        min_required_role=UserRoles.ADMIN,
+        request_model_type=RequestModelType.DATA,
+    )
+):
+    """
+    Sets fraction of requests to profile for routes starting with provided prefix
+
+    :param model: request data model
+
+    :returns JSON-formatted active sampling rates
+    """
+    RequestProfiler.set_route_sample_rate(
+        route=model.route, sample_rate=model.sample_rate
+    )
+    return JSONResponse(content=RequestProfiler.get_sample_rates())
+
+
+@router.post("/storage/gc")
+async def collect_storage_garbage(
+    model: StorageGCRequestModel = permitted_access(
+        StorageGCRequestModel,
+        min_required_role=UserRoles.ADMIN,
+        request_model_type=RequestModelType.DATA,
+    )
+):
+    """
+    Deletes content of deduplicated files which is no longer referenced
+
+    :param model: request data model
+
+    :returns JSON-formatted number of deleted blobs
+    """
+    storage = server_config.storage
+    if not isinstance(storage, ContentAddressedStorage):
+        return respond("File deduplication is disabled", 400)
+    num_deleted = await storage.run(
+        storage.collect_garbage, grace_period=model.grace_period, limit=model.limit
+    )
+    return JSONResponse(content=dict(deleted=num_deleted))
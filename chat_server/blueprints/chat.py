@@ -32,19 +32,26 @@ from fastapi import APIRouter, Form, Depends
 from fastapi.responses import JSONResponse
 
 from chat_server.server_utils.api_dependencies.models.chats import (
+    GetConversationsBatchModel,
     GetLiveConversationModel,
 )
 from chat_server.server_utils.api_dependencies.validators.users import (
     get_authorized_user,
     has_admin_role,
 )
-from chat_server.server_utils.conversation_utils import build_message_json
+from chat_server.server_utils.conversation_utils import (
+    build_conversation_delta,
+    build_message_json,
+)
 from chat_server.server_utils.api_dependencies.extractors import CurrentUserData
 from chat_server.server_utils.api_dependencies.models import GetConversationModel
 from chat_server.services.popularity_counter import PopularityCounter
 from utils.common import generate_uuid
 from utils.database_utils.mongo_utils import MongoFilter, MongoLogicalOperators
-from utils.database_utils.mongo_utils.queries.mongo_queries import fetch_message_data
+from utils.database_utils.mongo_utils.queries.mongo_queries import (
+    fetch_conversations_message_data,
+    fetch_message_data,
+)
 from utils.database_utils.mongo_utils.queries.wrapper import MongoDocumentsAPI
 from utils.http_utils import respond
 from utils.logging_utils import LOG
@@ -126,21 +133,14 @@ async def get_matching_conversation(
     if not conversation_data:
         return respond(f'No conversation matching = "{model.search_str}"', 404)
 
-    if model.creation_time_from:
-        query_filter = MongoFilter(
-            key="created_on",
-            logical_operator=MongoLogicalOperators.LT,
-            value=int(model.creation_time_from),
-        )
-    else:
-        query_filter = None
-
     message_data = (
         fetch_message_data(
             skin=model.skin,
             conversation_data=conversation_data,
             limit=model.limit_chat_history,
-            creation_time_filter=query_filter,
+            creation_time_filter=_build_creation_time_filter(
+                creation_time_from=model.creation_time_from
+            ),
         )
         or []
     )
@@ -152,6 +152,88 @@ async def get_matching_conversation(
     return conversation_data
 
 
+@router.post("/batch")
+async def get_conversations_batch(
+    current_user: CurrentUserData, model: GetConversationsBatchModel
+):
+    """
+    Gets data of multiple conversations along with the page of their history
+
+    :param current_user: current user data
+    :param model: request data model described in GetConversationsBatchModel
+
+    :returns JSON response with keys:
+        - "data": list of found conversations data in requested order
+        - "missing": list of conversation ids which were not found
+    """
+    cursors = {cursor.cid: cursor for cursor in model.conversations}
+    conversations_mapping = {
+        conversation_data["_id"]: conversation_data
+        for conversation_data in MongoDocumentsAPI.CHATS.get_chats_by_ids(
+            cids=list(cursors), requested_user_id=current_user.user_id
+        )
+    }
+    found_cursors = [
+        cursor for cid, cursor in cursors.items() if cid in conversations_mapping
+    ]
+    messages_mapping = fetch_conversations_message_data(
+        conversations=[
+            (
+                conversations_mapping[cursor.cid],
+                cursor.skin,
+                _build_creation_time_filter(
+                    creation_time_from=cursor.creation_time_from
+                ),
+            )
+            for cursor in found_cursors
+        ],
+        limit=model.limit_chat_history,
+    )
+    for cursor in found_cursors:
+        conversations_mapping[cursor.cid]["chat_flow"] = [
+            build_message_json(raw_message=message, skin=cursor.skin)
+            for message in messages_mapping[cursor.cid]
+        ]
+    return dict(
+        data=[conversations_mapping[cursor.cid] for cursor in found_cursors],
+        missing=[cid for cid in cursors if cid not in conversations_mapping],
+    )
+
+
+def _build_creation_time_filter(
+    creation_time_from: int | str | None,
+) -> MongoFilter | None:
+    """Builds filter of the messages created before provided timestamp"""
+    if creation_time_from:
+        return MongoFilter(
+            key="created_on",
+            logical_operator=MongoLogicalOperators.LT,
+            value=int(creation_time_from),
+        )
+    return None
+
+
+@router.get("/delta/{cid}")
+async def get_conversation_delta(current_user: CurrentUserData, cid: str, seq: int = 0):
+    """
+    Gets events of the conversation missed by the client since provided sequence number
+
+    :param current_user: current user data
+    :param cid: target conversation id
+    :param seq: last sequence number received by the client
+
+    :returns delta data described in "build_conversation_delta", 404 error code if conversation is not found
+    """
+    conversation_data = MongoDocumentsAPI.CHATS.get_chat(
+        search_str=cid,
+        column_identifiers=["_id"],
+        requested_user_id=current_user.user_id,
+    )
+    if not conversation_data:
+        return respond(f'No conversation matching = "{cid}"', 404)
+    return build_conversation_delta(cid=cid, seq=seq)
+
+
 @router.get("/live")
 async def get_live_conversation(
     current_user: CurrentUserData, model: GetLiveConversationModel = Depends()
@@ -25,15 +25,31 @@
 # LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import asyncio
+import mimetypes
+from io import BytesIO
 from typing import List
 
-from fastapi import APIRouter, UploadFile, File
+from fastapi import APIRouter, UploadFile, File, Request
 from starlette.responses import JSONResponse
 
+from chat_server.server_utils.api_dependencies.models.files import AvatarsRequestModel
 from chat_server.server_utils.api_dependencies.validators.users import (
     get_authorized_user,
+    permitted_access,
 )
-from chat_server.server_utils.http_utils import get_file_response, save_file
+from chat_server.server_config import server_config
+from chat_server.server_utils.http_utils import (
+    build_etag,
+    get_file_response,
+    get_ranged_response,
+    get_upload_setting,
+    save_file,
+)
+from chat_server.server_utils.enums import AvatarVariant, ClaimActions
+from chat_server.services.audio_cache import AudioCache
+from chat_server.services.audio_claims import AudioClaims, InvalidClaimException
+from chat_server.services.user_avatars import UserAvatars
 from utils.database_utils.mongo_utils.queries.wrapper import MongoDocumentsAPI
 from utils.http_utils import respond
 from utils.logging_utils import LOG
@@ -45,52 +61,157 @@ router = APIRouter(
 
 
 @router.get("/audio/{message_id}")
-async def get_audio_message(
-    message_id: str,
-):
-    """Gets file based on the name"""
+async def get_audio_message(message_id: str, request: Request):
+    """Gets audio of the message supporting "Range" requests"""
     matching_shout = MongoDocumentsAPI.SHOUTS.get_item(item_id=message_id)
     if matching_shout and matching_shout.get("is_audio", "0") == "1":
-        LOG.info(f"Fetching audio for message_id={message_id}")
-        return get_file_response(
-            matching_shout["message_text"],
-            location_prefix="audio",
+        # audio of the message is immutable, so message id identifies its content
+        etag = build_etag(message_id)
+        storage = server_config.storage
+        # disk tier of the cache is read off the event loop
+        audio_bytes = await storage.run(AudioCache.get, message_id=message_id)
+        if audio_bytes is not None:
+            return get_ranged_response(
+                request=request,
+                size=len(audio_bytes),
+                content_getter=lambda start, end: audio_bytes[start : end + 1],
+                etag=etag,
+                media_type="audio/wav",
+            )
+        LOG.info(f"Streaming audio for message_id={message_id}")
+        file_location = f'audio/{matching_shout["message_text"]}'
+        try:
+            file_stat = await storage.run(storage.stat, location=file_location)
+        except FileNotFoundError:
+            return respond("Audio file not found", 404)
+
+        def _stream_audio(start: int, end: int):
+            chunks = storage.stream(location=file_location, start=start, end=end)
+            if start == 0 and end == file_stat.size - 1:
+                chunks = AudioCache.cache_stream(chunks=chunks, message_id=message_id)
+            return chunks
+
+        return get_ranged_response(
+            request=request,
+            size=file_stat.size,
+            content_getter=_stream_audio,
+            etag=etag,
             media_type="audio/wav",
         )
     else:
         return respond("Matching shout not found", 404)
 
 
+@router.get("/claims/{claim}")
+async def read_claimed_audio(claim: str, request: Request):
+    """Gets audio file by the read claim supporting "Range" requests"""
+    try:
+        location = AudioClaims.resolve_claim(claim=claim, action=ClaimActions.READ)
+    except InvalidClaimException as ex:
+        return respond(f"Invalid claim - {ex}", 403)
+    location_prefix, _, filename = location.rpartition("/")
+    return await get_file_response(
+        filename=filename,
+        location_prefix=location_prefix,
+        media_type="audio/wav",
+        request=request,
+    )
+
+
+@router.put("/claims/{claim}")
+async def write_claimed_audio(claim: str, request: Request):
+    """Stores audio file uploaded as raw request body by the write claim"""
+    try:
+        location = AudioClaims.resolve_claim(claim=claim, action=ClaimActions.WRITE)
+    except InvalidClaimException as ex:
+        return respond(f"Invalid claim - {ex}", 403)
+    # size of the body is limited by the request size middleware
+    audio_bytes = await request.body()
+    if not audio_bytes:
+        return respond("Audio data is empty", 422)
+    storage = server_config.storage
+    await storage.run(storage.put, location=location, file_object=BytesIO(audio_bytes))
+    return respond("OK")
+
+
+# versioned avatar URLs never change their content
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
 @router.get("/avatar/{user_id}")
-async def get_avatar(user_id: str):
+async def get_avatar(
+    user_id: str,
+    request: Request,
+    variant: AvatarVariant = AvatarVariant.ORIGINAL,
+    version: str = None,
+):
     """
-    Gets file from the server
+    Gets avatar of the user
 
     :param user_id: target user id
+    :param request: Starlette request object
+    :param variant: variant of the avatar, falls back to the original if variant is not available
+    :param version: name of the avatar the URL was built for, long-lived caching is allowed if it is the current one
     """
     LOG.debug(f"Getting avatar of user id: {user_id}")
-    user_data = MongoDocumentsAPI.USERS.get_user(user_id=user_id) or {}
-    if user_data.get("avatar", None):
-        num_attempts = 0
+    avatar_data = UserAvatars.get_avatar(user_id=user_id)
+    if avatar_data:
+        filename = UserAvatars.get_avatar_filename(
+            avatar_data=avatar_data, variant=variant
+        )
+        if version == avatar_data["avatar"]:
+            cache_control = IMMUTABLE_CACHE_CONTROL
+        else:
+            cache_control = f"public, max-age={UserAvatars.max_age}"
         try:
-            return get_file_response(
-                filename=user_data["avatar"], location_prefix="avatars"
+            return await get_file_response(
+                filename=filename,
+                location_prefix=UserAvatars.AVATARS_PREFIX,
+                media_type=mimetypes.guess_type(filename)[0],
+                request=request,
+                # stored avatar names are unique, so the name identifies the content
+                etag=build_etag(filename),
+                cache_control=cache_control,
             )
         except Exception as ex:
-            LOG.error(
-                f'(attempt={num_attempts}) get_file_response(filename={user_data["avatar"]}, '
-                f'location_prefix="avatars") failed with ex - {ex}'
-            )
+            LOG.error(f"Failed to get avatar {filename = } - {ex}")
     return respond(f"Failed to get avatar of {user_id}", 404)
 
 
+@router.get("/avatars")
+async def get_avatars(
+    model: AvatarsRequestModel = permitted_access(AvatarsRequestModel),
+):
+    """
+    Resolves avatar URLs of the users
+
+    :param model: request data model
+
+    :returns JSON-formatted mapping of user id to the versioned avatar URL path, null for users without avatar
+    """
+    avatars = UserAvatars.get_avatars(user_ids=model.user_ids)
+    return JSONResponse(
+        content=dict(
+            data={
+                user_id: UserAvatars.build_url(
+                    user_id=user_id, avatar_data=avatar_data, variant=model.variant
+                )
+                if avatar_data
+                else None
+                for user_id, avatar_data in avatars.items()
+            }
+        )
+    )
+
+
 @router.get("/{msg_id}/get_attachment/{filename}")
-async def get_message_attachment(msg_id: str, filename: str):
+async def get_message_attachment(msg_id: str, filename: str, request: Request):
     """
     Gets file from the server
 
     :param msg_id: parent message id
     :param filename: name of the file to get
+    :param request: Starlette request object
     """
     LOG.debug(f"{msg_id} - {filename}")
     shout_data = MongoDocumentsAPI.SHOUTS.get_item(item_id=msg_id)
@@ -101,8 +222,11 @@ async def get_message_attachment(msg_id: str, filename: str):
             if attachment["name"] == filename
         ][0]
         media_type = attachment_data["mime"]
-        file_response = get_file_response(
-            filename=filename, media_type=media_type, location_prefix="attachments"
+        file_response = await get_file_response(
+            filename=filename,
+            media_type=media_type,
+            location_prefix="attachments",
+            request=request,
         )
         if file_response is None:
             return JSONResponse({"msg": "Missing attachments in destination"}, 400)
@@ -120,10 +244,17 @@ async def save_attachments(_=get_authorized_user, files: List[UploadFile] = File
 
     :returns JSON-formatted response from server
     """
-    response = {}
-    for file in files:
-        name = file.filename
-        stored_location = await save_file(location_prefix="attachments", file=file)
+    semaphore = asyncio.Semaphore(get_upload_setting("MAX_CONCURRENT_FILES"))
+
+    async def _save_attachment(file: UploadFile) -> str:
+        async with semaphore:
+            stored_location = await save_file(location_prefix="attachments", file=file)
         LOG.info(f"Stored location for {file.filename} - {stored_location}")
-        response[name] = stored_location
+        return stored_location
+
+    stored_locations = await asyncio.gather(*(_save_attachment(file) for file in files))
+    response = {
+        file.filename: stored_location
+        for file, stored_location in zip(files, stored_locations)
+    }
     return JSONResponse(content={"location_mapping": response})
@@ -32,13 +32,18 @@ from chat_server.server_utils.api_dependencies.extractors.users import (
     CurrentUserSessionData,
     CurrentUserData,
 )
+from chat_server.server_utils.api_dependencies.models.users import UsersRequestModel
 from chat_server.server_utils.api_dependencies.validators.users import (
     get_authorized_user,
+    permitted_access,
 )
 from chat_server.server_utils.auth import (
     check_password_strength,
 )
-from chat_server.server_utils.http_utils import save_file
+from chat_server.server_config import server_config
+from chat_server.server_utils.enums import AvatarVariant
+from chat_server.server_utils.http_utils import release_file, save_file
+from chat_server.services.user_avatars import UserAvatars
 from utils.common import get_hash
 from utils.database_utils.mongo_utils import MongoFilter
 from utils.database_utils.mongo_utils.queries.wrapper import MongoDocumentsAPI
@@ -67,12 +72,10 @@ async def get_user(
     session_token = ""
     if user_id:
         user = MongoDocumentsAPI.USERS.get_user(user_id=user_id)
-        user.pop("password", None)
-        user.pop("date_created", None)
-        user.pop("tokens", None)
-        if session_data.user.user_id != user_id:
-            user.pop("roles", None)
-            user.pop("preferences", None)
+        if user:
+            _strip_private_data(
+                user=user, is_current_user=session_data.user.user_id == user_id
+            )
         LOG.info(f"Fetched user data (id={user_id}): {user}")
     else:
         user = session_data.user
@@ -82,6 +85,33 @@ async def get_user(
     return dict(data=user, token=session_token)
 
 
+@router.get("/batch")
+async def get_users(model: UsersRequestModel = permitted_access(UsersRequestModel)):
+    """
+    Gets public profiles of the users within a single query
+
+    :param model: request data model
+
+    :returns JSON-formatted mapping of user id to the public profile, users which were not found are omitted
+    """
+    users = MongoDocumentsAPI.USERS.list_contains(
+        source_set=model.user_ids, aggregate_result=False, result_as_cursor=False
+    )
+    for user in users:
+        _strip_private_data(user=user)
+    return dict(data={user["_id"]: user for user in users})
+
+
+def _strip_private_data(user: dict, is_current_user: bool = False):
+    """Removes data of the user which is not exposed to the API, roles and preferences are exposed to the user only"""
+    user.pop("password", None)
+    user.pop("date_created", None)
+    user.pop("tokens", None)
+    if not is_current_user:
+        user.pop("roles", None)
+        user.pop("preferences", None)
+
+
 @router.post("/update")
 async def update_profile(
     current_user: CurrentUserData = get_authorized_user,
@@ -123,13 +153,41 @@ async def update_profile(
             return respond(msg=password_check, status_code=status.HTTP_401_UNAUTHORIZED)
         update_dict["password"] = get_hash(password)
     if avatar:
-        update_dict["avatar"] = await save_file(location_prefix="avatars", file=avatar)
+        update_dict["avatar"] = await save_file(
+            location_prefix=UserAvatars.AVATARS_PREFIX, file=avatar
+        )
+        if not isinstance(update_dict["avatar"], str):
+            return update_dict["avatar"]
+        await avatar.seek(0)
+        avatar_variants = await server_config.storage.run(
+            UserAvatars.store_variants,
+            file_object=avatar.file,
+            avatar=update_dict["avatar"],
+            storage=server_config.storage,
+        )
     try:
         filter_expression = MongoFilter(key="_id", value=current_user.user_id)
         update_dict = {k: v for k, v in update_dict.items() if v}
+        if avatar:
+            # set even if empty, so variants of the previous avatar are not referenced
+            update_dict["avatar_variants"] = avatar_variants
         MongoDocumentsAPI.USERS.update_item(
             filters=(filter_expression,), data=update_dict
         )
+        if avatar:
+            UserAvatars.set_avatar(
+                user_id=current_user.user_id,
+                avatar=update_dict["avatar"],
+                avatar_variants=avatar_variants,
+            )
+            if current_user.avatar:
+                for variant in AvatarVariant:
+                    await release_file(
+                        filename=UserAvatars.get_variant_filename(
+                            avatar=current_user.avatar, variant=variant
+                        ),
+                        location_prefix=UserAvatars.AVATARS_PREFIX,
+                    )
         return respond(msg="OK")
     except Exception as ex:
         LOG.exception(
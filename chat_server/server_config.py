@@ -25,15 +25,33 @@
 # LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
-from neon_sftp import NeonSFTPConnector
+from typing import Optional
+
 from kubernetes import client, config
 
 from config import KlatConfigurationBase
-from chat_server.server_utils.sftp_utils import init_sftp_connector
+from chat_server.server_utils.sftp_utils import (
+    SFTPConnectionPool,
+    init_sftp_connector,
+)
+from chat_server.server_utils.enums import DataSources
 from chat_server.server_utils.rmq_utils import RabbitMQAPI
+from chat_server.server_utils.storage import StorageBackend, init_storage
+from chat_server.services.admission_control import AdmissionController
+from chat_server.services.audio_cache import AudioCache
+from chat_server.services.audio_claims import AudioClaims
+from chat_server.services.conversation_replay import ConversationReplay
+from chat_server.services.inflight_requests import InFlightRequests
+from chat_server.services.rate_limiter import SIORateLimiter
+from chat_server.services.request_profiler import RequestProfiler
+from chat_server.services.translation_batcher import TranslationBatcher
+from chat_server.services.user_avatars import UserAvatars
 from utils.exceptions import MalformedConfigurationException
 from utils.database_utils import DatabaseController
+from utils.database_utils.slow_query_log import SlowQueryLog
+from utils.database_utils.mongo_utils.queries.dao.files import FilesDAO
 from utils.database_utils.mongo_utils.queries.wrapper import MongoDocumentsAPI
+from utils.logging_utils import LOG
 
 
 class KlatServerConfig(KlatConfigurationBase):
@@ -44,6 +62,7 @@ class KlatServerConfig(KlatConfigurationBase):
         super().__init__()
 
         self._sftp_connector = None
+        self._storage = None
         self._default_db_controller = None
         self._k8s_config = None
         self._k8s_default_namespace = None
@@ -52,8 +71,23 @@ class KlatServerConfig(KlatConfigurationBase):
         self._mq_management_config = None
 
         MongoDocumentsAPI.init(
-            db_controller=self.default_db_controller, sftp_connector=self.sftp_connector
+            db_controller=self.default_db_controller,
+            sftp_connector=self.sftp_connector,
+            storage=self.storage,
+        )
+        AdmissionController.init(config=self.config_data.get("ADMISSION_CONTROL", {}))
+        AudioCache.init(config=self.config_data.get("AUDIO_CACHE", {}))
+        AudioClaims.init(
+            config=self.config_data.get("AUDIO_CLAIMS", {}),
+            secret=self.config_data.get("COOKIES", {}).get("SECRET"),
         )
+        ConversationReplay.init(config=self.config_data.get("CONVERSATION_REPLAY", {}))
+        InFlightRequests.init(config=self.config_data.get("INFLIGHT_REQUESTS", {}))
+        SlowQueryLog.init(config=self.config_data.get("SLOW_QUERY_LOG", {}))
+        TranslationBatcher.init(config=self.config_data.get("TRANSLATION_BATCHING", {}))
+        RequestProfiler.init(config=self.config_data.get("PROFILING", {}))
+        SIORateLimiter.init(config=self.config_data.get("SIO_RATE_LIMITS", {}))
+        UserAvatars.init(config=self.config_data.get("AVATARS", {}))
 
     @property
     def config_key(self) -> str:
@@ -70,13 +104,32 @@ class KlatServerConfig(KlatConfigurationBase):
         )
 
     @property
-    def sftp_connector(self) -> NeonSFTPConnector:
-        if not self._sftp_connector:
+    def file_storing_type(self) -> DataSources:
+        return DataSources(self["FILE_STORING_TYPE"].upper())
+
+    @property
+    def sftp_connector(self) -> Optional[SFTPConnectionPool]:
+        """Pool of SFTP sessions, created only if SFTP storage is selected"""
+        if not self._sftp_connector and self.file_storing_type == DataSources.SFTP:
             self._sftp_connector = init_sftp_connector(
                 config=self.config_data.get("SFTP")
             )
         return self._sftp_connector
 
+    @property
+    def storage(self) -> StorageBackend:
+        """Storage of avatars, attachments and audio selected by "FILE_STORING_TYPE" """
+        if not self._storage:
+            LOG.info(f"Using {self.file_storing_type.value} file storage")
+            self._storage = init_storage(
+                data_source=self.file_storing_type,
+                config=self.config_data.get("FILE_STORAGE", {}),
+                local_location=self.config_data.get("FILE_STORING_LOCATION"),
+                sftp_connector=self.sftp_connector,
+                index=FilesDAO(db_controller=self.default_db_controller),
+            )
+        return self._storage
+
     @property
     def k8s_config(self) -> dict:
         return self.config_data.get("K8S_CONFIG", {})
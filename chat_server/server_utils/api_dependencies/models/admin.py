@@ -25,6 +25,8 @@
 # LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+from typing import Literal
+
 from fastapi import Query
 from pydantic import BaseModel, Field
 
@@ -36,3 +38,26 @@ class RefreshServiceRequestModel(BaseModel):
 
 class ChatsOverviewRequestModel(BaseModel):
     search_str: str = Field(default="")
+
+
+class SlowQueriesRequestModel(BaseModel):
+    limit: int = Field(default=100, examples=[100])
+
+
+class ProfilesRequestModel(BaseModel):
+    limit: int = Field(default=50, examples=[50])
+
+
+class ProfileRequestModel(BaseModel):
+    profile_id: str = Field(examples=["a1b2c3d4e5"])
+    format: Literal["speedscope", "html"] = Field(default="speedscope")
+
+
+class RouteProfilingRequestModel(BaseModel):
+    route: str = Field(examples=["/chat_api/search"])
+    sample_rate: float = Field(ge=0, le=1, examples=[0.05])
+
+
+class StorageGCRequestModel(BaseModel):
+    grace_period: int = Field(default=24 * 60 * 60, ge=0, examples=[86400])
+    limit: int = Field(default=1000, gt=0, examples=[1000])
@@ -48,3 +48,16 @@ class GetLiveConversationModel(BaseModel):
     skin: str = Field(
         Query(default=ConversationSkins.PROMPTS), examples=[ConversationSkins.PROMPTS]
     )
+
+
+class ConversationCursorModel(BaseModel):
+    cid: str = Field(examples=["1"])
+    creation_time_from: int | None = Field(default=None, examples=[int(time())])
+    skin: str = Field(
+        default=ConversationSkins.PROMPTS, examples=[ConversationSkins.PROMPTS]
+    )
+
+
+class GetConversationsBatchModel(BaseModel):
+    conversations: list[ConversationCursorModel] = Field(min_length=1, max_length=50)
+    limit_chat_history: int = Field(default=100, examples=[100])
@@ -25,6 +25,7 @@
 # LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+from fastapi import Query
 from pydantic import BaseModel, Field
 
 
@@ -46,3 +47,9 @@ class CurrentUserModel(BaseModel):
 class CurrentUserSessionModel(BaseModel):
     user: CurrentUserModel
     session: str
+
+
+class UsersRequestModel(BaseModel):
+    user_ids: list[str] = Field(
+        Query(min_length=1, max_length=500), examples=[["user_1", "user_2"]]
+    )
@@ -27,6 +27,8 @@
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 from chat_server.constants.conversations import ConversationSkins
+from chat_server.services.conversation_replay import ConversationReplay
+from utils.database_utils.mongo_utils.queries.wrapper import MongoDocumentsAPI
 from utils.logging_utils import LOG
 
 
@@ -57,3 +59,64 @@ def build_message_json(
         LOG.error(f"Undefined skin = {skin}")
         message = {}
     return message
+
+
+def build_new_message_data(shout: dict) -> dict:
+    """Builds data of "new_message" event from the stored shout"""
+    return {
+        "cid": shout["cid"],
+        "userID": shout["user_id"],
+        "messageID": shout["_id"],
+        "message_id": shout["_id"],
+        "messageText": shout["message_text"],
+        "lang": shout.get("message_lang", "en"),
+        "timeCreated": int(shout["created_on"]),
+        "repliedMessage": shout.get("replied_message", ""),
+        "attachments": shout.get("attachments", []),
+        "isAudio": shout.get("is_audio", "0"),
+        "isAnnouncement": shout.get("is_announcement", "0"),
+        "is_bot": shout.get("is_bot", "0"),
+        "prompt_id": shout.get("prompt_id", ""),
+        "seq": shout["seq"],
+    }
+
+
+def build_conversation_delta(cid: str, seq: int) -> dict:
+    """
+    Builds events of the conversation numbered after provided sequence number
+
+    Recent events are replayed from memory. Otherwise, messages are fetched from the database,
+    prompt and translation updates are not stored with sequence numbers so they are not included.
+
+    :param cid: target conversation id
+    :param seq: last sequence number received by the client
+
+    :returns delta data with keys:
+        - "cid": target conversation id
+        - "seq": last sequence number of the delta
+        - "events": list of events with keys "seq", "event" and "data"
+        - "complete": False if prompt and translation updates might be missing
+        - "reload": True if too many events are missing, so conversation has to be reloaded
+    """
+    events = ConversationReplay.get_since(cid=cid, seq=seq)
+    is_complete = events is not None
+    is_reload = False
+    if not is_complete:
+        limit = ConversationReplay.max_db_events
+        shouts = MongoDocumentsAPI.SHOUTS.list_since(cid=cid, seq=seq, limit=limit + 1)
+        is_reload = len(shouts) > limit
+        events = [
+            {
+                "seq": shout["seq"],
+                "event": "new_message",
+                "data": build_new_message_data(shout=shout),
+            }
+            for shout in shouts[:limit]
+        ]
+    return {
+        "cid": cid,
+        "seq": events[-1]["seq"] if events else seq,
+        "events": [] if is_reload else events,
+        "complete": is_complete,
+        "reload": is_reload,
+    }
@@ -34,6 +34,7 @@ class DataSources(Enum):
 
     SFTP = "SFTP"
     LOCAL = "LOCAL"
+    S3 = "S3"
 
 
 class UserRoles(IntEnum):
@@ -44,6 +45,28 @@ class UserRoles(IntEnum):
     SUPER_ADMIN = 3
 
 
+class AvatarVariant(StrEnum):
+    """Enumeration of stored avatar variants"""
+
+    THUMBNAIL = "thumbnail"
+    SMALL = "small"
+    ORIGINAL = "original"
+
+
 class RequestModelType(StrEnum):
     QUERY = "QUERY"
     DATA = "DATA"
+
+
+class ClaimActions(StrEnum):
+    """Actions permitted by the claim on the stored file"""
+
+    READ = "read"
+    WRITE = "write"
+
+
+class SIOSerializers(StrEnum):
+    """Serializers of the Socket.IO packets negotiated by the clients"""
+
+    JSON = "json"
+    MSGPACK = "msgpack"
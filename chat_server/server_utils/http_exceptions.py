@@ -77,3 +77,22 @@ class InvalidInputData(KlatAPIException):
 class PermissionDenied(KlatAPIException):
     HTTP_CODE = http.HTTPStatus.FORBIDDEN
     MESSAGE = "User has no permission to access this resource"
+
+
+class PayloadTooLargeException(KlatAPIException):
+    HTTP_CODE = http.HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+    MESSAGE = "Uploaded content exceeds allowed size"
+
+
+class ServiceOverloadedException(KlatAPIException):
+    HTTP_CODE = http.HTTPStatus.SERVICE_UNAVAILABLE
+    MESSAGE = "Server is overloaded, retry later"
+
+    def __init__(self, message: str = None, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+    def to_http_response(self):
+        response = super().to_http_response()
+        response.headers["Retry-After"] = str(self.retry_after)
+        return response
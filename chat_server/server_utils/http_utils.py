@@ -26,17 +26,19 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-import os
-from io import BytesIO
+import hashlib
+from dataclasses import dataclass
+from email.utils import formatdate
+from typing import Callable, Iterable
 
-import aiofiles
 from fastapi import UploadFile, Request
-from starlette.responses import FileResponse, StreamingResponse
+from starlette.responses import Response, StreamingResponse
 
 from chat_server.server_config import server_config
-from chat_server.server_utils.enums import DataSources
+from chat_server.server_utils.http_exceptions import PayloadTooLargeException
+from chat_server.server_utils.storage import ContentAddressedStorage, StorageBackend
 from utils.common import generate_uuid
-from utils.http_utils import respond
+from utils.http_utils import matches_entity_tag, respond
 from utils.logging_utils import LOG
 
 
@@ -49,89 +51,332 @@ class KlatAPIResponse:
     INTERNAL_SERVER_ERROR = respond("INTERNAL_SERVER_ERROR", status_code=500)
 
 
-def get_file_response(
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_byte_range(range_header: str, size: int) -> tuple[int, int] | None:
+    """
+    Parses value of the "Range" header, only single byte range is supported
+
+    :param range_header: value of the "Range" header
+    :param size: size of the requested content in bytes
+
+    :returns tuple of first and last (inclusive) byte offsets, None if header should be ignored
+    :raises RangeNotSatisfiable: if range is out of content bounds
+    """
+    unit, _, ranges = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in ranges:
+        return None
+    start, _, end = ranges.strip().partition("-")
+    try:
+        if not start:
+            # suffix range, e.g. "bytes=-500" for last 500 bytes
+            suffix_length = int(end)
+            if suffix_length <= 0:
+                raise RangeNotSatisfiable
+            return max(size - suffix_length, 0), size - 1
+        start = int(start)
+        end = int(end) if end else size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        raise RangeNotSatisfiable
+    return start, min(end, size - 1)
+
+
+def build_etag(*parts) -> str:
+    """Builds strong entity tag of the content identified by provided parts (e.g. size and modification time)"""
+    return f'"{"-".join(str(part) for part in parts)}"'
+
+
+def is_not_modified(request: Request | None, etag: str) -> bool:
+    """Checks if client already has the content identified by provided entity tag"""
+    return bool(request) and matches_entity_tag(
+        if_none_match=request.headers.get("if-none-match", ""), etag=etag
+    )
+
+
+def get_ranged_response(
+    request: Request | None,
+    size: int,
+    content_getter: Callable[[int, int], bytes | Iterable[bytes]],
+    etag: str,
+    media_type: str = None,
+    last_modified: float = None,
+    cache_control: str = None,
+) -> Response:
+    """
+    Builds response to the content supporting conditional and "Range" requests
+
+    :param request: Starlette request object (optional), Range headers are ignored if not provided
+    :param size: size of the content in bytes
+    :param content_getter: callable accepting first and last (inclusive) byte offsets, returns bytes or iterable of chunks
+    :param etag: entity tag of the content
+    :param media_type: type of the content
+    :param last_modified: timestamp of the last content modification (optional)
+    :param cache_control: value of the "Cache-Control" header (optional)
+
+    :returns 200 with full content, 206 with partial content, 304 if content was not modified
+             or 416 if requested range is not satisfiable
+    """
+    headers = {"Accept-Ranges": "bytes", "ETag": etag}
+    if last_modified:
+        headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    request_headers = request.headers if request else {}
+    if is_not_modified(request=request, etag=etag):
+        return Response(status_code=304, headers=headers)
+    byte_range = None
+    range_header = request_headers.get("range")
+    if range_header and size > 0:
+        if_range = request_headers.get("if-range")
+        if not if_range or if_range in (etag, headers.get("Last-Modified")):
+            try:
+                byte_range = parse_byte_range(range_header=range_header, size=size)
+            except RangeNotSatisfiable:
+                return Response(
+                    status_code=416,
+                    headers={**headers, "Content-Range": f"bytes */{size}"},
+                )
+    status_code = 200
+    start, end = 0, size - 1
+    if byte_range:
+        status_code = 206
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    content = content_getter(start, end) if size > 0 else b""
+    if isinstance(content, bytes):
+        response_class = Response
+    else:
+        response_class = StreamingResponse
+    return response_class(
+        content=content,
+        status_code=status_code,
+        headers=headers,
+        media_type=media_type,
+    )
+
+
+def get_storage_location(filename: str, location_prefix: str = "") -> str:
+    """Builds location of the file in the storage"""
+    return f"{location_prefix}/{filename}" if location_prefix else filename
+
+
+async def get_file_response(
     filename,
     location_prefix: str = "",
     media_type: str = None,
-    data_source: DataSources = DataSources.SFTP,
-) -> FileResponse:
+    storage: StorageBackend = None,
+    request: Request = None,
+    etag: str = None,
+    cache_control: str = None,
+) -> Response:
     """
     Gets starlette file response based on provided location
 
     :param location_prefix: subdirectory for file to get
     :param filename: name of the file to get
     :param media_type: type of file to send
-    :param data_source: source of the data from DataSources
+    :param storage: storage to get file from (defaults to configured storage)
+    :param request: Starlette request object to support conditional and "Range" requests (optional)
+    :param etag: entity tag of the file if known in advance, allows to respond to conditional requests
+                 without reaching the storage (optional)
+    :param cache_control: value of the "Cache-Control" header (optional)
 
-    :returns FileResponse in case file is present under specified location
+    :returns file response in case file is present under specified location
     """
-    # TODO: potentially support different ways to access files (e.g. local, S3, remote server, etc..)
     LOG.debug(f"Getting file based on filename: {filename}, media type: {media_type}")
-    if data_source == DataSources.SFTP:
-        sftp_data = server_config.sftp_connector.get_file_object(
-            get_from=f"{location_prefix}/{filename}"
-        )
-        file_response_args = dict(
-            content=sftp_data,
-        )
-        response_class = StreamingResponse
-    elif data_source == DataSources.LOCAL:
-        path = os.path.join(
-            server_config["FILE_STORING_LOCATION"], location_prefix, filename
-        )
-        LOG.debug(f"path: {path}")
-        if os.path.exists(os.path.expanduser(path)):
-            file_response_args = dict(path=path, filename=filename)
-        else:
-            LOG.error(f"{path} not found")
-            return respond("File not found", 404)
-        response_class = FileResponse
-    else:
-        LOG.error(f"Data source does not exists - {data_source}")
-        return respond("Unable to fetch relevant data source", 403)
-    if media_type:
-        file_response_args["media_type"] = media_type
-    return response_class(**file_response_args)
+    if etag and is_not_modified(request=request, etag=etag):
+        headers = {"ETag": etag}
+        if cache_control:
+            headers["Cache-Control"] = cache_control
+        return Response(status_code=304, headers=headers)
+    storage = storage or server_config.storage
+    file_location = get_storage_location(
+        filename=filename, location_prefix=location_prefix
+    )
+    try:
+        file_stat = await storage.run(storage.stat, location=file_location)
+    except (FileNotFoundError, ValueError):
+        LOG.error(f"{file_location} not found")
+        return respond("File not found", 404)
+    return get_ranged_response(
+        request=request,
+        size=file_stat.size,
+        content_getter=lambda start, end: storage.stream(
+            location=file_location, start=start, end=end
+        ),
+        etag=etag
+        or file_stat.etag
+        or build_etag(f"{int(file_stat.last_modified or 0):x}", f"{file_stat.size:x}"),
+        media_type=media_type,
+        last_modified=file_stat.last_modified,
+        cache_control=cache_control,
+    )
+
+
+_UPLOAD_DEFAULTS = {
+    "CHUNK_SIZE": 64 * 1024,
+    "MAX_FILE_SIZE": 50 * 1024 * 1024,
+    "MAX_REQUEST_SIZE": 200 * 1024 * 1024,
+    "MAX_CONCURRENT_FILES": 4,
+}
+
+
+def get_upload_setting(name: str) -> int:
+    """
+    Gets file upload setting from "FILE_UPLOADS" configuration section, supported keys:
+        - "CHUNK_SIZE": number of bytes read from upload at once (defaults to 64 KiB)
+        - "MAX_FILE_SIZE": max size of single uploaded file in bytes (defaults to 50 MiB)
+        - "MAX_REQUEST_SIZE": max size of request body in bytes (defaults to 200 MiB)
+        - "MAX_CONCURRENT_FILES": max number of files of single request stored concurrently (defaults to 4)
+
+    :param name: name of the setting
+    :returns configured value or its default
+    """
+    upload_config = server_config.get("FILE_UPLOADS", None) or {}
+    return int(upload_config.get(name, _UPLOAD_DEFAULTS[name]))
+
+
+@dataclass
+class StoredFile:
+    name: str
+    size: int
+    sha256: str
+
+
+class UploadStream:
+    """
+    File-like reader of the uploaded file, consumes it in bounded chunks
+    while computing content hash and enforcing max file size
+    """
+
+    def __init__(self, file: UploadFile):
+        self._file = file
+        self.chunk_size = get_upload_setting("CHUNK_SIZE")
+        self.max_size = get_upload_setting("MAX_FILE_SIZE")
+        self.size = 0
+        self._hash = hashlib.sha256()
+
+    @property
+    def sha256(self) -> str:
+        return self._hash.hexdigest()
+
+    def consume(self, chunk: bytes) -> bytes:
+        """
+        Accounts chunk of the uploaded content
+
+        :param chunk: chunk of content
+        :returns provided chunk
+        :raises PayloadTooLargeException: if uploaded content exceeds max file size
+        """
+        self.size += len(chunk)
+        if self.size > self.max_size:
+            raise PayloadTooLargeException(
+                f"{self._file.filename!r} exceeds max file size of {self.max_size} bytes"
+            )
+        self._hash.update(chunk)
+        return chunk
+
+    def read(self, size: int = -1) -> bytes:
+        """Synchronous read used by blocking storage clients, never reads more than a chunk at once"""
+        if size is None or size < 0 or size > self.chunk_size:
+            size = self.chunk_size
+        return self.consume(self._file.file.read(size))
+
+
+async def store_file(
+    file: UploadFile,
+    location_prefix: str = "",
+    storage: StorageBackend = None,
+) -> StoredFile:
+    """
+    Streams uploaded file to the storage keeping memory footprint bounded by a chunk size
+
+    :param file: file to save
+    :param location_prefix: subdirectory for file to get
+    :param storage: storage to save file to (defaults to configured storage)
+
+    :returns StoredFile with generated location, size and content hash of the provided file
+    :raises PayloadTooLargeException: if uploaded content exceeds max file size
+    """
+    storage = storage or server_config.storage
+    new_name = f'{generate_uuid(length=12)}.{file.filename.split(".")[-1]}'
+    upload_stream = UploadStream(file=file)
+    await file.seek(0)
+    # partially stored content is removed by the storage if upload fails
+    await storage.run(
+        storage.put,
+        location=get_storage_location(
+            filename=new_name, location_prefix=location_prefix
+        ),
+        file_object=upload_stream,
+    )
+    LOG.debug(
+        f"Stored {file.filename!r} as {new_name!r} "
+        f"({upload_stream.size} bytes, sha256={upload_stream.sha256})"
+    )
+    return StoredFile(
+        name=new_name, size=upload_stream.size, sha256=upload_stream.sha256
+    )
 
 
 async def save_file(
     file: UploadFile,
     location_prefix: str = "",
-    data_source: DataSources = DataSources.SFTP,
+    storage: StorageBackend = None,
 ) -> str:
     """
     Saves file in the file system
 
     :param file: file to save
     :param location_prefix: subdirectory for file to get
-    :param data_source: source of the data from DataSources
+    :param storage: storage to save file to (defaults to configured storage)
 
     :returns generated location for the provided file
+    :raises PayloadTooLargeException: if uploaded content exceeds max file size
     """
-    new_name = f'{generate_uuid(length=12)}.{file.filename.split(".")[-1]}'
-    if data_source == DataSources.LOCAL:
-        storing_path = os.path.expanduser(
-            os.path.join(server_config["FILE_STORING_LOCATION"], location_prefix)
+    try:
+        stored_file = await store_file(
+            file=file, location_prefix=location_prefix, storage=storage
         )
-        os.makedirs(storing_path, exist_ok=True)
-        async with aiofiles.open(
-            os.path.join(storing_path, new_name), "wb"
-        ) as out_file:
-            content = file.file.read()  # async read
-            await out_file.write(content)
-    elif data_source == DataSources.SFTP:
-        content = BytesIO(file.file.read())
-        try:
-            server_config.sftp_connector.put_file_object(
-                file_object=content, save_to=f"{location_prefix}/{new_name}"
-            )
-        except Exception as ex:
-            LOG.error(f"failed to save file: {file.filename}- {ex}")
-            return respond("Failed to save attachment due to unexpected error", 422)
-    else:
-        LOG.error(f"Data source does not exists - {data_source}")
-        return respond(f"Unable to fetch relevant data source", 403)
-    return new_name
+    except PayloadTooLargeException:
+        raise
+    except Exception as ex:
+        LOG.error(f"failed to save file: {file.filename}- {ex}")
+        return respond("Failed to save attachment due to unexpected error", 422)
+    return stored_file.name
+
+
+async def release_file(
+    filename: str,
+    location_prefix: str = "",
+    storage: StorageBackend = None,
+):
+    """
+    Releases file which is no longer referenced,
+    content of deduplicated files is deleted by the garbage collection once no file references it
+
+    :param filename: name of the file to release
+    :param location_prefix: subdirectory of the file
+    :param storage: storage of the file (defaults to configured storage)
+    """
+    storage = storage or server_config.storage
+    if not isinstance(storage, ContentAddressedStorage):
+        # files might be shared if deduplication is disabled, so they are kept
+        return
+    try:
+        await storage.run(
+            storage.delete,
+            location=get_storage_location(
+                filename=filename, location_prefix=location_prefix
+            ),
+        )
+    except Exception as ex:
+        LOG.warning(f"Failed to release {filename = }: {ex}")
 
 
 def get_request_path_string(request: Request) -> str:
@@ -26,55 +26,223 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-import random
-import string
 import time
 import traceback
 
+from fastapi import HTTPException
 from starlette.requests import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import Message, Receive, Scope, Send
 
-from chat_server.server_utils.http_exceptions import KlatAPIException
-from chat_server.server_utils.http_utils import get_request_path_string, KlatAPIResponse
+from chat_server.server_utils.api_dependencies.models.users import CurrentUserModel
+from chat_server.server_utils.api_dependencies.validators.users import has_admin_role
+from chat_server.server_utils.auth import get_current_user
+from chat_server.server_utils.http_exceptions import (
+    KlatAPIException,
+    PayloadTooLargeException,
+    ServiceOverloadedException,
+)
+from chat_server.server_utils.http_utils import KlatAPIResponse, get_upload_setting
+from chat_server.services.admission_control import AdmissionController
+from chat_server.services.request_profiler import RequestProfiler
+from utils.http_utils import ASGIMiddleware, RequestTimer, generate_request_id
 from utils.logging_utils import LOG
+from utils.metrics_utils import (
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUEST_ERRORS,
+    HTTP_REQUESTS_IN_PROGRESS,
+)
 
 
-class KlatAPIExceptionMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
+class KlatAPIExceptionMiddleware(ASGIMiddleware):
+    async def handle(self, scope: Scope, receive: Receive, send: Send):
+        request_timer = RequestTimer(send=send)
         try:
-            response = await call_next(request)
+            await self.app(scope, receive, request_timer.send)
         except KlatAPIException as exc:
-            path = get_request_path_string(request=request)
+            if request_timer.response_started:
+                raise
+            path = _get_request_path_string(scope=scope)
             LOG.warning(f"Klat API exception occurred for {path = } msg={exc.MESSAGE}")
-            response = exc.to_http_response()
-        return response
+            await exc.to_http_response()(scope, receive, send)
 
 
-class LogMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        path = get_request_path_string(request=request)
-        request_id = "".join(
-            random.choices(string.ascii_uppercase + string.digits, k=6)
-        )
+class LogMiddleware(ASGIMiddleware):
+    """Logs request timings and gracefully handles Internal Server Errors"""
+
+    REQUEST_ID_HEADER = "X-Request-ID"
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send):
+        path = _get_request_path_string(scope=scope)
+        request_id = generate_request_id()
         LOG.info(f"{request_id = } start at {path = }")
-        start_time = time.time()
+        request_timer = RequestTimer(
+            send=send,
+            headers={self.REQUEST_ID_HEADER: request_id},
+            server_timing=True,
+        )
         try:
-            response = await call_next(request)
-            process_time = (time.time() - start_time) * 1000
-            formatted_process_time = "{0:.2f}".format(process_time)
-            log_message = (
+            await self.app(scope, receive, request_timer.send)
+            LOG.info(
                 f"{request_id = } "
-                f"completed_in={formatted_process_time}ms "
-                f"status_code={response.status_code}"
+                f"completed_in={request_timer.elapsed_ms:.2f}ms "
+                f"status_code={request_timer.status_code}"
             )
-            LOG.info(log_message)
-            return response
         except:
             LOG.error(f"{path = }| traceback = {traceback.format_exc()}")
-        return KlatAPIResponse.INTERNAL_SERVER_ERROR
+            if not request_timer.response_started:
+                await KlatAPIResponse.INTERNAL_SERVER_ERROR(
+                    scope, receive, request_timer.send
+                )
+
+
+class MetricsMiddleware(ASGIMiddleware):
+    async def handle(self, scope: Scope, receive: Receive, send: Send):
+        method = scope["method"]
+        HTTP_REQUESTS_IN_PROGRESS.labels(method=method).inc()
+        start_time = time.perf_counter()
+        request_timer = RequestTimer(send=send)
+        try:
+            await self.app(scope, receive, request_timer.send)
+        except:
+            HTTP_REQUEST_ERRORS.labels(
+                method=method, route=_get_route_template(scope=scope)
+            ).inc()
+            raise
+        finally:
+            HTTP_REQUEST_DURATION.labels(
+                method=method,
+                route=_get_route_template(scope=scope),
+                status_code=request_timer.status_code or 500,
+            ).observe(time.perf_counter() - start_time)
+            HTTP_REQUESTS_IN_PROGRESS.labels(method=method).dec()
+
+
+class ProfilingMiddleware(ASGIMiddleware):
+    """
+    Profiles requests flagged by admins with "X-Klat-Profile" header or "profile" query param
+    and sampled fraction of the configured routes, id of the stored profile is returned in response header
+    """
+
+    PROFILE_HEADER = "X-Klat-Profile"
+    PROFILE_QUERY_PARAM = "profile"
+    PROFILE_ID_HEADER = "X-Klat-Profile-Id"
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send):
+        if not RequestProfiler.enabled:
+            return await self.app(scope, receive, send)
+        request = Request(scope)
+        trigger, user_id = None, None
+        if self._is_profiling_requested(request=request):
+            user_id = self._get_admin_user_id(request=request)
+            if user_id:
+                trigger = "admin"
+            else:
+                LOG.warning(
+                    f"Ignoring profiling request from non-admin user to {request.url.path}"
+                )
+        if not trigger and RequestProfiler.should_sample_route(path=request.url.path):
+            trigger = "sampled"
+        if not trigger:
+            return await self.app(scope, receive, send)
+        with RequestProfiler.profile(
+            kind="http",
+            target=f"{request.method} {request.url.path}",
+            trigger=trigger,
+            user_id=user_id,
+        ) as profile_metadata:
+            request_timer = RequestTimer(
+                send=send,
+                headers={self.PROFILE_ID_HEADER: profile_metadata["profile_id"]},
+            )
+            await self.app(scope, receive, request_timer.send)
+
+    def _is_profiling_requested(self, request: Request) -> bool:
+        flag = request.headers.get(self.PROFILE_HEADER) or request.query_params.get(
+            self.PROFILE_QUERY_PARAM
+        )
+        return flag in ("1", "true")
+
+    @staticmethod
+    def _get_admin_user_id(request: Request) -> str | None:
+        """Gets id of the current user if it has admin role"""
+        try:
+            current_user = CurrentUserModel.model_validate(
+                get_current_user(request=request), strict=True
+            )
+        except Exception as ex:
+            LOG.warning(f"Failed to resolve user requested profiling: {ex}")
+            return None
+        if current_user.is_tmp or not has_admin_role(current_user=current_user):
+            return None
+        return current_user.user_id
+
+
+class RequestSizeLimitMiddleware(ASGIMiddleware):
+    """Rejects requests which body exceeds configured max request size while it is being received"""
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send):
+        max_size = get_upload_setting("MAX_REQUEST_SIZE")
+        content_length = Request(scope).headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > max_size:
+            response = PayloadTooLargeException(
+                f"Request body exceeds max size of {max_size} bytes"
+            ).to_http_response()
+            return await response(scope, receive, send)
+        received_size = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received_size
+            message = await receive()
+            if message["type"] == "http.request":
+                received_size += len(message.get("body", b""))
+                if received_size > max_size:
+                    # raised from the body parsing, so FastAPI re-raises it untouched
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"Request body exceeds max size of {max_size} bytes",
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+class AdmissionControlMiddleware(ASGIMiddleware):
+    """Limits concurrency of the requests per route class, excessive requests are shed with 503"""
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send):
+        if not AdmissionController.enabled:
+            return await self.app(scope, receive, send)
+        route_class = AdmissionController.classify_route(
+            method=scope["method"], path=scope["path"]
+        )
+        async with AdmissionController.admit(
+            route_class=route_class, kind="http"
+        ) as admitted:
+            if admitted:
+                return await self.app(scope, receive, send)
+        path = _get_request_path_string(scope=scope)
+        LOG.warning(f"Shedding request to {path = } ({route_class = })")
+        response = ServiceOverloadedException(
+            retry_after=AdmissionController.get_gate(route_class).retry_after
+        ).to_http_response()
+        await response(scope, receive, send)
+
+
+def _get_request_path_string(scope: Scope) -> str:
+    return f"[{scope['method']}] {scope['path']} "
+
+
+def _get_route_template(scope: Scope) -> str:
+    """Gets path template of the matched route to keep metrics cardinality bounded"""
+    route = scope.get("route")
+    return getattr(route, "path", "unmatched")
 
 
 SUPPORTED_MIDDLEWARE = (
     KlatAPIExceptionMiddleware,
+    ProfilingMiddleware,
+    RequestSizeLimitMiddleware,
+    AdmissionControlMiddleware,
+    MetricsMiddleware,
     LogMiddleware,
 )
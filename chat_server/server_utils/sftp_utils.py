@@ -26,20 +26,413 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from threading import Condition
+from typing import Callable, Iterator
+
 from neon_sftp import NeonSFTPConnector
+from paramiko import SSHException
 
 from utils.constants import KLAT_ENV
 from utils.exceptions import MalformedConfigurationException
+from utils.logging_utils import LOG
+from utils.metrics_utils import (
+    SFTP_POOL_CONNECTIONS,
+    SFTP_POOL_RECONNECTS,
+    SFTP_POOL_WAIT_DURATION,
+    SFTP_TRANSFER_BYTES,
+    SFTP_TRANSFER_DURATION,
+    SFTP_TRANSFER_ERRORS,
+    track_duration,
+)
+
+
+class InstrumentedSFTPConnector(NeonSFTPConnector):
+    """SFTP Connector collecting transfer metrics"""
+
+    def get_file_object(self, get_from: str, *args, **kwargs):
+        with track_duration(
+            duration=SFTP_TRANSFER_DURATION,
+            errors=SFTP_TRANSFER_ERRORS,
+            operation="get",
+        ):
+            file_object = super().get_file_object(get_from, *args, **kwargs)
+        SFTP_TRANSFER_BYTES.labels(operation="get").observe(
+            file_object.getbuffer().nbytes
+        )
+        return file_object
+
+    def put_file_object(self, file_object, save_to):
+        with track_duration(
+            duration=SFTP_TRANSFER_DURATION,
+            errors=SFTP_TRANSFER_ERRORS,
+            operation="put",
+        ):
+            stats = super().put_file_object(file_object=file_object, save_to=save_to)
+        if stats:
+            SFTP_TRANSFER_BYTES.labels(operation="put").observe(stats.st_size or 0)
+        return stats
+
+    def put_file_stream(self, file_object, save_to: str):
+        """
+        Stores readable file object remotely reading it in chunks,
+        unlike "put_file_object" it does not require content to be buffered in memory
+
+        :param file_object: file-like object supporting "read(size)"
+        :param save_to: remote path to save content to
+
+        :returns SFTPAttributes of the stored file
+        """
+        remote_path = f"{self.root_path}/{save_to}"
+        with track_duration(
+            duration=SFTP_TRANSFER_DURATION,
+            errors=SFTP_TRANSFER_ERRORS,
+            operation="put",
+        ):
+            try:
+                stats = self.connection.putfo(fl=file_object, remotepath=remote_path)
+            except Exception:
+                self._remove_partial_file(remote_path=remote_path)
+                raise
+        SFTP_TRANSFER_BYTES.labels(operation="put").observe(stats.st_size or 0)
+        return stats
+
+    def stat_file(self, get_from: str):
+        """
+        Gets attributes of the remote file
+
+        :param get_from: remote file location
+        :returns SFTPAttributes of the file
+        :raises FileNotFoundError: if file does not exist
+        """
+        return self.connection.stat(f"{self.root_path}/{get_from}")
+
+    def stream_file(
+        self,
+        get_from: str,
+        start: int = 0,
+        end: int = None,
+        chunk_size: int = 256 * 1024,
+    ) -> Iterator[bytes]:
+        """
+        Reads remote file in chunks without buffering it in memory
+
+        :param get_from: remote file location
+        :param start: offset of the first byte to read
+        :param end: offset of the last byte to read (inclusive), reads till the end of file if not provided
+        :param chunk_size: max number of bytes per chunk
+
+        :returns iterator over the file chunks
+        """
+        remaining = None if end is None else end - start + 1
+        transferred = 0
+        with track_duration(
+            duration=SFTP_TRANSFER_DURATION,
+            errors=SFTP_TRANSFER_ERRORS,
+            operation="get",
+        ):
+            with self.connection.open(f"{self.root_path}/{get_from}", "rb") as f:
+                f.seek(start)
+                while remaining is None or remaining > 0:
+                    read_size = chunk_size
+                    if remaining is not None:
+                        read_size = min(read_size, remaining)
+                        remaining -= read_size
+                    chunk = f.read(read_size)
+                    if not chunk:
+                        break
+                    transferred += len(chunk)
+                    yield chunk
+        SFTP_TRANSFER_BYTES.labels(operation="get").observe(transferred)
+
+    def read_file_range(
+        self, get_from: str, start: int, end: int, chunk_size: int = 256 * 1024
+    ) -> list[bytes]:
+        """
+        Reads range of the remote file in chunks
+
+        :param get_from: remote file location
+        :param start: offset of the first byte to read
+        :param end: offset of the last byte to read (inclusive)
+        :param chunk_size: max number of bytes per chunk
+
+        :returns list of the read chunks, fewer bytes than requested are returned at the end of file
+        """
+        return list(
+            self.stream_file(get_from, start=start, end=end, chunk_size=chunk_size)
+        )
+
+    def remove_file(self, get_from: str):
+        """
+        Removes the remote file
+
+        :param get_from: remote file location
+        :raises FileNotFoundError: if file does not exist
+        """
+        self.connection.remove(f"{self.root_path}/{get_from}")
+
+    def _remove_partial_file(self, remote_path: str):
+        try:
+            self.connection.remove(remote_path)
+        except Exception as ex:
+            LOG.warning(f"Failed to remove partially stored {remote_path = }: {ex}")
+
+    def close(self):
+        """Closes SFTP session and its transport"""
+        for resource in (self._connection, self._transport):
+            if resource:
+                try:
+                    resource.close()
+                except Exception as ex:
+                    LOG.debug(f"Failed to close SFTP resource: {ex}")
+        self._connection = None
+        self._transport = None
+
+    def is_healthy(self) -> bool:
+        """Checks if established SFTP session is responsive"""
+        if not (self._transport and self._transport.is_active()):
+            return False
+        try:
+            self.connection.stat(self.root_path or "/")
+            return True
+        except Exception:
+            return False
+
+
+def _is_connection_error(ex: Exception) -> bool:
+    """Checks if exception means that the connection itself is broken, as opposed to e.g. missing file"""
+    if isinstance(ex, (EOFError, ConnectionError, SSHException, TimeoutError)):
+        return True
+    # paramiko raises errno-less OSError on closed socket, file errors are mapped to errno
+    return isinstance(ex, OSError) and ex.errno is None
+
+
+class SFTPConnectionPool:
+    """
+    Bounded pool of SFTP sessions exposing the interface of the SFTP connector
+
+    Each operation checks out a dedicated session, so concurrent transfers do not share one SSH channel.
+    Idle sessions expire after "idle_timeout" seconds, sessions idle longer than "health_check_interval"
+    are checked before reuse, and idempotent operations are retried once on a fresh session
+    if connection breaks. Blocking operations can be offloaded from the event loop with "run".
+    Streamed files are read by windows of "stream_window_size" bytes, each window checks out a session
+    only while it is being read, so slow consumers of the streams do not hold the sessions.
+    """
+
+    def __init__(
+        self,
+        connector_factory: Callable[[], InstrumentedSFTPConnector],
+        max_size: int = 4,
+        idle_timeout: float = 300,
+        health_check_interval: float = 30,
+        acquire_timeout: float = 30,
+        stream_window_size: int = 4 * 1024 * 1024,
+    ):
+        self._connector_factory = connector_factory
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.acquire_timeout = acquire_timeout
+        self.stream_window_size = stream_window_size
+        self._idle: deque[tuple[InstrumentedSFTPConnector, float]] = deque()
+        self._size = 0
+        self._condition = Condition()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_size, thread_name_prefix="sftp"
+        )
+        SFTP_POOL_CONNECTIONS.labels(state="idle").set_function(lambda: len(self._idle))
+        SFTP_POOL_CONNECTIONS.labels(state="in_use").set_function(
+            lambda: self._size - len(self._idle)
+        )
+
+    def acquire(self, force_health_check: bool = False) -> InstrumentedSFTPConnector:
+        """
+        Checks out healthy SFTP session, opening new one if the pool is not exhausted
+
+        :param force_health_check: to check idle session before reuse regardless of its idle time
+
+        :raises TimeoutError: if no session becomes available within "acquire_timeout"
+        """
+        start_time = time.perf_counter()
+        while True:
+            connector, idle_since = None, None
+            with self._condition:
+                while not self._idle and self._size >= self.max_size:
+                    remaining = self.acquire_timeout - (
+                        time.perf_counter() - start_time
+                    )
+                    if remaining <= 0 or not self._condition.wait(timeout=remaining):
+                        raise TimeoutError("Timed out waiting for SFTP connection")
+                if self._idle:
+                    connector, idle_since = self._idle.pop()
+                else:
+                    self._size += 1
+            SFTP_POOL_WAIT_DURATION.observe(time.perf_counter() - start_time)
+            if connector is None:
+                try:
+                    return self._connector_factory()
+                except BaseException:
+                    self._discard()
+                    raise
+            idle_time = time.monotonic() - idle_since
+            if idle_time > self.idle_timeout:
+                self._discard(connector=connector, reason="idle_timeout")
+            elif (
+                force_health_check or idle_time > self.health_check_interval
+            ) and not connector.is_healthy():
+                self._discard(connector=connector, reason="health_check")
+            else:
+                return connector
+
+    def release(self, connector: InstrumentedSFTPConnector, broken: bool = False):
+        """
+        Returns checked out SFTP session to the pool
+
+        :param connector: checked out session
+        :param broken: to close session instead of returning it to the pool
+        """
+        if broken:
+            return self._discard(connector=connector, reason="connection_error")
+        with self._condition:
+            self._idle.append((connector, time.monotonic()))
+            self._condition.notify()
+
+    def _discard(self, connector: InstrumentedSFTPConnector = None, reason: str = ""):
+        if connector:
+            SFTP_POOL_RECONNECTS.labels(reason=reason).inc()
+            connector.close()
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+    @contextmanager
+    def session(
+        self, force_health_check: bool = False
+    ) -> Iterator[InstrumentedSFTPConnector]:
+        """
+        Context manager checking out SFTP session for the wrapped block
+
+        :param force_health_check: to check idle session before reuse regardless of its idle time
+        """
+        connector = self.acquire(force_health_check=force_health_check)
+        broken = False
+        try:
+            yield connector
+        except Exception as ex:
+            broken = _is_connection_error(ex)
+            raise
+        finally:
+            self.release(connector=connector, broken=broken)
+
+    def _call(self, method: str, *args, retriable: bool = False, **kwargs):
+        attempts = 2 if retriable else 1
+        for attempt in range(1, attempts + 1):
+            try:
+                # retry is performed on the session verified to be alive
+                with self.session(force_health_check=attempt > 1) as connector:
+                    return getattr(connector, method)(*args, **kwargs)
+            except Exception as ex:
+                if attempt == attempts or not _is_connection_error(ex):
+                    raise
+                LOG.warning(f"SFTP {method} failed with {ex!r} - retrying")
+                file_object = kwargs.get("file_object")
+                if hasattr(file_object, "seek"):
+                    file_object.seek(0)
+
+    async def run(self, func: Callable, *args, **kwargs):
+        """
+        Runs blocking operation involving SFTP transfers in the SFTP thread pool without blocking the event loop
+
+        :param func: callable to run (e.g. pool method or DAO method storing files)
+        :returns result of the callable
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, partial(func, *args, **kwargs)
+        )
+
+    def get_file_object(self, get_from: str, *args, **kwargs):
+        return self._call("get_file_object", get_from, *args, retriable=True, **kwargs)
+
+    def put_file_object(self, file_object, save_to: str):
+        return self._call(
+            "put_file_object", file_object=file_object, save_to=save_to, retriable=True
+        )
+
+    def put_file_stream(self, file_object, save_to: str):
+        # consumed stream can not be replayed, so upload is not retried
+        return self._call("put_file_stream", file_object=file_object, save_to=save_to)
+
+    def stat_file(self, get_from: str):
+        return self._call("stat_file", get_from=get_from, retriable=True)
+
+    def remove_file(self, get_from: str):
+        return self._call("remove_file", get_from=get_from, retriable=True)
+
+    def stream_file(
+        self,
+        get_from: str,
+        start: int = 0,
+        end: int = None,
+        chunk_size: int = 256 * 1024,
+    ) -> Iterator[bytes]:
+        """Streams remote file by windows, SFTP session is released before the read window is yielded"""
+        while end is None or start <= end:
+            window_end = start + self.stream_window_size - 1
+            if end is not None:
+                window_end = min(window_end, end)
+            chunks = self._call(
+                "read_file_range",
+                get_from,
+                start=start,
+                end=window_end,
+                chunk_size=chunk_size,
+                retriable=True,
+            )
+            yield from chunks
+            read_size = sum(len(chunk) for chunk in chunks)
+            if read_size < window_end - start + 1:
+                break
+            start = window_end + 1
+
+    def close(self):
+        """Closes idle sessions and shuts down SFTP thread pool"""
+        with self._condition:
+            idle, self._idle = list(self._idle), deque()
+        for connector, _ in idle:
+            self._discard(connector=connector, reason="shutdown")
+        self._executor.shutdown(wait=False)
+
 
+def init_sftp_connector(config) -> SFTPConnectionPool:
+    """
+    Initialise pool of SFTP Connectors based on provided configuration
 
-def init_sftp_connector(config):
-    """Initialise SFTP Connector based on provided configuration"""
+    :param config: SFTP configuration, pool is configured with keys:
+        - "POOL_SIZE": max number of SFTP sessions (defaults to 4)
+        - "IDLE_TIMEOUT": seconds after which idle session is closed (defaults to 300)
+        - "HEALTH_CHECK_INTERVAL": seconds of idleness after which session is checked before reuse (defaults to 30)
+        - "ACQUIRE_TIMEOUT": seconds to wait for available session (defaults to 30)
+        - "STREAM_WINDOW_SIZE": max number of bytes of the streamed file read per session checkout (defaults to 4 MiB)
+    """
     if config is None:
         raise MalformedConfigurationException("No SFTP Config Detected")
-    return NeonSFTPConnector(
-        host=config.get("HOST", "127.0.0.1"),
-        username=config.get("USERNAME", "root"),
-        passphrase=config.get("PASSWORD", ""),
-        port=int(config.get("PORT", 22)),
-        root_path=config.get("ROOT_PATH", "/").format(env=KLAT_ENV.lower()),
+    return SFTPConnectionPool(
+        connector_factory=partial(
+            InstrumentedSFTPConnector,
+            host=config.get("HOST", "127.0.0.1"),
+            username=config.get("USERNAME", "root"),
+            passphrase=config.get("PASSWORD", ""),
+            port=int(config.get("PORT", 22)),
+            root_path=config.get("ROOT_PATH", "/").format(env=KLAT_ENV.lower()),
+        ),
+        max_size=int(config.get("POOL_SIZE", 4)),
+        idle_timeout=float(config.get("IDLE_TIMEOUT", 300)),
+        health_check_interval=float(config.get("HEALTH_CHECK_INTERVAL", 30)),
+        acquire_timeout=float(config.get("ACQUIRE_TIMEOUT", 30)),
+        stream_window_size=int(config.get("STREAM_WINDOW_SIZE", 4 * 1024 * 1024)),
     )
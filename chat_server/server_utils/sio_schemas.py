@@ -0,0 +1,154 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from time import time
+from typing import Annotated, Any, Optional
+
+from pydantic import (
+    BaseModel,
+    BeforeValidator,
+    ConfigDict,
+    Field,
+    PlainSerializer,
+    model_validator,
+)
+
+from utils.database_utils.mongo_utils.queries.dao.prompts import PromptStates
+
+_TRUE_FLAGS = (True, 1, "1", "true", "True")
+
+
+def _parse_flag(value: Any) -> bool:
+    # missing or unknown flags are treated as unset, as clients send "0", "", None or omit them
+    return value in _TRUE_FLAGS
+
+
+def _parse_timestamp(value: Any) -> int:
+    if value in (None, ""):
+        return int(time())
+    return int(float(value))
+
+
+# flags are exchanged as "1"/"0" strings, while handlers operate on booleans
+Flag = Annotated[
+    bool,
+    BeforeValidator(_parse_flag),
+    PlainSerializer(lambda value: "1" if value else "0", return_type=str),
+]
+# timestamps in seconds, sent as int, float or numeric string
+Timestamp = Annotated[int, BeforeValidator(_parse_timestamp)]
+
+
+class SIOEventModel(BaseModel):
+    """
+    Base model of the inbound Socket IO events
+
+    Keys which are not declared by the model are kept as is,
+    so they are forwarded to the recipients of the event.
+    """
+
+    model_config = ConfigDict(extra="allow", populate_by_name=True)
+
+
+class UserMessageEvent(SIOEventModel):
+    cid: str
+    user_id: str = Field(alias="userID")
+    # raw audio or its base64 string for audio messages
+    message_text: str | bytes = Field(alias="messageText")
+    lang: str = "en"
+    is_bot: Flag = Field(False, validation_alias="bot")
+    is_audio: Flag = Field(False, alias="isAudio")
+    is_announcement: Flag = Field(False, alias="isAnnouncement")
+    prompt_id: str = Field("", validation_alias="promptID")
+    prompt_state: Optional[PromptStates] = Field(None, alias="promptState")
+    replied_message: Optional[str] = Field("", alias="repliedMessage")
+    attachments: list[str] = Field(default_factory=list)
+    context: Optional[dict] = None
+    # stored on receiving, so it is not broadcast
+    message_tts: dict[str, dict[str, str | bytes]] = Field(
+        default_factory=dict, validation_alias="messageTTS", exclude=True
+    )
+    time_created: Timestamp = Field(None, alias="timeCreated", validate_default=True)
+
+    @model_validator(mode="after")
+    def check_prompt_state(self):
+        if self.prompt_id and not self.is_announcement and self.prompt_state is None:
+            raise ValueError("promptState is required for the prompt messages")
+        return self
+
+
+class TranslationMapping(SIOEventModel):
+    lang: str = "en"
+    shouts: list[str] = Field(default_factory=list)
+    source_lang: Optional[str] = None
+
+
+class TranslateRequestEvent(SIOEventModel):
+    chat_mapping: dict[str, TranslationMapping] = Field(default_factory=dict)
+    user: Optional[str] = None
+    input_type: str = Field("incoming", alias="inputType")
+
+
+class TTSRequestEvent(SIOEventModel):
+    cid: str
+    message_id: str
+    lang: str = "en"
+
+
+class STTRequestEvent(SIOEventModel):
+    message_id: str
+    cid: str = ""
+    lang: str = "en"
+    # raw audio or its base64 string
+    audio_data: Optional[str | bytes] = None
+
+
+class ConversationDeltaRequestEvent(SIOEventModel):
+    cid: str
+    seq: int = Field(0, ge=0)
+
+
+class NewPromptEvent(SIOEventModel):
+    cid: str
+    prompt_id: str
+    prompt_text: str
+    created_on: Timestamp = Field(None, validate_default=True)
+
+
+class PromptReference(SIOEventModel):
+    prompt_id: str
+
+
+class PromptContext(SIOEventModel):
+    prompt: PromptReference
+    winner: str = ""
+
+
+class PromptCompletedEvent(SIOEventModel):
+    cid: str | None = None
+    context: PromptContext
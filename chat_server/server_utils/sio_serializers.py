@@ -0,0 +1,141 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import asyncio
+from urllib.parse import parse_qs
+
+import socketio
+from engineio import packet as eio_packet
+from socketio import packet
+
+from chat_server.server_utils.enums import SIOSerializers
+from utils.logging_utils import LOG
+
+try:
+    from socketio.msgpack_packet import MsgPackPacket
+except ModuleNotFoundError:
+    LOG.info("msgpack dependency was not installed")
+    MsgPackPacket = None
+
+SERIALIZER_QUERY_PARAM = "serializer"
+
+# MessagePack carries binary natively, so it has no separate packet types for binary attachments
+_PLAIN_PACKET_TYPES = {packet.BINARY_EVENT: packet.EVENT, packet.BINARY_ACK: packet.ACK}
+
+
+def get_requested_serializer(environ: dict) -> SIOSerializers:
+    """
+    Gets serializer requested by the client in the query of the connection URL (e.g. "?serializer=msgpack")
+
+    :param environ: WSGI-like environment of the Engine.IO connection
+    :returns requested serializer, JSON if none or unknown serializer requested
+    """
+    values = parse_qs(environ.get("QUERY_STRING", "")).get(SERIALIZER_QUERY_PARAM)
+    try:
+        return SIOSerializers(values[-1].lower()) if values else SIOSerializers.JSON
+    except ValueError:
+        return SIOSerializers.JSON
+
+
+def convert_packet(pkt: packet.Packet, packet_class: type) -> packet.Packet:
+    """Converts Socket.IO packet to be encoded with provided packet class"""
+    if type(pkt) is packet_class:
+        return pkt
+    return packet_class(
+        _PLAIN_PACKET_TYPES.get(pkt.packet_type, pkt.packet_type),
+        data=pkt.data,
+        namespace=pkt.namespace,
+        id=pkt.id,
+    )
+
+
+def encode_eio_packets(pkt: packet.Packet) -> list[eio_packet.Packet]:
+    """Encodes Socket.IO packet into the Engine.IO packets sent to the client"""
+    encoded_packet = pkt.encode()
+    if not isinstance(encoded_packet, list):
+        encoded_packet = [encoded_packet]
+    return [eio_packet.Packet(eio_packet.MESSAGE, p) for p in encoded_packet]
+
+
+class NegotiatedSerializerManager(socketio.AsyncManager):
+    """
+    Client manager encoding broadcast packets with the serializers negotiated by the recipients
+
+    Packets are encoded once per serializer, so broadcasts cost the same
+    as with the single serializer while all recipients use JSON.
+    """
+
+    async def emit(
+        self,
+        event,
+        data,
+        namespace,
+        room=None,
+        skip_sid=None,
+        callback=None,
+        to=None,
+        **kwargs,
+    ):
+        if callback or not self.server.has_negotiated_serializers():
+            return await super().emit(
+                event,
+                data,
+                namespace,
+                room=room,
+                skip_sid=skip_sid,
+                callback=callback,
+                to=to,
+                **kwargs,
+            )
+        room = to or room
+        if namespace not in self.rooms:
+            return
+        if isinstance(data, tuple):
+            data = list(data)
+        elif data is not None:
+            data = [data]
+        else:
+            data = []
+        if not isinstance(skip_sid, list):
+            skip_sid = [skip_sid]
+        encoded_packets = {}
+        tasks = []
+        for sid, eio_sid in self.get_participants(namespace, room):
+            if sid in skip_sid:
+                continue
+            packet_class = self.server.get_packet_class(eio_sid)
+            if packet_class not in encoded_packets:
+                encoded_packets[packet_class] = encode_eio_packets(
+                    packet_class(packet.EVENT, namespace=namespace, data=[event] + data)
+                )
+            for eio_pkt in encoded_packets[packet_class]:
+                tasks.append(
+                    asyncio.create_task(self.server._send_eio_packet(eio_sid, eio_pkt))
+                )
+        if tasks:
+            await asyncio.wait(tasks)
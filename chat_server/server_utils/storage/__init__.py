@@ -0,0 +1,115 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from chat_server.server_utils.enums import DataSources
+from chat_server.server_utils.sftp_utils import SFTPConnectionPool
+from chat_server.server_utils.storage.base import FileStat, StorageBackend
+from chat_server.server_utils.storage.cache import CachedStorage
+from chat_server.server_utils.storage.dedup import ContentAddressedStorage, FileIndex
+from chat_server.server_utils.storage.local import LocalStorage
+from chat_server.server_utils.storage.s3 import S3Storage
+from chat_server.server_utils.storage.sftp import SFTPStorage
+from utils.exceptions import MalformedConfigurationException
+
+
+def init_storage(
+    data_source: DataSources,
+    config: dict = None,
+    local_location: str = None,
+    sftp_connector: SFTPConnectionPool = None,
+    index: FileIndex = None,
+) -> StorageBackend:
+    """
+    Initialises file storage backend based on provided configuration
+
+    :param data_source: type of the storage from DataSources
+    :param config: storage configuration, supported keys:
+        - "S3": S3 configuration with keys "BUCKET", "PREFIX", "ENDPOINT_URL", "REGION",
+                "ACCESS_KEY", "SECRET_KEY" and "MAX_CONNECTIONS"
+        - "CACHE": read-through disk cache configuration applied to the remote storages, keys:
+            - "LOCATION": local directory of the cache, cache is disabled if not provided
+            - "MAX_BYTES": max number of cached bytes (defaults to 1 GiB)
+            - "MAX_FILE_BYTES": max size of the cached file (defaults to 1/8 of "MAX_BYTES")
+        - "DEDUPLICATION": to store each distinct content once (defaults to True if index is provided)
+    :param local_location: root directory of the local storage
+    :param sftp_connector: pool of SFTP sessions used by SFTP storage
+    :param index: index of the content-addressed files, deduplication is disabled if not provided
+    """
+    config = config or {}
+    storage = _init_backend(
+        data_source=data_source,
+        config=config,
+        local_location=local_location,
+        sftp_connector=sftp_connector,
+    )
+    if index is not None and config.get("DEDUPLICATION", True):
+        storage = ContentAddressedStorage(backend=storage, index=index)
+    return storage
+
+
+def _init_backend(
+    data_source: DataSources,
+    config: dict,
+    local_location: str = None,
+    sftp_connector: SFTPConnectionPool = None,
+) -> StorageBackend:
+    if data_source == DataSources.LOCAL:
+        if not local_location:
+            raise MalformedConfigurationException(
+                "Local storage requires FILE_STORING_LOCATION"
+            )
+        # local files are already on the disk, so they are not cached
+        return LocalStorage(root_path=local_location)
+    if data_source == DataSources.SFTP:
+        if sftp_connector is None:
+            raise MalformedConfigurationException("SFTP storage requires SFTP Config")
+        storage = SFTPStorage(sftp_connector=sftp_connector)
+    elif data_source == DataSources.S3:
+        s3_config = config.get("S3") or {}
+        if not s3_config.get("BUCKET"):
+            raise MalformedConfigurationException("S3 storage requires BUCKET")
+        storage = S3Storage(
+            bucket=s3_config["BUCKET"],
+            prefix=s3_config.get("PREFIX", ""),
+            endpoint_url=s3_config.get("ENDPOINT_URL"),
+            region=s3_config.get("REGION"),
+            access_key=s3_config.get("ACCESS_KEY"),
+            secret_key=s3_config.get("SECRET_KEY"),
+            max_connections=int(s3_config.get("MAX_CONNECTIONS", 10)),
+        )
+    else:
+        raise MalformedConfigurationException(f"Unsupported storage - {data_source}")
+    cache_config = config.get("CACHE") or {}
+    if cache_location := cache_config.get("LOCATION"):
+        storage = CachedStorage(
+            backend=storage,
+            location=cache_location,
+            max_bytes=int(cache_config.get("MAX_BYTES", 1024 * 1024 * 1024)),
+            max_file_bytes=int(cache_config.get("MAX_FILE_BYTES", 0)) or None,
+        )
+    return storage
@@ -0,0 +1,153 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import asyncio
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import partial
+from typing import BinaryIO, Callable, Iterator, Optional
+
+DEFAULT_CHUNK_SIZE = 256 * 1024
+
+
+@dataclass
+class FileStat:
+    size: int
+    last_modified: Optional[float] = None
+    # backend-native entity tag (e.g. S3 ETag), None if backend does not provide one
+    etag: Optional[str] = None
+
+
+def iter_file_chunks(
+    file_object: BinaryIO,
+    start: int = 0,
+    end: int = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """
+    Reads seekable file object in chunks
+
+    :param file_object: seekable file object opened in binary mode
+    :param start: offset of the first byte to read
+    :param end: offset of the last byte to read (inclusive), reads till the end of file if not provided
+    :param chunk_size: max number of bytes per chunk
+
+    :returns iterator over the file chunks
+    """
+    file_object.seek(start)
+    remaining = None if end is None else end - start + 1
+    while remaining is None or remaining > 0:
+        read_size = chunk_size if remaining is None else min(chunk_size, remaining)
+        chunk = file_object.read(read_size)
+        if not chunk:
+            break
+        if remaining is not None:
+            remaining -= len(chunk)
+        yield chunk
+
+
+class StorageBackend(ABC):
+    """
+    Interface of the file storage
+
+    Files are addressed by the relative location (e.g. "avatars/<name>").
+    Operations are blocking, async callers should offload them with "run".
+    """
+
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+
+    @abstractmethod
+    def put(self, location: str, file_object) -> FileStat:
+        """
+        Stores content of the file object reading it in chunks
+
+        :param location: location to store file under
+        :param file_object: file-like object supporting "read(size)"
+
+        :returns FileStat of the stored file
+        """
+
+    def get(self, location: str) -> bytes:
+        """
+        Gets the whole file content
+
+        :param location: location of the file
+        :raises FileNotFoundError: if file does not exist
+        """
+        return b"".join(self.stream(location=location))
+
+    @abstractmethod
+    def stream(self, location: str, start: int = 0, end: int = None) -> Iterator[bytes]:
+        """
+        Reads file in chunks without buffering it in memory
+
+        :param location: location of the file
+        :param start: offset of the first byte to read
+        :param end: offset of the last byte to read (inclusive), reads till the end of file if not provided
+
+        :returns iterator over the file chunks
+        :raises FileNotFoundError: if file does not exist
+        """
+
+    @abstractmethod
+    def stat(self, location: str) -> FileStat:
+        """
+        Gets attributes of the file
+
+        :param location: location of the file
+        :raises FileNotFoundError: if file does not exist
+        """
+
+    @abstractmethod
+    def delete(self, location: str) -> None:
+        """
+        Deletes the file, missing files are ignored
+
+        :param location: location of the file
+        """
+
+    def exists(self, location: str) -> bool:
+        try:
+            self.stat(location=location)
+            return True
+        except FileNotFoundError:
+            return False
+
+    async def run(self, func: Callable, *args, **kwargs):
+        """
+        Runs blocking storage operation without blocking the event loop
+
+        :param func: callable to run (e.g. backend method)
+        :returns result of the callable
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            None, partial(func, *args, **kwargs)
+        )
+
+    def close(self) -> None:
+        """Releases resources held by the backend"""
@@ -0,0 +1,321 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from dataclasses import asdict
+from threading import RLock
+from typing import BinaryIO, Callable, Iterator, Optional
+
+from chat_server.server_utils.storage.base import (
+    FileStat,
+    StorageBackend,
+    iter_file_chunks,
+)
+from utils.common import generate_uuid
+from utils.logging_utils import LOG
+from utils.metrics_utils import (
+    STORAGE_CACHE_BYTES,
+    STORAGE_CACHE_EVICTIONS,
+    STORAGE_CACHE_REQUESTS,
+)
+
+
+class _CacheWriter:
+    """Writes copy of the transferred content into the temporary cache file, gives up once size limit is exceeded"""
+
+    def __init__(self, path: str, max_size: int):
+        self.path = path
+        self.max_size = max_size
+        self.size = 0
+        self._file = open(path, "wb")
+
+    @property
+    def active(self) -> bool:
+        return self._file is not None
+
+    def write(self, chunk: bytes):
+        if not self._file:
+            return
+        self.size += len(chunk)
+        if self.size > self.max_size:
+            self.discard()
+        else:
+            self._file.write(chunk)
+
+    def close(self):
+        if self._file:
+            self._file.close()
+
+    def discard(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class _TeeReader:
+    """File-like object passing read chunks into the cache writer"""
+
+    def __init__(self, file_object, writer: _CacheWriter):
+        self._file_object = file_object
+        self._writer = writer
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._file_object.read(size)
+        self._writer.write(chunk)
+        return chunk
+
+
+class CachedStorage(StorageBackend):
+    """
+    Read-through disk cache in front of the storage backend
+
+    Files are cached on the local disk on the first read or on upload, the least recently used files
+    are evicted once total size of the cached files exceeds "max_bytes".
+    Stored files are expected to be immutable - location of the changed content must change as well.
+    """
+
+    _META_SUFFIX = ".json"
+    _TMP_SUFFIX = ".tmp"
+
+    def __init__(
+        self,
+        backend: StorageBackend,
+        location: str,
+        max_bytes: int = 1024 * 1024 * 1024,
+        max_file_bytes: int = None,
+    ):
+        """
+        :param backend: storage backend to cache files of
+        :param location: local directory of the cache
+        :param max_bytes: max number of bytes kept in the cache
+        :param max_file_bytes: max size of the cached file, larger files are always served by the backend
+            (defaults to 1/8 of "max_bytes")
+        """
+        self.backend = backend
+        self.chunk_size = backend.chunk_size
+        self.location = os.path.expanduser(location)
+        self.max_bytes = max_bytes
+        self.max_file_bytes = max_file_bytes or max_bytes // 8
+        self._entries: OrderedDict[str, FileStat] = OrderedDict()
+        self._used_bytes = 0
+        self._lock = RLock()
+        os.makedirs(self.location, exist_ok=True)
+        self._load_entries()
+        STORAGE_CACHE_BYTES.set_function(lambda: self._used_bytes)
+
+    @property
+    def used_bytes(self) -> int:
+        return self._used_bytes
+
+    def _get_path(self, location: str) -> str:
+        return os.path.join(self.location, hashlib.sha1(location.encode()).hexdigest())
+
+    def _get_tmp_path(self, location: str) -> str:
+        return f"{self._get_path(location)}.{generate_uuid(length=8)}{self._TMP_SUFFIX}"
+
+    def _load_entries(self):
+        """Restores index of the cached files left by the previous process, recency is restored from access time"""
+        entries = []
+        for entry in os.scandir(self.location):
+            if entry.name.endswith(self._TMP_SUFFIX) or not (
+                entry.name.endswith(self._META_SUFFIX)
+                or os.path.exists(f"{entry.path}{self._META_SUFFIX}")
+            ):
+                # leftovers of interrupted writes
+                os.remove(entry.path)
+            elif entry.name.endswith(self._META_SUFFIX):
+                data_path = entry.path[: -len(self._META_SUFFIX)]
+                try:
+                    with open(entry.path) as f:
+                        meta = json.load(f)
+                    file_stat = FileStat(**meta["stat"])
+                    accessed_at = os.stat(data_path).st_mtime
+                except (OSError, ValueError, KeyError, TypeError) as ex:
+                    LOG.warning(
+                        f"Dropping broken storage cache entry {entry.path}: {ex}"
+                    )
+                    self._remove_files(path=data_path)
+                    continue
+                entries.append((accessed_at, meta["location"], file_stat))
+        for _, location, file_stat in sorted(entries, key=lambda item: item[0]):
+            self._entries[location] = file_stat
+            self._used_bytes += file_stat.size
+        self._evict()
+
+    def _remove_files(self, path: str):
+        for file_path in (path, f"{path}{self._META_SUFFIX}"):
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+
+    def _evict(self):
+        with self._lock:
+            while self._used_bytes > self.max_bytes and self._entries:
+                location, file_stat = self._entries.popitem(last=False)
+                self._used_bytes -= file_stat.size
+                self._remove_files(path=self._get_path(location))
+                STORAGE_CACHE_EVICTIONS.inc()
+
+    def _install(self, location: str, tmp_path: str, file_stat: FileStat):
+        """Moves completely written temporary file into the cache"""
+        path = self._get_path(location)
+        try:
+            with open(f"{path}{self._META_SUFFIX}", "w") as f:
+                json.dump({"location": location, "stat": asdict(file_stat)}, f)
+            with self._lock:
+                os.replace(tmp_path, path)
+                if previous := self._entries.pop(location, None):
+                    self._used_bytes -= previous.size
+                self._entries[location] = file_stat
+                self._used_bytes += file_stat.size
+        except OSError as ex:
+            LOG.warning(f"Failed to cache {location = }: {ex}")
+            self._remove_files(path=tmp_path)
+            return
+        self._evict()
+
+    def _drop(self, location: str):
+        with self._lock:
+            if file_stat := self._entries.pop(location, None):
+                self._used_bytes -= file_stat.size
+                self._remove_files(path=self._get_path(location))
+
+    def _open_cached(self, location: str) -> Optional[BinaryIO]:
+        """Opens cached file marking it as recently used, None if file is not cached"""
+        with self._lock:
+            if location not in self._entries:
+                return None
+            self._entries.move_to_end(location)
+            path = self._get_path(location)
+            try:
+                # opened file remains readable even if it gets evicted while being streamed
+                f = open(path, "rb")
+            except FileNotFoundError:
+                self._drop(location)
+                return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return f
+
+    def is_cached(self, location: str) -> bool:
+        with self._lock:
+            return location in self._entries
+
+    def put(self, location: str, file_object) -> FileStat:
+        # write-through, so freshly uploaded avatars and attachments are served from the cache
+        self._drop(location)
+        writer = _CacheWriter(
+            path=self._get_tmp_path(location), max_size=self.max_file_bytes
+        )
+        try:
+            file_stat = self.backend.put(
+                location=location,
+                file_object=_TeeReader(file_object=file_object, writer=writer),
+            )
+        except BaseException:
+            writer.discard()
+            raise
+        writer.close()
+        if writer.active and writer.size == file_stat.size:
+            self._install(location=location, tmp_path=writer.path, file_stat=file_stat)
+        else:
+            writer.discard()
+        return file_stat
+
+    def stream(self, location: str, start: int = 0, end: int = None) -> Iterator[bytes]:
+        if f := self._open_cached(location):
+            STORAGE_CACHE_REQUESTS.labels(result="hit").inc()
+            with f:
+                yield from iter_file_chunks(
+                    f, start=start, end=end, chunk_size=self.chunk_size
+                )
+            return
+        file_stat = self.backend.stat(location)
+        if file_stat.size > self.max_file_bytes:
+            STORAGE_CACHE_REQUESTS.labels(result="bypass").inc()
+            yield from self.backend.stream(location=location, start=start, end=end)
+            return
+        STORAGE_CACHE_REQUESTS.labels(result="miss").inc()
+        if start == 0 and (end is None or end >= file_stat.size - 1):
+            # whole file is requested, so it is cached while being passed to the caller
+            yield from self._fill(location=location, file_stat=file_stat)
+            return
+        for _ in self._fill(location=location, file_stat=file_stat):
+            pass
+        if f := self._open_cached(location):
+            with f:
+                yield from iter_file_chunks(
+                    f, start=start, end=end, chunk_size=self.chunk_size
+                )
+        else:
+            yield from self.backend.stream(location=location, start=start, end=end)
+
+    def _fill(self, location: str, file_stat: FileStat) -> Iterator[bytes]:
+        """Streams the whole file from the backend writing it into the cache"""
+        writer = _CacheWriter(
+            path=self._get_tmp_path(location), max_size=self.max_file_bytes
+        )
+        completed = False
+        try:
+            for chunk in self.backend.stream(location=location):
+                writer.write(chunk)
+                yield chunk
+            completed = True
+        finally:
+            writer.close()
+            if completed and writer.active and writer.size == file_stat.size:
+                self._install(
+                    location=location, tmp_path=writer.path, file_stat=file_stat
+                )
+            else:
+                writer.discard()
+
+    def stat(self, location: str) -> FileStat:
+        with self._lock:
+            file_stat = self._entries.get(location)
+        return file_stat or self.backend.stat(location)
+
+    def delete(self, location: str) -> None:
+        self.backend.delete(location)
+        self._drop(location)
+
+    async def run(self, func: Callable, *args, **kwargs):
+        return await self.backend.run(func, *args, **kwargs)
+
+    def close(self) -> None:
+        self.backend.close()
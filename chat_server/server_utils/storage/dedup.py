@@ -0,0 +1,334 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import hashlib
+import time
+from abc import ABC, abstractmethod
+from dataclasses import replace
+from tempfile import SpooledTemporaryFile
+from threading import Lock
+from typing import Callable, Iterator, Optional
+
+from cachetools import TTLCache
+
+from chat_server.server_utils.storage.base import FileStat, StorageBackend
+from utils.logging_utils import LOG
+
+
+class FileIndex(ABC):
+    """
+    Index mapping logical file locations to the content-addressed blobs
+
+    Each blob keeps the number of locations referencing it,
+    blobs which are left unreferenced are removed by the garbage collection.
+    Blob being collected is leased by the collector, so it can not be referenced or registered again
+    until its content is deleted or the lease expires.
+    """
+
+    @abstractmethod
+    def resolve(self, location: str) -> Optional[str]:
+        """
+        Gets hash of the blob referenced by location
+
+        :param location: logical location of the file
+        :returns SHA-256 hex digest of the blob, None if location is not indexed
+        """
+
+    @abstractmethod
+    def add_blob(self, sha256: str, size: int) -> bool:
+        """
+        Registers blob before storing its content, registered blob is unreferenced until "add_reference" is called
+
+        :param sha256: SHA-256 hex digest of the blob content
+        :param size: size of the blob in bytes
+
+        :returns False if blob is being collected, so its content can not be stored yet
+        """
+
+    @abstractmethod
+    def add_reference(self, location: str, sha256: str) -> bool:
+        """
+        Points location to the registered blob, blob previously referenced by location is released
+
+        :param location: logical location of the file
+        :param sha256: SHA-256 hex digest of the blob content
+
+        :returns False if blob is not registered or is being collected, so its content has to be stored first
+        """
+
+    @abstractmethod
+    def remove_reference(self, location: str) -> Optional[str]:
+        """
+        Removes location releasing the blob it references
+
+        :param location: logical location of the file
+        :returns SHA-256 hex digest of the released blob, None if location is not indexed
+        """
+
+    @abstractmethod
+    def list_unreferenced_blobs(self, released_before: float, limit: int) -> list[str]:
+        """
+        Lists blobs left unreferenced
+
+        :param released_before: timestamp before which blob has to be released
+        :param limit: max number of blobs to list
+
+        :returns list of SHA-256 hex digests
+        """
+
+    @abstractmethod
+    def lease_blob(
+        self, sha256: str, released_before: float, lease_duration: float
+    ) -> Optional[float]:
+        """
+        Leases blob for collection if it is still unreferenced
+
+        :param sha256: SHA-256 hex digest of the blob content
+        :param released_before: timestamp before which blob has to be released
+        :param lease_duration: seconds to keep blob leased
+
+        :returns timestamp until which blob is leased, None if blob can not be collected
+        """
+
+    @abstractmethod
+    def remove_blob(self, sha256: str, leased_until: float) -> bool:
+        """
+        Unregisters blob if it is still leased for collection
+
+        :param sha256: SHA-256 hex digest of the blob content
+        :param leased_until: timestamp returned by "lease_blob"
+
+        :returns True if blob was unregistered
+        """
+
+
+class ContentAddressedStorage(StorageBackend):
+    """
+    Deduplicating storage keeping each distinct content once
+
+    Content is stored under the location derived from its SHA-256 hash and the index maps logical locations
+    (e.g. "attachments/<name>") to the hashes, so uploading the same file again only adds a reference.
+    Locations missing in the index are read from the underlying storage as is,
+    so files stored before deduplication was enabled keep resolving.
+    """
+
+    BLOBS_PREFIX = "blobs"
+
+    def __init__(
+        self,
+        backend: StorageBackend,
+        index: FileIndex,
+        spool_max_size: int = 1024 * 1024,
+        resolved_cache_size: int = 4096,
+        resolved_cache_ttl: float = 300,
+        collection_lease: float = 60,
+        lease_poll_interval: float = 0.5,
+        lease_wait_timeout: float = 5,
+    ):
+        """
+        :param backend: storage to keep blobs in
+        :param index: index of the logical locations
+        :param spool_max_size: max number of bytes of the hashed upload kept in memory, the rest is spooled to disk
+        :param resolved_cache_size: max number of resolved locations kept in memory
+        :param resolved_cache_ttl: seconds to keep resolved location in memory
+        :param collection_lease: seconds blob being collected is kept from storing its content again
+        :param lease_poll_interval: seconds between attempts to register blob which is being collected
+        :param lease_wait_timeout: max seconds to wait for collection of the uploaded content to complete
+        """
+        self.backend = backend
+        self.index = index
+        self.chunk_size = backend.chunk_size
+        self.spool_max_size = spool_max_size
+        self.collection_lease = collection_lease
+        self.lease_poll_interval = lease_poll_interval
+        self.lease_wait_timeout = lease_wait_timeout
+        self._resolved = TTLCache(maxsize=resolved_cache_size, ttl=resolved_cache_ttl)
+        self._lock = Lock()
+
+    @classmethod
+    def get_blob_location(cls, sha256: str) -> str:
+        return f"{cls.BLOBS_PREFIX}/{sha256[:2]}/{sha256}"
+
+    def _resolve(self, location: str, refresh: bool = False) -> tuple[str, str | None]:
+        """
+        Resolves location of the file in the underlying storage
+
+        :param location: logical location of the file
+        :param refresh: to bypass in-memory cache of resolved locations
+
+        :returns tuple of storage location and blob hash (None for legacy files)
+        """
+        with self._lock:
+            sha256 = None if refresh else self._resolved.get(location)
+        if sha256 is None:
+            sha256 = self.index.resolve(location) or ""
+            with self._lock:
+                self._resolved[location] = sha256
+        if sha256:
+            return self.get_blob_location(sha256), sha256
+        return location, None
+
+    def _forget(self, location: str):
+        with self._lock:
+            self._resolved.pop(location, None)
+
+    def put(self, location: str, file_object) -> FileStat:
+        # content is spooled while hashing, so duplicate content is never transferred to the storage
+        content_hash = hashlib.sha256()
+        size = 0
+        with SpooledTemporaryFile(max_size=self.spool_max_size) as spooled_file:
+            while chunk := file_object.read(self.chunk_size):
+                content_hash.update(chunk)
+                size += len(chunk)
+                spooled_file.write(chunk)
+            sha256 = content_hash.hexdigest()
+            blob_location = self.get_blob_location(sha256)
+            file_stat = None
+            if not self.index.add_reference(location=location, sha256=sha256):
+                self._register_blob(sha256=sha256, size=size)
+                spooled_file.seek(0)
+                file_stat = self.backend.put(
+                    location=blob_location, file_object=spooled_file
+                )
+                if not self.index.add_reference(location=location, sha256=sha256):
+                    raise RuntimeError(f"Failed to reference blob {sha256!r}")
+            else:
+                LOG.debug(f"Content of {location = } is already stored as {sha256!r}")
+        with self._lock:
+            self._resolved[location] = sha256
+        file_stat = file_stat or self.backend.stat(blob_location)
+        return FileStat(
+            size=file_stat.size,
+            last_modified=file_stat.last_modified,
+            etag=f'"{sha256}"',
+        )
+
+    def _register_blob(self, sha256: str, size: int):
+        """
+        Registers blob before uploading its content, so content being collected is never uploaded until deleted
+
+        Collection of a single blob completes quickly, while its lease only guards against crashed collectors,
+        so upload waits for "lease_wait_timeout" instead of the whole lease to keep transfer workers available.
+
+        :raises TimeoutError: if blob is still being collected after "lease_wait_timeout"
+        """
+        deadline = time.monotonic() + self.lease_wait_timeout
+        while not self.index.add_blob(sha256=sha256, size=size):
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Blob {sha256!r} is still being collected")
+            LOG.debug(f"Waiting for collection of {sha256!r} to complete")
+            time.sleep(self.lease_poll_interval)
+
+    def _call_resolved(self, func: Callable, location: str, **kwargs):
+        storage_location, sha256 = self._resolve(location)
+        try:
+            return func(storage_location, sha256, **kwargs)
+        except FileNotFoundError:
+            # resolved location might be outdated if file was replaced by another server instance
+            refreshed_location, refreshed_sha256 = self._resolve(location, refresh=True)
+            if refreshed_location == storage_location:
+                raise
+            return func(refreshed_location, refreshed_sha256, **kwargs)
+
+    def get(self, location: str) -> bytes:
+        return self._call_resolved(
+            lambda storage_location, _: self.backend.get(storage_location),
+            location=location,
+        )
+
+    def stream(self, location: str, start: int = 0, end: int = None) -> Iterator[bytes]:
+        def _start_stream(storage_location: str, _) -> tuple[bytes | None, Iterator]:
+            chunks = iter(
+                self.backend.stream(location=storage_location, start=start, end=end)
+            )
+            # missing file is detected once the stream is started
+            return next(chunks, None), chunks
+
+        first_chunk, chunks = self._call_resolved(_start_stream, location=location)
+        if first_chunk is not None:
+            yield first_chunk
+            yield from chunks
+
+    def stat(self, location: str) -> FileStat:
+        def _stat(storage_location: str, sha256: str | None) -> FileStat:
+            file_stat = self.backend.stat(storage_location)
+            if sha256:
+                # hash of the content is the strongest entity tag possible
+                file_stat = replace(file_stat, etag=f'"{sha256}"')
+            return file_stat
+
+        return self._call_resolved(_stat, location=location)
+
+    def delete(self, location: str) -> None:
+        """Releases the blob referenced by location, files stored before deduplication are deleted as is"""
+        sha256 = self.index.remove_reference(location)
+        self._forget(location)
+        if not sha256:
+            self.backend.delete(location)
+
+    def collect_garbage(
+        self, grace_period: float = 24 * 60 * 60, limit: int = 1000
+    ) -> int:
+        """
+        Deletes content of the blobs which are not referenced by any location
+
+        Blobs are collected only after staying unreferenced for "grace_period".
+        Collected blob is leased first, so the same content uploaded meanwhile is stored only after its deletion.
+
+        :param grace_period: seconds since the last release of the blob
+        :param limit: max number of blobs to collect per call
+
+        :returns number of deleted blobs
+        """
+        released_before = time.time() - grace_period
+        num_deleted = 0
+        for sha256 in self.index.list_unreferenced_blobs(
+            released_before=released_before, limit=limit
+        ):
+            leased_until = self.index.lease_blob(
+                sha256=sha256,
+                released_before=released_before,
+                lease_duration=self.collection_lease,
+            )
+            if leased_until is None:
+                continue
+            if time.time() >= leased_until:
+                # expired lease is taken over by uploads, blob is collected on the next run
+                LOG.warning(f"Lease of {sha256!r} expired before collecting")
+                continue
+            self.backend.delete(self.get_blob_location(sha256))
+            if self.index.remove_blob(sha256=sha256, leased_until=leased_until):
+                num_deleted += 1
+        LOG.info(f"Collected {num_deleted} unreferenced blobs")
+        return num_deleted
+
+    async def run(self, func: Callable, *args, **kwargs):
+        return await self.backend.run(func, *args, **kwargs)
+
+    def close(self) -> None:
+        self.backend.close()
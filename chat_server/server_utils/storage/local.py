@@ -0,0 +1,88 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+from typing import Iterator
+
+from chat_server.server_utils.storage.base import (
+    FileStat,
+    StorageBackend,
+    iter_file_chunks,
+)
+from utils.common import generate_uuid
+
+
+class LocalStorage(StorageBackend):
+    """Storage of the files in the local directory"""
+
+    def __init__(self, root_path: str):
+        self.root_path = os.path.abspath(os.path.expanduser(root_path))
+
+    def get_path(self, location: str) -> str:
+        """
+        Resolves absolute path of the file
+
+        :param location: location of the file
+        :raises ValueError: if location points outside of the storage root
+        """
+        path = os.path.normpath(os.path.join(self.root_path, location.lstrip("/")))
+        if os.path.commonpath((path, self.root_path)) != self.root_path:
+            raise ValueError(f"{location = } is outside of the storage root")
+        return path
+
+    def put(self, location: str, file_object) -> FileStat:
+        path = self.get_path(location)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # content is written to the temporary file so readers never see partially stored file
+        tmp_path = f"{path}.{generate_uuid(length=8)}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                while chunk := file_object.read(self.chunk_size):
+                    f.write(chunk)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return self.stat(location)
+
+    def stream(self, location: str, start: int = 0, end: int = None) -> Iterator[bytes]:
+        with open(self.get_path(location), "rb") as f:
+            yield from iter_file_chunks(
+                f, start=start, end=end, chunk_size=self.chunk_size
+            )
+
+    def stat(self, location: str) -> FileStat:
+        stats = os.stat(self.get_path(location))
+        return FileStat(size=stats.st_size, last_modified=stats.st_mtime)
+
+    def delete(self, location: str) -> None:
+        try:
+            os.remove(self.get_path(location))
+        except FileNotFoundError:
+            pass
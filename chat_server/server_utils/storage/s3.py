@@ -0,0 +1,171 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from typing import Iterator
+
+from chat_server.server_utils.storage.base import FileStat, StorageBackend
+from utils.logging_utils import LOG
+
+try:
+    import boto3
+    from boto3.s3.transfer import TransferConfig
+    from botocore.config import Config as BotoConfig
+    from botocore.exceptions import ClientError
+except ModuleNotFoundError:
+    LOG.info("S3 dependency was not installed")
+    boto3 = None
+
+
+class _FullReadAdapter:
+    """
+    Makes "read(size)" return exactly requested number of bytes unless stream is exhausted
+
+    S3 transfer manager treats short read as the end of part, while upload streams return at most one chunk per read
+    """
+
+    def __init__(self, file_object):
+        self._file_object = file_object
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            return b"".join(iter(lambda: self._file_object.read(), b""))
+        chunks, remaining = [], size
+        while remaining > 0 and (chunk := self._file_object.read(remaining)):
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b"".join(chunks)
+
+
+def _is_not_found(ex: Exception) -> bool:
+    return isinstance(ex, ClientError) and ex.response.get("Error", {}).get("Code") in (
+        "404",
+        "NoSuchKey",
+        "NotFound",
+    )
+
+
+class S3Storage(StorageBackend):
+    """Storage of the files in the bucket of S3-compatible object storage (e.g. AWS S3, MinIO, Ceph)"""
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        endpoint_url: str = None,
+        region: str = None,
+        access_key: str = None,
+        secret_key: str = None,
+        max_connections: int = 10,
+        multipart_chunk_size: int = 8 * 1024 * 1024,
+        client=None,
+    ):
+        """
+        :param bucket: name of the bucket
+        :param prefix: key prefix of the stored files (optional)
+        :param endpoint_url: URL of S3-compatible service, AWS endpoint is used if not provided
+        :param region: name of the region (optional)
+        :param access_key: access key id, default AWS credentials chain is used if not provided
+        :param secret_key: secret access key
+        :param max_connections: max number of pooled HTTP connections
+        :param multipart_chunk_size: size of the uploaded part, bounds memory used by single upload
+        :param client: preconfigured boto3 S3 client (optional)
+        """
+        if boto3 is None:
+            raise ModuleNotFoundError("S3 storage requires boto3 to be installed")
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.client = client or boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region,
+            aws_access_key_id=access_key,
+            aws_secret_access_key=secret_key,
+            config=BotoConfig(max_pool_connections=max_connections),
+        )
+        self._transfer_config = TransferConfig(
+            multipart_threshold=multipart_chunk_size,
+            multipart_chunksize=multipart_chunk_size,
+            max_concurrency=2,
+        )
+
+    def _get_key(self, location: str) -> str:
+        location = location.lstrip("/")
+        return f"{self.prefix}/{location}" if self.prefix else location
+
+    def put(self, location: str, file_object) -> FileStat:
+        self.client.upload_fileobj(
+            Fileobj=_FullReadAdapter(file_object),
+            Bucket=self.bucket,
+            Key=self._get_key(location),
+            Config=self._transfer_config,
+        )
+        return self.stat(location)
+
+    def _get_object(self, location: str, **kwargs) -> dict:
+        try:
+            return self.client.get_object(
+                Bucket=self.bucket, Key=self._get_key(location), **kwargs
+            )
+        except ClientError as ex:
+            if _is_not_found(ex):
+                raise FileNotFoundError(location) from ex
+            raise
+
+    def get(self, location: str) -> bytes:
+        body = self._get_object(location)["Body"]
+        with body:
+            return body.read()
+
+    def stream(self, location: str, start: int = 0, end: int = None) -> Iterator[bytes]:
+        kwargs = {}
+        if start or end is not None:
+            kwargs["Range"] = f"bytes={start}-{'' if end is None else end}"
+        body = self._get_object(location, **kwargs)["Body"]
+        with body:
+            yield from body.iter_chunks(chunk_size=self.chunk_size)
+
+    def stat(self, location: str) -> FileStat:
+        try:
+            response = self.client.head_object(
+                Bucket=self.bucket, Key=self._get_key(location)
+            )
+        except ClientError as ex:
+            if _is_not_found(ex):
+                raise FileNotFoundError(location) from ex
+            raise
+        return FileStat(
+            size=response["ContentLength"],
+            last_modified=response["LastModified"].timestamp(),
+            etag=response.get("ETag"),
+        )
+
+    def delete(self, location: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._get_key(location))
+
+    def close(self) -> None:
+        self.client.close()
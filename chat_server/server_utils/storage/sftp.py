@@ -0,0 +1,71 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from typing import Callable, Iterator
+
+from chat_server.server_utils.sftp_utils import SFTPConnectionPool
+from chat_server.server_utils.storage.base import FileStat, StorageBackend
+
+
+class SFTPStorage(StorageBackend):
+    """Storage of the files on the SFTP server accessed through the pool of SFTP sessions"""
+
+    def __init__(self, sftp_connector: SFTPConnectionPool):
+        self.sftp_connector = sftp_connector
+
+    @staticmethod
+    def _to_file_stat(stats) -> FileStat:
+        return FileStat(size=stats.st_size or 0, last_modified=stats.st_mtime)
+
+    def put(self, location: str, file_object) -> FileStat:
+        return self._to_file_stat(
+            self.sftp_connector.put_file_stream(
+                file_object=file_object, save_to=location
+            )
+        )
+
+    def get(self, location: str) -> bytes:
+        return self.sftp_connector.get_file_object(location).getvalue()
+
+    def stream(self, location: str, start: int = 0, end: int = None) -> Iterator[bytes]:
+        return self.sftp_connector.stream_file(
+            get_from=location, start=start, end=end, chunk_size=self.chunk_size
+        )
+
+    def stat(self, location: str) -> FileStat:
+        return self._to_file_stat(self.sftp_connector.stat_file(get_from=location))
+
+    def delete(self, location: str) -> None:
+        try:
+            self.sftp_connector.remove_file(get_from=location)
+        except FileNotFoundError:
+            pass
+
+    async def run(self, func: Callable, *args, **kwargs):
+        # transfers are bounded by the number of pooled SFTP sessions
+        return await self.sftp_connector.run(func, *args, **kwargs)
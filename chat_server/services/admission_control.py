@@ -0,0 +1,287 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from enum import StrEnum
+from typing import AsyncIterator, Optional
+
+from utils.metrics_utils import (
+    ADMISSION_ACTIVE,
+    ADMISSION_QUEUE_DURATION,
+    ADMISSION_QUEUED,
+    ADMISSION_SHED,
+)
+
+
+class RouteClasses(StrEnum):
+    """Classes of the handled requests sharing concurrency limits"""
+
+    CHEAP = "cheap"
+    HISTORY = "history"
+    FILES = "files"
+    AUTH = "auth"
+    WRITES = "writes"
+    DEFAULT = "default"
+
+
+class AdmissionGate:
+    """
+    Concurrency limit of the requests class
+
+    Requests exceeding the limit wait in FIFO queue,
+    requests which would wait longer than "max_queue_time" or overflow the queue are shed.
+    """
+
+    def __init__(
+        self,
+        route_class: RouteClasses,
+        max_concurrency: int,
+        max_queue_size: int,
+        max_queue_time: float,
+    ):
+        self.route_class = route_class
+        self.max_concurrency = max_concurrency
+        self.max_queue_size = max_queue_size
+        self.max_queue_time = max_queue_time
+        self.active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def retry_after(self) -> int:
+        """Seconds for the shed clients to wait before retrying"""
+        return max(1, math.ceil(self.max_queue_time))
+
+    async def acquire(self) -> bool:
+        """
+        Acquires slot of the gate
+
+        :returns True if slot was acquired, False if request is shed
+        """
+        if self.active < self.max_concurrency and not self._waiters:
+            self.active += 1
+            return True
+        if len(self._waiters) >= self.max_queue_size or self.max_queue_time <= 0:
+            return False
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        ADMISSION_QUEUED.labels(route_class=self.route_class).inc()
+        start_time = time.perf_counter()
+        try:
+            # waiter is shielded, so slot handed over right on timeout is not lost
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=self.max_queue_time)
+            return True
+        except asyncio.TimeoutError:
+            return not self._abandon(waiter)
+        except asyncio.CancelledError:
+            if not self._abandon(waiter):
+                self.release()
+            raise
+        finally:
+            ADMISSION_QUEUED.labels(route_class=self.route_class).dec()
+            ADMISSION_QUEUE_DURATION.labels(route_class=self.route_class).observe(
+                time.perf_counter() - start_time
+            )
+
+    def _abandon(self, waiter: asyncio.Future) -> bool:
+        """
+        Abandons waiting for the slot
+
+        :returns False if slot was already handed over to the waiter
+        """
+        if waiter.done():
+            return False
+        self._waiters.remove(waiter)
+        waiter.cancel()
+        return True
+
+    def release(self):
+        """Releases slot of the gate handing it over to the longest waiting request"""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+
+class AdmissionController:
+    """
+    Admission control of the HTTP requests and Socket IO events
+
+    Requests are classified by route, each class has own concurrency limit,
+    so slow storage or database affects only requests depending on it.
+    Cheap routes (e.g. served from cache) have their own class and never queue behind expensive ones.
+    Requests queued for longer than allowed are shed, so the server stays responsive under overload.
+    """
+
+    # limits are tuples of (max concurrency, max queue size, max queue time in seconds)
+    __DEFAULT_LIMITS = {
+        RouteClasses.CHEAP: (256, 0, 0),
+        RouteClasses.HISTORY: (32, 256, 2),
+        RouteClasses.FILES: (32, 256, 5),
+        RouteClasses.AUTH: (16, 128, 2),
+        RouteClasses.WRITES: (64, 512, 2),
+        RouteClasses.DEFAULT: (64, 512, 2),
+    }
+    # routes are matched by path prefix, the longest prefix wins
+    __DEFAULT_ROUTES = {
+        RouteClasses.CHEAP: [
+            "/chat_api/live",
+            "/chat_api/get_popular_cids",
+            "/language_api/settings",
+            "/metrics",
+        ],
+        RouteClasses.HISTORY: [
+            "/chat_api/search",
+            "/chat_api/batch",
+            "/chat_api/delta",
+            "/admin/chats/list",
+        ],
+        RouteClasses.FILES: ["/files"],
+        RouteClasses.AUTH: ["/auth"],
+    }
+    __DEFAULT_EVENTS = {
+        "user_message": RouteClasses.WRITES,
+        "new_prompt": RouteClasses.WRITES,
+        "prompt_completed": RouteClasses.WRITES,
+        "get_prompt_data": RouteClasses.HISTORY,
+        "get_conversation_delta": RouteClasses.HISTORY,
+        "request_stt": RouteClasses.FILES,
+        "request_tts": RouteClasses.FILES,
+    }
+    # responses of the backend to already admitted requests, shedding them would throw away finished work
+    __DEFAULT_EXEMPT_EVENTS = ("tts_response", "stt_response", "get_neon_translations")
+    __WRITE_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+    __gates: dict[RouteClasses, AdmissionGate] = {}
+    __routes: list[tuple[str, RouteClasses]] = []
+    __events: dict[str, RouteClasses] = {}
+    __exempt_events: frozenset[str] = frozenset(__DEFAULT_EXEMPT_EVENTS)
+    enabled: bool = False
+
+    @classmethod
+    def init(cls, config: dict = None):
+        """
+        Initialises admission control from provided configuration
+
+        :param config: admission control configuration, supported keys:
+            - "ENABLED": to limit concurrency of the requests (defaults to False)
+            - "LIMITS": mapping of route class (e.g. "HISTORY") to the limits overriding the defaults with keys
+                "MAX_CONCURRENCY", "MAX_QUEUE_SIZE" and "MAX_QUEUE_TIME" (seconds)
+            - "ROUTES": mapping of route class to the list of path prefixes extending the defaults
+            - "EVENTS": mapping of Socket IO event name to the route class extending the defaults
+            - "EXEMPT_EVENTS": list of Socket IO events which are never shed extending the defaults
+                (defaults to responses of the backend - "tts_response", "stt_response" and "get_neon_translations")
+        Requests not matching any route are classified as "writes" if they modify data, "default" otherwise,
+        Socket IO events not listed are classified as "default".
+        """
+        config = config or {}
+        limits_config = config.get("LIMITS") or {}
+        gates = {}
+        for route_class, default_limits in cls.__DEFAULT_LIMITS.items():
+            limits = limits_config.get(route_class.upper()) or {}
+            max_concurrency, max_queue_size, max_queue_time = default_limits
+            gates[route_class] = AdmissionGate(
+                route_class=route_class,
+                max_concurrency=int(limits.get("MAX_CONCURRENCY", max_concurrency)),
+                max_queue_size=int(limits.get("MAX_QUEUE_SIZE", max_queue_size)),
+                max_queue_time=float(limits.get("MAX_QUEUE_TIME", max_queue_time)),
+            )
+        routes = {
+            prefix: route_class
+            for route_class, prefixes in cls.__DEFAULT_ROUTES.items()
+            for prefix in prefixes
+        }
+        for route_class, prefixes in (config.get("ROUTES") or {}).items():
+            routes.update(dict.fromkeys(prefixes, RouteClasses(route_class.lower())))
+        cls.__gates = gates
+        cls.__routes = sorted(routes.items(), key=lambda item: -len(item[0]))
+        cls.__events = {
+            **cls.__DEFAULT_EVENTS,
+            **{
+                event: RouteClasses(route_class.lower())
+                for event, route_class in (config.get("EVENTS") or {}).items()
+            },
+        }
+        cls.__exempt_events = frozenset(
+            (*cls.__DEFAULT_EXEMPT_EVENTS, *(config.get("EXEMPT_EVENTS") or []))
+        )
+        cls.enabled = bool(config.get("ENABLED", False))
+
+    @classmethod
+    def classify_route(cls, method: str, path: str) -> RouteClasses:
+        """Classifies HTTP request by its method and path"""
+        for prefix, route_class in cls.__routes:
+            if path.startswith(prefix):
+                return route_class
+        if method in cls.__WRITE_METHODS:
+            return RouteClasses.WRITES
+        return RouteClasses.DEFAULT
+
+    @classmethod
+    def classify_event(cls, event: str) -> Optional[RouteClasses]:
+        """Classifies Socket IO event by its name, None for the events which are never shed"""
+        if event in cls.__exempt_events:
+            return None
+        return cls.__events.get(event, RouteClasses.DEFAULT)
+
+    @classmethod
+    def get_gate(cls, route_class: Optional[RouteClasses]) -> Optional[AdmissionGate]:
+        return cls.__gates.get(route_class)
+
+    @classmethod
+    @asynccontextmanager
+    async def admit(
+        cls, route_class: Optional[RouteClasses], kind: str
+    ) -> AsyncIterator[bool]:
+        """
+        Admits request of provided class, slot is held until the context exits
+
+        :param route_class: class of the request, requests without class are always admitted
+        :param kind: kind of the request for metrics ("http" or "sio")
+
+        :returns True if request is admitted, False if it is shed
+        """
+        gate = cls.get_gate(route_class)
+        if not cls.enabled or gate is None:
+            yield True
+            return
+        if not await gate.acquire():
+            ADMISSION_SHED.labels(route_class=route_class, kind=kind).inc()
+            yield False
+            return
+        ADMISSION_ACTIVE.labels(route_class=route_class).inc()
+        try:
+            yield True
+        finally:
+            ADMISSION_ACTIVE.labels(route_class=route_class).dec()
+            gate.release()
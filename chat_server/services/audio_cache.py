@@ -0,0 +1,253 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import hashlib
+import os
+from threading import RLock
+from typing import Iterable, Iterator, Optional
+
+from cachetools import LRUCache
+
+from chat_server.server_utils.storage.base import StorageBackend
+from utils.logging_utils import LOG
+
+
+class AudioCache:
+    """
+    Bounded read-through cache of audio files kept in the file storage
+
+    Consists of the in-memory tier bounded by the total number of bytes
+    and optional local-disk tier with size-based eviction of the least recently used files.
+    Items are keyed by (message_id, lang, gender), the original audio of the message is stored with empty lang and gender.
+    """
+
+    __DEFAULT_MEMORY_MAX_BYTES = 64 * 1024 * 1024
+    __DEFAULT_DISK_MAX_BYTES = 512 * 1024 * 1024
+
+    __memory_tier: LRUCache = LRUCache(
+        maxsize=__DEFAULT_MEMORY_MAX_BYTES, getsizeof=len
+    )
+    __disk_location: Optional[str] = None
+    __disk_max_bytes: int = 0
+    __disk_used_bytes: int = 0
+    __lock = RLock()
+
+    @classmethod
+    def init(cls, config: dict = None):
+        """
+        Initialises cache tiers from provided configuration
+
+        :param config: audio cache configuration, supported keys:
+            - "MEMORY_MAX_BYTES": max number of bytes kept in memory (defaults to 64 MB)
+            - "DISK_LOCATION": local directory for disk tier, disk tier is disabled if not provided
+            - "DISK_MAX_BYTES": max number of bytes kept on disk (defaults to 512 MB)
+        """
+        config = config or {}
+        with cls.__lock:
+            cls.__memory_tier = LRUCache(
+                maxsize=int(
+                    config.get("MEMORY_MAX_BYTES", cls.__DEFAULT_MEMORY_MAX_BYTES)
+                ),
+                getsizeof=len,
+            )
+            cls.__disk_location = None
+            cls.__disk_used_bytes = 0
+            if disk_location := config.get("DISK_LOCATION"):
+                cls.__disk_location = os.path.expanduser(disk_location)
+                cls.__disk_max_bytes = int(
+                    config.get("DISK_MAX_BYTES", cls.__DEFAULT_DISK_MAX_BYTES)
+                )
+                os.makedirs(cls.__disk_location, exist_ok=True)
+                cls.__disk_used_bytes = sum(
+                    entry.stat().st_size
+                    for entry in os.scandir(cls.__disk_location)
+                    if entry.is_file()
+                )
+                cls._evict_disk_items()
+
+    @staticmethod
+    def build_key(message_id: str, lang: str = "", gender: str = "") -> tuple:
+        """Builds cache key out of audio properties"""
+        return message_id, lang or "", gender or ""
+
+    @classmethod
+    def get(cls, message_id: str, lang: str = "", gender: str = "") -> bytes | None:
+        """
+        Gets cached audio bytes
+
+        :param message_id: id of the message audio belongs to
+        :param lang: language of the audio (empty for original message audio)
+        :param gender: gender of the audio voice (empty for original message audio)
+
+        :returns cached audio bytes if any
+        """
+        key = cls.build_key(message_id=message_id, lang=lang, gender=gender)
+        with cls.__lock:
+            data = cls.__memory_tier.get(key)
+        if data is None and cls.__disk_location:
+            data = cls._read_from_disk(key=key)
+            if data:
+                cls._put_to_memory(key=key, data=data)
+        return data
+
+    @classmethod
+    def put(cls, data: bytes, message_id: str, lang: str = "", gender: str = ""):
+        """
+        Puts audio bytes into the cache
+
+        :param data: audio bytes to cache
+        :param message_id: id of the message audio belongs to
+        :param lang: language of the audio (empty for original message audio)
+        :param gender: gender of the audio voice (empty for original message audio)
+        """
+        if not data:
+            return
+        key = cls.build_key(message_id=message_id, lang=lang, gender=gender)
+        cls._put_to_memory(key=key, data=data)
+        if cls.__disk_location:
+            cls._write_to_disk(key=key, data=data)
+
+    @classmethod
+    def get_or_fetch(
+        cls,
+        storage: StorageBackend,
+        file_location: str,
+        message_id: str,
+        lang: str = "",
+        gender: str = "",
+    ) -> bytes | None:
+        """
+        Gets audio bytes from cache, fetches them from the storage on cache miss
+
+        :param storage: storage to fetch file from
+        :param file_location: location of the file in the storage
+        :param message_id: id of the message audio belongs to
+        :param lang: language of the audio (empty for original message audio)
+        :param gender: gender of the audio voice (empty for original message audio)
+
+        :returns audio bytes if any
+        """
+        data = cls.get(message_id=message_id, lang=lang, gender=gender)
+        if data is None:
+            LOG.info(f"Fetching existing file from: {file_location}")
+            data = storage.get(file_location)
+            cls.put(data=data, message_id=message_id, lang=lang, gender=gender)
+        return data
+
+    @classmethod
+    def cache_stream(
+        cls,
+        chunks: Iterable[bytes],
+        message_id: str,
+        lang: str = "",
+        gender: str = "",
+    ) -> Iterator[bytes]:
+        """
+        Passes through streamed audio chunks and caches audio once the stream is completed
+
+        :param chunks: iterable over chunks of the complete audio file
+        :param message_id: id of the message audio belongs to
+        :param lang: language of the audio (empty for original message audio)
+        :param gender: gender of the audio voice (empty for original message audio)
+
+        :returns iterator over provided chunks
+        """
+        received_chunks = []
+        for chunk in chunks:
+            received_chunks.append(chunk)
+            yield chunk
+        cls.put(
+            data=b"".join(received_chunks),
+            message_id=message_id,
+            lang=lang,
+            gender=gender,
+        )
+
+    @classmethod
+    def _put_to_memory(cls, key: tuple, data: bytes):
+        with cls.__lock:
+            try:
+                cls.__memory_tier[key] = data
+            except ValueError:
+                LOG.debug(f"Audio of {key = } exceeds memory tier size - skipping")
+
+    @classmethod
+    def _get_disk_path(cls, key: tuple) -> str:
+        return os.path.join(
+            cls.__disk_location,
+            f'{hashlib.sha1("|".join(key).encode()).hexdigest()}.wav',
+        )
+
+    @classmethod
+    def _read_from_disk(cls, key: tuple) -> bytes | None:
+        path = cls._get_disk_path(key=key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            # Updating modification time to keep track of the least recently used items
+            os.utime(path)
+            return data
+        except FileNotFoundError:
+            return None
+        except OSError as ex:
+            LOG.warning(f"Failed to read cached audio from {path = } - {ex}")
+            return None
+
+    @classmethod
+    def _write_to_disk(cls, key: tuple, data: bytes):
+        path = cls._get_disk_path(key=key)
+        tmp_path = f"{path}.tmp"
+        try:
+            previous_size = os.path.getsize(path) if os.path.exists(path) else 0
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            with cls.__lock:
+                cls.__disk_used_bytes += len(data) - previous_size
+            cls._evict_disk_items()
+        except OSError as ex:
+            LOG.warning(f"Failed to write cached audio to {path = } - {ex}")
+
+    @classmethod
+    def _evict_disk_items(cls):
+        """Removes least recently used files until disk tier fits its size limit"""
+        with cls.__lock:
+            if cls.__disk_used_bytes <= cls.__disk_max_bytes:
+                return
+            entries = sorted(
+                (entry for entry in os.scandir(cls.__disk_location) if entry.is_file()),
+                key=lambda entry: entry.stat().st_mtime,
+            )
+            for entry in entries:
+                if cls.__disk_used_bytes <= cls.__disk_max_bytes:
+                    break
+                try:
+                    size = entry.stat().st_size
+                    os.remove(entry.path)
+                    cls.__disk_used_bytes -= size
+                except OSError as ex:
+                    LOG.warning(f"Failed to evict cached audio {entry.path} - {ex}")
@@ -0,0 +1,136 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from threading import Lock
+from time import time
+
+import jwt
+
+from chat_server.server_utils.enums import ClaimActions
+from utils.logging_utils import LOG
+
+
+class InvalidClaimException(Exception):
+    """Claim is malformed, expired or does not permit requested action"""
+
+
+class AudioClaims:
+    """
+    Claim-check references to the audio files in the storage
+
+    Instead of passing audio through Socket IO and MQ, only the short-lived signed claim travels with the request,
+    services redeem it at "/files/claims/<claim>" to read the audio or to upload the produced one.
+    """
+
+    CLAIMS_PATH = "/files/claims"
+
+    __DEFAULT_TTL = 300
+    __DEFAULT_MIN_BYTES = 64 * 1024
+    __ALGORITHM = "HS256"
+
+    __secret: str | None = None
+    __lock = Lock()
+    enabled: bool = False
+    ttl: int = __DEFAULT_TTL
+    min_bytes: int = __DEFAULT_MIN_BYTES
+
+    @classmethod
+    def init(cls, config: dict = None, secret: str = None):
+        """
+        Initialises audio claims from provided configuration
+
+        :param config: audio claims configuration, supported keys:
+            - "ENABLED": to pass audio by claims (defaults to False)
+            - "SECRET": key to sign claims with (defaults to provided "secret")
+            - "TTL": seconds claim stays valid (defaults to 300)
+            - "MIN_BYTES": min size of the audio to pass by claim, smaller audio is passed inline (defaults to 64 KB)
+        :param secret: default key to sign claims with
+        """
+        config = config or {}
+        with cls.__lock:
+            cls.__secret = config.get("SECRET") or secret
+            cls.enabled = bool(config.get("ENABLED", False))
+            if cls.enabled and not cls.__secret:
+                LOG.warning("Audio claims are disabled - signing secret is missing")
+                cls.enabled = False
+            cls.ttl = int(config.get("TTL", cls.__DEFAULT_TTL))
+            cls.min_bytes = int(config.get("MIN_BYTES", cls.__DEFAULT_MIN_BYTES))
+
+    @classmethod
+    def create_claim(cls, location: str, action: ClaimActions) -> str:
+        """
+        Creates claim on the file
+
+        :param location: location of the file in the storage
+        :param action: action permitted by the claim
+
+        :returns signed claim
+        """
+        return jwt.encode(
+            payload={
+                "location": location,
+                "action": action,
+                "exp": int(time()) + cls.ttl,
+            },
+            key=cls.__secret,
+            algorithm=cls.__ALGORITHM,
+        )
+
+    @classmethod
+    def resolve_claim(
+        cls, claim: str, action: ClaimActions, verify_expiration: bool = True
+    ) -> str:
+        """
+        Resolves location of the claimed file
+
+        :param claim: signed claim
+        :param action: action to perform with the file
+        :param verify_expiration: to reject expired claim (defaults to True)
+
+        :returns location of the file in the storage
+        :raises InvalidClaimException: if claim is not valid for the action
+        """
+        if not cls.__secret:
+            raise InvalidClaimException("Audio claims are not configured")
+        try:
+            payload = jwt.decode(
+                claim,
+                key=cls.__secret,
+                algorithms=[cls.__ALGORITHM],
+                options={"verify_exp": verify_expiration},
+            )
+        except jwt.PyJWTError as ex:
+            raise InvalidClaimException(str(ex)) from ex
+        if payload.get("action") != action or not payload.get("location"):
+            raise InvalidClaimException(f"Claim does not permit '{action}'")
+        return payload["location"]
+
+    @classmethod
+    def build_path(cls, claim: str) -> str:
+        """Builds URL path redeeming the claim"""
+        return f"{cls.CLAIMS_PATH}/{claim}"
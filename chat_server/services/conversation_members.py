@@ -0,0 +1,109 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+from threading import Lock
+
+
+class ConversationMembers:
+    """
+    Registry of client sessions subscribed to the conversations along with their preferred languages
+
+    Used to translate new messages once per language active in the conversation
+    instead of letting each client request translation on its own.
+    """
+
+    __members: dict[str, dict[str, str]] = {}  # cid -> sid -> preferred language
+    __subscriptions: dict[str, set[str]] = {}  # sid -> subscribed cids
+    __lock = Lock()
+
+    @classmethod
+    def join(cls, sid: str, cid: str, lang: str = "en"):
+        """
+        Subscribes client session to the conversation
+
+        :param sid: client session id
+        :param cid: target conversation id
+        :param lang: preferred language of the client session in conversation
+        """
+        with cls.__lock:
+            cls.__members.setdefault(cid, {})[sid] = lang
+            cls.__subscriptions.setdefault(sid, set()).add(cid)
+
+    @classmethod
+    def leave(cls, sid: str, cid: str):
+        """
+        Unsubscribes client session from the conversation
+
+        :param sid: client session id
+        :param cid: target conversation id
+        """
+        with cls.__lock:
+            cls._remove_member(sid=sid, cid=cid)
+            subscriptions = cls.__subscriptions.get(sid)
+            if subscriptions is not None:
+                subscriptions.discard(cid)
+                if not subscriptions:
+                    cls.__subscriptions.pop(sid, None)
+
+    @classmethod
+    def remove_session(cls, sid: str):
+        """
+        Unsubscribes client session from every conversation
+
+        :param sid: client session id
+        """
+        with cls.__lock:
+            for cid in cls.__subscriptions.pop(sid, set()):
+                cls._remove_member(sid=sid, cid=cid)
+
+    @classmethod
+    def _remove_member(cls, sid: str, cid: str):
+        members = cls.__members.get(cid)
+        if members is not None:
+            members.pop(sid, None)
+            if not members:
+                cls.__members.pop(cid, None)
+
+    @classmethod
+    def get_languages(
+        cls, cid: str, skip_sids: list[str] | None = None
+    ) -> dict[str, list[str]]:
+        """
+        Gets languages preferred by the members of the conversation
+
+        :param cid: target conversation id
+        :param skip_sids: list of client session ids to exclude (optional)
+
+        :returns mapping of language to the list of client session ids preferring it
+        """
+        skip_sids = set(skip_sids or [])
+        languages = {}
+        with cls.__lock:
+            for sid, lang in cls.__members.get(cid, {}).items():
+                if sid not in skip_sids:
+                    languages.setdefault(lang, []).append(sid)
+        return languages
@@ -0,0 +1,120 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from bisect import insort
+from threading import Lock
+
+from cachetools import TTLCache
+
+
+class ConversationReplay:
+    """
+    Bounded in-memory buffer of the recent events per conversation
+
+    Events broadcast to the conversation are numbered with its sequence number,
+    so clients reconnecting after short disconnection get missed events replayed from memory.
+    Buffer is kept per server instance, replay is refused unless buffer holds every event after the requested one.
+    """
+
+    __DEFAULT_BUFFER_SIZE = 200
+    __DEFAULT_MAX_CONVERSATIONS = 1000
+    __DEFAULT_TTL = 60 * 60
+
+    __buffers: TTLCache = TTLCache(
+        maxsize=__DEFAULT_MAX_CONVERSATIONS, ttl=__DEFAULT_TTL
+    )
+    __lock = Lock()
+    buffer_size: int = __DEFAULT_BUFFER_SIZE
+    max_db_events: int = 500
+
+    @classmethod
+    def init(cls, config: dict = None):
+        """
+        Initialises replay buffer from provided configuration
+
+        :param config: replay configuration, supported keys:
+            - "BUFFER_SIZE": max number of events kept per conversation (defaults to 200)
+            - "MAX_CONVERSATIONS": max number of conversations which events are kept (defaults to 1000)
+            - "TTL": seconds to keep events of the conversation since its last event (defaults to 3600)
+            - "MAX_DB_EVENTS": max number of messages resumed from the database,
+                               clients missing more are requested to reload conversation (defaults to 500)
+        """
+        config = config or {}
+        with cls.__lock:
+            cls.buffer_size = int(config.get("BUFFER_SIZE", cls.__DEFAULT_BUFFER_SIZE))
+            cls.__buffers = TTLCache(
+                maxsize=int(
+                    config.get("MAX_CONVERSATIONS", cls.__DEFAULT_MAX_CONVERSATIONS)
+                ),
+                ttl=int(config.get("TTL", cls.__DEFAULT_TTL)),
+            )
+            cls.max_db_events = int(config.get("MAX_DB_EVENTS", 500))
+
+    @classmethod
+    def record(cls, cid: str, seq: int, event: str, data: dict):
+        """
+        Adds event to the buffer of the conversation
+
+        :param cid: target conversation id
+        :param seq: sequence number of the event
+        :param event: name of the emitted event
+        :param data: emitted event data
+        """
+        if cls.buffer_size <= 0:
+            return
+        with cls.__lock:
+            buffer = cls.__buffers.get(cid) or []
+            # concurrent events might be recorded in different order than they were numbered
+            insort(buffer, (seq, event, data), key=lambda item: item[0])
+            del buffer[: -cls.buffer_size]
+            # re-assigning refreshes expiration of the buffer
+            cls.__buffers[cid] = buffer
+
+    @classmethod
+    def get_since(cls, cid: str, seq: int) -> list[dict] | None:
+        """
+        Gets events of the conversation numbered after provided sequence number
+
+        :param cid: target conversation id
+        :param seq: last sequence number received by the client
+
+        :returns list of events with keys "seq", "event" and "data",
+                 None if buffer does not hold every event after provided sequence number
+        """
+        with cls.__lock:
+            buffer = cls.__buffers.get(cid)
+            if not buffer:
+                return None
+            events = [item for item in buffer if item[0] > seq]
+        for expected_seq, (event_seq, _, _) in enumerate(events, start=seq + 1):
+            if event_seq != expected_seq:
+                return None
+        return [
+            {"seq": event_seq, "event": event, "data": data}
+            for event_seq, event, data in events
+        ]
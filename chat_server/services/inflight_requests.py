@@ -0,0 +1,108 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+from enum import StrEnum
+from threading import Lock
+
+from cachetools import TTLCache
+
+
+class RequestKinds(StrEnum):
+    """Kinds of requests dispatched to the external services"""
+
+    TTS = "tts"
+    STT = "stt"
+    TRANSLATION = "translation"
+
+
+class InFlightRequests:
+    """
+    Registry of requests pending response from the external services
+
+    Ensures that identical requests are dispatched only once (single-flight):
+    duplicated requests are attached to the pending one and get answered along with it.
+    Entries expire after the configured timeout so that lost responses do not block further requests.
+    """
+
+    __DEFAULT_MAX_SIZE = 4096
+    __DEFAULT_TIMEOUT = 120
+
+    __requests: TTLCache = TTLCache(maxsize=__DEFAULT_MAX_SIZE, ttl=__DEFAULT_TIMEOUT)
+    __lock = Lock()
+
+    @classmethod
+    def init(cls, config: dict = None):
+        """
+        Initialises registry from provided configuration
+
+        :param config: registry configuration, supported keys:
+            - "MAX_SIZE": max number of tracked pending requests (defaults to 4096)
+            - "TIMEOUT": number of seconds to wait for the response (defaults to 120)
+        """
+        config = config or {}
+        with cls.__lock:
+            cls.__requests = TTLCache(
+                maxsize=int(config.get("MAX_SIZE", cls.__DEFAULT_MAX_SIZE)),
+                ttl=int(config.get("TIMEOUT", cls.__DEFAULT_TIMEOUT)),
+            )
+
+    @staticmethod
+    def build_key(kind: RequestKinds, message_id: str, lang: str, gender: str = ""):
+        """Builds key identifying the request"""
+        return kind.value, message_id, lang, gender
+
+    @classmethod
+    def attach(cls, key: tuple, waiter: str) -> bool:
+        """
+        Attaches waiter to the request under provided key
+
+        :param key: key of the request built with build_key()
+        :param waiter: identifier of the waiting party (e.g. client session id)
+
+        :returns True if new request was registered and should be dispatched,
+                 False if waiter was attached to the already pending request
+        """
+        with cls.__lock:
+            waiters = cls.__requests.get(key)
+            if waiters is None:
+                cls.__requests[key] = [waiter]
+                return True
+            if waiter not in waiters:
+                waiters.append(waiter)
+            return False
+
+    @classmethod
+    def resolve(cls, key: tuple) -> list[str]:
+        """
+        Resolves pending request under provided key
+
+        :param key: key of the request built with build_key()
+
+        :returns list of waiters attached to the request
+        """
+        with cls.__lock:
+            return cls.__requests.pop(key, None) or []
@@ -0,0 +1,277 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from dataclasses import dataclass
+from enum import StrEnum
+from threading import Lock
+from time import monotonic
+from typing import Optional
+
+from cachetools import TTLCache
+
+
+class RateLimitTiers(StrEnum):
+    """Tiers of the rate limits"""
+
+    HUMAN = "human"
+    BOT = "bot"
+    # trusted services (e.g. observer relaying bots and responses of the backend) are never limited
+    SERVICE = "service"
+
+
+class RateLimitScopes(StrEnum):
+    """Scopes the rate limits are applied per"""
+
+    SESSION = "session"
+    USER = "user"
+
+
+@dataclass
+class Throttle:
+    """Rejection of the event exceeding the rate limit"""
+
+    retry_after: float
+    scope: RateLimitScopes
+    tier: RateLimitTiers
+    # client is notified once per throttling period
+    notify: bool
+
+
+class TokenBucket:
+    """Token bucket refilled at constant rate up to the burst size"""
+
+    __slots__ = ("rate", "burst", "tokens", "updated", "throttled")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = monotonic()
+        self.throttled = False
+
+    def refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def retry_after(self, tokens: float = 1) -> float:
+        """Gets number of seconds until requested tokens are available, 0 if they are available now"""
+        if self.tokens >= tokens:
+            return 0
+        if self.rate <= 0:
+            return float("inf")
+        return (tokens - self.tokens) / self.rate
+
+
+class SIORateLimiter:
+    """
+    Token-bucket rate limits of the Socket IO events
+
+    Each event is counted against the bucket of the client session and the bucket of the user authorized by it,
+    so opening more connections does not increase the allowed rate.
+    Limits are configured per event for humans and bots separately.
+    Tier and user are resolved from the authorized user of the session, never from the event data:
+    bot users are limited as bots, users having any of the service roles are not limited.
+    """
+
+    # limits are tuples of (rate in events per second, burst)
+    __DEFAULT_LIMITS = {
+        RateLimitTiers.HUMAN: {
+            RateLimitScopes.SESSION: {
+                "*": (20, 40),
+                "user_message": (2, 10),
+                "request_tts": (2, 10),
+                "request_stt": (2, 10),
+                "request_translate": (10, 40),
+            },
+            RateLimitScopes.USER: {
+                "*": (40, 80),
+                "user_message": (3, 15),
+                "request_tts": (3, 15),
+                "request_stt": (3, 15),
+                "request_translate": (20, 80),
+            },
+        },
+        RateLimitTiers.BOT: {
+            RateLimitScopes.SESSION: {
+                "*": (200, 400),
+            },
+            RateLimitScopes.USER: {
+                "*": (20, 40),
+                "user_message": (5, 20),
+            },
+        },
+    }
+    __DEFAULT_SERVICE_ROLES = ("admin", "super_admin")
+    __DEFAULT_MAX_BUCKETS = 100_000
+    __DEFAULT_MAX_OUTBOUND_QUEUE_SIZE = 1000
+
+    __limits: dict = __DEFAULT_LIMITS
+    __buckets: TTLCache = TTLCache(maxsize=__DEFAULT_MAX_BUCKETS, ttl=600)
+    __sessions: dict[str, tuple[str, RateLimitTiers]] = {}
+    __service_roles: frozenset[str] = frozenset(__DEFAULT_SERVICE_ROLES)
+    __lock = Lock()
+    enabled: bool = False
+    max_outbound_queue_size: int = 0
+
+    @classmethod
+    def init(cls, config: dict = None):
+        """
+        Initialises rate limits from provided configuration
+
+        :param config: rate limits configuration, supported keys:
+            - "ENABLED": to limit rate of the events (defaults to False)
+            - "HUMAN", "BOT": limits of the tier overriding the defaults, mapping of
+                "SESSION" and "USER" scopes to the mapping of event name ("*" for any event)
+                to {"RATE": events per second, "BURST": max number of events at once}
+            - "SERVICE_ROLES": roles of the trusted service users which are not limited (defaults to ["admin", "super_admin"])
+            - "MAX_BUCKETS": max number of tracked buckets (defaults to 100000)
+            - "MAX_OUTBOUND_QUEUE_SIZE": max number of packets queued for the client session,
+                slower clients are disconnected, 0 to disable (defaults to 1000)
+        """
+        config = config or {}
+        limits = {}
+        for tier, tier_limits in cls.__DEFAULT_LIMITS.items():
+            tier_config = config.get(tier.upper()) or {}
+            limits[tier] = {}
+            for scope, scope_limits in tier_limits.items():
+                configured_limits = {
+                    event: (float(limit["RATE"]), float(limit["BURST"]))
+                    for event, limit in (tier_config.get(scope.upper()) or {}).items()
+                }
+                limits[tier][scope] = {**scope_limits, **configured_limits}
+        with cls.__lock:
+            cls.enabled = bool(config.get("ENABLED", False))
+            cls.__limits = limits
+            # idle buckets are refilled by then, so dropping them does not change the limits
+            max_refill_time = max(
+                (
+                    burst / rate
+                    for tier_limits in limits.values()
+                    for scope_limits in tier_limits.values()
+                    for rate, burst in scope_limits.values()
+                    if rate > 0
+                ),
+                default=600,
+            )
+            cls.__buckets = TTLCache(
+                maxsize=int(config.get("MAX_BUCKETS", cls.__DEFAULT_MAX_BUCKETS)),
+                ttl=max_refill_time,
+            )
+            cls.__sessions = {}
+            cls.__service_roles = frozenset(
+                config.get("SERVICE_ROLES", cls.__DEFAULT_SERVICE_ROLES)
+            )
+            cls.max_outbound_queue_size = int(
+                config.get(
+                    "MAX_OUTBOUND_QUEUE_SIZE", cls.__DEFAULT_MAX_OUTBOUND_QUEUE_SIZE
+                )
+            )
+
+    @classmethod
+    def register_session(cls, sid: str, user: dict = None):
+        """
+        Binds client session to the authorized user
+
+        :param sid: client session id
+        :param user: data of the user authorized by the session (optional)
+        """
+        if user and user.get("_id"):
+            with cls.__lock:
+                cls.__sessions[sid] = (user["_id"], cls._get_user_tier(user=user))
+
+    @classmethod
+    def remove_session(cls, sid: str):
+        """Forgets client session"""
+        with cls.__lock:
+            cls.__sessions.pop(sid, None)
+
+    @classmethod
+    def _get_user_tier(cls, user: dict) -> RateLimitTiers:
+        if cls.__service_roles.intersection(user.get("roles") or []):
+            return RateLimitTiers.SERVICE
+        if user.get("is_bot") == "1":
+            return RateLimitTiers.BOT
+        return RateLimitTiers.HUMAN
+
+    @classmethod
+    def get_session_tier(cls, sid: str) -> RateLimitTiers:
+        """Gets tier of the client session, sessions without authorized user are limited as humans"""
+        with cls.__lock:
+            return cls.__sessions.get(sid, (None, RateLimitTiers.HUMAN))[1]
+
+    @classmethod
+    def _get_bucket(
+        cls, tier: RateLimitTiers, scope: RateLimitScopes, key: str, event: str
+    ) -> Optional[TokenBucket]:
+        scope_limits = cls.__limits[tier][scope]
+        limit = scope_limits.get(event) or scope_limits.get("*")
+        if not limit:
+            return None
+        # events without own limit share the bucket of the scope
+        bucket_key = (tier, scope, key, event if event in scope_limits else "*")
+        bucket = cls.__buckets.get(bucket_key)
+        if bucket is None:
+            bucket = cls.__buckets[bucket_key] = TokenBucket(*limit)
+        return bucket
+
+    @classmethod
+    def acquire(cls, sid: str, event: str) -> Optional[Throttle]:
+        """
+        Accounts the event against the rate limits
+
+        :param sid: client session id
+        :param event: name of the event
+
+        :returns Throttle if the event exceeds any of the limits, None if it is allowed
+        """
+        with cls.__lock:
+            user_id, tier = cls.__sessions.get(sid, (None, RateLimitTiers.HUMAN))
+            if tier == RateLimitTiers.SERVICE:
+                return None
+            buckets = [
+                (scope, bucket)
+                for scope, key in (
+                    (RateLimitScopes.SESSION, sid),
+                    (RateLimitScopes.USER, user_id),
+                )
+                if key
+                and (bucket := cls._get_bucket(tier, scope, key, event)) is not None
+            ]
+            now = monotonic()
+            for scope, bucket in buckets:
+                bucket.refill(now)
+                if retry_after := bucket.retry_after():
+                    notify = not bucket.throttled
+                    bucket.throttled = True
+                    return Throttle(
+                        retry_after=retry_after, scope=scope, tier=tier, notify=notify
+                    )
+            for _, bucket in buckets:
+                bucket.tokens -= 1
+                bucket.throttled = False
+        return None
@@ -0,0 +1,221 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import random
+from collections import deque
+from contextlib import contextmanager
+from threading import Lock
+from time import time
+
+from pyinstrument import Profiler
+from pyinstrument.renderers import HTMLRenderer, SpeedscopeRenderer
+
+from utils.common import generate_uuid
+from utils.logging_utils import LOG
+
+
+class ProfileFormat:
+    """Supported formats of the stored profile"""
+
+    SPEEDSCOPE = "speedscope"
+    HTML = "html"
+
+
+class RequestProfiler:
+    """
+    Opt-in sampling profiler of the HTTP requests and Socket IO events
+
+    Profiling is triggered explicitly by admins or by sampling configured fraction of the route/event traffic,
+    collected profiles are kept in memory and can be downloaded as speedscope JSON or HTML flamegraph.
+    """
+
+    __DEFAULT_INTERVAL = 0.001
+    __DEFAULT_MAX_PROFILES = 50
+
+    enabled: bool = True
+    interval: float = __DEFAULT_INTERVAL
+
+    __route_sample_rates: dict[str, float] = {}  # route prefix -> fraction of requests
+    __event_sample_rates: dict[str, float] = {}  # sio event -> fraction of events
+    __profiles: deque = deque(maxlen=__DEFAULT_MAX_PROFILES)
+    __lock = Lock()
+
+    @classmethod
+    def init(cls, config: dict = None):
+        """
+        Initialises profiler from provided configuration
+
+        :param config: profiler configuration, supported keys:
+            - "ENABLED": to allow profiling (defaults to True)
+            - "INTERVAL": sampling interval in seconds (defaults to 0.001)
+            - "MAX_PROFILES": max number of the kept profiles (defaults to 50)
+            - "ROUTE_SAMPLE_RATES": mapping of route prefix to fraction of requests to profile
+            - "EVENT_SAMPLE_RATES": mapping of Socket IO event to fraction of events to profile
+        """
+        config = config or {}
+        with cls.__lock:
+            cls.enabled = bool(config.get("ENABLED", True))
+            cls.interval = float(config.get("INTERVAL", cls.__DEFAULT_INTERVAL))
+            cls.__profiles = deque(
+                cls.__profiles,
+                maxlen=int(config.get("MAX_PROFILES", cls.__DEFAULT_MAX_PROFILES)),
+            )
+            cls.__route_sample_rates = {
+                route: float(rate)
+                for route, rate in config.get("ROUTE_SAMPLE_RATES", {}).items()
+            }
+            cls.__event_sample_rates = {
+                event: float(rate)
+                for event, rate in config.get("EVENT_SAMPLE_RATES", {}).items()
+            }
+
+    @classmethod
+    def set_route_sample_rate(cls, route: str, sample_rate: float):
+        """
+        Sets fraction of requests to profile for routes starting with provided prefix
+
+        :param route: route prefix (e.g. "/chat_api/search")
+        :param sample_rate: fraction of requests to profile, 0 disables sampling of the route
+        """
+        with cls.__lock:
+            if sample_rate > 0:
+                cls.__route_sample_rates[route] = min(sample_rate, 1.0)
+            else:
+                cls.__route_sample_rates.pop(route, None)
+
+    @classmethod
+    def set_event_sample_rate(cls, event: str, sample_rate: float):
+        """
+        Sets fraction of Socket IO events to profile
+
+        :param event: name of the event
+        :param sample_rate: fraction of events to profile, 0 disables sampling of the event
+        """
+        with cls.__lock:
+            if sample_rate > 0:
+                cls.__event_sample_rates[event] = min(sample_rate, 1.0)
+            else:
+                cls.__event_sample_rates.pop(event, None)
+
+    @classmethod
+    def get_sample_rates(cls) -> dict:
+        with cls.__lock:
+            return {
+                "routes": dict(cls.__route_sample_rates),
+                "events": dict(cls.__event_sample_rates),
+            }
+
+    @classmethod
+    def should_sample_route(cls, path: str) -> bool:
+        """Samples request to the path based on the longest matching route prefix"""
+        if not cls.enabled or not cls.__route_sample_rates:
+            return False
+        matching_routes = [
+            route for route in cls.__route_sample_rates if path.startswith(route)
+        ]
+        if not matching_routes:
+            return False
+        sample_rate = cls.__route_sample_rates.get(max(matching_routes, key=len), 0)
+        return random.random() < sample_rate
+
+    @classmethod
+    def should_sample_event(cls, event: str) -> bool:
+        """Samples Socket IO event based on its configured rate"""
+        if not cls.enabled or event not in cls.__event_sample_rates:
+            return False
+        return random.random() < cls.__event_sample_rates.get(event, 0)
+
+    @classmethod
+    @contextmanager
+    def profile(cls, kind: str, target: str, trigger: str, user_id: str = None):
+        """
+        Profiles the wrapped block and stores resulting profile
+
+        :param kind: kind of the profiled operation ("http" or "sio")
+        :param target: profiled route or event
+        :param trigger: reason of profiling ("admin" or "sampled")
+        :param user_id: id of the admin requested profiling (optional)
+
+        :returns profile metadata, populated with duration and samples once the block is completed
+        """
+        metadata = {
+            "profile_id": generate_uuid(),
+            "kind": kind,
+            "target": target,
+            "trigger": trigger,
+            "user_id": user_id,
+            "created_on": int(time()),
+        }
+        profiler = Profiler(interval=cls.interval, async_mode="enabled")
+        profiler.start()
+        try:
+            yield metadata
+        finally:
+            session = profiler.stop()
+            metadata["duration_ms"] = round(session.duration * 1000, 2)
+            metadata["sample_count"] = session.sample_count
+            with cls.__lock:
+                cls.__profiles.append({**metadata, "session": session})
+            LOG.info(
+                f"Stored profile of {kind} {target = } in {metadata['duration_ms']}ms "
+                f"({metadata['profile_id']})"
+            )
+
+    @classmethod
+    def list_profiles(cls, limit: int = None) -> list[dict]:
+        """Lists metadata of the stored profiles starting from the most recent"""
+        with cls.__lock:
+            profiles = list(cls.__profiles)
+        profiles.reverse()
+        return [
+            {k: v for k, v in profile.items() if k != "session"}
+            for profile in profiles[:limit]
+        ]
+
+    @classmethod
+    def render_profile(
+        cls, profile_id: str, profile_format: str = ProfileFormat.SPEEDSCOPE
+    ) -> str | None:
+        """
+        Renders stored profile
+
+        :param profile_id: id of the stored profile
+        :param profile_format: format of rendering from ProfileFormat
+
+        :returns rendered profile or None if profile is not found
+        """
+        with cls.__lock:
+            profile = next(
+                (p for p in cls.__profiles if p["profile_id"] == profile_id), None
+            )
+        if not profile:
+            return None
+        if profile_format == ProfileFormat.HTML:
+            renderer = HTMLRenderer()
+        else:
+            renderer = SpeedscopeRenderer()
+        return renderer.render(profile["session"])
@@ -0,0 +1,167 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+from threading import Lock
+
+from cachetools import TTLCache
+
+from utils.common import generate_uuid
+
+
+class TranslationBatcher:
+    """
+    Aggregates translation requests into batches grouped by (source language, target language)
+
+    Requests are accumulated during the configured window or until the batch reaches its max size,
+    responses to the batch are demultiplexed back to the original requests.
+    """
+
+    __DEFAULT_WINDOW = 0.05
+    __DEFAULT_MAX_SIZE = 100
+    __DEFAULT_RESPONSE_TIMEOUT = 300
+
+    window: float = __DEFAULT_WINDOW
+    max_size: int = __DEFAULT_MAX_SIZE
+    flush_scheduled: bool = False
+
+    __pending: dict[str, dict] = {}  # group key -> translation request payload
+    __pending_routes: dict[
+        str, dict[str, tuple]
+    ] = {}  # group key -> shout id -> (request id, cid)
+    __pending_request_ids: set[str] = set()
+    __pending_size: int = 0
+    __batches: TTLCache = TTLCache(maxsize=1024, ttl=__DEFAULT_RESPONSE_TIMEOUT)
+    __lock = Lock()
+
+    @classmethod
+    def init(cls, config: dict = None):
+        """
+        Initialises batcher from provided configuration
+
+        :param config: batcher configuration, supported keys:
+            - "WINDOW": number of seconds to accumulate requests (defaults to 0.05, 0 disables batching)
+            - "MAX_SIZE": max number of shouts in batch (defaults to 100)
+            - "RESPONSE_TIMEOUT": number of seconds to keep batch routing awaiting response (defaults to 300)
+        """
+        config = config or {}
+        with cls.__lock:
+            cls.window = float(config.get("WINDOW", cls.__DEFAULT_WINDOW))
+            cls.max_size = int(config.get("MAX_SIZE", cls.__DEFAULT_MAX_SIZE))
+            cls.__batches = TTLCache(
+                maxsize=1024,
+                ttl=int(config.get("RESPONSE_TIMEOUT", cls.__DEFAULT_RESPONSE_TIMEOUT)),
+            )
+
+    @staticmethod
+    def build_group_key(source_lang: str, target_lang: str) -> str:
+        """Builds key of the translation group in batch"""
+        return f"{source_lang}-{target_lang}"
+
+    @classmethod
+    def add(cls, request_id: str, missing_translations: dict) -> bool:
+        """
+        Adds translation request to the pending batch
+
+        :param request_id: id of the translation request
+        :param missing_translations: mapping of cid to the translations missing in db
+
+        :returns True if pending batch reached its max size and should be flushed
+        """
+        with cls.__lock:
+            cls.__pending_request_ids.add(request_id)
+            for cid, cid_data in missing_translations.items():
+                if not cid_data.get("shouts"):
+                    continue
+                lang = cid_data.get("lang", "en")
+                source_lang = cid_data.get("source_lang", "en")
+                group_key = cls.build_group_key(
+                    source_lang=source_lang, target_lang=lang
+                )
+                group = cls.__pending.setdefault(
+                    group_key, {"shouts": {}, "lang": lang, "source_lang": source_lang}
+                )
+                routes = cls.__pending_routes.setdefault(group_key, {})
+                for shout_id, text in cid_data.get("shouts", {}).items():
+                    group["shouts"][shout_id] = text
+                    routes[shout_id] = (request_id, cid)
+                    cls.__pending_size += 1
+            return cls.__pending_size >= cls.max_size
+
+    @classmethod
+    def flush(cls) -> tuple[str, dict] | None:
+        """
+        Flushes pending batch
+
+        :returns tuple of batch id and batch payload, None if there is no pending requests
+        """
+        with cls.__lock:
+            cls.flush_scheduled = False
+            if not cls.__pending_request_ids:
+                return None
+            batch_id = generate_uuid()
+            payload = cls.__pending
+            cls.__batches[batch_id] = {
+                "routes": cls.__pending_routes,
+                "request_ids": cls.__pending_request_ids,
+                "langs": {
+                    group_key: group["lang"] for group_key, group in payload.items()
+                },
+            }
+            cls.__pending = {}
+            cls.__pending_routes = {}
+            cls.__pending_request_ids = set()
+            cls.__pending_size = 0
+            return batch_id, payload
+
+    @classmethod
+    def demultiplex(cls, batch_id: str, translations: dict) -> dict[str, dict] | None:
+        """
+        Splits batch translations between the original requests
+
+        :param batch_id: id of the batch
+        :param translations: received translations mapping of group key to the translated shouts
+
+        :returns mapping of request id to its translations mapping, None if batch is unknown
+        """
+        with cls.__lock:
+            batch = cls.__batches.pop(batch_id, None)
+        if batch is None:
+            return None
+        request_translations = {request_id: {} for request_id in batch["request_ids"]}
+        for group_key, group_data in translations.items():
+            routes = batch["routes"].get(group_key, {})
+            lang = batch["langs"].get(group_key, group_data.get("lang", "en"))
+            for shout_id, translation in group_data.get("shouts", {}).items():
+                route = routes.get(shout_id)
+                if not route:
+                    continue
+                request_id, cid = route
+                cid_translations = request_translations[request_id].setdefault(
+                    cid, {"shouts": {}, "lang": lang}
+                )
+                cid_translations["shouts"][shout_id] = translation
+        return request_translations
@@ -0,0 +1,221 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+from io import BytesIO
+from threading import RLock
+from typing import BinaryIO
+from urllib.parse import urlencode
+
+from cachetools import TTLCache
+
+from chat_server.server_utils.enums import AvatarVariant
+from chat_server.server_utils.storage.base import StorageBackend
+from utils.database_utils.mongo_utils.queries.wrapper import MongoDocumentsAPI
+from utils.logging_utils import LOG
+
+try:
+    from PIL import Image, ImageOps, UnidentifiedImageError
+except ModuleNotFoundError:
+    LOG.info("Pillow dependency was not installed")
+    Image = None
+
+
+class UserAvatars:
+    """
+    Resolves avatars of the users and maintains their resized variants
+
+    Mapping of user id to the avatar is cached in memory, so serving avatars does not query the database.
+    Stored avatar names are unique, so the avatar name identifies its content and versions avatar URLs.
+    """
+
+    AVATARS_PREFIX = "avatars"
+    VARIANTS_FORMAT = "webp"
+
+    __DEFAULT_SIZES = {AvatarVariant.THUMBNAIL: 64, AvatarVariant.SMALL: 256}
+
+    __sizes: dict[AvatarVariant, int] = dict(__DEFAULT_SIZES)
+    __cache: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+    __lock = RLock()
+    max_age: int = 300
+
+    @classmethod
+    def init(cls, config: dict = None):
+        """
+        Initialises avatars handling from provided configuration
+
+        :param config: avatars configuration, supported keys:
+            - "THUMBNAIL_SIZE": max side of the thumbnail variant in pixels (defaults to 64)
+            - "SMALL_SIZE": max side of the small variant in pixels (defaults to 256)
+            - "CACHE_SIZE": max number of users which avatars are kept in memory (defaults to 10000)
+            - "CACHE_TTL": seconds to keep avatar of the user in memory (defaults to 300)
+            - "MAX_AGE": seconds for clients to cache avatar requested without version (defaults to 300)
+        """
+        config = config or {}
+        with cls.__lock:
+            cls.__sizes = {
+                AvatarVariant.THUMBNAIL: int(
+                    config.get(
+                        "THUMBNAIL_SIZE", cls.__DEFAULT_SIZES[AvatarVariant.THUMBNAIL]
+                    )
+                ),
+                AvatarVariant.SMALL: int(
+                    config.get("SMALL_SIZE", cls.__DEFAULT_SIZES[AvatarVariant.SMALL])
+                ),
+            }
+            cls.__cache = TTLCache(
+                maxsize=int(config.get("CACHE_SIZE", 10_000)),
+                ttl=int(config.get("CACHE_TTL", 300)),
+            )
+            cls.max_age = int(config.get("MAX_AGE", 300))
+
+    @classmethod
+    def get_variant_filename(cls, avatar: str, variant: AvatarVariant) -> str:
+        """Gets name of the file storing provided variant of the avatar"""
+        if variant == AvatarVariant.ORIGINAL:
+            return avatar
+        return f"{os.path.splitext(avatar)[0]}_{variant}.{cls.VARIANTS_FORMAT}"
+
+    @classmethod
+    def create_variants(cls, file_object: BinaryIO) -> dict[AvatarVariant, bytes]:
+        """
+        Creates resized variants of the avatar image, aspect ratio of the image is preserved
+
+        :param file_object: file object of the original image
+        :returns mapping of variant to its encoded content, empty if image can not be processed
+        """
+        if Image is None:
+            return {}
+        try:
+            with Image.open(file_object) as image:
+                # applies orientation from EXIF, animated images are represented by their first frame
+                image = ImageOps.exif_transpose(image)
+                if image.mode not in ("RGB", "RGBA"):
+                    image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+                variants = {}
+                for variant, size in cls.__sizes.items():
+                    resized_image = image.copy()
+                    resized_image.thumbnail((size, size), Image.Resampling.LANCZOS)
+                    buffer = BytesIO()
+                    resized_image.save(buffer, format=cls.VARIANTS_FORMAT, quality=85)
+                    variants[variant] = buffer.getvalue()
+                return variants
+        except (
+            UnidentifiedImageError,
+            OSError,
+            ValueError,
+            Image.DecompressionBombError,
+        ) as ex:
+            LOG.warning(f"Failed to create avatar variants: {ex}")
+            return {}
+
+    @classmethod
+    def store_variants(
+        cls, file_object: BinaryIO, avatar: str, storage: StorageBackend
+    ) -> list[str]:
+        """
+        Creates resized variants of the avatar and stores them next to the original
+
+        :param file_object: file object of the original image
+        :param avatar: name of the stored original avatar
+        :param storage: storage to save variants to
+
+        :returns list of stored variants
+        """
+        variants = cls.create_variants(file_object=file_object)
+        for variant, content in variants.items():
+            filename = cls.get_variant_filename(avatar=avatar, variant=variant)
+            storage.put(
+                location=f"{cls.AVATARS_PREFIX}/{filename}",
+                file_object=BytesIO(content),
+            )
+        return [str(variant) for variant in variants]
+
+    @classmethod
+    def get_avatars(cls, user_ids: list[str]) -> dict[str, dict | None]:
+        """
+        Gets avatars of the users, users missing in memory are fetched within a single query
+
+        :param user_ids: list of user ids
+        :returns mapping of user id to the avatar data ("avatar" and "avatar_variants"), None if user has no avatar
+        """
+        avatars = {}
+        missing_user_ids = []
+        with cls.__lock:
+            for user_id in set(user_ids):
+                if user_id in cls.__cache:
+                    avatars[user_id] = cls.__cache[user_id]
+                else:
+                    missing_user_ids.append(user_id)
+        if missing_user_ids:
+            users = MongoDocumentsAPI.USERS.list_contains(
+                source_set=missing_user_ids,
+                aggregate_result=False,
+                result_as_cursor=False,
+                project_fields=["_id", "avatar", "avatar_variants"],
+            )
+            fetched_avatars = dict.fromkeys(missing_user_ids)
+            for user in users:
+                if user.get("avatar"):
+                    fetched_avatars[user["_id"]] = {
+                        "avatar": user["avatar"],
+                        "avatar_variants": user.get("avatar_variants") or [],
+                    }
+            with cls.__lock:
+                # users without avatar are cached as well, so repeated requests do not reach the database
+                cls.__cache.update(fetched_avatars)
+            avatars.update(fetched_avatars)
+        return avatars
+
+    @classmethod
+    def get_avatar(cls, user_id: str) -> dict | None:
+        return cls.get_avatars(user_ids=[user_id])[user_id]
+
+    @classmethod
+    def set_avatar(cls, user_id: str, avatar: str, avatar_variants: list[str]):
+        """Updates cached avatar of the user"""
+        with cls.__lock:
+            cls.__cache[user_id] = {
+                "avatar": avatar,
+                "avatar_variants": avatar_variants,
+            }
+
+    @classmethod
+    def get_avatar_filename(cls, avatar_data: dict, variant: AvatarVariant) -> str:
+        """Gets name of the file storing requested variant, falls back to the original if variant was not created"""
+        if variant not in avatar_data["avatar_variants"]:
+            variant = AvatarVariant.ORIGINAL
+        return cls.get_variant_filename(avatar=avatar_data["avatar"], variant=variant)
+
+    @staticmethod
+    def build_url(
+        user_id: str, avatar_data: dict, variant: AvatarVariant = AvatarVariant.ORIGINAL
+    ) -> str:
+        """Builds versioned URL path of the avatar, content under this URL never changes"""
+        query = urlencode({"variant": variant, "version": avatar_data["avatar"]})
+        return f"/files/avatar/{user_id}?{query}"
@@ -30,9 +30,11 @@
 from .server import sio
 from .handlers import (
     session,
+    conversation,
     stt,
     tts,
     translation,
     user_message,
     prompt,
+    profiling,
 )
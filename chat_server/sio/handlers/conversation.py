@@ -0,0 +1,126 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+from utils.database_utils.mongo_utils.queries.wrapper import MongoDocumentsAPI
+from utils.logging_utils import LOG
+from ..server import sio
+from ..utils import get_session_user, typed_event
+from ...server_utils.conversation_utils import build_conversation_delta
+from ...server_utils.http_exceptions import KlatAPIException
+from ...server_utils.sio_schemas import ConversationDeltaRequestEvent
+from ...services.conversation_members import ConversationMembers
+
+
+@sio.event
+async def join_conversation(sid, data):
+    """
+    SIO event fired when client displays conversation
+
+    :param sid: client session id
+    :param data: subscription data
+    Example:
+    ```
+        data = {'cid': 'conversation id',
+                'lang': 'preferred language of incoming messages (optional)',
+                'user': 'id of the subscribed user (optional)'}
+    ```
+    """
+    cid = data.get("cid")
+    if not cid:
+        LOG.warning(f"Missing cid in conversation subscription of {sid = }")
+        return
+    lang = data.get("lang") or _get_preferred_language(
+        user_id=data.get("user"), cid=cid
+    )
+    await sio.enter_room(sid, cid)
+    ConversationMembers.join(sid=sid, cid=cid, lang=lang)
+    LOG.debug(f"{sid} joined {cid = } with {lang = }")
+
+
+@sio.event
+async def leave_conversation(sid, data):
+    """
+    SIO event fired when client closes conversation
+
+    :param sid: client session id
+    :param data: subscription data
+    Example:
+    ```
+        data = {'cid': 'conversation id'}
+    ```
+    """
+    cid = data.get("cid")
+    if cid:
+        await sio.leave_room(sid, cid)
+        ConversationMembers.leave(sid=sid, cid=cid)
+        LOG.debug(f"{sid} left {cid = }")
+
+
+@sio.event
+@typed_event(ConversationDeltaRequestEvent)
+async def get_conversation_delta(sid, data: ConversationDeltaRequestEvent):
+    """
+    SIO event fired when reconnected client resumes events of the conversation missed while disconnected
+
+    :param sid: client session id
+    :param data: delta request data
+    Example:
+    ```
+        data = {'cid': 'conversation id',
+                'seq': 'last sequence number received by the client'}
+    ```
+    """
+    try:
+        user_id = (get_session_user(sid) or {}).get("_id")
+    except KlatAPIException:
+        user_id = None
+    conversation_data = MongoDocumentsAPI.CHATS.get_chat(
+        search_str=data.cid,
+        column_identifiers=["_id"],
+        requested_user_id=user_id,
+    )
+    # privacy filters are not applied without requesting user
+    if not conversation_data or (
+        user_id is None and conversation_data.get("is_private")
+    ):
+        LOG.warning(f"{sid} requested delta of inaccessible cid = {data.cid!r}")
+        return
+    delta = build_conversation_delta(cid=data.cid, seq=data.seq)
+    await sio.emit("conversation_delta", data=delta, to=sid)
+
+
+def _get_preferred_language(user_id: str | None, cid: str) -> str:
+    """Gets incoming messages language preferred by the user in the conversation"""
+    if user_id:
+        user = MongoDocumentsAPI.USERS.get_user(user_id=user_id) or {}
+        return (
+            user.get("preferences", {})
+            .get("chat_language_mapping", {})
+            .get(cid, {})
+            .get("incoming", "en")
+        )
+    return "en"
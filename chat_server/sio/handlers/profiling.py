@@ -0,0 +1,82 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+from utils.logging_utils import LOG
+from ..server import sio
+from ..utils import emit_error, login_required
+from ...server_utils.enums import UserRoles
+from ...services.request_profiler import RequestProfiler
+
+
+@sio.event
+@login_required(min_required_role=UserRoles.ADMIN)
+async def profile_event(sid, data):
+    """
+    Runs Socket IO event handler under profiler, id of the stored profile is returned in acknowledgement
+
+    :param sid: client session id
+    :param data: profiling request data
+    Example:
+    ```
+        data = {'event': 'name of the profiled event',
+                'data': 'payload of the profiled event'}
+    ```
+    """
+    event = data.get("event")
+    handler = sio.handlers.get("/", {}).get(event)
+    if not handler or event == "profile_event":
+        return await emit_error(
+            sids=[sid], message=f"Unable to profile unknown event: {event!r}"
+        )
+    with RequestProfiler.profile(
+        kind="sio", target=event, trigger="admin"
+    ) as profile_metadata:
+        await handler(sid, data.get("data", {}))
+    return {"profile_id": profile_metadata["profile_id"]}
+
+
+@sio.event
+@login_required(min_required_role=UserRoles.ADMIN)
+async def set_event_profiling(sid, data):
+    """
+    Sets fraction of the Socket IO event traffic to profile
+
+    :param sid: client session id
+    :param data: profiling configuration
+    Example:
+    ```
+        data = {'event': 'name of the profiled event',
+                'sample_rate': 'fraction of events to profile, 0 disables profiling'}
+    ```
+    """
+    event = data.get("event")
+    if not event:
+        return await emit_error(sids=[sid], message="Missing event to profile")
+    sample_rate = float(data.get("sample_rate", 0))
+    RequestProfiler.set_event_sample_rate(event=event, sample_rate=sample_rate)
+    LOG.info(f"Set profiling of {event = } with {sample_rate = }")
+    return RequestProfiler.get_sample_rates()
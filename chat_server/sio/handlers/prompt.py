@@ -26,16 +26,17 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-from time import time
-
 from utils.database_utils.mongo_utils.queries import mongo_queries
 from utils.database_utils.mongo_utils.queries.wrapper import MongoDocumentsAPI
 from utils.logging_utils import LOG
 from ..server import sio
+from ..utils import emit_conversation_event, typed_event
+from ...server_utils.sio_schemas import NewPromptEvent, PromptCompletedEvent
 
 
 @sio.event
-async def new_prompt(sid, data):
+@typed_event(NewPromptEvent)
+async def new_prompt(sid, data: NewPromptEvent):
     """
     SIO event fired on new prompt data saving request
     :param sid: client session id
@@ -49,42 +50,47 @@ async def new_prompt(sid, data):
                 }
     ```
     """
-    prompt_id = data["prompt_id"]
-    cid = data["cid"]
-    prompt_text = data["prompt_text"]
-    created_on = int(data.get("created_on") or time())
+    prompt_id = data.prompt_id
     try:
         formatted_data = {
             "_id": prompt_id,
-            "cid": cid,
+            "cid": data.cid,
             "is_completed": "0",
-            "data": {"prompt_text": prompt_text},
-            "created_on": created_on,
+            "data": {"prompt_text": data.prompt_text},
+            "created_on": data.created_on,
         }
         MongoDocumentsAPI.PROMPTS.add_item(data=formatted_data)
-        await sio.emit("new_prompt_created", data=formatted_data)
+        await emit_conversation_event(
+            "new_prompt_created", cid=data.cid, data=formatted_data
+        )
     except Exception as ex:
         LOG.error(f'Prompt "{prompt_id}" was not created due to exception - {ex}')
 
 
 @sio.event
-async def prompt_completed(sid, data):
+@typed_event(PromptCompletedEvent)
+async def prompt_completed(sid, data: PromptCompletedEvent):
     """
     SIO event fired upon prompt completion
     :param sid: client session id
     :param data: user message data
     """
-    prompt_id = data["context"]["prompt"]["prompt_id"]
+    prompt_id = data.context.prompt.prompt_id
 
     LOG.info(f"setting {prompt_id = } as completed")
     MongoDocumentsAPI.PROMPTS.set_completed(
-        prompt_id=prompt_id, prompt_context=data["context"]
+        prompt_id=prompt_id, prompt_context=data.context.model_dump(exclude_unset=True)
     )
     formatted_data = {
-        "winner": data["context"].get("winner", ""),
+        "winner": data.context.winner,
         "prompt_id": prompt_id,
     }
-    await sio.emit("set_prompt_completed", data=formatted_data)
+    if data.cid:
+        await emit_conversation_event(
+            "set_prompt_completed", cid=data.cid, data=formatted_data
+        )
+    else:
+        await sio.emit("set_prompt_completed", data=formatted_data)
 
 
 @sio.event
@@ -26,8 +26,14 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import jwt
+
 from utils.logging_utils import LOG
 from ..server import sio
+from ..utils import enable_binary_audio, get_session_user
+from ...server_utils.http_exceptions import KlatAPIException
+from ...services.conversation_members import ConversationMembers
+from ...services.rate_limiter import SIORateLimiter
 
 
 @sio.event
@@ -36,9 +42,21 @@ async def connect(sid, environ: dict, auth):
     SIO event fired on client connect
     :param sid: client session id
     :param environ: connection environment dict
-    :param auth: authorization method (None if was not provided)
+    :param auth: authorization method (None if was not provided),
+                 clients supporting binary frames declare it with {"binaryAudio": true}
     """
     LOG.info(f"{sid} connected")
+    if isinstance(auth, dict) and auth.get("binaryAudio"):
+        await enable_binary_audio(sid)
+    if SIORateLimiter.enabled:
+        # user is resolved once per connection, so connections of the same user share the rate limits
+        # and the tier of the limits can not be changed by the event data
+        try:
+            user = get_session_user(sid)
+        except (KlatAPIException, jwt.PyJWTError) as ex:
+            LOG.debug(f"Rate limits of {sid} are not bound to user - {ex}")
+            user = None
+        SIORateLimiter.register_session(sid=sid, user=user)
 
 
 @sio.event
@@ -59,4 +77,6 @@ async def disconnect(sid):
 
     :param sid: client session id
     """
+    ConversationMembers.remove_session(sid=sid)
+    SIORateLimiter.remove_session(sid=sid)
     LOG.info(f"{sid} disconnected")
@@ -26,11 +26,17 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+from utils.common import audio_data_to_buffer
 from utils.database_utils.mongo_utils.queries.wrapper import MongoDocumentsAPI
 from utils.logging_utils import LOG
 from ..server import sio
-from ..utils import emit_error
+from ..utils import emit_audio, emit_error, typed_event
+from ...server_config import server_config
+from ...server_utils.enums import ClaimActions
 from ...server_utils.languages import LanguageSettings
+from ...server_utils.sio_schemas import STTRequestEvent
+from ...services.audio_claims import AudioClaims
+from ...services.inflight_requests import InFlightRequests, RequestKinds
 
 
 @sio.event
@@ -38,6 +44,19 @@ async def stt_response(sid, data):
     """Handle STT Response from Observer"""
     mq_context = data.get("context", {})
     message_id = mq_context.get("message_id")
+    lang = LanguageSettings.to_system_lang(data.get("lang", "en-us"))
+    sids = InFlightRequests.resolve(
+        key=InFlightRequests.build_key(
+            kind=RequestKinds.STT, message_id=message_id, lang=lang
+        )
+    )
+    if (sid := mq_context.get("sid")) and sid not in sids:
+        sids.append(sid)
+    if not data.get("success", True):
+        LOG.warning(f"STT failed for message_id={message_id}")
+        if sids:
+            await emit_error(message="Failed to transcribe message", sids=sids)
+        return
     matching_shout = MongoDocumentsAPI.SHOUTS.get_item(item_id=message_id)
     if not matching_shout:
         LOG.warning(
@@ -46,11 +65,9 @@ async def stt_response(sid, data):
     else:
         try:
             message_text = data.get("transcript")
-            lang = LanguageSettings.to_system_lang(data["lang"])
             MongoDocumentsAPI.SHOUTS.save_stt_response(
                 shout_id=message_id, message_text=message_text, lang=lang
             )
-            sid = mq_context.get("sid")
             cid = mq_context.get("cid")
             response_data = {
                 "cid": cid,
@@ -58,13 +75,32 @@ async def stt_response(sid, data):
                 "lang": lang,
                 "message_text": message_text,
             }
-            await sio.emit("incoming_stt", data=response_data, to=sid)
+            await sio.emit("incoming_stt", data=response_data, to=sids or None)
         except Exception as ex:
             LOG.error(f"Failed to save received transcript due to exception {ex}")
 
 
+async def create_audio_read_claim(audio_location: str) -> str | None:
+    """
+    Creates read claim on the stored audio, so it is passed to the STT service by reference
+
+    :param audio_location: location of the audio in the storage
+    :returns signed claim, None if audio is small enough to be passed inline
+    """
+    storage = server_config.storage
+    try:
+        file_stat = await storage.run(storage.stat, location=audio_location)
+    except FileNotFoundError:
+        LOG.warning(f"Audio file is missing in the storage - {audio_location}")
+        return None
+    if file_stat.size < AudioClaims.min_bytes:
+        return None
+    return AudioClaims.create_claim(location=audio_location, action=ClaimActions.READ)
+
+
 @sio.event
-async def request_stt(sid, data):
+@typed_event(STTRequestEvent)
+async def request_stt(sid, data: STTRequestEvent):
     """
     Handles request to Neon STT service
 
@@ -75,46 +111,65 @@ async def request_stt(sid, data):
         data = {
                     'cid': (target conversation id)
                     'message_id': (target message id),
-                    'audio_data':(target audio data base64 encoded),
+                    'audio_data':(target audio data as binary frame or base64 encoded string),
                     (optional) 'lang': (target message lang)
                }
     ```
     """
-    required_keys = ("message_id",)
-    if not all(key in list(data) for key in required_keys):
-        LOG.error(f"Missing one of the required keys - {required_keys}")
+    cid = data.cid
+    message_id = data.message_id
+    # TODO: process received language
+    lang = "en"
+    # lang = data.get('lang', 'en')
+    shout_data = MongoDocumentsAPI.SHOUTS.get_item(item_id=message_id)
+    if shout_data and (
+        message_transcript := shout_data.get("transcripts", {}).get(lang)
+    ):
+        response_data = {
+            "cid": cid,
+            "message_id": message_id,
+            "lang": lang,
+            "message_text": message_transcript,
+        }
+        return await sio.emit("incoming_stt", data=response_data, to=sid)
+    if not (shout_data or data.audio_data):
+        return await emit_error(message="Requested message was missing", sids=[sid])
+    request_key = InFlightRequests.build_key(
+        kind=RequestKinds.STT, message_id=message_id, lang=lang
+    )
+    if not InFlightRequests.attach(key=request_key, waiter=sid):
+        LOG.info(
+            f"STT is already requested for message_id={message_id}, lang={lang} - waiting for response"
+        )
+        return
+    audio_claim = None
+    if audio_data := data.audio_data:
+        audio_data = audio_data_to_buffer(audio_data).getvalue()
+    elif AudioClaims.enabled and (
+        audio_location := MongoDocumentsAPI.SHOUTS.get_audio_location(
+            shout_data=shout_data
+        )
+    ):
+        audio_claim = await create_audio_read_claim(audio_location=audio_location)
+    if not (audio_data or audio_claim):
+        audio_data = await server_config.storage.run(
+            MongoDocumentsAPI.SHOUTS.fetch_audio_data, message_id=message_id
+        )
+    if not (audio_data or audio_claim):
+        waiters = InFlightRequests.resolve(key=request_key)
+        await emit_error(message="Failed to fetch audio data", sids=waiters)
     else:
-        cid = data.get("cid", "")
-        message_id = data.get("message_id", "")
-        # TODO: process received language
-        lang = "en"
-        # lang = data.get('lang', 'en')
-        if shout_data := MongoDocumentsAPI.SHOUTS.get_item(item_id=message_id):
-            message_transcript = shout_data.get("transcripts", {}).get(lang)
-            if message_transcript:
-                response_data = {
-                    "cid": cid,
-                    "message_id": message_id,
-                    "lang": lang,
-                    "message_text": message_transcript,
-                }
-                return await sio.emit("incoming_stt", data=response_data, to=sid)
-            else:
-                err_msg = "Message transcript was missing"
-                LOG.error(err_msg)
-                return await emit_error(message=err_msg, sids=[sid])
-        audio_data = data.get(
-            "audio_data"
-        ) or MongoDocumentsAPI.SHOUTS.fetch_audio_data(message_id=message_id)
-        if not audio_data:
-            LOG.error("Failed to fetch audio data")
+        lang = LanguageSettings.to_neon_lang(lang)
+        formatted_data = {
+            "cid": cid,
+            "sid": sid,
+            "message_id": message_id,
+            "lang": lang,
+        }
+        if audio_claim:
+            # only the reference is passed, the audio is fetched by the claim
+            await sio.emit(
+                "get_stt", data={**formatted_data, "audio_claim": audio_claim}
+            )
         else:
-            lang = LanguageSettings.to_neon_lang(lang)
-            formatted_data = {
-                "cid": cid,
-                "sid": sid,
-                "message_id": message_id,
-                "audio_data": audio_data,
-                "lang": lang,
-            }
-            await sio.emit("get_stt", data=formatted_data)
+            await emit_audio("get_stt", data=formatted_data, audio=audio_data)
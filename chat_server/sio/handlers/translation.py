@@ -28,29 +28,37 @@
 
 from cachetools import LRUCache
 
-from utils.common import generate_uuid, deep_merge
+from utils.common import generate_uuid
 from utils.database_utils.mongo_utils.queries import mongo_queries
 from utils.database_utils.mongo_utils.queries.wrapper import MongoDocumentsAPI
 from utils.logging_utils import LOG
 from ..server import sio
+from ..utils import typed_event
 from ...server_utils.cache_utils import CacheFactory
+from ...server_utils.sio_schemas import TranslateRequestEvent
+from ...services.inflight_requests import InFlightRequests, RequestKinds
+from ...services.translation_batcher import TranslationBatcher
 
 
 @sio.event
-async def request_translate(sid, data):
+@typed_event(TranslateRequestEvent)
+async def request_translate(sid, data: TranslateRequestEvent):
     """
     Handles requesting for cid translation
     :param sid: client session id
     :param data: mapping of cid to desired translation language
     """
-    if not data:
+    if not data.chat_mapping:
         LOG.warning("Missing request translate data, skipping...")
     else:
-        input_type = data.get("inputType", "incoming")
-        user_id = data.get("user")
+        input_type = data.input_type
 
         populated_translations, missing_translations = mongo_queries.get_translations(
-            translation_mapping=data.get("chat_mapping", {}), requested_user_id=user_id
+            translation_mapping={
+                cid: mapping.model_dump(exclude_none=True)
+                for cid, mapping in data.chat_mapping.items()
+            },
+            requested_user_id=data.user,
         )
         if populated_translations and not missing_translations:
             await sio.emit(
@@ -62,18 +70,234 @@ async def request_translate(sid, data):
             LOG.info(
                 "Not every translation is contained in db, sending out request to Neon"
             )
-            request_id = generate_uuid()
-            caching_instance = {
-                "translations": populated_translations,
-                "sid": sid,
-                "input_type": input_type,
-            }
-            CacheFactory.get("translation_cache", cache_type=LRUCache)[
-                request_id
-            ] = caching_instance
+            await _request_neon_translations(
+                recipients=sid,
+                input_type=input_type,
+                populated_translations=populated_translations,
+                missing_translations=missing_translations,
+            )
+
+
+async def translate_new_shout(shout: dict, member_languages: dict[str, list[str]]):
+    """
+    Translates new shout to the languages preferred by the members of its conversation,
+    translations are pushed to the members once available
+
+    :param shout: new shout data
+    :param member_languages: mapping of target language to the list of member session ids
+    """
+    cid = shout["cid"]
+    for lang, sids in member_languages.items():
+        memory_translations = {}
+        if lang != "en":
+            memory_translations = mongo_queries.get_translation_memory_hits(
+                shouts=[shout], lang=lang
+            )
+        if memory_translations:
+            MongoDocumentsAPI.SHOUTS.backfill_translations(
+                translations=memory_translations, lang=lang
+            )
+            await sio.emit(
+                "translation_response",
+                data={
+                    "translations": {cid: {"shouts": memory_translations}},
+                    "input_type": "incoming",
+                },
+                to=sids,
+            )
+        else:
+            await _request_neon_translations(
+                recipients=sids,
+                input_type="incoming",
+                populated_translations={},
+                missing_translations={
+                    cid: {
+                        "shouts": {shout["_id"]: shout["message_text"]},
+                        "lang": lang,
+                        "source_lang": shout.get("message_lang", "en"),
+                    }
+                },
+            )
+
+
+async def _request_neon_translations(
+    recipients: str | list[str],
+    input_type: str,
+    populated_translations: dict,
+    missing_translations: dict,
+):
+    """
+    Requests missing translations from Neon, translations already requested are awaited instead
+
+    :param recipients: session id(s) to send translation response to
+    :param input_type: type of the translated messages (incoming or outcoming)
+    :param populated_translations: mapping of cid to the translations fetched from db
+    :param missing_translations: mapping of cid to the translations missing in db
+    """
+    request_id = generate_uuid()
+    requested_keys, pending_keys = _attach_to_inflight_translations(
+        request_id=request_id, missing_translations=missing_translations
+    )
+    caching_instance = {
+        "translations": populated_translations,
+        "sid": recipients,
+        "input_type": input_type,
+        "requested_keys": requested_keys,
+        "pending_keys": pending_keys,
+        "requested_translations": missing_translations,
+    }
+    CacheFactory.get("translation_cache", cache_type=LRUCache)[
+        request_id
+    ] = caching_instance
+    if missing_translations:
+        await _dispatch_neon_translations(
+            request_id=request_id, missing_translations=missing_translations
+        )
+    else:
+        LOG.info(
+            f"All missing translations of {request_id = } are already requested - waiting for response"
+        )
+
+
+async def _dispatch_neon_translations(request_id: str, missing_translations: dict):
+    """
+    Adds missing translations to the batch requested from Neon,
+    batch is sent out once it is full or once batching window elapses
+
+    :param request_id: id of the translation request
+    :param missing_translations: mapping of cid to the translations missing in db
+    """
+    is_full = TranslationBatcher.add(
+        request_id=request_id, missing_translations=missing_translations
+    )
+    if is_full or TranslationBatcher.window <= 0:
+        await _flush_neon_translations()
+    elif not TranslationBatcher.flush_scheduled:
+        TranslationBatcher.flush_scheduled = True
+        sio.start_background_task(_flush_neon_translations_after_window)
+
+
+async def _flush_neon_translations_after_window():
+    await sio.sleep(TranslationBatcher.window)
+    await _flush_neon_translations()
+
+
+async def _flush_neon_translations():
+    """Sends out pending batch of translation requests to Neon"""
+    batch = TranslationBatcher.flush()
+    if batch:
+        batch_id, payload = batch
+        await sio.emit(
+            "request_neon_translations",
+            data={"request_id": batch_id, "data": payload},
+        )
+
+
+def _attach_to_inflight_translations(
+    request_id: str, missing_translations: dict
+) -> tuple[list[tuple], set[tuple]]:
+    """
+    Attaches translation request to the pending translation requests,
+    shouts which are already requested are excluded from :param missing_translations
+
+    :param request_id: id of the translation request
+    :param missing_translations: mapping of cid to the translations missing in db
+
+    :returns tuple of: keys of translations requested by the given request,
+                       keys of all translations awaited by the given request
+    """
+    requested_keys = []
+    pending_keys = set()
+    for cid in list(missing_translations):
+        cid_data = missing_translations[cid]
+        lang = cid_data.get("lang", "en")
+        for shout_id in list(cid_data.get("shouts", {})):
+            request_key = InFlightRequests.build_key(
+                kind=RequestKinds.TRANSLATION, message_id=shout_id, lang=lang
+            )
+            pending_keys.add(request_key)
+            if InFlightRequests.attach(key=request_key, waiter=request_id):
+                requested_keys.append(request_key)
+            else:
+                cid_data["shouts"].pop(shout_id)
+        if not cid_data.get("shouts"):
+            missing_translations.pop(cid)
+    return requested_keys, pending_keys
+
+
+def _save_translation_memory(requested_translations: dict, translations: dict):
+    """
+    Saves received translations to the translation memory
+
+    :param requested_translations: mapping of cid to the source texts sent for translation
+    :param translations: received translations mapping
+    """
+    for cid, cid_data in translations.items():
+        lang = cid_data.get("lang", "en")
+        source_data = requested_translations.get(cid, {})
+        source_lang = source_data.get("source_lang", "en")
+        if lang == "en" or lang == source_lang:
+            continue
+        memory_translations = {}
+        for shout_id, translation in cid_data.get("shouts", {}).items():
+            source_text = source_data.get("shouts", {}).get(shout_id)
+            if source_text:
+                memory_translations[source_text] = translation
+        if memory_translations:
+            MongoDocumentsAPI.TRANSLATION_MEMORY.save_translations(
+                translations=memory_translations,
+                source_lang=source_lang,
+                target_lang=lang,
+            )
+
+
+async def _resolve_inflight_translations(
+    request_id: str, cached_data: dict, translations: dict
+):
+    """
+    Resolves translations requested by the given request, distributes them among
+    every attached request and responds to those which received every awaited translation
+
+    :param request_id: id of the resolved translation request
+    :param cached_data: cached data of the resolved translation request
+    :param translations: received translations mapping
+    """
+    received_translations = {}
+    for cid, cid_data in translations.items():
+        lang = cid_data.get("lang", "en")
+        for shout_id, translation in cid_data.get("shouts", {}).items():
+            received_translations[
+                InFlightRequests.build_key(
+                    kind=RequestKinds.TRANSLATION, message_id=shout_id, lang=lang
+                )
+            ] = (cid, translation)
+    translation_cache = CacheFactory.get("translation_cache", cache_type=LRUCache)
+    affected_waiter_ids = {request_id}
+    for request_key in cached_data.get("requested_keys", []):
+        waiter_ids = set(InFlightRequests.resolve(key=request_key))
+        waiter_ids.add(request_id)
+        affected_waiter_ids |= waiter_ids
+        for waiter_id in waiter_ids:
+            waiter_data = translation_cache.get(waiter_id)
+            if not waiter_data:
+                continue
+            waiter_data["pending_keys"].discard(request_key)
+            if request_key in received_translations:
+                cid, translation = received_translations[request_key]
+                waiter_data["translations"].setdefault(cid, {}).setdefault(
+                    "shouts", {}
+                )[request_key[1]] = translation
+    for waiter_id in affected_waiter_ids:
+        waiter_data = translation_cache.get(waiter_id)
+        if waiter_data and not waiter_data["pending_keys"]:
+            translation_cache.pop(waiter_id, None)
             await sio.emit(
-                "request_neon_translations",
-                data={"request_id": request_id, "data": missing_translations},
+                "translation_response",
+                data={
+                    "translations": waiter_data["translations"],
+                    "input_type": waiter_data["input_type"],
+                },
+                to=waiter_data["sid"],
             )
 
 
@@ -94,32 +318,52 @@ async def get_neon_translations(sid, data):
     request_id = data.get("request_id")
     if not request_id:
         LOG.error('Missing "request id" in response dict')
-    else:
-        try:
-            cached_data = CacheFactory.get("translation_cache").get(key=request_id)
-            if not cached_data:
-                LOG.warning("Failed to get matching cached data")
-                return
-            sid = cached_data.get("sid")
-            input_type = cached_data.get("input_type")
-            updated_shouts = MongoDocumentsAPI.SHOUTS.save_translations(
-                translation_mapping=data.get("translations", {})
-            )
-            populated_translations = deep_merge(
-                data.get("translations", {}), cached_data.get("translations", {})
-            )
-            await sio.emit(
-                "translation_response",
-                data={"translations": populated_translations, "input_type": input_type},
-                to=sid,
-            )
-            if updated_shouts:
-                send_dict = {
-                    "input_type": input_type,
-                    "translations": updated_shouts,
-                }
-                await sio.emit("updated_shouts", data=send_dict, skip_sid=[sid])
-        except KeyError as err:
-            LOG.error(
-                f"No translation cache detected under request_id={request_id} (err={err})"
-            )
+        return
+    translations = data.get("translations", {})
+    request_translations = TranslationBatcher.demultiplex(
+        batch_id=request_id, translations=translations
+    )
+    if request_translations is None:
+        request_translations = {request_id: translations}
+    for request_id, translations in request_translations.items():
+        await _apply_neon_translations(request_id=request_id, translations=translations)
+
+
+async def _apply_neon_translations(request_id: str, translations: dict):
+    """
+    Applies translations received for the translation request
+
+    :param request_id: id of the translation request
+    :param translations: received translations mapping
+    """
+    try:
+        cached_data = CacheFactory.get("translation_cache").get(request_id)
+        if not cached_data:
+            LOG.warning("Failed to get matching cached data")
+            return
+        recipients = cached_data.get("sid")
+        if not isinstance(recipients, list):
+            recipients = [recipients]
+        input_type = cached_data.get("input_type")
+        updated_shouts = MongoDocumentsAPI.SHOUTS.save_translations(
+            translation_mapping=translations
+        )
+        _save_translation_memory(
+            requested_translations=cached_data.get("requested_translations", {}),
+            translations=translations,
+        )
+        await _resolve_inflight_translations(
+            request_id=request_id,
+            cached_data=cached_data,
+            translations=translations,
+        )
+        if updated_shouts:
+            send_dict = {
+                "input_type": input_type,
+                "translations": updated_shouts,
+            }
+            await sio.emit("updated_shouts", data=send_dict, skip_sid=recipients)
+    except KeyError as err:
+        LOG.error(
+            f"No translation cache detected under request_id={request_id} (err={err})"
+        )
@@ -26,17 +26,23 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-from utils.common import buffer_to_base64
+from utils.common import audio_data_to_buffer, generate_uuid
 from utils.database_utils.mongo_utils.queries.wrapper import MongoDocumentsAPI
 from utils.logging_utils import LOG
 from ..server import sio
-from ..utils import emit_error
+from ..utils import emit_audio, emit_error, typed_event
 from ...server_config import server_config
+from ...server_utils.enums import ClaimActions
 from ...server_utils.languages import LanguageSettings
+from ...server_utils.sio_schemas import TTSRequestEvent
+from ...services.audio_cache import AudioCache
+from ...services.audio_claims import AudioClaims, InvalidClaimException
+from ...services.inflight_requests import InFlightRequests, RequestKinds
 
 
 @sio.event
-async def request_tts(sid, data):
+@typed_event(TTSRequestEvent)
+async def request_tts(sid, data: TTSRequestEvent):
     """
     Handles request to Neon TTS service
 
@@ -51,69 +57,121 @@ async def request_tts(sid, data):
                }
     ```
     """
-    required_keys = (
-        "cid",
-        "message_id",
-    )
-    if not all(key in list(data) for key in required_keys):
-        LOG.error(f"Missing one of the required keys - {required_keys}")
+    lang = data.lang
+    message_id = data.message_id
+    cid = data.cid
+    matching_message = MongoDocumentsAPI.SHOUTS.get_item(item_id=message_id)
+    if not matching_message:
+        LOG.error("Failed to request TTS - matching message not found")
     else:
-        lang = data.get("lang", "en")
-        message_id = data["message_id"]
-        cid = data["cid"]
-        matching_message = MongoDocumentsAPI.SHOUTS.get_item(item_id=message_id)
-        if not matching_message:
-            LOG.error("Failed to request TTS - matching message not found")
-        else:
-            # TODO: support for multiple genders in TTS
-            # Trying to get existing audio data
-            # preferred_gender = (
-            #     MongoDocumentsAPI.USERS.get_preferences(user_id=user_id)
-            #     .get("tts", {})
-            #     .get(lang, {})
-            #     .get("gender", "female")
-            # )
-            preferred_gender = "female"
-            audio_file = (
-                matching_message.get("audio", {}).get(lang, {}).get(preferred_gender)
+        # TODO: support for multiple genders in TTS
+        # Trying to get existing audio data
+        # preferred_gender = (
+        #     MongoDocumentsAPI.USERS.get_preferences(user_id=user_id)
+        #     .get("tts", {})
+        #     .get(lang, {})
+        #     .get("gender", "female")
+        # )
+        preferred_gender = "female"
+        audio_file = (
+            matching_message.get("audio", {}).get(lang, {}).get(preferred_gender)
+        )
+        if not audio_file:
+            LOG.info(
+                f"File was not detected for cid={cid}, message_id={message_id}, lang={lang}"
             )
-            if not audio_file:
-                LOG.info(
-                    f"File was not detected for cid={cid}, message_id={message_id}, lang={lang}"
+            message_text = matching_message.get("message_text")
+            formatted_data = {
+                "cid": cid,
+                "sid": sid,
+                "message_id": message_id,
+                "text": message_text,
+                "lang": LanguageSettings.to_neon_lang(lang),
+            }
+            if AudioClaims.enabled:
+                # produced audio is uploaded by the claim instead of being sent back through MQ and Socket IO
+                formatted_data["audio_claim"] = AudioClaims.create_claim(
+                    location=f"audio/{message_id}_{lang}_{generate_uuid()}.wav",
+                    action=ClaimActions.WRITE,
                 )
-                message_text = matching_message.get("message_text")
-                formatted_data = {
-                    "cid": cid,
-                    "sid": sid,
-                    "message_id": message_id,
-                    "text": message_text,
-                    "lang": LanguageSettings.to_neon_lang(lang),
-                }
+            # TODO: consider gender once multiple genders are supported in TTS
+            request_key = InFlightRequests.build_key(
+                kind=RequestKinds.TTS, message_id=message_id, lang=lang
+            )
+            if InFlightRequests.attach(key=request_key, waiter=sid):
                 await sio.emit("get_tts", data=formatted_data)
             else:
-                try:
-                    file_location = f"audio/{audio_file}"
-                    LOG.info(f"Fetching existing file from: {file_location}")
-                    fo = server_config.sftp_connector.get_file_object(file_location)
-                    if fo.getbuffer().nbytes > 0:
-                        LOG.info(
-                            f"File detected for cid={cid}, message_id={message_id}, lang={lang}"
-                        )
-                        audio_data = buffer_to_base64(fo)
-                        response_data = {
-                            "cid": cid,
-                            "message_id": message_id,
-                            "lang": lang,
-                            "gender": preferred_gender,
-                            "audio_data": audio_data,
-                        }
-                        await sio.emit("incoming_tts", data=response_data, to=sid)
-                    else:
-                        LOG.error(
-                            f"Empty file detected for cid={cid}, message_id={message_id}, lang={lang}"
-                        )
-                except Exception as ex:
-                    LOG.error(f"Failed to send TTS response - {ex}")
+                LOG.info(
+                    f"TTS is already requested for message_id={message_id}, lang={lang} - waiting for response"
+                )
+        else:
+            try:
+                audio_bytes = await server_config.storage.run(
+                    AudioCache.get_or_fetch,
+                    storage=server_config.storage,
+                    file_location=f"audio/{audio_file}",
+                    message_id=message_id,
+                    lang=lang,
+                    gender=preferred_gender,
+                )
+                if audio_bytes:
+                    LOG.info(
+                        f"File detected for cid={cid}, message_id={message_id}, lang={lang}"
+                    )
+                    response_data = {
+                        "cid": cid,
+                        "message_id": message_id,
+                        "lang": lang,
+                        "gender": preferred_gender,
+                    }
+                    await emit_audio(
+                        "incoming_tts",
+                        data=response_data,
+                        audio=audio_bytes,
+                        to=sid,
+                    )
+                else:
+                    LOG.error(
+                        f"Empty file detected for cid={cid}, message_id={message_id}, lang={lang}"
+                    )
+            except Exception as ex:
+                LOG.error(f"Failed to send TTS response - {ex}")
+
+
+def save_claimed_tts_audio(
+    audio_claim: str, message_id: str, lang: str, gender: str
+) -> bytes | None:
+    """
+    Sets TTS audio uploaded by the claim to the corresponding shout
+
+    :param audio_claim: write claim the audio was uploaded by
+    :param message_id: target message id
+    :param lang: language of speech
+    :param gender: language gender
+
+    :returns uploaded audio bytes, None if audio was not uploaded
+    """
+    try:
+        # claim is verified on upload, so it might expire by the time response is received
+        audio_location = AudioClaims.resolve_claim(
+            claim=audio_claim, action=ClaimActions.WRITE, verify_expiration=False
+        )
+    except InvalidClaimException as ex:
+        LOG.warning(f"Received invalid TTS audio claim - {ex}")
+        return None
+    try:
+        audio_bytes = server_config.storage.get(audio_location)
+    except FileNotFoundError:
+        LOG.warning(f"Claimed TTS audio was not uploaded - {audio_location}")
+        return None
+    MongoDocumentsAPI.SHOUTS.set_tts_audio(
+        shout_id=message_id,
+        audio_file_name=audio_location.removeprefix("audio/"),
+        lang=lang,
+        gender=gender,
+    )
+    AudioCache.put(data=audio_bytes, message_id=message_id, lang=lang, gender=gender)
+    return audio_bytes
 
 
 @sio.event
@@ -125,39 +183,72 @@ async def tts_response(sid, data):
     sid = mq_context.get("sid")
     lang = LanguageSettings.to_system_lang(data.get("lang", "en-us"))
     lang_gender = data.get("gender", "undefined")
+    sids = InFlightRequests.resolve(
+        key=InFlightRequests.build_key(
+            kind=RequestKinds.TTS, message_id=message_id, lang=lang
+        )
+    )
+    if sid and sid not in sids:
+        sids.append(sid)
     matching_shout = MongoDocumentsAPI.SHOUTS.get_item(item_id=message_id)
     if not matching_shout:
         LOG.warning(
             f"Skipping TTS Response for message_id={message_id} - matching shout does not exist"
         )
+        await _emit_tts_failure(sids=sids, message_id=message_id, cid=cid)
     else:
         audio_data = data.get("audio_data")
-        if not audio_data:
+        # audio uploaded by the claim is referenced by the claim echoed in the context
+        audio_claim = mq_context.get("audio_claim")
+        if not (audio_data or audio_claim):
             LOG.warning(
                 f"Skipping TTS Response for message_id={message_id} - audio data is empty"
             )
+            await _emit_tts_failure(sids=sids, message_id=message_id, cid=cid)
         else:
-            is_ok = MongoDocumentsAPI.SHOUTS.save_tts_response(
-                shout_id=message_id,
-                audio_data=audio_data,
-                lang=lang,
-                gender=lang_gender,
-            )
+            if audio_data:
+                # decoded once, so the same bytes are stored and emitted
+                audio_bytes = audio_data_to_buffer(audio_data).getvalue()
+                is_ok = await server_config.storage.run(
+                    MongoDocumentsAPI.SHOUTS.save_tts_response,
+                    shout_id=message_id,
+                    audio_data=audio_bytes,
+                    lang=lang,
+                    gender=lang_gender,
+                )
+            else:
+                audio_bytes = await server_config.storage.run(
+                    save_claimed_tts_audio,
+                    audio_claim=audio_claim,
+                    message_id=message_id,
+                    lang=lang,
+                    gender=lang_gender,
+                )
+                is_ok = audio_bytes is not None
             if is_ok:
                 response_data = {
                     "cid": cid,
                     "message_id": message_id,
                     "lang": lang,
                     "gender": lang_gender,
-                    "audio_data": audio_data,
                 }
-                await sio.emit("incoming_tts", data=response_data, to=sid)
-            else:
-                to = None
-                if sid:
-                    to = [sid]
-                await emit_error(
-                    message="Failed to get TTS response",
-                    context={"message_id": message_id, "cid": cid},
-                    sids=to,
+                await emit_audio(
+                    "incoming_tts",
+                    data=response_data,
+                    audio=audio_bytes,
+                    to=sids or None,
                 )
+            else:
+                await _emit_tts_failure(sids=sids, message_id=message_id, cid=cid)
+
+
+async def _emit_tts_failure(sids: list[str], message_id: str, cid: str):
+    """Notifies clients waiting for TTS of the message that it could not be produced"""
+    if not sids:
+        LOG.error(f"Failed to get TTS response for message_id={message_id}")
+        return
+    await emit_error(
+        message="Failed to get TTS response",
+        context={"message_id": message_id, "cid": cid},
+        sids=sids,
+    )
@@ -25,21 +25,40 @@
 # LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
-from time import time
-
-from utils.common import generate_uuid
+from utils.common import generate_uuid, audio_data_to_buffer
 from utils.database_utils.mongo_utils.queries import mongo_queries
 from utils.database_utils.mongo_utils.queries.wrapper import MongoDocumentsAPI
 from utils.logging_utils import LOG
 from ..server import sio
-from ..utils import emit_error, login_required
+from ..utils import (
+    emit_conversation_event,
+    emit_error,
+    login_required,
+    typed_event,
+)
+from .translation import translate_new_shout
 from ...server_config import server_config
 from ...server_utils.enums import UserRoles
+from ...server_utils.sio_schemas import UserMessageEvent
+from ...services.audio_cache import AudioCache
+from ...services.conversation_members import ConversationMembers
 from ...services.popularity_counter import PopularityCounter
 
 
+def _get_log_summary(data: UserMessageEvent) -> dict:
+    """Gets summary of the user message to log, audio data is replaced with its size"""
+    # TTS audio is excluded by the model itself
+    summary = data.model_dump(exclude={"message_text"} if data.is_audio else None)
+    if data.is_audio:
+        summary["audio_size"] = len(data.message_text)
+    if data.message_tts:
+        summary["tts_langs"] = list(data.message_tts)
+    return summary
+
+
 @sio.event
-async def user_message(sid, data):
+@typed_event(UserMessageEvent)
+async def user_message(sid, data: UserMessageEvent):
     """
     SIO event fired on new user message in chat
     :param sid: client session id
@@ -50,7 +69,7 @@ async def user_message(sid, data):
                 'userID': 'emitted user id',
                 'promptID': 'id of related prompt (optional)',
                 'source': 'declared name of the source that shouted given user message'
-                'messageText': 'content of the user message',
+                'messageText': 'content of the user message (raw audio data or its base64 encoded string for audio messages)',
                 'repliedMessage': 'id of replied message (optional)',
                 'bot': 'if the message is from bot (defaults to False)',
                 'lang': 'language of the message (defaults to "en")'
@@ -58,115 +77,137 @@ async def user_message(sid, data):
                 'context': 'message context (optional)',
                 'test': 'is test message (defaults to False)',
                 'isAudio': '1 if current message is audio message 0 otherwise',
-                'messageTTS': received tts mapping of type: {language: {gender: (audio data base64 encoded)}},
+                'messageTTS': received tts mapping of type: {language: {gender: (raw audio data or its base64 encoded string)}},
                 'isAnnouncement': if received message is the announcement,
                 'timeCreated': 'timestamp on which message was created'}
     ```
     """
-    LOG.info(f"Received user message data: {data}")
+    LOG.info(f"Received user message data: {_get_log_summary(data=data)}")
     try:
-        data["is_bot"] = data.pop("bot", "0")
-        is_bot = data["is_bot"] == "1"
-        if data["userID"].startswith("neon") and not is_bot:
+        if data.user_id.startswith("neon") and not data.is_bot:
             neon_data = MongoDocumentsAPI.USERS.get_neon_data(skill_name="neon")
-            data["userID"] = neon_data["_id"]
-        elif is_bot:
+            data.user_id = neon_data["_id"]
+        elif data.is_bot:
             bot_data = MongoDocumentsAPI.USERS.get_bot_data(
-                user_id=data["userID"], context=data.get("context")
+                user_id=data.user_id, context=data.context
             )
-            data["userID"] = bot_data["_id"]
+            data.user_id = bot_data["_id"]
 
         cid_data = MongoDocumentsAPI.CHATS.get_chat(
-            search_str=data["cid"],
+            search_str=data.cid,
             column_identifiers=["_id"],
-            requested_user_id=data["userID"],
+            requested_user_id=data.user_id,
         )
         if not cid_data:
             msg = "Shouting to non-existent conversation, skipping further processing"
             await emit_error(sids=[sid], message=msg)
             return
 
-        data["message_id"] = generate_uuid()
-        is_audio = data.get("isAudio", "0")
-
-        if is_audio != "1":
-            is_audio = "0"
+        message_id = generate_uuid()
 
-        audio_path = f'{data["message_id"]}_audio.wav'
+        audio_path = f"{message_id}_audio.wav"
         try:
-            if is_audio == "1":
-                message_text = data["messageText"].split(",")[-1]
-                server_config.sftp_connector.put_file_object(
-                    file_object=message_text, save_to=f"audio/{audio_path}"
+            if data.is_audio:
+                audio_buffer = audio_data_to_buffer(data.message_text)
+                await server_config.storage.run(
+                    server_config.storage.put,
+                    location=f"audio/{audio_path}",
+                    file_object=audio_buffer,
+                )
+                await server_config.storage.run(
+                    AudioCache.put, data=audio_buffer.getvalue(), message_id=message_id
                 )
                 # for audio messages "message_text" references the name of the audio stored
-                data["messageText"] = audio_path
+                data.message_text = audio_path
         except Exception as ex:
             LOG.error(f"Failed to located file - {ex}")
             return -1
 
-        is_announcement = data.get("isAnnouncement", "0") or "0"
-
-        if is_announcement != "1":
-            is_announcement = "0"
-
-        lang = data.setdefault("lang", "en")
-
-        data["prompt_id"] = data.pop("promptID", "")
+        lang = data.lang
 
         new_shout_data = {
-            "_id": data["message_id"],
-            "cid": data["cid"],
-            "user_id": data["userID"],
-            "prompt_id": data["prompt_id"],
-            "message_text": data["messageText"],
+            "_id": message_id,
+            "cid": data.cid,
+            "user_id": data.user_id,
+            "prompt_id": data.prompt_id,
+            "message_text": data.message_text,
             "message_lang": lang,
-            "attachments": data.get("attachments", []),
-            "replied_message": data.get("repliedMessage", ""),
-            "is_audio": is_audio,
-            "is_announcement": is_announcement,
-            "is_bot": data["is_bot"],
+            "attachments": data.attachments,
+            "replied_message": data.replied_message,
+            "is_audio": "1" if data.is_audio else "0",
+            "is_announcement": "1" if data.is_announcement else "0",
+            "is_bot": "1" if data.is_bot else "0",
             "translations": {},
-            "created_on": int(data.get("timeCreated", time())),
+            "created_on": data.time_created,
         }
 
         # in case message is received in some foreign language -
         # message text is kept in that language unless English translation received
         if lang != "en":
-            new_shout_data["translations"][lang] = data["messageText"]
+            new_shout_data["translations"][lang] = data.message_text
 
         mongo_queries.add_shout(data=new_shout_data)
-        if is_announcement == "0" and data.get("prompt_id"):
-            is_ok = MongoDocumentsAPI.PROMPTS.add_shout_to_prompt(
-                prompt_id=data["prompt_id"],
-                user_id=data["userID"],
-                message_id=data["message_id"],
-                prompt_state=data["promptState"],
+        # stored shouts are numbered, so clients can resume missed messages from the database,
+        # sequence numbers are allocated in the order events are emitted
+        seq = MongoDocumentsAPI.CHATS.next_sequence(cid=data.cid)
+        if seq is not None:
+            MongoDocumentsAPI.SHOUTS.set_sequence(shout_id=message_id, seq=seq)
+        is_prompt_message = False
+        if not data.is_announcement and data.prompt_id:
+            is_prompt_message = MongoDocumentsAPI.PROMPTS.add_shout_to_prompt(
+                prompt_id=data.prompt_id,
+                user_id=data.user_id,
+                message_id=message_id,
+                prompt_state=data.prompt_state,
             )
-            if is_ok:
-                await sio.emit(
-                    "new_prompt_message",
-                    data={
-                        "cid": data["cid"],
-                        "userID": data["userID"],
-                        "messageText": data["messageText"],
-                        "promptID": data["prompt_id"],
-                        "promptState": data["promptState"],
-                    },
-                )
 
-        message_tts = data.get("messageTTS", {})
-        for language, gender_mapping in message_tts.items():
+        # stored TTS is served on request, so audio is not broadcast along with the message
+        for language, gender_mapping in data.message_tts.items():
             for gender, audio_data in gender_mapping.items():
-                MongoDocumentsAPI.SHOUTS.save_tts_response(
-                    shout_id=data["message_id"],
+                await server_config.storage.run(
+                    MongoDocumentsAPI.SHOUTS.save_tts_response,
+                    shout_id=message_id,
                     audio_data=audio_data,
                     lang=language,
                     gender=gender,
                 )
 
-        data["bound_service"] = cid_data.get("bound_service", "")
-        await sio.emit("new_message", data=data, skip_sid=[sid])
+        member_languages = {}
+        if not data.is_audio:
+            member_languages = ConversationMembers.get_languages(
+                cid=data.cid, skip_sids=[sid]
+            )
+            member_languages.pop(lang, None)
+
+        await emit_conversation_event(
+            "new_message",
+            cid=data.cid,
+            seq=seq,
+            data={
+                **data.model_dump(by_alias=True),
+                "message_id": message_id,
+                "bound_service": cid_data.get("bound_service", ""),
+                # languages the message is translated to by the server, clients preferring them should not request translation
+                "translatedLangs": list(member_languages),
+            },
+            skip_sid=[sid],
+        )
+        if is_prompt_message:
+            await emit_conversation_event(
+                "new_prompt_message",
+                cid=data.cid,
+                data={
+                    "cid": data.cid,
+                    "userID": data.user_id,
+                    "messageText": data.message_text,
+                    "promptID": data.prompt_id,
+                    "promptState": data.prompt_state,
+                },
+            )
+        if member_languages:
+            await translate_new_shout(
+                shout=new_shout_data, member_languages=member_languages
+            )
         PopularityCounter.increment_cid_popularity(new_shout_data["cid"])
     except Exception as ex:
         LOG.exception(
@@ -174,7 +215,7 @@ async def user_message(sid, data):
         )
         await emit_error(
             sids=[sid],
-            message=f'Unable to process request "user_message" with data: {data}',
+            message=f'Unable to process request "user_message" with data: {data!r}',
         )
 
 
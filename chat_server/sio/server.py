@@ -27,5 +27,215 @@
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import socketio
+from socketio import packet
 
-sio = socketio.AsyncServer(cors_allowed_origins="*", async_mode="asgi")
+from chat_server.server_utils.enums import SIOSerializers
+from chat_server.services.admission_control import AdmissionController
+from chat_server.services.rate_limiter import SIORateLimiter
+from chat_server.services.request_profiler import RequestProfiler
+from chat_server.server_utils.sio_serializers import (
+    MsgPackPacket,
+    NegotiatedSerializerManager,
+    convert_packet,
+    get_requested_serializer,
+)
+from utils.logging_utils import LOG
+from utils.metrics_utils import (
+    SIO_CONNECTED_SOCKETS,
+    SIO_EVENT_DURATION,
+    SIO_EVENT_ERRORS,
+    SIO_EVENTS_IN_PROGRESS,
+    SIO_OUTBOUND_QUEUE_MAX_DEPTH,
+    SIO_OUTBOUND_QUEUED_PACKETS,
+    SIO_ROOMS,
+    SIO_SLOW_CONSUMER_DISCONNECTS,
+    SIO_THROTTLED_EVENTS,
+    track_duration,
+)
+
+
+class KlatAsyncServer(socketio.AsyncServer):
+    """
+    Socket IO server collecting metrics of the handled events
+
+    Events exceeding the rate limits are rejected with "throttled" event,
+    events shed by the admission control are rejected with "overloaded" event,
+    clients which do not keep up with the outbound packets are disconnected.
+
+    Clients connecting with "?serializer=msgpack" exchange MessagePack-encoded packets,
+    the rest of the clients (browsers, nano embeds) keep using JSON.
+    """
+
+    # lifecycle events are never limited
+    UNLIMITED_EVENTS = ("connect", "disconnect")
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("client_manager", NegotiatedSerializerManager())
+        super().__init__(*args, **kwargs)
+        self._msgpack_eio_sids = set()
+
+    def has_negotiated_serializers(self) -> bool:
+        """Checks if any of the clients uses serializer other than the default one"""
+        return bool(self._msgpack_eio_sids)
+
+    def get_packet_class(self, eio_sid) -> type:
+        """Gets class of the packets exchanged with the client"""
+        if eio_sid in self._msgpack_eio_sids:
+            return MsgPackPacket
+        return self.packet_class
+
+    async def _handle_eio_connect(self, eio_sid, environ):
+        if get_requested_serializer(environ) == SIOSerializers.MSGPACK:
+            if MsgPackPacket is None:
+                LOG.warning(
+                    f"Rejecting {eio_sid} - msgpack serializer is not supported"
+                )
+                return False
+            self._msgpack_eio_sids.add(eio_sid)
+        return await super()._handle_eio_connect(eio_sid, environ)
+
+    async def _handle_eio_disconnect(self, eio_sid):
+        try:
+            return await super()._handle_eio_disconnect(eio_sid)
+        finally:
+            self._msgpack_eio_sids.discard(eio_sid)
+
+    async def _handle_eio_message(self, eio_sid, data):
+        if eio_sid not in self._msgpack_eio_sids:
+            return await super()._handle_eio_message(eio_sid, data)
+        pkt = MsgPackPacket(encoded_packet=data)
+        if pkt.packet_type == packet.CONNECT:
+            await self._handle_connect(eio_sid, pkt.namespace, pkt.data)
+        elif pkt.packet_type == packet.DISCONNECT:
+            await self._handle_disconnect(eio_sid, pkt.namespace)
+        elif pkt.packet_type == packet.EVENT:
+            await self._handle_event(eio_sid, pkt.namespace, pkt.id, pkt.data)
+        elif pkt.packet_type == packet.ACK:
+            await self._handle_ack(eio_sid, pkt.namespace, pkt.id, pkt.data)
+        else:
+            raise ValueError(f"Unexpected packet type: {pkt.packet_type}")
+
+    async def _trigger_event(self, event, namespace, *args):
+        # labels are limited to the registered events to keep metrics cardinality bounded
+        event_label = (
+            event if event in self.handlers.get(namespace, {}) else "unhandled"
+        )
+        if event_label == "unhandled" or event in self.UNLIMITED_EVENTS:
+            return await self._trigger_tracked_event(
+                event, event_label, namespace, *args
+            )
+        sid = args[0]
+        if SIORateLimiter.enabled and await self._throttle(event, namespace, sid):
+            return None
+        route_class = AdmissionController.classify_event(event=event)
+        async with AdmissionController.admit(
+            route_class=route_class, kind="sio"
+        ) as admitted:
+            if admitted:
+                return await self._trigger_tracked_event(
+                    event, event_label, namespace, *args
+                )
+        LOG.warning(f"Shedding event {event!r} of {sid} ({route_class = })")
+        await self.emit(
+            "overloaded",
+            data={
+                "event": event,
+                "retry_after": AdmissionController.get_gate(route_class).retry_after,
+            },
+            to=sid,
+            namespace=namespace,
+        )
+        return None
+
+    async def _throttle(self, event: str, namespace: str, sid: str) -> bool:
+        """
+        Accounts event against the rate limits
+
+        :returns True if event exceeds the rate limits
+        """
+        throttle = SIORateLimiter.acquire(sid=sid, event=event)
+        if not throttle:
+            return False
+        SIO_THROTTLED_EVENTS.labels(
+            event=event, tier=throttle.tier, scope=throttle.scope
+        ).inc()
+        if throttle.notify:
+            await self.emit(
+                "throttled",
+                data={"event": event, "retry_after": round(throttle.retry_after, 3)},
+                to=sid,
+                namespace=namespace,
+            )
+        return True
+
+    async def _trigger_tracked_event(self, event, event_label, namespace, *args):
+        with track_duration(
+            duration=SIO_EVENT_DURATION,
+            errors=SIO_EVENT_ERRORS,
+            in_progress=SIO_EVENTS_IN_PROGRESS,
+            event=event_label,
+        ):
+            if event_label != "unhandled" and RequestProfiler.should_sample_event(
+                event=event
+            ):
+                with RequestProfiler.profile(
+                    kind="sio", target=event, trigger="sampled"
+                ):
+                    return await super()._trigger_event(event, namespace, *args)
+            return await super()._trigger_event(event, namespace, *args)
+
+    def count_connected_sockets(self, namespace: str = "/") -> int:
+        """Counts clients connected to the namespace"""
+        return len(self.manager.rooms.get(namespace, {}).get(None, {}))
+
+    async def _send_packet(self, eio_sid, pkt):
+        if not await self._disconnect_slow_consumer(eio_sid):
+            pkt = convert_packet(pkt, packet_class=self.get_packet_class(eio_sid))
+            await super()._send_packet(eio_sid, pkt)
+
+    async def _send_eio_packet(self, eio_sid, eio_pkt):
+        # broadcasts are encoded once and sent to each client as Engine.IO packets
+        if not await self._disconnect_slow_consumer(eio_sid):
+            await super()._send_eio_packet(eio_sid, eio_pkt)
+
+    async def _disconnect_slow_consumer(self, eio_sid) -> bool:
+        """
+        Disconnects client if its outbound queue exceeds the limit
+
+        :returns True if client is disconnected
+        """
+        max_queue_size = SIORateLimiter.max_outbound_queue_size
+        if not max_queue_size or self.get_outbound_queue_size(eio_sid) < max_queue_size:
+            return False
+        LOG.warning(
+            f"Disconnecting client {eio_sid} - outbound queue exceeded "
+            f"{SIORateLimiter.max_outbound_queue_size} packets"
+        )
+        SIO_SLOW_CONSUMER_DISCONNECTS.inc()
+        await self.eio.disconnect(eio_sid)
+        return True
+
+    def get_outbound_queue_size(self, eio_sid) -> int:
+        """Counts packets queued for the client"""
+        socket = self.eio.sockets.get(eio_sid)
+        return socket.queue.qsize() if socket is not None else 0
+
+    def list_outbound_queue_sizes(self) -> list[int]:
+        return [socket.queue.qsize() for socket in list(self.eio.sockets.values())]
+
+    def count_rooms(self, namespace: str = "/") -> int:
+        """Counts rooms of the namespace excluding personal rooms of the clients"""
+        rooms = self.manager.rooms.get(namespace, {})
+        return len(
+            [room for room, members in rooms.items() if room and room not in members]
+        )
+
+
+sio = KlatAsyncServer(cors_allowed_origins="*", async_mode="asgi")
+
+SIO_CONNECTED_SOCKETS.set_function(sio.count_connected_sockets)
+SIO_ROOMS.set_function(sio.count_rooms)
+SIO_OUTBOUND_QUEUE_MAX_DEPTH.set_function(
+    lambda: max(sio.list_outbound_queue_sizes(), default=0)
+)
+SIO_OUTBOUND_QUEUED_PACKETS.set_function(lambda: sum(sio.list_outbound_queue_sizes()))
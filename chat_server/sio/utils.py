@@ -30,9 +30,14 @@ import os
 from functools import wraps
 from typing import Optional, List, Tuple
 
+from pydantic import BaseModel, ValidationError
+
+from utils.common import bytes_to_base64
 from utils.database_utils.mongo_utils.queries.wrapper import MongoDocumentsAPI
 from utils.logging_utils import LOG
+from utils.metrics_utils import SIO_INVALID_EVENTS
 from .server import sio
+from ..services.conversation_replay import ConversationReplay
 from ..server_utils.auth import decode_jwt_token, session_token_expired
 from ..server_utils.enums import UserRoles
 from ..server_utils.http_exceptions import (
@@ -73,25 +78,8 @@ def login_required(min_required_role=UserRoles.GUEST, *outer_args, **outer_kwarg
         @wraps(func)
         async def wrapper(sid, *args, **kwargs):
             if os.environ.get("DISABLE_AUTH_CHECK", "0") != "1":
-                user = None
-
-                nano_token = get_header(sid, "nano_session")
-                session_token = get_header(sid, "session")
-
                 try:
-                    if nano_token:
-                        user = MongoDocumentsAPI.USERS.get_user_by_nano_token(
-                            nano_token=nano_token
-                        )
-                    if not user:
-                        if session_token:
-                            user = _get_user_from_session_token(
-                                session_token=session_token
-                            )
-                        else:
-                            raise ItemNotFoundException(
-                                message="Missing session header in SIO request"
-                            )
+                    user = get_session_user(sid)
 
                     if not _user_has_min_required_role(
                         user=user, min_required_role=min_required_role
@@ -122,6 +110,56 @@ def login_required(min_required_role=UserRoles.GUEST, *outer_args, **outer_kwarg
         return outer
 
 
+def typed_event(model: type[BaseModel]):
+    """
+    Decorator validating payload of the event against provided model,
+    handler receives validated model instance while malformed payloads are rejected with an error
+
+    :param model: model of the event payload
+    """
+
+    def outer(func):
+        @wraps(func)
+        async def wrapper(sid, data, *args, **kwargs):
+            try:
+                event_data = model.model_validate(data)
+            except ValidationError as ex:
+                SIO_INVALID_EVENTS.labels(event=func.__name__).inc()
+                LOG.warning(
+                    f"Rejecting malformed {func.__name__!r} payload from {sid} - "
+                    f"{ex.errors(include_url=False, include_input=False)}"
+                )
+                return await sio.emit(
+                    "klatchat_sio_error",
+                    data={"msg": f'Malformed payload of "{func.__name__}"'},
+                    to=sid,
+                )
+            return await func(sid, event_data, *args, **kwargs)
+
+        return wrapper
+
+    return outer
+
+
+def get_session_user(sid: str) -> Optional[dict]:
+    """
+    Gets user authorized by the headers of the client session
+
+    :param sid: client session id
+    :returns authorized user data
+    :raises KlatAPIException: if authorization headers are missing or invalid
+    """
+    user = None
+    if nano_token := get_header(sid, "nano_session"):
+        user = MongoDocumentsAPI.USERS.get_user_by_nano_token(nano_token=nano_token)
+    if not user:
+        if session_token := get_header(sid, "session"):
+            user = _get_user_from_session_token(session_token=session_token)
+        else:
+            raise ItemNotFoundException(message="Missing session header in SIO request")
+    return user
+
+
 def _get_user_from_session_token(
     session_token: str,
 ) -> Tuple[str, int]:
@@ -173,3 +211,85 @@ async def emit_session_expired(sid: str):
         context={"callback_event": "auth_expired"},
         sids=[sid],
     )
+
+
+# room of the client sessions receiving audio as binary frames instead of base64 strings
+BINARY_AUDIO_ROOM = "binary_audio"
+
+
+async def enable_binary_audio(sid: str):
+    """Makes client session receive audio as binary frames"""
+    await sio.enter_room(sid, BINARY_AUDIO_ROOM)
+
+
+def list_binary_audio_sids() -> set[str]:
+    """Lists client sessions receiving audio as binary frames"""
+    return set(sio.manager.rooms.get("/", {}).get(BINARY_AUDIO_ROOM, {}))
+
+
+async def emit_audio(
+    event: str,
+    data: dict,
+    audio: bytes,
+    audio_key: str = "audio_data",
+    to: Optional[List[str] | str] = None,
+):
+    """
+    Emits audio to the client sessions in format each of them supports,
+    sessions which did not enable binary audio receive it as base64 string
+
+    :param event: name of the event to emit
+    :param data: data to emit along with the audio
+    :param audio: raw audio data
+    :param audio_key: key of the audio in emitted data (defaults to "audio_data")
+    :param to: client session ids, audio is broadcast if not provided
+    """
+    binary_sids = list_binary_audio_sids()
+    if isinstance(to, str):
+        to = [to]
+    if to is None:
+        if binary_sids:
+            await sio.emit(event, data={**data, audio_key: audio}, to=BINARY_AUDIO_ROOM)
+        await sio.emit(
+            event,
+            data={**data, audio_key: bytes_to_base64(audio)},
+            skip_sid=list(binary_sids) or None,
+        )
+        return
+    binary_recipients = [sid for sid in to if sid in binary_sids]
+    base64_recipients = [sid for sid in to if sid not in binary_sids]
+    if binary_recipients:
+        await sio.emit(event, data={**data, audio_key: audio}, to=binary_recipients)
+    if base64_recipients:
+        await sio.emit(
+            event,
+            data={**data, audio_key: bytes_to_base64(audio)},
+            to=base64_recipients,
+        )
+
+
+async def emit_conversation_event(
+    event: str, cid: str, data: dict, seq: Optional[int] = None, **kwargs
+) -> Optional[int]:
+    """
+    Emits event of the conversation numbered with its sequence number,
+    so clients missing the event can resume it via "get_conversation_delta"
+
+    :param event: name of the event to emit
+    :param cid: target conversation id
+    :param data: data to emit, sequence number is added under "seq" key
+    :param seq: sequence number of the event, next sequence number of the conversation is assigned if not provided
+    :param kwargs: keyword arguments of the emit (e.g. "to" or "skip_sid"),
+                   skipped sessions receive "conversation_seq" event, so they do not miss the sequence number
+
+    :returns sequence number of the event, None if conversation does not exist
+    """
+    if seq is None:
+        seq = MongoDocumentsAPI.CHATS.next_sequence(cid=cid)
+    if seq is not None:
+        data["seq"] = seq
+        ConversationReplay.record(cid=cid, seq=seq, event=event, data=data)
+    await sio.emit(event, data=data, **kwargs)
+    if seq is not None and (skip_sid := kwargs.get("skip_sid")):
+        await sio.emit("conversation_seq", data={"cid": cid, "seq": seq}, to=skip_sid)
+    return seq
@@ -0,0 +1,184 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import asyncio
+import sys
+import unittest
+from unittest import mock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from chat_server.services.admission_control import (
+    AdmissionController,
+    AdmissionGate,
+    RouteClasses,
+)
+
+# application is imported without loading server configuration
+with mock.patch.dict(sys.modules, {"chat_server.server_config": mock.MagicMock()}):
+    from chat_server.app import _init_middleware
+
+
+class TestAdmissionGate(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.gate = AdmissionGate(
+            route_class=RouteClasses.DEFAULT,
+            max_concurrency=1,
+            max_queue_size=1,
+            max_queue_time=0.2,
+        )
+
+    async def test_slot_is_handed_over_to_waiter(self):
+        self.assertTrue(await self.gate.acquire())
+        waiter = asyncio.create_task(self.gate.acquire())
+        await asyncio.sleep(0)
+        self.gate.release()
+        self.assertTrue(await waiter)
+        self.assertEqual(self.gate.active, 1)
+        self.gate.release()
+        self.assertEqual(self.gate.active, 0)
+
+    async def test_shedding(self):
+        self.assertTrue(await self.gate.acquire())
+        waiter = asyncio.create_task(self.gate.acquire())
+        await asyncio.sleep(0)
+        # queue is full
+        self.assertFalse(await self.gate.acquire())
+        # waited for longer than allowed
+        self.assertFalse(await waiter)
+        self.gate.release()
+        self.assertEqual(self.gate.active, 0)
+
+    async def test_cancelled_waiter_leaves_queue(self):
+        self.assertTrue(await self.gate.acquire())
+        waiter = asyncio.create_task(self.gate.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+        self.gate.release()
+        self.assertEqual(self.gate.active, 0)
+        self.assertTrue(await self.gate.acquire())
+
+
+class TestAdmissionController(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        AdmissionController.init(
+            config={
+                "ENABLED": True,
+                "LIMITS": {"HISTORY": {"MAX_CONCURRENCY": 1, "MAX_QUEUE_SIZE": 0}},
+                "ROUTES": {"CHEAP": ["/chat_api/search/cached"]},
+            }
+        )
+
+    def tearDown(self):
+        AdmissionController.init()
+
+    def test_classify_route(self):
+        for method, path, route_class in (
+            ("GET", "/chat_api/live", RouteClasses.CHEAP),
+            ("GET", "/chat_api/search/cid", RouteClasses.HISTORY),
+            ("GET", "/chat_api/search/cached", RouteClasses.CHEAP),
+            ("POST", "/files/attachments", RouteClasses.FILES),
+            ("POST", "/auth/login", RouteClasses.AUTH),
+            ("POST", "/preferences/update", RouteClasses.WRITES),
+            ("GET", "/users_api/", RouteClasses.DEFAULT),
+        ):
+            self.assertEqual(
+                AdmissionController.classify_route(method=method, path=path),
+                route_class,
+            )
+        self.assertEqual(
+            AdmissionController.classify_event(event="user_message"),
+            RouteClasses.WRITES,
+        )
+        # responses of the backend are never shed
+        for event in ("tts_response", "stt_response", "get_neon_translations"):
+            self.assertIsNone(AdmissionController.classify_event(event=event))
+
+    async def test_exempt_events_are_admitted(self):
+        AdmissionController.init(
+            config={
+                "ENABLED": True,
+                "LIMITS": {"DEFAULT": {"MAX_CONCURRENCY": 0, "MAX_QUEUE_SIZE": 0}},
+            }
+        )
+        for event, is_admitted in (("stt_response", True), ("unknown", False)):
+            async with AdmissionController.admit(
+                route_class=AdmissionController.classify_event(event=event),
+                kind="sio",
+            ) as admitted:
+                self.assertEqual(admitted, is_admitted)
+
+    async def test_admit(self):
+        async with AdmissionController.admit(
+            route_class=RouteClasses.HISTORY, kind="http"
+        ) as admitted:
+            self.assertTrue(admitted)
+            async with AdmissionController.admit(
+                route_class=RouteClasses.HISTORY, kind="http"
+            ) as admitted:
+                self.assertFalse(admitted)
+            # other classes are not affected
+            async with AdmissionController.admit(
+                route_class=RouteClasses.CHEAP, kind="http"
+            ) as admitted:
+                self.assertTrue(admitted)
+        async with AdmissionController.admit(
+            route_class=RouteClasses.HISTORY, kind="http"
+        ) as admitted:
+            self.assertTrue(admitted)
+
+
+class TestAdmissionControlMiddleware(unittest.TestCase):
+    def setUp(self):
+        AdmissionController.init(
+            config={
+                "ENABLED": True,
+                "LIMITS": {"DEFAULT": {"MAX_CONCURRENCY": 0, "MAX_QUEUE_SIZE": 0}},
+            }
+        )
+        app = FastAPI()
+
+        @app.get("/users_api/")
+        async def get_users():
+            return {"msg": "OK"}
+
+        _init_middleware(app=app)
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        AdmissionController.init()
+
+    def test_shed_response_has_cors_headers(self):
+        response = self.client.get(
+            "/users_api/", headers={"Origin": "https://chat.example"}
+        )
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("access-control-allow-origin", response.headers)
@@ -0,0 +1,110 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from chat_server.services.audio_cache import AudioCache
+
+
+class TestAudioCache(unittest.TestCase):
+    def setUp(self):
+        self.disk_location = tempfile.mkdtemp()
+
+    def tearDown(self):
+        AudioCache.init()
+        shutil.rmtree(self.disk_location, ignore_errors=True)
+
+    def _set_last_used(self, message_id: str, timestamp: float):
+        path = AudioCache._get_disk_path(key=AudioCache.build_key(message_id))
+        os.utime(path, (timestamp, timestamp))
+
+    def test_memory_tier_eviction_by_bytes(self):
+        AudioCache.init(config={"MEMORY_MAX_BYTES": 100})
+        AudioCache.put(data=b"a" * 40, message_id="a")
+        AudioCache.put(data=b"b" * 40, message_id="b")
+        self.assertEqual(AudioCache.get(message_id="a"), b"a" * 40)
+        # least recently used item is evicted once total size exceeds the limit
+        AudioCache.put(data=b"c" * 40, message_id="c")
+        self.assertIsNone(AudioCache.get(message_id="b"))
+        self.assertEqual(AudioCache.get(message_id="a"), b"a" * 40)
+        self.assertEqual(AudioCache.get(message_id="c"), b"c" * 40)
+        # items exceeding the whole tier are not cached
+        AudioCache.put(data=b"d" * 101, message_id="d")
+        self.assertIsNone(AudioCache.get(message_id="d"))
+        self.assertEqual(AudioCache.get(message_id="a"), b"a" * 40)
+
+    def test_disk_tier_eviction_by_last_use(self):
+        # memory tier fitting no items makes every read go to the disk
+        AudioCache.init(
+            config={
+                "MEMORY_MAX_BYTES": 0,
+                "DISK_LOCATION": self.disk_location,
+                "DISK_MAX_BYTES": 100,
+            }
+        )
+        AudioCache.put(data=b"a" * 40, message_id="a")
+        AudioCache.put(data=b"b" * 40, message_id="b")
+        self._set_last_used("a", time.time() - 20)
+        self._set_last_used("b", time.time() - 10)
+        # reading the item marks it as recently used
+        self.assertEqual(AudioCache.get(message_id="a"), b"a" * 40)
+        AudioCache.put(data=b"c" * 40, message_id="c")
+        self.assertIsNone(AudioCache.get(message_id="b"))
+        self.assertEqual(AudioCache.get(message_id="a"), b"a" * 40)
+        self.assertEqual(AudioCache.get(message_id="c"), b"c" * 40)
+        self.assertEqual(len(os.listdir(self.disk_location)), 2)
+
+    def test_disk_tier_is_restored_after_restart(self):
+        config = {
+            "MEMORY_MAX_BYTES": 0,
+            "DISK_LOCATION": self.disk_location,
+            "DISK_MAX_BYTES": 100,
+        }
+        AudioCache.init(config=config)
+        AudioCache.put(data=b"a" * 60, message_id="a")
+        AudioCache.init(config=config)
+        self.assertEqual(AudioCache.get(message_id="a"), b"a" * 60)
+        # restored items count towards the size limit
+        AudioCache.put(data=b"b" * 60, message_id="b")
+        self.assertEqual(len(os.listdir(self.disk_location)), 1)
+
+    def test_cache_stream(self):
+        AudioCache.init()
+        chunks = [b"a" * 10, b"b" * 10, b"c" * 10]
+        stream = AudioCache.cache_stream(chunks=chunks, message_id="partial")
+        self.assertEqual(next(stream), chunks[0])
+        stream.close()
+        # interrupted stream is not cached
+        self.assertIsNone(AudioCache.get(message_id="partial"))
+        stream = AudioCache.cache_stream(chunks=chunks, message_id="complete")
+        self.assertEqual(list(stream), chunks)
+        self.assertEqual(AudioCache.get(message_id="complete"), b"".join(chunks))
@@ -0,0 +1,83 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+
+from chat_server.server_utils.enums import ClaimActions
+from chat_server.services.audio_claims import AudioClaims, InvalidClaimException
+
+
+class TestAudioClaims(unittest.TestCase):
+    def setUp(self):
+        AudioClaims.init(config={"ENABLED": True, "TTL": 60}, secret="test-secret")
+
+    def tearDown(self):
+        AudioClaims.init()
+
+    def test_resolve_claim(self):
+        claim = AudioClaims.create_claim(
+            location="audio/a.wav", action=ClaimActions.READ
+        )
+        self.assertEqual(
+            AudioClaims.resolve_claim(claim=claim, action=ClaimActions.READ),
+            "audio/a.wav",
+        )
+        self.assertEqual(AudioClaims.build_path(claim), f"/files/claims/{claim}")
+
+    def test_claim_permits_only_its_action(self):
+        claim = AudioClaims.create_claim(
+            location="audio/a.wav", action=ClaimActions.READ
+        )
+        with self.assertRaises(InvalidClaimException):
+            AudioClaims.resolve_claim(claim=claim, action=ClaimActions.WRITE)
+
+    def test_expired_claim(self):
+        AudioClaims.init(config={"ENABLED": True, "TTL": -1}, secret="test-secret")
+        claim = AudioClaims.create_claim(
+            location="audio/a.wav", action=ClaimActions.WRITE
+        )
+        with self.assertRaises(InvalidClaimException):
+            AudioClaims.resolve_claim(claim=claim, action=ClaimActions.WRITE)
+        self.assertEqual(
+            AudioClaims.resolve_claim(
+                claim=claim, action=ClaimActions.WRITE, verify_expiration=False
+            ),
+            "audio/a.wav",
+        )
+
+    def test_claim_signed_by_other_secret(self):
+        claim = AudioClaims.create_claim(
+            location="audio/a.wav", action=ClaimActions.READ
+        )
+        AudioClaims.init(config={"ENABLED": True}, secret="other-secret")
+        with self.assertRaises(InvalidClaimException):
+            AudioClaims.resolve_claim(claim=claim, action=ClaimActions.READ)
+
+    def test_disabled_without_secret(self):
+        AudioClaims.init(config={"ENABLED": True})
+        self.assertFalse(AudioClaims.enabled)
@@ -0,0 +1,86 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+
+from chat_server.services.conversation_replay import ConversationReplay
+
+
+class TestConversationReplay(unittest.TestCase):
+    def setUp(self):
+        ConversationReplay.init(config={"BUFFER_SIZE": 3})
+
+    def tearDown(self):
+        ConversationReplay.init()
+
+    def test_get_since(self):
+        for seq in (1, 3, 2):
+            ConversationReplay.record(
+                cid="cid", seq=seq, event="new_message", data={"seq": seq}
+            )
+        events = ConversationReplay.get_since(cid="cid", seq=1)
+        self.assertEqual([event["seq"] for event in events], [2, 3])
+        self.assertEqual(events[0]["event"], "new_message")
+        self.assertEqual(ConversationReplay.get_since(cid="cid", seq=3), [])
+
+    def test_unknown_conversation(self):
+        self.assertIsNone(ConversationReplay.get_since(cid="unknown", seq=0))
+
+    def test_trimmed_events_are_not_replayed(self):
+        for seq in range(1, 6):
+            ConversationReplay.record(
+                cid="cid", seq=seq, event="new_message", data={"seq": seq}
+            )
+        self.assertIsNone(ConversationReplay.get_since(cid="cid", seq=1))
+        events = ConversationReplay.get_since(cid="cid", seq=2)
+        self.assertEqual([event["seq"] for event in events], [3, 4, 5])
+
+    def test_gap_is_not_replayed(self):
+        for seq in (1, 3):
+            ConversationReplay.record(
+                cid="cid", seq=seq, event="new_message", data={"seq": seq}
+            )
+        self.assertIsNone(ConversationReplay.get_since(cid="cid", seq=1))
+        self.assertEqual(len(ConversationReplay.get_since(cid="cid", seq=2)), 1)
+
+    def test_prompt_message_follows_its_shout(self):
+        ConversationReplay.record(
+            cid="cid", seq=1, event="new_message", data={"seq": 1}
+        )
+        ConversationReplay.record(
+            cid="cid", seq=2, event="new_message", data={"seq": 2}
+        )
+        ConversationReplay.record(
+            cid="cid", seq=3, event="new_prompt_message", data={"seq": 3}
+        )
+        # client received prompt message only, so its last contiguous sequence number stays at 1
+        events = ConversationReplay.get_since(cid="cid", seq=1)
+        self.assertEqual(
+            [(event["seq"], event["event"]) for event in events],
+            [(2, "new_message"), (3, "new_prompt_message")],
+        )
@@ -0,0 +1,156 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import sys
+import unittest
+from unittest import mock
+
+from starlette.requests import Request
+
+from utils.http_utils import matches_entity_tag
+
+# server utilities are imported without loading server configuration
+with mock.patch.dict(sys.modules, {"chat_server.server_config": mock.MagicMock()}):
+    from chat_server.server_utils.http_utils import (
+        RangeNotSatisfiable,
+        get_ranged_response,
+        parse_byte_range,
+    )
+
+
+class TestMatchesEntityTag(unittest.TestCase):
+    def test_listed_tags(self):
+        self.assertTrue(matches_entity_tag('"a", "b"', '"b"'))
+        self.assertTrue(matches_entity_tag('"a","b"', '"a"'))
+        self.assertFalse(matches_entity_tag('"a", "b"', '"c"'))
+        self.assertFalse(matches_entity_tag("", '"a"'))
+
+    def test_substring_does_not_match(self):
+        self.assertFalse(matches_entity_tag('"abc"', '"b"'))
+        self.assertFalse(matches_entity_tag('"a-1"', '"a"'))
+
+    def test_any_tag(self):
+        self.assertTrue(matches_entity_tag("*", '"a"'))
+        self.assertTrue(matches_entity_tag(" * ", 'W/"a"'))
+
+    def test_weak_comparison(self):
+        self.assertTrue(matches_entity_tag('W/"a"', '"a"'))
+        self.assertTrue(matches_entity_tag('"a"', 'W/"a"'))
+        self.assertTrue(matches_entity_tag('"b", W/"a"', 'W/"a"'))
+
+    def test_comma_inside_tag(self):
+        self.assertTrue(matches_entity_tag('"a,b", "c"', '"a,b"'))
+        self.assertFalse(matches_entity_tag('"a,b"', '"a"'))
+
+
+class TestParseByteRange(unittest.TestCase):
+    def test_ranges(self):
+        self.assertEqual(parse_byte_range("bytes=0-9", size=100), (0, 9))
+        self.assertEqual(parse_byte_range("bytes=90-", size=100), (90, 99))
+        self.assertEqual(parse_byte_range("bytes=-10", size=100), (90, 99))
+        # ranges exceeding the content are truncated
+        self.assertEqual(parse_byte_range("bytes=-200", size=100), (0, 99))
+        self.assertEqual(parse_byte_range("bytes=50-200", size=100), (50, 99))
+
+    def test_ignored_ranges(self):
+        self.assertIsNone(parse_byte_range("bytes=0-9,20-29", size=100))
+        self.assertIsNone(parse_byte_range("items=0-9", size=100))
+        self.assertIsNone(parse_byte_range("bytes=a-b", size=100))
+
+    def test_unsatisfiable_ranges(self):
+        for range_header in ("bytes=100-", "bytes=20-10", "bytes=-0"):
+            with self.assertRaises(RangeNotSatisfiable):
+                parse_byte_range(range_header, size=100)
+
+
+class TestRangedResponse(unittest.TestCase):
+    content = bytes(range(100))
+    etag = '"abc"'
+
+    def _get_response(self, **headers):
+        request = Request(
+            {
+                "type": "http",
+                "method": "GET",
+                "path": "/",
+                "headers": [
+                    (name.replace("_", "-").encode(), value.encode())
+                    for name, value in headers.items()
+                ],
+            }
+        )
+        return get_ranged_response(
+            request=request,
+            size=len(self.content),
+            content_getter=lambda start, end: self.content[start : end + 1],
+            etag=self.etag,
+            last_modified=0,
+        )
+
+    def test_full_content(self):
+        response = self._get_response()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.body, self.content)
+        self.assertEqual(response.headers["accept-ranges"], "bytes")
+        self.assertEqual(response.headers["etag"], self.etag)
+
+    def test_partial_content(self):
+        response = self._get_response(range="bytes=-10")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.body, self.content[90:])
+        self.assertEqual(response.headers["content-range"], "bytes 90-99/100")
+        response = self._get_response(range="bytes=95-")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.body, self.content[95:])
+        self.assertEqual(response.headers["content-length"], "5")
+
+    def test_unsatisfiable_range(self):
+        response = self._get_response(range="bytes=100-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response.headers["content-range"], "bytes */100")
+
+    def test_multiple_ranges_fall_back_to_full_content(self):
+        response = self._get_response(range="bytes=0-9,20-29")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.body, self.content)
+
+    def test_if_range(self):
+        response = self._get_response(range="bytes=0-9", if_range=self.etag)
+        self.assertEqual(response.status_code, 206)
+        # range is ignored if content changed since it was received
+        response = self._get_response(range="bytes=0-9", if_range='"outdated"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.body, self.content)
+
+    def test_if_none_match(self):
+        for if_none_match in ('"abc"', 'W/"abc"', '"other", "abc"', "*"):
+            response = self._get_response(if_none_match=if_none_match)
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.headers["etag"], self.etag)
+        response = self._get_response(if_none_match='"abcd", W/"ab"')
+        self.assertEqual(response.status_code, 200)
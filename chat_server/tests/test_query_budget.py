@@ -0,0 +1,205 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import asyncio
+import os
+import unittest
+from time import time
+
+from chat_server.app import create_app
+from chat_server.server_config import server_config
+from chat_server.server_utils.auth import AUTHORIZATION_HEADER, generate_session_token
+from chat_server.sio.handlers.translation import request_translate
+from chat_server.tests.utils.query_counter import QueryCounter
+from utils.common import generate_uuid
+from utils.database_utils.mongo_utils import MongoFilter
+from utils.database_utils.mongo_utils.queries.constants import ConversationSkins
+from utils.database_utils.mongo_utils.queries.wrapper import MongoDocumentsAPI
+
+NUM_PROMPTS = 20
+NUM_SHOUTS = 60
+
+
+class TestQueryBudget(unittest.TestCase):
+    """Asserts upper bounds of the database round-trips issued by endpoints and SIO handlers"""
+
+    test_client = None
+    cid = None
+    user_id = None
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        os.environ["DISABLE_AUTH_CHECK"] = "1"
+        cls.test_client = create_app(testing_mode=True)
+        cls.db_controller = server_config.default_db_controller
+        cls.cid = f"test_budget_{generate_uuid()}"
+        cls.user_id = f"test_budget_{generate_uuid()}"
+        MongoDocumentsAPI.USERS.add_item(
+            data={
+                "_id": cls.user_id,
+                "nickname": cls.user_id,
+                "first_name": "Query",
+                "last_name": "Budget",
+                "preferences": {"tts": {}, "chat_language_mapping": {}},
+                "roles": [],
+            }
+        )
+        MongoDocumentsAPI.CHATS.add_item(
+            data={
+                "_id": cls.cid,
+                "conversation_name": cls.cid,
+                "is_private": False,
+                "created_on": int(time()),
+            }
+        )
+        created_on = int(time()) - NUM_SHOUTS
+        for i in range(NUM_SHOUTS):
+            # prompts are among the latest messages, so every page contains some
+            prompt_id = f"{cls.cid}_prompt_{i}" if i >= NUM_SHOUTS - NUM_PROMPTS else ""
+            shout_id = f"{cls.cid}_shout_{i}"
+            MongoDocumentsAPI.SHOUTS.add_item(
+                data={
+                    "_id": shout_id,
+                    "cid": cls.cid,
+                    "user_id": cls.user_id,
+                    "prompt_id": prompt_id,
+                    "message_text": f"Query budget message {i}",
+                    "message_lang": "en",
+                    "translations": {},
+                    "created_on": created_on + i,
+                }
+            )
+            if prompt_id:
+                MongoDocumentsAPI.PROMPTS.add_item(
+                    data={
+                        "_id": prompt_id,
+                        "cid": cls.cid,
+                        "is_completed": "1",
+                        "data": {
+                            "prompt_text": f"Query budget prompt {i}",
+                            "participating_subminds": [cls.user_id],
+                            "proposed_responses": {cls.user_id: shout_id},
+                            "submind_opinions": {},
+                            "votes": {},
+                        },
+                        "created_on": created_on + i,
+                    }
+                )
+        cls.headers = {
+            AUTHORIZATION_HEADER: generate_session_token(user_id=cls.user_id)
+        }
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        for document, filters in (
+            ("shouts", {"cid": cls.cid}),
+            ("prompts", {"cid": cls.cid}),
+            ("chats", {"_id": cls.cid}),
+            ("users", {"_id": cls.user_id}),
+        ):
+            cls.db_controller.exec_query(
+                query={"command": "delete_many", "document": document, "data": filters}
+            )
+
+    def _count_search_queries(self, skin: str, limit: int) -> QueryCounter:
+        with QueryCounter() as counter:
+            response = self.test_client.get(
+                f"/chat_api/search/{self.cid}",
+                params={"skin": skin, "limit_chat_history": limit},
+                headers=self.headers,
+            )
+        self.assertEqual(response.status_code, 200)
+        return counter
+
+    def test_search_prompts_skin(self):
+        small_page = self._count_search_queries(skin=ConversationSkins.PROMPTS, limit=5)
+        large_page = self._count_search_queries(
+            skin=ConversationSkins.PROMPTS, limit=NUM_SHOUTS
+        )
+        self.assertEqual(small_page.count, large_page.count)
+        large_page.assert_max_queries(5)
+
+    def test_search_base_skin(self):
+        small_page = self._count_search_queries(skin=ConversationSkins.BASE, limit=5)
+        large_page = self._count_search_queries(
+            skin=ConversationSkins.BASE, limit=NUM_SHOUTS
+        )
+        self.assertEqual(small_page.count, large_page.count)
+        large_page.assert_max_queries(4)
+
+    def test_save_translations(self):
+        shout_ids = [f"{self.cid}_shout_{i}" for i in range(NUM_SHOUTS)]
+        with QueryCounter() as counter:
+            MongoDocumentsAPI.SHOUTS.save_translations(
+                translation_mapping={
+                    self.cid: {
+                        "lang": "uk",
+                        "shouts": {shout_id: "переклад" for shout_id in shout_ids},
+                    }
+                }
+            )
+        counter.assert_max_queries(2)
+
+    def test_request_translate(self):
+        shout_ids = [f"{self.cid}_shout_{i}" for i in range(NUM_SHOUTS)]
+        MongoDocumentsAPI.SHOUTS.save_translations(
+            translation_mapping={
+                self.cid: {
+                    "lang": "de",
+                    "shouts": {shout_id: "Übersetzung" for shout_id in shout_ids},
+                }
+            }
+        )
+        with QueryCounter() as counter:
+            asyncio.run(
+                request_translate(
+                    sid="test_sid",
+                    data={
+                        "chat_mapping": {
+                            self.cid: {"lang": "de", "shouts": shout_ids},
+                        },
+                        "user": self.user_id,
+                    },
+                )
+            )
+        counter.assert_max_queries(2)
+
+    def test_backfill_translations(self):
+        shout_ids = [f"{self.cid}_shout_{i}" for i in range(NUM_SHOUTS)]
+        # legacy shouts might keep null translations
+        MongoDocumentsAPI.SHOUTS.update_item(
+            filters=[MongoFilter("_id", shout_ids[0])], data={"translations": None}
+        )
+        with QueryCounter() as counter:
+            MongoDocumentsAPI.SHOUTS.backfill_translations(
+                translations={shout_id: "traduction" for shout_id in shout_ids},
+                lang="fr",
+            )
+        counter.assert_max_queries(1)
+        for shout_id in (shout_ids[0], shout_ids[-1]):
+            shout = MongoDocumentsAPI.SHOUTS.get_item(item_id=shout_id)
+            self.assertEqual(shout["translations"]["fr"], "traduction")
@@ -0,0 +1,124 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import time
+import unittest
+
+from chat_server.services.rate_limiter import (
+    RateLimitScopes,
+    RateLimitTiers,
+    SIORateLimiter,
+)
+
+
+class TestSIORateLimiter(unittest.TestCase):
+    def setUp(self):
+        SIORateLimiter.init(
+            config={
+                "ENABLED": True,
+                "HUMAN": {
+                    "SESSION": {"user_message": {"RATE": 100, "BURST": 2}},
+                    "USER": {"user_message": {"RATE": 100, "BURST": 3}},
+                },
+                "BOT": {"USER": {"user_message": {"RATE": 100, "BURST": 1}}},
+            }
+        )
+
+    def tearDown(self):
+        SIORateLimiter.init()
+
+    def test_session_burst(self):
+        self.assertIsNone(SIORateLimiter.acquire(sid="s1", event="user_message"))
+        self.assertIsNone(SIORateLimiter.acquire(sid="s1", event="user_message"))
+        throttle = SIORateLimiter.acquire(sid="s1", event="user_message")
+        self.assertEqual(throttle.scope, RateLimitScopes.SESSION)
+        self.assertEqual(throttle.tier, RateLimitTiers.HUMAN)
+        self.assertGreater(throttle.retry_after, 0)
+        self.assertTrue(throttle.notify)
+        # client is notified once per throttling period
+        self.assertFalse(SIORateLimiter.acquire(sid="s1", event="user_message").notify)
+        # other events have their own buckets
+        self.assertIsNone(SIORateLimiter.acquire(sid="s1", event="request_tts"))
+
+    def test_refill(self):
+        for _ in range(2):
+            SIORateLimiter.acquire(sid="s1", event="user_message")
+        self.assertIsNotNone(SIORateLimiter.acquire(sid="s1", event="user_message"))
+        time.sleep(0.02)
+        self.assertIsNone(SIORateLimiter.acquire(sid="s1", event="user_message"))
+
+    def test_user_limit_is_shared_by_sessions(self):
+        for sid in ("s1", "s2"):
+            SIORateLimiter.register_session(sid=sid, user={"_id": "u1"})
+        self.assertIsNone(SIORateLimiter.acquire(sid="s1", event="user_message"))
+        self.assertIsNone(SIORateLimiter.acquire(sid="s1", event="user_message"))
+        self.assertIsNone(SIORateLimiter.acquire(sid="s2", event="user_message"))
+        throttle = SIORateLimiter.acquire(sid="s2", event="user_message")
+        self.assertEqual(throttle.scope, RateLimitScopes.USER)
+        SIORateLimiter.remove_session(sid="s2")
+        self.assertIsNone(SIORateLimiter.acquire(sid="s2", event="user_message"))
+
+    def test_bot_tier(self):
+        for sid in ("bot_session_1", "bot_session_2"):
+            SIORateLimiter.register_session(
+                sid=sid, user={"_id": "bot_1", "is_bot": "1"}
+            )
+        self.assertEqual(
+            SIORateLimiter.get_session_tier(sid="bot_session_1"), RateLimitTiers.BOT
+        )
+        self.assertIsNone(
+            SIORateLimiter.acquire(sid="bot_session_1", event="user_message")
+        )
+        throttle = SIORateLimiter.acquire(sid="bot_session_2", event="user_message")
+        self.assertEqual(throttle.tier, RateLimitTiers.BOT)
+        self.assertEqual(throttle.scope, RateLimitScopes.USER)
+
+    def test_spoofed_bot_flag(self):
+        # tier is resolved from the session, so the event data can not select it
+        SIORateLimiter.register_session(sid="s1", user={"_id": "u1"})
+        self.assertEqual(
+            SIORateLimiter.get_session_tier(sid="s1"), RateLimitTiers.HUMAN
+        )
+        for _ in range(2):
+            self.assertIsNone(SIORateLimiter.acquire(sid="s1", event="user_message"))
+        throttle = SIORateLimiter.acquire(sid="s1", event="user_message")
+        self.assertEqual(throttle.tier, RateLimitTiers.HUMAN)
+        self.assertEqual(
+            SIORateLimiter.get_session_tier(sid="anonymous"), RateLimitTiers.HUMAN
+        )
+
+    def test_service_session_is_not_limited(self):
+        SIORateLimiter.register_session(
+            sid="observer", user={"_id": "observer", "roles": ["admin"]}
+        )
+        self.assertEqual(
+            SIORateLimiter.get_session_tier(sid="observer"), RateLimitTiers.SERVICE
+        )
+        for event in ("user_message", "tts_response", "stt_response"):
+            for _ in range(500):
+                self.assertIsNone(SIORateLimiter.acquire(sid="observer", event=event))
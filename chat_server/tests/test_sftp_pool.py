@@ -0,0 +1,81 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+
+from chat_server.server_utils.sftp_utils import SFTPConnectionPool
+
+
+class InMemorySFTPConnector:
+    def __init__(self, files: dict):
+        self.files = files
+
+    def read_file_range(self, get_from, start, end, chunk_size=256 * 1024):
+        content = self.files[get_from][start : end + 1]
+        return [
+            content[offset : offset + chunk_size]
+            for offset in range(0, len(content), chunk_size)
+        ]
+
+    def is_healthy(self):
+        return True
+
+    def close(self):
+        pass
+
+
+class TestSFTPConnectionPool(unittest.TestCase):
+    def setUp(self):
+        self.content = bytes(range(100))
+        self.pool = SFTPConnectionPool(
+            connector_factory=lambda: InMemorySFTPConnector({"a": self.content}),
+            max_size=1,
+            acquire_timeout=0.1,
+            stream_window_size=32,
+        )
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_stream_file(self):
+        self.assertEqual(
+            b"".join(self.pool.stream_file("a", chunk_size=10)), self.content
+        )
+        self.assertEqual(
+            b"".join(self.pool.stream_file("a", start=30, end=70)),
+            self.content[30:71],
+        )
+        self.assertEqual(b"".join(self.pool.stream_file("a", start=100)), b"")
+
+    def test_stream_does_not_hold_session(self):
+        stream = self.pool.stream_file("a", chunk_size=10)
+        self.assertEqual(next(stream), self.content[:10])
+        # suspended stream leaves session available for other operations
+        with self.pool.session() as connector:
+            self.assertEqual(connector.read_file_range("a", 0, 0), [b"\x00"])
+        self.assertEqual(b"".join(stream), self.content[10:])
@@ -0,0 +1,259 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import sys
+import unittest
+from unittest import mock
+
+from chat_server.server_utils.sio_schemas import UserMessageEvent
+from chat_server.server_utils.storage import FileStat
+from chat_server.services.audio_claims import AudioClaims
+from chat_server.services.inflight_requests import InFlightRequests
+
+# handlers are imported without loading server configuration, so modules imported here are discarded afterwards
+with mock.patch.dict(sys.modules, {"chat_server.server_config": mock.MagicMock()}):
+    from chat_server.sio import utils as sio_utils
+    from chat_server.sio.handlers import stt, tts, user_message
+
+
+class HandlerTestCase(unittest.IsolatedAsyncioTestCase):
+    handlers = ()
+
+    def setUp(self):
+        InFlightRequests.init()
+        self.shouts = {}
+        self.storage = mock.MagicMock()
+        self.storage.run = mock.AsyncMock(
+            side_effect=lambda func, *args, **kwargs: func(*args, **kwargs)
+        )
+        self.sio = mock.MagicMock(emit=mock.AsyncMock())
+        self.emit_error = mock.AsyncMock()
+        self.emit_audio = mock.AsyncMock()
+        self.mongo_api = mock.MagicMock()
+        self.mongo_api.SHOUTS.get_item.side_effect = lambda item_id: self.shouts.get(
+            item_id
+        )
+        self.mongo_api.SHOUTS.get_audio_location.side_effect = (
+            lambda shout_data: f'audio/{shout_data["message_text"]}'
+        )
+        for handlers in self.handlers:
+            for name, value in {
+                "sio": self.sio,
+                "MongoDocumentsAPI": self.mongo_api,
+                "server_config": mock.MagicMock(storage=self.storage),
+                "emit_error": self.emit_error,
+                "emit_audio": self.emit_audio,
+            }.items():
+                if hasattr(handlers, name):
+                    patcher = mock.patch.object(handlers, name, value)
+                    patcher.start()
+                    self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        InFlightRequests.init()
+
+    def get_emitted(self, event: str) -> list[dict]:
+        return [
+            call.kwargs["data"]
+            for call in self.sio.emit.await_args_list
+            if call.args[0] == event
+        ]
+
+
+class TestRequestSTT(HandlerTestCase):
+    handlers = (stt,)
+
+    def setUp(self):
+        super().setUp()
+        AudioClaims.init(config={"ENABLED": True, "MIN_BYTES": 10}, secret="secret")
+        self.shouts["m1"] = {
+            "_id": "m1",
+            "is_audio": "1",
+            "message_text": "m1_audio.wav",
+        }
+        self.storage.stat.return_value = FileStat(size=100, last_modified=0)
+
+    def tearDown(self):
+        super().tearDown()
+        AudioClaims.init()
+
+    async def test_stored_audio_is_passed_by_claim(self):
+        await stt.request_stt("sid", {"cid": "cid", "message_id": "m1"})
+        (request,) = self.get_emitted("get_stt")
+        self.assertEqual(request["message_id"], "m1")
+        self.assertEqual(
+            AudioClaims.resolve_claim(
+                claim=request["audio_claim"], action=stt.ClaimActions.READ
+            ),
+            "audio/m1_audio.wav",
+        )
+        # repeated request waits for the pending one
+        await stt.request_stt("other-sid", {"cid": "cid", "message_id": "m1"})
+        self.assertEqual(len(self.get_emitted("get_stt")), 1)
+
+    async def test_stored_audio_is_read_through_cache(self):
+        AudioClaims.init()
+        self.mongo_api.SHOUTS.fetch_audio_data.return_value = b"audio"
+        await stt.request_stt("sid", {"cid": "cid", "message_id": "m1"})
+        self.storage.run.assert_awaited_once_with(
+            self.mongo_api.SHOUTS.fetch_audio_data, message_id="m1"
+        )
+        self.assertEqual(self.emit_audio.await_args.kwargs["audio"], b"audio")
+
+    async def test_stored_transcript(self):
+        self.shouts["m1"]["transcripts"] = {"en": "hello"}
+        await stt.request_stt("sid", {"cid": "cid", "message_id": "m1"})
+        self.assertEqual(self.get_emitted("incoming_stt")[0]["message_text"], "hello")
+        self.assertEqual(self.get_emitted("get_stt"), [])
+
+    async def test_missing_message(self):
+        await stt.request_stt("sid", {"cid": "cid", "message_id": "unknown"})
+        self.emit_error.assert_awaited_once()
+        self.assertEqual(self.get_emitted("get_stt"), [])
+
+
+class TestTTSResponse(HandlerTestCase):
+    handlers = (tts,)
+
+    def setUp(self):
+        super().setUp()
+        self.shouts["m1"] = {"_id": "m1", "message_text": "hello"}
+        for sid in ("sid", "other-sid"):
+            InFlightRequests.attach(
+                key=InFlightRequests.build_key(
+                    kind=tts.RequestKinds.TTS, message_id="m1", lang="en"
+                ),
+                waiter=sid,
+            )
+
+    def assert_waiters_notified(self):
+        self.emit_error.assert_awaited_once()
+        self.assertEqual(
+            self.emit_error.await_args.kwargs["sids"], ["sid", "other-sid"]
+        )
+        self.emit_audio.assert_not_awaited()
+        # pending request is resolved, so the next one is sent again
+        self.assertTrue(
+            InFlightRequests.attach(
+                key=InFlightRequests.build_key(
+                    kind=tts.RequestKinds.TTS, message_id="m1", lang="en"
+                ),
+                waiter="sid",
+            )
+        )
+
+    async def test_missing_message(self):
+        self.shouts.clear()
+        await tts.tts_response(
+            "observer", {"context": {"message_id": "m1"}, "audio_data": "YQ=="}
+        )
+        self.assert_waiters_notified()
+
+    async def test_empty_audio(self):
+        await tts.tts_response("observer", {"context": {"message_id": "m1"}})
+        self.assert_waiters_notified()
+
+    async def test_failure_is_not_broadcast(self):
+        await tts.tts_response("observer", {"context": {"message_id": "unknown"}})
+        self.emit_error.assert_not_awaited()
+        self.sio.emit.assert_not_awaited()
+
+
+class TestUserMessageLogSummary(unittest.TestCase):
+    def test_audio_is_not_logged(self):
+        data = UserMessageEvent.model_validate(
+            {
+                "cid": "cid",
+                "userID": "user",
+                "messageText": b"audio" * 10,
+                "isAudio": "1",
+                "messageTTS": {"en": {"female": "dHRz"}},
+            }
+        )
+        summary = user_message._get_log_summary(data=data)
+        self.assertNotIn("message_text", summary)
+        self.assertNotIn("message_tts", summary)
+        self.assertEqual(summary["audio_size"], 50)
+        self.assertEqual(summary["tts_langs"], ["en"])
+
+    def test_text_is_logged(self):
+        data = UserMessageEvent.model_validate(
+            {"cid": "cid", "userID": "user", "messageText": "hello"}
+        )
+        self.assertEqual(
+            user_message._get_log_summary(data=data)["message_text"], "hello"
+        )
+
+
+class TestEmitAudio(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.sio = mock.MagicMock(emit=mock.AsyncMock())
+        self.sio.manager.rooms = {"/": {sio_utils.BINARY_AUDIO_ROOM: {"binary": None}}}
+        patcher = mock.patch.object(sio_utils, "sio", self.sio)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get_emits(self) -> list[tuple[dict, dict]]:
+        return [
+            (call.kwargs.pop("data"), call.kwargs)
+            for call in self.sio.emit.await_args_list
+        ]
+
+    async def test_emit_to_sessions(self):
+        await sio_utils.emit_audio(
+            "incoming_tts", data={"cid": "cid"}, audio=b"audio", to=["binary", "text"]
+        )
+        self.assertEqual(
+            self.get_emits(),
+            [
+                ({"cid": "cid", "audio_data": b"audio"}, {"to": ["binary"]}),
+                ({"cid": "cid", "audio_data": "YXVkaW8="}, {"to": ["text"]}),
+            ],
+        )
+
+    async def test_broadcast(self):
+        await sio_utils.emit_audio(
+            "incoming_tts", data={"cid": "cid"}, audio=b"audio", audio_key="audio"
+        )
+        self.assertEqual(
+            self.get_emits(),
+            [
+                (
+                    {"cid": "cid", "audio": b"audio"},
+                    {"to": sio_utils.BINARY_AUDIO_ROOM},
+                ),
+                ({"cid": "cid", "audio": "YXVkaW8="}, {"skip_sid": ["binary"]}),
+            ],
+        )
+
+    async def test_broadcast_without_binary_sessions(self):
+        self.sio.manager.rooms = {}
+        await sio_utils.emit_audio("incoming_tts", data={}, audio=b"audio")
+        self.assertEqual(
+            self.get_emits(), [({"audio_data": "YXVkaW8="}, {"skip_sid": None})]
+        )
@@ -0,0 +1,93 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+
+from pydantic import ValidationError
+
+from chat_server.server_utils.sio_schemas import (
+    PromptCompletedEvent,
+    TranslateRequestEvent,
+    UserMessageEvent,
+)
+from utils.database_utils.mongo_utils.queries.dao.prompts import PromptStates
+
+
+class TestSIOSchemas(unittest.TestCase):
+    def test_user_message_normalization(self):
+        event = UserMessageEvent.model_validate(
+            {
+                "cid": "cid",
+                "userID": "user",
+                "messageText": "hello",
+                "messageID": "client_message_id",
+                "bot": "1",
+                "isAnnouncement": "",
+                "promptID": "prompt",
+                "promptState": 1,
+                "timeCreated": "1700000000.7",
+                "messageTTS": {"en": {"female": "YXVkaW8="}},
+            }
+        )
+        self.assertTrue(event.is_bot)
+        self.assertFalse(event.is_audio)
+        self.assertFalse(event.is_announcement)
+        self.assertEqual(event.prompt_state, PromptStates.RESP)
+        self.assertEqual(event.time_created, 1700000000)
+
+        envelope = event.model_dump(by_alias=True)
+        self.assertEqual(envelope["is_bot"], "1")
+        self.assertEqual(envelope["isAnnouncement"], "0")
+        self.assertEqual(envelope["prompt_id"], "prompt")
+        # undeclared keys are forwarded, stored TTS is not
+        self.assertEqual(envelope["messageID"], "client_message_id")
+        self.assertNotIn("messageTTS", envelope)
+        self.assertNotIn("message_tts", envelope)
+
+    def test_user_message_audio(self):
+        event = UserMessageEvent.model_validate(
+            {"cid": "cid", "userID": "user", "messageText": b"\x00", "isAudio": "1"}
+        )
+        self.assertTrue(event.is_audio)
+        self.assertEqual(event.message_text, b"\x00")
+        self.assertGreater(event.time_created, 0)
+
+    def test_malformed_payloads(self):
+        for model, payload in (
+            (UserMessageEvent, None),
+            (UserMessageEvent, {"cid": "cid", "messageText": "hello"}),
+            # prompt messages have to declare the state of the prompt
+            (
+                UserMessageEvent,
+                {"cid": "cid", "userID": "user", "messageText": "hi", "promptID": "p"},
+            ),
+            (TranslateRequestEvent, {"chat_mapping": {"cid": "en"}}),
+            (PromptCompletedEvent, {"context": {"winner": "neon"}}),
+        ):
+            with self.assertRaises(ValidationError):
+                model.model_validate(payload)
@@ -0,0 +1,68 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+
+import msgpack
+from socketio import packet
+
+from chat_server.server_utils.enums import SIOSerializers
+from chat_server.server_utils.sio_serializers import (
+    MsgPackPacket,
+    convert_packet,
+    encode_eio_packets,
+    get_requested_serializer,
+)
+
+
+class TestSIOSerializers(unittest.TestCase):
+    def test_get_requested_serializer(self):
+        for query_string, serializer in (
+            ("EIO=4&transport=websocket", SIOSerializers.JSON),
+            ("EIO=4&serializer=msgpack", SIOSerializers.MSGPACK),
+            ("serializer=MsgPack", SIOSerializers.MSGPACK),
+            ("serializer=pickle", SIOSerializers.JSON),
+        ):
+            self.assertEqual(
+                get_requested_serializer({"QUERY_STRING": query_string}), serializer
+            )
+        self.assertEqual(get_requested_serializer({}), SIOSerializers.JSON)
+
+    def test_convert_binary_packet(self):
+        pkt = packet.Packet(packet.EVENT, data=["audio", {"audio_data": b"\x00\x01"}])
+        self.assertEqual(pkt.packet_type, packet.BINARY_EVENT)
+        self.assertEqual(len(encode_eio_packets(pkt)), 2)
+
+        msgpack_pkt = convert_packet(pkt, packet_class=MsgPackPacket)
+        self.assertIsInstance(msgpack_pkt, MsgPackPacket)
+        self.assertEqual(msgpack_pkt.packet_type, packet.EVENT)
+        (eio_pkt,) = encode_eio_packets(msgpack_pkt)
+        self.assertEqual(
+            msgpack.loads(eio_pkt.data)["data"], ["audio", {"audio_data": b"\x00\x01"}]
+        )
+        self.assertIs(convert_packet(pkt, packet_class=packet.Packet), pkt)
@@ -0,0 +1,431 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from chat_server.server_utils.storage import (
+    CachedStorage,
+    ContentAddressedStorage,
+    FileIndex,
+    LocalStorage,
+    S3Storage,
+)
+
+try:
+    from moto import mock_aws
+except ModuleNotFoundError:
+    mock_aws = None
+
+
+class ChunkedReader:
+    """File-like object returning at most "chunk_size" bytes per read, as upload streams do"""
+
+    def __init__(self, data: bytes, chunk_size: int = 1000):
+        self._buffer = io.BytesIO(data)
+        self.chunk_size = chunk_size
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0 or size > self.chunk_size:
+            size = self.chunk_size
+        return self._buffer.read(size)
+
+
+class CountingStorage(LocalStorage):
+    """Local storage standing in for the remote backend, counts performed reads"""
+
+    def __init__(self, root_path: str):
+        super().__init__(root_path=root_path)
+        self.num_reads = 0
+
+    def stream(self, location: str, start: int = 0, end: int = None):
+        self.num_reads += 1
+        return super().stream(location=location, start=start, end=end)
+
+
+class TestLocalStorage(unittest.TestCase):
+    def setUp(self):
+        self.root_path = tempfile.mkdtemp()
+        self.storage = LocalStorage(root_path=self.root_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.root_path, ignore_errors=True)
+
+    def test_put_stream_stat_delete(self):
+        data = os.urandom(5000)
+        file_stat = self.storage.put("avatars/a.png", ChunkedReader(data))
+        self.assertEqual(file_stat.size, len(data))
+        self.assertEqual(self.storage.stat("avatars/a.png").size, len(data))
+        self.assertEqual(self.storage.get("avatars/a.png"), data)
+        self.assertEqual(
+            b"".join(self.storage.stream("avatars/a.png", start=10, end=1999)),
+            data[10:2000],
+        )
+        self.storage.delete("avatars/a.png")
+        self.assertFalse(self.storage.exists("avatars/a.png"))
+        # deleting missing file is a no-op
+        self.storage.delete("avatars/a.png")
+
+    def test_failed_put_leaves_no_file(self):
+        class FailingReader(ChunkedReader):
+            def read(self, size=-1):
+                raise RuntimeError("upload aborted")
+
+        with self.assertRaises(RuntimeError):
+            self.storage.put("attachments/a.txt", FailingReader(b""))
+        self.assertEqual(os.listdir(os.path.join(self.root_path, "attachments")), [])
+
+    def test_location_outside_of_root(self):
+        with self.assertRaises(ValueError):
+            self.storage.stat("../secret")
+
+
+class TestCachedStorage(unittest.TestCase):
+    def setUp(self):
+        self.remote_path = tempfile.mkdtemp()
+        self.cache_path = tempfile.mkdtemp()
+        self.remote = CountingStorage(root_path=self.remote_path)
+        self.storage = CachedStorage(
+            backend=self.remote,
+            location=self.cache_path,
+            max_bytes=3000,
+            max_file_bytes=2000,
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.remote_path, ignore_errors=True)
+        shutil.rmtree(self.cache_path, ignore_errors=True)
+
+    def test_read_through(self):
+        data = os.urandom(1000)
+        self.remote.put("attachments/a", ChunkedReader(data))
+        self.assertEqual(self.storage.get("attachments/a"), data)
+        self.assertEqual(self.storage.get("attachments/a"), data)
+        self.assertEqual(
+            b"".join(self.storage.stream("attachments/a", start=100, end=199)),
+            data[100:200],
+        )
+        self.assertEqual(self.remote.num_reads, 1)
+        self.assertEqual(self.storage.used_bytes, len(data))
+
+    def test_range_miss_fills_cache(self):
+        data = os.urandom(1000)
+        self.remote.put("attachments/a", ChunkedReader(data))
+        self.assertEqual(
+            b"".join(self.storage.stream("attachments/a", start=500, end=599)),
+            data[500:600],
+        )
+        self.assertTrue(self.storage.is_cached("attachments/a"))
+
+    def test_interrupted_read_is_not_cached(self):
+        self.remote.put("attachments/a", ChunkedReader(os.urandom(1000)))
+        self.storage.chunk_size = self.remote.chunk_size = 100
+        chunks = self.storage.stream("attachments/a")
+        next(chunks)
+        chunks.close()
+        self.assertFalse(self.storage.is_cached("attachments/a"))
+        self.assertEqual(os.listdir(self.cache_path), [])
+
+    def test_write_through(self):
+        data = os.urandom(1000)
+        self.storage.put("avatars/a", ChunkedReader(data))
+        self.assertEqual(self.remote.get("avatars/a"), data)
+        self.assertEqual(self.storage.get("avatars/a"), data)
+        self.assertEqual(self.remote.num_reads, 1)
+
+    def test_lru_eviction_by_bytes(self):
+        for name in ("a", "b", "c"):
+            self.storage.put(name, ChunkedReader(os.urandom(1000)))
+        # "a" becomes the most recently used, so "b" is evicted next
+        self.storage.get("a")
+        self.storage.put("d", ChunkedReader(os.urandom(1000)))
+        self.assertTrue(self.storage.is_cached("a"))
+        self.assertFalse(self.storage.is_cached("b"))
+        self.assertLessEqual(self.storage.used_bytes, 3000)
+
+    def test_large_files_bypass_cache(self):
+        data = os.urandom(2500)
+        self.storage.put("attachments/large", ChunkedReader(data))
+        self.assertFalse(self.storage.is_cached("attachments/large"))
+        self.assertEqual(self.storage.get("attachments/large"), data)
+        self.assertFalse(self.storage.is_cached("attachments/large"))
+
+    def test_delete(self):
+        self.storage.put("avatars/a", ChunkedReader(os.urandom(1000)))
+        self.storage.delete("avatars/a")
+        self.assertFalse(self.storage.is_cached("avatars/a"))
+        self.assertFalse(self.remote.exists("avatars/a"))
+        self.assertEqual(self.storage.used_bytes, 0)
+
+    def test_index_restored_after_restart(self):
+        data = os.urandom(1000)
+        self.storage.put("avatars/a", ChunkedReader(data))
+        restarted_storage = CachedStorage(
+            backend=self.remote, location=self.cache_path, max_bytes=3000
+        )
+        self.assertTrue(restarted_storage.is_cached("avatars/a"))
+        self.assertEqual(restarted_storage.get("avatars/a"), data)
+        self.assertEqual(restarted_storage.stat("avatars/a").size, len(data))
+        self.assertEqual(self.remote.num_reads, 0)
+
+
+class InMemoryFileIndex(FileIndex):
+    def __init__(self):
+        self.files = {}
+        self.blobs = {}
+        self.refused_blobs = set()
+
+    def resolve(self, location):
+        return self.files.get(location)
+
+    def add_blob(self, sha256, size):
+        blob = self.blobs.get(sha256)
+        if blob and blob.get("collecting_until", 0) > time.time():
+            self.refused_blobs.add(sha256)
+            return False
+        if blob:
+            blob.pop("collecting_until", None)
+            blob["released_on"] = time.time()
+        else:
+            self.blobs[sha256] = {
+                "size": size,
+                "ref_count": 0,
+                "released_on": time.time(),
+            }
+        return True
+
+    def add_reference(self, location, sha256):
+        previous_sha256 = self.files.get(location)
+        if previous_sha256 == sha256:
+            return True
+        blob = self.blobs.get(sha256)
+        if not blob or "collecting_until" in blob:
+            return False
+        blob["ref_count"] += 1
+        self.files[location] = sha256
+        if previous_sha256:
+            self._release(previous_sha256)
+        return True
+
+    def _release(self, sha256):
+        self.blobs[sha256]["ref_count"] -= 1
+        self.blobs[sha256]["released_on"] = time.time()
+
+    def remove_reference(self, location):
+        sha256 = self.files.pop(location, None)
+        if sha256:
+            self._release(sha256)
+        return sha256
+
+    def list_unreferenced_blobs(self, released_before, limit):
+        return [
+            sha256
+            for sha256, blob in self.blobs.items()
+            if blob["ref_count"] <= 0
+            and blob["released_on"] < released_before
+            and blob.get("collecting_until", 0) <= time.time()
+        ][:limit]
+
+    def lease_blob(self, sha256, released_before, lease_duration):
+        if sha256 in self.list_unreferenced_blobs(released_before, limit=None):
+            self.blobs[sha256]["collecting_until"] = time.time() + lease_duration
+            return self.blobs[sha256]["collecting_until"]
+        return None
+
+    def remove_blob(self, sha256, leased_until):
+        blob = self.blobs.get(sha256)
+        if blob and blob.get("collecting_until") == leased_until:
+            del self.blobs[sha256]
+            return True
+        return False
+
+
+class TestContentAddressedStorage(unittest.TestCase):
+    def setUp(self):
+        self.remote_path = tempfile.mkdtemp()
+        self.remote = CountingStorage(root_path=self.remote_path)
+        self.index = InMemoryFileIndex()
+        self.storage = ContentAddressedStorage(backend=self.remote, index=self.index)
+
+    def tearDown(self):
+        shutil.rmtree(self.remote_path, ignore_errors=True)
+
+    def _list_blobs(self) -> list[str]:
+        return [
+            name
+            for _, _, names in os.walk(os.path.join(self.remote_path, "blobs"))
+            for name in names
+        ]
+
+    def test_same_content_is_stored_once(self):
+        data = os.urandom(3000)
+        for i in range(5):
+            file_stat = self.storage.put(f"attachments/{i}.png", ChunkedReader(data))
+        self.assertEqual(len(self._list_blobs()), 1)
+        self.assertEqual(file_stat.size, len(data))
+        for i in range(5):
+            self.assertEqual(self.storage.get(f"attachments/{i}.png"), data)
+        (blob,) = self.index.blobs.values()
+        self.assertEqual(blob["ref_count"], 5)
+        # content hash serves as entity tag
+        self.assertEqual(
+            self.storage.stat("attachments/0.png").etag,
+            self.storage.stat("attachments/4.png").etag,
+        )
+
+    def test_legacy_files_keep_resolving(self):
+        data = os.urandom(1000)
+        self.remote.put("avatars/legacy.png", ChunkedReader(data))
+        self.assertEqual(self.storage.get("avatars/legacy.png"), data)
+        self.assertEqual(self.storage.stat("avatars/legacy.png").size, len(data))
+        self.storage.delete("avatars/legacy.png")
+        # files stored before deduplication are deleted as is
+        self.assertFalse(self.remote.exists("avatars/legacy.png"))
+
+    def test_stream_refreshes_outdated_location(self):
+        other_instance = ContentAddressedStorage(backend=self.remote, index=self.index)
+        self.storage.put("audio/a.wav", ChunkedReader(b"first"))
+        self.assertEqual(b"".join(self.storage.stream("audio/a.wav")), b"first")
+        other_instance.put("audio/a.wav", ChunkedReader(b"second"))
+        self.assertEqual(other_instance.collect_garbage(grace_period=0), 1)
+        self.assertEqual(
+            b"".join(self.storage.stream("audio/a.wav", start=1, end=3)), b"eco"
+        )
+
+    def test_garbage_collection(self):
+        shared, unique = os.urandom(1000), os.urandom(1000)
+        self.storage.put("attachments/a", ChunkedReader(shared))
+        self.storage.put("attachments/b", ChunkedReader(shared))
+        self.storage.put("avatars/c", ChunkedReader(unique))
+        self.storage.delete("attachments/a")
+        self.storage.delete("avatars/c")
+        # unreferenced blobs are kept during the grace period
+        self.assertEqual(self.storage.collect_garbage(grace_period=60), 0)
+        self.assertEqual(self.storage.collect_garbage(grace_period=0), 1)
+        self.assertEqual(len(self._list_blobs()), 1)
+        self.assertEqual(self.storage.get("attachments/b"), shared)
+        with self.assertRaises(FileNotFoundError):
+            self.storage.get("avatars/c")
+
+    def test_put_during_garbage_collection(self):
+        data = os.urandom(1000)
+        self.storage.put("attachments/a", ChunkedReader(data))
+        self.storage.delete("attachments/a")
+        self.storage.lease_poll_interval = 0.01
+        put_thread = threading.Thread(
+            target=self.storage.put, args=("attachments/b", ChunkedReader(data))
+        )
+        delete_blob = self.remote.delete
+
+        def delete(location):
+            # same content is uploaded while its blob is being collected
+            put_thread.start()
+            while not self.index.refused_blobs:
+                time.sleep(0.01)
+            delete_blob(location)
+
+        self.remote.delete = delete
+        self.assertEqual(self.storage.collect_garbage(grace_period=0), 1)
+        put_thread.join(timeout=5)
+        self.assertEqual(self.storage.get("attachments/b"), data)
+        self.assertEqual(len(self._list_blobs()), 1)
+
+    def test_put_waits_for_collection_within_timeout(self):
+        data = b"data"
+        self.storage.put("attachments/a", ChunkedReader(data))
+        self.storage.delete("attachments/a")
+        sha256 = next(iter(self.index.blobs))
+        self.index.lease_blob(sha256, released_before=time.time(), lease_duration=60)
+        self.storage.lease_wait_timeout = 0.05
+        self.storage.lease_poll_interval = 0.01
+        with self.assertRaises(TimeoutError):
+            self.storage.put("attachments/b", ChunkedReader(data))
+        self.assertIsNone(self.index.resolve("attachments/b"))
+
+    def test_expired_lease_is_not_collected(self):
+        self.storage.put("attachments/a", ChunkedReader(b"data"))
+        self.storage.delete("attachments/a")
+        self.storage.collection_lease = 0
+        self.assertEqual(self.storage.collect_garbage(grace_period=0), 0)
+        self.assertEqual(len(self._list_blobs()), 1)
+        self.storage.collection_lease = 60
+        self.assertEqual(self.storage.collect_garbage(grace_period=0), 1)
+        self.assertEqual(self._list_blobs(), [])
+
+    def test_replaced_content_releases_previous_blob(self):
+        self.storage.put("audio/a.wav", ChunkedReader(b"first"))
+        self.storage.put("audio/a.wav", ChunkedReader(b"second"))
+        self.assertEqual(self.storage.get("audio/a.wav"), b"second")
+        self.assertEqual(self.storage.collect_garbage(grace_period=0), 1)
+        self.assertEqual(self.storage.get("audio/a.wav"), b"second")
+
+
+@unittest.skipIf(mock_aws is None, "moto is not installed")
+class TestS3Storage(unittest.TestCase):
+    def setUp(self):
+        self.mock = mock_aws()
+        self.mock.start()
+        self.storage = S3Storage(
+            bucket="klat-test",
+            prefix="files",
+            region="us-east-1",
+            access_key="test",
+            secret_key="test",
+            multipart_chunk_size=5 * 1024 * 1024,
+        )
+        self.storage.client.create_bucket(Bucket="klat-test")
+
+    def tearDown(self):
+        self.mock.stop()
+
+    def test_put_stream_stat_delete(self):
+        data = os.urandom(5000)
+        file_stat = self.storage.put("avatars/a.png", ChunkedReader(data))
+        self.assertEqual(file_stat.size, len(data))
+        self.assertTrue(file_stat.etag)
+        self.assertEqual(self.storage.get("avatars/a.png"), data)
+        self.assertEqual(
+            b"".join(self.storage.stream("avatars/a.png", start=10, end=1999)),
+            data[10:2000],
+        )
+        self.storage.delete("avatars/a.png")
+        with self.assertRaises(FileNotFoundError):
+            self.storage.stat("avatars/a.png")
+        with self.assertRaises(FileNotFoundError):
+            self.storage.get("avatars/a.png")
+
+    def test_multipart_upload_of_chunked_stream(self):
+        data = os.urandom(11 * 1024 * 1024)
+        self.storage.put("attachments/large", ChunkedReader(data, chunk_size=64 * 1024))
+        self.assertEqual(self.storage.stat("attachments/large").size, len(data))
+        self.assertEqual(self.storage.get("attachments/large"), data)
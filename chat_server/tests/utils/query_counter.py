@@ -0,0 +1,94 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+from collections import Counter
+from unittest import mock
+
+from utils.database_utils import DatabaseController
+from utils.database_utils.mongo_utils import MongoQuery
+
+
+class QueryCounter:
+    """
+    Context manager recording database queries issued via DatabaseController.exec_query
+
+    Example:
+    ```
+        with QueryCounter() as counter:
+            test_client.get("/chat_api/search/1")
+        counter.assert_max_queries(5)
+    ```
+    """
+
+    def __init__(self):
+        self.queries: list[tuple[str, str]] = []
+        self._patcher = None
+
+    def __enter__(self):
+        original_exec_query = DatabaseController.exec_query
+        counter = self
+
+        def exec_query(controller, query, *args, **kwargs):
+            counter.record(query=query)
+            return original_exec_query(controller, query, *args, **kwargs)
+
+        self._patcher = mock.patch.object(DatabaseController, "exec_query", exec_query)
+        self._patcher.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._patcher.stop()
+
+    def record(self, query: MongoQuery | dict):
+        """Records executed query as a tuple of (document, command)"""
+        if isinstance(query, MongoQuery):
+            document = getattr(query.document, "value", query.document)
+            command = getattr(query.command, "value", query.command)
+        else:
+            document = query.get("document")
+            command = query.get("command", "find")
+        self.queries.append((str(document), str(command)))
+
+    @property
+    def count(self) -> int:
+        """Number of recorded queries"""
+        return len(self.queries)
+
+    def summary(self) -> Counter:
+        """Number of recorded queries per (document, command)"""
+        return Counter(self.queries)
+
+    def assert_max_queries(self, max_queries: int):
+        """
+        Asserts that number of recorded queries does not exceed provided budget
+
+        :param max_queries: max allowed number of queries
+        """
+        assert self.count <= max_queries, (
+            f"Expected at most {max_queries} queries, got {self.count}: "
+            f"{dict(self.summary())}"
+        )
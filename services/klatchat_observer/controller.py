@@ -26,6 +26,7 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import base64
 import cachetools.func
 import http
 import re
@@ -99,13 +100,18 @@ class ChatObserver(MQConnector):
             Recipients.CHATBOT_CONTROLLER: self._handle_chatbot_recipient,
         }
         self.sio_url = config["SIO_URL"]
+        # "msgpack" reduces CPU and traffic spent on Socket.IO packets, requires server supporting it
+        self.sio_serializer = config.get("SIO_SERIALIZER", "json")
 
-        self._sio: socketio.Client = socketio.Client()
+        self._sio: socketio.Client = socketio.Client(
+            serializer="msgpack" if self.sio_serializer == "msgpack" else "default")
         self.sio_connecting = False
         self.sio_queued_messages = Queue(maxsize=256)
         self.register_sio_handlers()
 
         self.server_url = self.sio_url
+        # if enabled, Neon services redeem audio claims on their own, otherwise observer redeems them
+        self.forward_audio_claims = config.get("FORWARD_AUDIO_CLAIMS", False)
         self._klat_session_token = None
         self.klat_auth_credentials = config.get("KLAT_AUTH_CREDENTIALS", {})
         self._klat_nano_token = config.get("KLAT_NANO_TOKEN", {})
@@ -369,7 +375,7 @@ class ChatObserver(MQConnector):
         self.sio_connecting = True
         try:
             self._sio.connect(
-                url=self.sio_url,
+                url=self.sio_connection_url,
                 namespaces=["/"],
                 headers={
                     "session": self._klat_session_token,
@@ -392,6 +398,14 @@ class ChatObserver(MQConnector):
                 self._sio_emit(**self.sio_queued_messages.get())
                 time.sleep(0.1)
 
+    @property
+    def sio_connection_url(self) -> str:
+        """URL of Socket.IO server, negotiating serializer of the packets"""
+        if self.sio_serializer != "msgpack":
+            return self.sio_url
+        separator = "&" if "?" in self.sio_url else "?"
+        return f"{self.sio_url}{separator}serializer=msgpack"
+
     @property
     def sio(self):
         """
@@ -448,11 +462,18 @@ class ChatObserver(MQConnector):
                 "context": {"sender_context": msg_data},
             }
         elif requested_skill == "stt":
-            request_dict = {
-                "data": {
-                    "audio_data": msg_data.pop("audio_data", msg_data["message_body"]),
+            if audio_url := msg_data.pop("audio_url", None):
+                request_dict = {
+                    "data": {
+                        "audio_url": audio_url,
+                    }
+                }
+            else:
+                request_dict = {
+                    "data": {
+                        "audio_data": msg_data.pop("audio_data", msg_data["message_body"]),
+                    }
                 }
-            }
         else:
             request_dict = {
                 "data": {
@@ -494,6 +515,11 @@ class ChatObserver(MQConnector):
                 "username": msg_data.pop("nick", "guest"),
             },
         }
+        if audio_claim := msg_data.get("audio_claim"):
+            # echoed back with the response to reference the audio uploaded by the claim
+            request_dict["context"]["audio_claim"] = audio_claim
+            if self.forward_audio_claims:
+                request_dict["context"]["audio_upload_url"] = self.get_audio_claim_url(audio_claim)
         input_queue = "neon_chat_api_request"
         if self.neon_detection_enabled:
             neon_service_id = self.neon_service_id
@@ -525,12 +551,48 @@ class ChatObserver(MQConnector):
                 f"{recipient_data=}"
             )
 
+    def get_audio_claim_url(self, audio_claim: str) -> str:
+        """Builds URL redeeming the audio claim on Klat Server"""
+        return f"{self.server_url}/files/claims/{audio_claim}"
+
     def handle_get_stt(self, data):
         """Handler for get STT request from Socket IO channel"""
         data["recipient"] = Recipients.NEON
         data["requested_skill"] = "stt"
+        if audio_claim := data.pop("audio_claim", None):
+            audio_url = self.get_audio_claim_url(audio_claim)
+            if self.forward_audio_claims:
+                data["audio_url"] = audio_url
+            else:
+                try:
+                    response = requests.get(url=audio_url, timeout=30)
+                except requests.RequestException as ex:
+                    LOG.error(f"Failed to fetch claimed audio - {ex}")
+                    return self._emit_failed_stt(data=data)
+                if not response.ok:
+                    LOG.error(
+                        f"Failed to fetch claimed audio: [{response.status_code}] {response.text}"
+                    )
+                    return self._emit_failed_stt(data=data)
+                data["audio_data"] = base64.b64encode(response.content).decode("utf-8")
         self.handle_message(data=data)
 
+    def _emit_failed_stt(self, data: dict):
+        """Responds to the STT request which could not be processed, so its requesters stop waiting"""
+        self._sio_emit(
+            "stt_response",
+            data={
+                "lang": data.get("lang"),
+                "transcript": "",
+                "success": False,
+                "context": {
+                    "cid": data.get("cid"),
+                    "sid": data.get("sid"),
+                    "message_id": data.get("message_id"),
+                },
+            },
+        )
+
     def handle_get_tts(self, data):
         """Handler for get TTS request from Socket IO channel"""
         data["recipient"] = Recipients.NEON
@@ -836,8 +898,33 @@ class ChatObserver(MQConnector):
     def on_tts_response(self, body: dict):
         """Handles receiving TTS response"""
         LOG.debug(f"Received TTS Response: {body}")
+        audio_claim = body.get("context", {}).get("audio_claim")
+        if audio_claim and body.get("audio_data"):
+            self._upload_claimed_audio(body=body, audio_claim=audio_claim)
         self._sio_emit("tts_response", data=body)
 
+    def _upload_claimed_audio(self, body: dict, audio_claim: str):
+        """
+        Uploads audio of the response by the claim, so only the claim is emitted to Klat Server.
+        Audio is emitted inline if upload fails.
+        """
+        try:
+            response = requests.put(
+                url=self.get_audio_claim_url(audio_claim),
+                data=base64.b64decode(body["audio_data"]),
+                headers={"Content-Type": "audio/wav"},
+                timeout=30,
+            )
+        except requests.RequestException as ex:
+            LOG.warning(f"Failed to upload claimed audio - {ex}")
+            return
+        if response.ok:
+            body.pop("audio_data")
+        else:
+            LOG.warning(
+                f"Failed to upload claimed audio: [{response.status_code}] {response.text}"
+            )
+
     @create_mq_callback()
     def on_subminds_state(self, body: dict):
         """Handles receiving subminds state message"""
@@ -0,0 +1,369 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+Synthetic dataset generator seeding MongoDB with production-like volumes of Klatchat data
+
+Usage:
+    python -m tests.load.dataset --host 127.0.0.1 --port 27017 --database klatchat_load \
+        --users 1000 --chats 300 --shouts 200000 --prompts 5000 --personas 50
+"""
+import argparse
+import json
+import random
+from time import time
+
+from utils.common import get_hash
+from utils.database_utils import DatabaseController
+from utils.database_utils.mongo_utils import MongoCommands, MongoDocuments
+from utils.logging_utils import LOG
+
+DATASET_PREFIX = "load"
+DEFAULT_PASSWORD = "LoadTest123!"
+SUPPORTED_LANGS = ("en", "uk", "de", "es", "fr", "ru", "pl", "it")
+# probability of the message being in English, the rest is distributed among SUPPORTED_LANGS
+ENGLISH_SHARE = 0.7
+BOTS_SHARE = 0.1
+TRANSLATED_SHARE = 0.3
+AUDIO_SHARE = 0.05
+ATTACHMENTS_SHARE = 0.03
+PRIVATE_CHATS_SHARE = 0.2
+WORDS = (
+    "hello neon how are you today what about weather news music translate "
+    "please tell me more about this topic that sounds great thanks answer question "
+    "why when where who prompt opinion vote response idea friend chat"
+).split()
+
+
+def user_id(index: int) -> str:
+    return f"{DATASET_PREFIX}_user_{index}"
+
+
+def chat_id(index: int) -> str:
+    return f"{DATASET_PREFIX}_chat_{index}"
+
+
+def build_chat_weights(num_chats: int, skew: float) -> list[float]:
+    """
+    Builds Zipf-like popularity weights of the conversations,
+    so that few conversations are hot and most of them are cold
+
+    :param num_chats: number of conversations
+    :param skew: Zipf exponent, higher values concentrate more messages in the hottest conversations
+    """
+    return [1 / (rank + 1) ** skew for rank in range(num_chats)]
+
+
+def random_text(rng: random.Random, min_words: int = 3, max_words: int = 25) -> str:
+    return " ".join(rng.choices(WORDS, k=rng.randint(min_words, max_words)))
+
+
+class DatasetGenerator:
+    """Generates synthetic Klatchat documents and inserts them in batches"""
+
+    def __init__(
+        self,
+        db_controller: DatabaseController,
+        seed: int = 42,
+        batch_size: int = 1000,
+        days: int = 90,
+        skew: float = 1.1,
+    ):
+        self.db_controller = db_controller
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.skew = skew
+        self.now = int(time())
+        self.oldest_ts = self.now - days * 24 * 3600
+        self.stats = {}
+
+    def insert(self, document: MongoDocuments, items: list[dict]):
+        """Inserts items into the document in batches"""
+        for i in range(0, len(items), self.batch_size):
+            self.db_controller.exec_query(
+                query={
+                    "command": MongoCommands.INSERT_MANY.value,
+                    "document": document.value,
+                    "data": (items[i : i + self.batch_size],),
+                }
+            )
+        self.stats[document.value] = self.stats.get(document.value, 0) + len(items)
+        LOG.info(f"Inserted {len(items)} items into {document.value!r}")
+
+    def generate_users(self, num_users: int) -> list[dict]:
+        password = get_hash(DEFAULT_PASSWORD)
+        users = []
+        for i in range(num_users):
+            is_bot = self.rng.random() < BOTS_SHARE
+            users.append(
+                {
+                    "_id": user_id(i),
+                    "nickname": user_id(i),
+                    "first_name": "Bot" if is_bot else "Load",
+                    "last_name": f"User{i}",
+                    "password": password,
+                    "is_bot": "1" if is_bot else "0",
+                    "avatar": f"{user_id(i)}.png" if self.rng.random() < 0.3 else "",
+                    "date_created": self.rng.randint(self.oldest_ts, self.now),
+                    "preferences": {"tts": {}, "chat_language_mapping": {}},
+                    "roles": ["user"],
+                }
+            )
+        self.insert(MongoDocuments.USERS, users)
+        return users
+
+    def generate_chats(self, num_chats: int, num_users: int) -> list[dict]:
+        chats = [
+            {
+                "_id": chat_id(i),
+                "conversation_name": f"{DATASET_PREFIX} conversation {i}",
+                "is_private": self.rng.random() < PRIVATE_CHATS_SHARE,
+                "is_live_conversation": i == 0,
+                "bound_service": "",
+                "creator": user_id(self.rng.randrange(num_users)),
+                "created_on": self.oldest_ts,
+                "last_shout_ts": self.oldest_ts,
+            }
+            for i in range(num_chats)
+        ]
+        self.insert(MongoDocuments.CHATS, chats)
+        return chats
+
+    def generate_shouts(
+        self, num_shouts: int, chats: list[dict], users: list[dict]
+    ) -> dict[str, list[dict]]:
+        """
+        Generates shouts distributed among conversations according to their popularity
+
+        :returns mapping of cid to the generated shouts
+        """
+        weights = build_chat_weights(num_chats=len(chats), skew=self.skew)
+        target_chats = self.rng.choices(chats, weights=weights, k=num_shouts)
+        shouts_by_cid = {}
+        batch = []
+        for i, chat in enumerate(target_chats):
+            sender = self.rng.choice(users)
+            created_on = self.rng.randint(self.oldest_ts, self.now)
+            shout_id = f"{DATASET_PREFIX}_shout_{i}"
+            is_audio = self.rng.random() < AUDIO_SHARE
+            message_lang = self._random_lang()
+            shout = {
+                "_id": shout_id,
+                "cid": chat["_id"],
+                "user_id": sender["_id"],
+                "prompt_id": "",
+                "message_text": (
+                    f"{shout_id}_audio.wav" if is_audio else random_text(self.rng)
+                ),
+                "message_lang": message_lang,
+                "attachments": (
+                    [f"{shout_id}_{n}.png" for n in range(self.rng.randint(1, 3))]
+                    if self.rng.random() < ATTACHMENTS_SHARE
+                    else []
+                ),
+                "replied_message": "",
+                "is_audio": "1" if is_audio else "0",
+                "is_announcement": "0",
+                "is_bot": sender["is_bot"],
+                "translations": self._random_translations(message_lang=message_lang),
+                "created_on": created_on,
+            }
+            chat["last_shout_ts"] = max(chat["last_shout_ts"], created_on)
+            shouts_by_cid.setdefault(chat["_id"], []).append(shout)
+            batch.append(shout)
+            if len(batch) >= self.batch_size:
+                self.insert(MongoDocuments.SHOUTS, batch)
+                batch = []
+        if batch:
+            self.insert(MongoDocuments.SHOUTS, batch)
+        for chat in chats:
+            self.db_controller.exec_query(
+                query={
+                    "command": MongoCommands.UPDATE_ONE.value,
+                    "document": MongoDocuments.CHATS.value,
+                    "data": (
+                        {"_id": chat["_id"]},
+                        {"$set": {"last_shout_ts": chat["last_shout_ts"]}},
+                    ),
+                }
+            )
+        return shouts_by_cid
+
+    def generate_prompts(
+        self, num_prompts: int, shouts_by_cid: dict[str, list[dict]], users: list[dict]
+    ):
+        """Generates completed prompts in the hottest conversations referring existing shouts"""
+        bots = [user for user in users if user["is_bot"] == "1"] or users
+        hot_cids = sorted(shouts_by_cid, key=lambda cid: -len(shouts_by_cid[cid]))[
+            : max(1, len(shouts_by_cid) // 10)
+        ]
+        prompts = []
+        for i in range(num_prompts):
+            cid = self.rng.choice(hot_cids)
+            participants = self.rng.sample(bots, k=min(len(bots), 3))
+            responses = self.rng.sample(
+                shouts_by_cid[cid], k=min(len(shouts_by_cid[cid]), len(participants))
+            )
+            prompts.append(
+                {
+                    "_id": f"{DATASET_PREFIX}_prompt_{i}",
+                    "cid": cid,
+                    "is_completed": "1",
+                    "data": {
+                        "prompt_text": random_text(self.rng),
+                        "participating_subminds": [
+                            user["_id"] for user in participants
+                        ],
+                        "proposed_responses": {
+                            user["_id"]: shout["_id"]
+                            for user, shout in zip(participants, responses)
+                        },
+                        "submind_opinions": {},
+                        "votes": {},
+                    },
+                    "created_on": self.rng.randint(self.oldest_ts, self.now),
+                }
+            )
+        self.insert(MongoDocuments.PROMPTS, prompts)
+
+    def generate_personas(self, num_personas: int, num_users: int):
+        personas = []
+        for i in range(num_personas):
+            persona_name = f"{DATASET_PREFIX}_persona_{i}"
+            owner = user_id(self.rng.randrange(num_users)) if i % 2 else None
+            personas.append(
+                {
+                    "_id": f"{persona_name}_{owner}" if owner else persona_name,
+                    "persona_name": persona_name,
+                    "user_id": owner,
+                    "supported_llms": ["chat_gpt", "llama", "fastchat"],
+                    "default_llm": "chat_gpt",
+                    "description": random_text(self.rng),
+                    "enabled": self.rng.random() < 0.5,
+                }
+            )
+        self.insert(MongoDocuments.PERSONAS, personas)
+
+    def run(
+        self,
+        num_users: int,
+        num_chats: int,
+        num_shouts: int,
+        num_prompts: int,
+        num_personas: int,
+    ) -> dict:
+        """Generates the whole dataset and returns number of inserted items per document"""
+        users = self.generate_users(num_users=num_users)
+        chats = self.generate_chats(num_chats=num_chats, num_users=num_users)
+        shouts_by_cid = self.generate_shouts(
+            num_shouts=num_shouts, chats=chats, users=users
+        )
+        self.generate_prompts(
+            num_prompts=num_prompts, shouts_by_cid=shouts_by_cid, users=users
+        )
+        self.generate_personas(num_personas=num_personas, num_users=num_users)
+        return self.stats
+
+    def _random_lang(self) -> str:
+        if self.rng.random() < ENGLISH_SHARE:
+            return "en"
+        return self.rng.choice(SUPPORTED_LANGS[1:])
+
+    def _random_translations(self, message_lang: str) -> dict:
+        translations = {}
+        if message_lang != "en":
+            translations[message_lang] = random_text(self.rng)
+        if self.rng.random() < TRANSLATED_SHARE:
+            for lang in self.rng.sample(SUPPORTED_LANGS[1:], k=self.rng.randint(1, 3)):
+                translations[lang] = random_text(self.rng)
+        return translations
+
+
+def drop_dataset(db_controller: DatabaseController):
+    """Removes previously generated dataset"""
+    for document in (
+        MongoDocuments.USERS,
+        MongoDocuments.CHATS,
+        MongoDocuments.SHOUTS,
+        MongoDocuments.PROMPTS,
+        MongoDocuments.PERSONAS,
+    ):
+        db_controller.exec_query(
+            query={
+                "command": MongoCommands.DELETE_MANY.value,
+                "document": document.value,
+                "data": {"_id": {"$regex": f"^{DATASET_PREFIX}_"}},
+            }
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seeds MongoDB with synthetic data")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=27017)
+    parser.add_argument("--database", default="klatchat_load")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--chats", type=int, default=300)
+    parser.add_argument("--shouts", type=int, default=100_000)
+    parser.add_argument("--prompts", type=int, default=2000)
+    parser.add_argument("--personas", type=int, default=50)
+    parser.add_argument("--days", type=int, default=90, help="time span of data")
+    parser.add_argument(
+        "--skew", type=float, default=1.1, help="Zipf exponent of chats popularity"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--drop", action="store_true", help="remove previously generated dataset first"
+    )
+    args = parser.parse_args()
+
+    db_controller = DatabaseController(
+        config_data={"host": args.host, "port": args.port, "database": args.database}
+    )
+    db_controller.attach_connector(dialect="mongo")
+    db_controller.connect()
+    if args.drop:
+        drop_dataset(db_controller=db_controller)
+    stats = DatasetGenerator(
+        db_controller=db_controller,
+        seed=args.seed,
+        batch_size=args.batch_size,
+        days=args.days,
+        skew=args.skew,
+    ).run(
+        num_users=args.users,
+        num_chats=args.chats,
+        num_shouts=args.shouts,
+        num_prompts=args.prompts,
+        num_personas=args.personas,
+    )
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+Microbenchmark of the per-request overhead of chat_server middleware stack
+
+Compares legacy BaseHTTPMiddleware-based stack with the pure ASGI one doing the same work
+(full pure ASGI stack is reported separately) by calling application in-process,
+so network and server loop costs are excluded. Request logs are suppressed unless "--with-logs" is set
+as LOG resolves caller frames on every record and would dominate the measurement, usage:
+    python -m tests.load.middleware_benchmark --requests 5000
+"""
+import argparse
+import asyncio
+import random
+import string
+import time
+from contextlib import nullcontext
+from unittest import mock
+
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
+
+from chat_server.server_utils.http_exceptions import KlatAPIException
+from chat_server.server_utils.middleware import (
+    SUPPORTED_MIDDLEWARE,
+    KlatAPIExceptionMiddleware,
+    LogMiddleware,
+    MetricsMiddleware,
+    _get_route_template,
+)
+from utils.logging_utils import LOG
+from utils.metrics_utils import HTTP_REQUEST_DURATION
+
+
+class LegacyExceptionMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        try:
+            return await call_next(request)
+        except KlatAPIException as exc:
+            return exc.to_http_response()
+
+
+class LegacyMetricsMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        start_time = time.perf_counter()
+        response = await call_next(request)
+        HTTP_REQUEST_DURATION.labels(
+            method=request.method,
+            route=_get_route_template(scope=request.scope),
+            status_code=response.status_code,
+        ).observe(time.perf_counter() - start_time)
+        return response
+
+
+class LegacyLogMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        request_id = "".join(
+            random.choices(string.ascii_uppercase + string.digits, k=6)
+        )
+        LOG.info(f"{request_id = } start at {request.url.path}")
+        start_time = time.time()
+        response = await call_next(request)
+        LOG.info(
+            f"{request_id = } completed_in={(time.time() - start_time) * 1000:.2f}ms"
+        )
+        return response
+
+
+LEGACY_MIDDLEWARE = (
+    LegacyExceptionMiddleware,
+    LegacyMetricsMiddleware,
+    LegacyLogMiddleware,
+)
+
+# pure ASGI counterparts of LEGACY_MIDDLEWARE, so both stacks do the same work
+ASGI_MIDDLEWARE = (
+    KlatAPIExceptionMiddleware,
+    MetricsMiddleware,
+    LogMiddleware,
+)
+
+
+def build_app(middleware: tuple = ()) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"msg": "OK"}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for _ in range(16):
+                yield b"x" * 4096
+
+        return StreamingResponse(chunks(), media_type="application/octet-stream")
+
+    for middleware_class in middleware:
+        app.add_middleware(middleware_class=middleware_class)
+    return app
+
+
+async def call_app(app: FastAPI, path: str) -> int:
+    """Performs single in-process request, returns number of received body bytes"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"benchmark")],
+        "client": ("127.0.0.1", 10000),
+        "server": ("benchmark", 80),
+    }
+    received_bytes = 0
+    request_messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if request_messages:
+            return request_messages.pop()
+        # connection stays open until the response is completed
+        await asyncio.Event().wait()
+
+    async def send(message):
+        nonlocal received_bytes
+        if message["type"] == "http.response.body":
+            received_bytes += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return received_bytes
+
+
+async def measure(app: FastAPI, path: str, num_requests: int) -> float:
+    """Measures mean time per request in microseconds"""
+    for _ in range(min(num_requests, 100)):
+        await call_app(app=app, path=path)
+    start = time.perf_counter()
+    for _ in range(num_requests):
+        await call_app(app=app, path=path)
+    return (time.perf_counter() - start) / num_requests * 1_000_000
+
+
+async def run(num_requests: int) -> dict:
+    stacks = {
+        "no_middleware": build_app(),
+        "base_http_middleware": build_app(middleware=LEGACY_MIDDLEWARE),
+        "pure_asgi_middleware": build_app(middleware=ASGI_MIDDLEWARE),
+        "pure_asgi_full_stack": build_app(middleware=SUPPORTED_MIDDLEWARE),
+    }
+    results = {}
+    for path in ("/ping", "/stream"):
+        timings = {
+            name: await measure(app=app, path=path, num_requests=num_requests)
+            for name, app in stacks.items()
+        }
+        results[path] = {
+            name: {
+                "mean_us": round(timing, 1),
+                "overhead_us": round(timing - timings["no_middleware"], 1),
+            }
+            for name, timing in timings.items()
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks middleware overhead")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--with-logs", action="store_true")
+    args = parser.parse_args()
+    if args.with_logs:
+        logs_context = nullcontext()
+    else:
+        logs_context = mock.patch.object(LOG, "info")
+    with logs_context:
+        results = asyncio.run(run(num_requests=args.requests))
+    for path, timings in results.items():
+        print(path)
+        for name, timing in timings.items():
+            print(
+                f"  {name:<24} {timing['mean_us']:>10.1f}us/request "
+                f"overhead={timing['overhead_us']:.1f}us"
+            )
+
+
+if __name__ == "__main__":
+    main()
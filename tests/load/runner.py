@@ -0,0 +1,372 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+Load-test runner driving chat_server HTTP blueprints and Socket IO events at a fixed rate
+
+Requires a server seeded with tests.load.dataset, usage:
+    python -m tests.load.runner --url http://127.0.0.1:8010 --rate 50 --duration 60 \
+        --mix search_base=4,search_prompts=2,get_user=1,user_message=2,request_translate=2,request_tts=1 \
+        --output load_results.json
+"""
+import argparse
+import json
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import requests
+import socketio
+
+from tests.load.dataset import (
+    DEFAULT_PASSWORD,
+    SUPPORTED_LANGS,
+    DATASET_PREFIX,
+    build_chat_weights,
+    chat_id,
+    random_text,
+    user_id,
+)
+
+DEFAULT_MIX = "search_base=4,search_prompts=2,get_user=1,user_message=2,request_translate=2,request_tts=1"
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Calculates percentile of sorted values using nearest-rank method"""
+    if not values:
+        return 0.0
+    rank = max(0, min(len(values) - 1, round(pct / 100 * len(values) + 0.5) - 1))
+    return values[rank]
+
+
+class LatencyRecorder:
+    """Thread-safe recorder of the scenario latencies"""
+
+    def __init__(self):
+        self._latencies: dict[str, list[float]] = {}
+        self._errors: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, scenario: str, latency: float, is_error: bool = False):
+        with self._lock:
+            if is_error:
+                self._errors[scenario] = self._errors.get(scenario, 0) + 1
+            else:
+                self._latencies.setdefault(scenario, []).append(latency)
+
+    def summary(self, elapsed: float) -> dict:
+        """
+        Summarizes recorded latencies
+
+        :param elapsed: duration of the run in seconds
+
+        :returns mapping of scenario to its latency percentiles (ms) and throughput (rps)
+        """
+        with self._lock:
+            latencies = {k: sorted(v) for k, v in self._latencies.items()}
+            errors = dict(self._errors)
+        summary = {}
+        all_latencies = []
+        for scenario in sorted(set(latencies) | set(errors)):
+            values = latencies.get(scenario, [])
+            all_latencies.extend(values)
+            summary[scenario] = self._summarize(
+                values=values, errors=errors.get(scenario, 0), elapsed=elapsed
+            )
+        summary["total"] = self._summarize(
+            values=sorted(all_latencies), errors=sum(errors.values()), elapsed=elapsed
+        )
+        return summary
+
+    @staticmethod
+    def _summarize(values: list[float], errors: int, elapsed: float) -> dict:
+        return {
+            "count": len(values),
+            "errors": errors,
+            "throughput_rps": round(len(values) / elapsed, 2) if elapsed else 0,
+            "p50_ms": round(percentile(values, 50) * 1000, 2),
+            "p95_ms": round(percentile(values, 95) * 1000, 2),
+            "p99_ms": round(percentile(values, 99) * 1000, 2),
+            "mean_ms": round(sum(values) / len(values) * 1000, 2) if values else 0,
+            "max_ms": round(values[-1] * 1000, 2) if values else 0,
+        }
+
+
+class LoadRunner:
+    """
+    Open-loop load generator: operations are scheduled at the fixed rate regardless of the responses,
+    latency is measured from the scheduled time, so queueing delays are not hidden by slow responses
+    """
+
+    def __init__(
+        self,
+        url: str,
+        rate: float,
+        duration: float,
+        mix: dict[str, int],
+        num_users: int,
+        num_chats: int,
+        num_shouts: int,
+        workers: int = 32,
+        sio_connections: int = 8,
+        timeout: float = 30,
+        seed: int = 42,
+    ):
+        self.url = url.rstrip("/")
+        self.rate = rate
+        self.duration = duration
+        self.mix = mix
+        self.num_users = num_users
+        self.num_chats = num_chats
+        self.num_shouts = num_shouts
+        self.workers = workers
+        self.sio_connections = sio_connections
+        self.timeout = timeout
+        self.rng = random.Random(seed)
+        self.chat_weights = build_chat_weights(num_chats=num_chats, skew=1.1)
+        self.recorder = LatencyRecorder()
+        self.scenarios = {
+            "search_base": self.search_base,
+            "search_prompts": self.search_prompts,
+            "get_user": self.get_user,
+            "user_message": self.user_message,
+            "request_translate": self.request_translate,
+            "request_tts": self.request_tts,
+        }
+        unknown_scenarios = set(mix) - set(self.scenarios)
+        if unknown_scenarios:
+            raise ValueError(f"Unknown scenarios: {unknown_scenarios}")
+        self.token = ""
+        self._http = threading.local()
+        self._sio_clients = queue.Queue()
+
+    def login(self, nickname: str = None):
+        """Obtains session token of the seeded user"""
+        response = requests.post(
+            f"{self.url}/auth/login",
+            data={"username": nickname or user_id(0), "password": DEFAULT_PASSWORD},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        self.token = response.json()["token"]
+
+    def connect_sio_clients(self):
+        if not any(scenario in self.mix for scenario in self._sio_scenarios):
+            return
+        for _ in range(self.sio_connections):
+            client = socketio.Client()
+            client.connect(
+                self.url, headers={"session": self.token}, wait_timeout=self.timeout
+            )
+            self._sio_clients.put(client)
+
+    def disconnect_sio_clients(self):
+        while not self._sio_clients.empty():
+            self._sio_clients.get().disconnect()
+
+    @property
+    def _sio_scenarios(self) -> tuple[str, ...]:
+        return "user_message", "request_translate", "request_tts"
+
+    @property
+    def http_session(self) -> requests.Session:
+        if not hasattr(self._http, "session"):
+            self._http.session = requests.Session()
+            self._http.session.headers["Authorization"] = self.token
+        return self._http.session
+
+    def random_cid(self) -> str:
+        return chat_id(
+            self.rng.choices(range(self.num_chats), weights=self.chat_weights)[0]
+        )
+
+    def _http_get(self, path: str, params: dict = None):
+        response = self.http_session.get(
+            f"{self.url}{path}", params=params, timeout=self.timeout
+        )
+        if response.status_code >= 500:
+            raise RuntimeError(f"{path} responded with {response.status_code}")
+
+    def _sio_call(self, event: str, data: dict):
+        client = self._sio_clients.get()
+        try:
+            # waits for the acknowledgement sent once the handler completes
+            client.call(event, data, timeout=self.timeout)
+        finally:
+            self._sio_clients.put(client)
+
+    def search_base(self):
+        self._http_get(
+            f"/chat_api/search/{self.random_cid()}",
+            params={"skin": "base", "limit_chat_history": 50},
+        )
+
+    def search_prompts(self):
+        self._http_get(
+            f"/chat_api/search/{self.random_cid()}",
+            params={"skin": "prompts", "limit_chat_history": 50},
+        )
+
+    def get_user(self):
+        self._http_get(
+            "/users_api/",
+            params={"user_id": user_id(self.rng.randrange(self.num_users))},
+        )
+
+    def user_message(self):
+        self._sio_call(
+            "user_message",
+            {
+                "cid": self.random_cid(),
+                "userID": user_id(self.rng.randrange(self.num_users)),
+                "messageText": random_text(self.rng),
+                "bot": "0",
+                "lang": "en",
+                "source": DATASET_PREFIX,
+                "timeCreated": int(time.time()),
+            },
+        )
+
+    def request_translate(self):
+        self._sio_call(
+            "request_translate",
+            {
+                "chat_mapping": {
+                    self.random_cid(): {
+                        "lang": self.rng.choice(SUPPORTED_LANGS[1:]),
+                        "shouts": [],
+                    }
+                },
+                "user": user_id(0),
+                "inputType": "incoming",
+            },
+        )
+
+    def request_tts(self):
+        self._sio_call(
+            "request_tts",
+            {
+                "cid": self.random_cid(),
+                "message_id": f"{DATASET_PREFIX}_shout_{self.rng.randrange(self.num_shouts)}",
+                "lang": "en",
+            },
+        )
+
+    def _run_scenario(self, scenario: str, scheduled_at: float):
+        is_error = False
+        try:
+            self.scenarios[scenario]()
+        except Exception as ex:
+            print(f"{scenario} failed: {ex}")
+            is_error = True
+        self.recorder.record(
+            scenario=scenario,
+            latency=time.perf_counter() - scheduled_at,
+            is_error=is_error,
+        )
+
+    def run(self) -> dict:
+        """Runs load test and returns its results"""
+        self.login()
+        self.connect_sio_clients()
+        scenarios = list(self.mix)
+        weights = [self.mix[scenario] for scenario in scenarios]
+        interval = 1 / self.rate
+        started_at = datetime.now(timezone.utc).isoformat()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            tick = 0
+            while True:
+                scheduled_at = start + tick * interval
+                if scheduled_at - start >= self.duration:
+                    break
+                delay = scheduled_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                scenario = self.rng.choices(scenarios, weights=weights)[0]
+                executor.submit(self._run_scenario, scenario, scheduled_at)
+                tick += 1
+        elapsed = time.perf_counter() - start
+        self.disconnect_sio_clients()
+        return {
+            "started_at": started_at,
+            "url": self.url,
+            "target_rate_rps": self.rate,
+            "duration_s": round(elapsed, 2),
+            "mix": self.mix,
+            "scenarios": self.recorder.summary(elapsed=elapsed),
+        }
+
+
+def parse_mix(mix: str) -> dict[str, int]:
+    """Parses scenario mix of format "scenario=weight,..." """
+    result = {}
+    for item in mix.split(","):
+        scenario, _, weight = item.partition("=")
+        result[scenario.strip()] = int(weight or 1)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Runs load test against chat_server")
+    parser.add_argument("--url", default="http://127.0.0.1:8010")
+    parser.add_argument("--rate", type=float, default=20, help="operations per second")
+    parser.add_argument("--duration", type=float, default=60, help="seconds")
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--chats", type=int, default=300)
+    parser.add_argument("--shouts", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--sio-connections", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="load_results.json")
+    args = parser.parse_args()
+
+    results = LoadRunner(
+        url=args.url,
+        rate=args.rate,
+        duration=args.duration,
+        mix=parse_mix(args.mix),
+        num_users=args.users,
+        num_chats=args.chats,
+        num_shouts=args.shouts,
+        workers=args.workers,
+        sio_connections=args.sio_connections,
+        timeout=args.timeout,
+        seed=args.seed,
+    ).run()
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(json.dumps(results["scenarios"], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+Microbenchmark of the Socket.IO packets serializers
+
+Compares encoding/decoding CPU time and wire size of JSON and MessagePack packets
+on representative "new_message" and "prompt_data" payloads, usage:
+    python -m tests.load.serializer_benchmark --iterations 20000
+"""
+import argparse
+import random
+import time
+import uuid
+
+from socketio import packet
+from socketio.msgpack_packet import MsgPackPacket
+
+from tests.load.dataset import WORDS
+
+SERIALIZERS = {"json": packet.Packet, "msgpack": MsgPackPacket}
+
+
+def build_text(num_words: int) -> str:
+    return " ".join(random.choices(WORDS, k=num_words))
+
+
+def build_new_message() -> dict:
+    """Builds "new_message" payload as broadcast by the server"""
+    return {
+        "cid": uuid.uuid4().hex,
+        "userID": uuid.uuid4().hex,
+        "messageID": uuid.uuid4().hex,
+        "message_id": uuid.uuid4().hex,
+        "messageText": build_text(num_words=30),
+        "lang": "en",
+        "attachments": [],
+        "context": {},
+        "prompt_id": "",
+        "promptState": "",
+        "isAudio": "0",
+        "isAnnouncement": "0",
+        "is_bot": "0",
+        "timeCreated": int(time.time()),
+        "bound_service": "",
+        "translatedLangs": ["uk", "de"],
+    }
+
+
+def build_prompt_data(num_prompts: int = 5, num_subminds: int = 4) -> dict:
+    """Builds "prompt_data" payload with prompts fetched along with the nicknames of the subminds"""
+    prompts = []
+    for _ in range(num_prompts):
+        nicks = [f"submind_{uuid.uuid4().hex[:6]}" for _ in range(num_subminds)]
+        prompts.append(
+            {
+                "_id": uuid.uuid4().hex,
+                "created_on": int(time.time()),
+                "is_completed": "1",
+                "prompt_text": build_text(num_words=20),
+                "participating_subminds": nicks,
+                "proposed_responses": {
+                    nick: build_text(num_words=60) for nick in nicks
+                },
+                "submind_opinions": {nick: build_text(num_words=40) for nick in nicks},
+                "votes": {nick: random.choice(nicks) for nick in nicks},
+            }
+        )
+    return {
+        "data": prompts,
+        "receiver": "neon",
+        "cid": uuid.uuid4().hex,
+        "request_id": uuid.uuid4().hex,
+    }
+
+
+def encode(packet_class: type, event: str, data: dict) -> list:
+    encoded_packet = packet_class(
+        packet.EVENT, data=[event, data], namespace="/"
+    ).encode()
+    return encoded_packet if isinstance(encoded_packet, list) else [encoded_packet]
+
+
+def decode(packet_class: type, encoded_packets: list) -> packet.Packet:
+    pkt = packet_class(encoded_packet=encoded_packets[0])
+    for attachment in encoded_packets[1:]:
+        pkt.add_attachment(attachment)
+    return pkt
+
+
+def measure(func, iterations: int) -> float:
+    """Measures mean time per call in microseconds"""
+    for _ in range(min(iterations, 100)):
+        func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def run(iterations: int) -> dict:
+    payloads = {
+        "new_message": build_new_message(),
+        "prompt_data": build_prompt_data(),
+    }
+    results = {}
+    for event, data in payloads.items():
+        results[event] = {}
+        for name, packet_class in SERIALIZERS.items():
+            encoded_packets = encode(packet_class=packet_class, event=event, data=data)
+            decoded_data = decode(
+                packet_class=packet_class, encoded_packets=encoded_packets
+            ).data
+            assert decoded_data == [event, data], f"{name} altered {event} payload"
+            results[event][name] = {
+                "bytes": sum(len(p) for p in encoded_packets),
+                "encode_us": round(
+                    measure(
+                        lambda: encode(packet_class, event, data), iterations=iterations
+                    ),
+                    2,
+                ),
+                "decode_us": round(
+                    measure(
+                        lambda: decode(packet_class, encoded_packets),
+                        iterations=iterations,
+                    ),
+                    2,
+                ),
+            }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks Socket.IO serializers")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    random.seed(args.seed)
+    results = run(iterations=args.iterations)
+    for event, stats in results.items():
+        print(event)
+        for name, stat in stats.items():
+            print(
+                f"  {name:<10} {stat['bytes']:>8} bytes "
+                f"encode={stat['encode_us']:.2f}us decode={stat['decode_us']:.2f}us"
+            )
+
+
+if __name__ == "__main__":
+    main()
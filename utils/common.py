@@ -89,6 +89,23 @@ def buffer_to_base64(b: BytesIO, encoding: str = "utf-8") -> str:
     return base64.b64encode(b.read()).decode(encoding)
 
 
+def bytes_to_base64(b: bytes, encoding: str = "utf-8") -> str:
+    """Encodes bytes value to base64 string based on provided encoding"""
+    return base64.b64encode(b).decode(encoding)
+
+
 def base64_to_buffer(b64_encoded_string: str) -> BytesIO:
     """Decodes buffered value to base64 string based on provided encoding"""
     return BytesIO(base64.b64decode(b64_encoded_string))
+
+
+def audio_data_to_buffer(audio_data: str | bytes | bytearray | memoryview) -> BytesIO:
+    """
+    Buffers received audio data
+
+    :param audio_data: raw audio bytes received as binary frame or base64 encoded string (data URLs are supported)
+    :returns buffer with the raw audio
+    """
+    if isinstance(audio_data, str):
+        return base64_to_buffer(audio_data.split(",")[-1])
+    return BytesIO(audio_data)
@@ -33,6 +33,7 @@ import pymongo.results
 
 from neon_sftp import NeonSFTPConnector
 
+from chat_server.server_utils.storage.base import StorageBackend
 from utils.database_utils import DatabaseController
 from utils.database_utils.mongo_utils import (
     MongoQuery,
@@ -40,6 +41,7 @@ from utils.database_utils.mongo_utils import (
     MongoFilter,
     MongoLogicalOperators,
 )
+from utils.metrics_utils import DB_QUERY_DURATION, DB_QUERY_ERRORS, track_duration
 
 
 class MongoDocumentDAO(ABC):
@@ -47,9 +49,11 @@ class MongoDocumentDAO(ABC):
         self,
         db_controller: DatabaseController,
         sftp_connector: NeonSFTPConnector = None,
+        storage: StorageBackend = None,
     ):
         self.db_controller = db_controller
         self.sftp_connector = sftp_connector
+        self.storage = storage
 
     @property
     @abstractmethod
@@ -227,16 +231,22 @@ class MongoDocumentDAO(ABC):
         *args,
         **kwargs
     ):
-        return self.db_controller.exec_query(
-            MongoQuery(
-                command=command,
-                document=self.document,
-                filters=filters,
-                data=data,
-                data_action=data_action,
-                result_filters=result_filters,
-            ),
-            as_cursor=result_as_cursor,
-            *args,
-            **kwargs
-        )
+        with track_duration(
+            duration=DB_QUERY_DURATION,
+            errors=DB_QUERY_ERRORS,
+            collection=self.document.value,
+            command=command.value,
+        ):
+            return self.db_controller.exec_query(
+                MongoQuery(
+                    command=command,
+                    document=self.document,
+                    filters=filters,
+                    data=data,
+                    data_action=data_action,
+                    result_filters=result_filters,
+                ),
+                as_cursor=result_as_cursor,
+                *args,
+                **kwargs
+            )
@@ -30,8 +30,10 @@ import re
 from typing import Union, List
 
 from bson import ObjectId
+from pymongo import ReturnDocument
 
 from utils.database_utils.mongo_utils import (
+    MongoCommands,
     MongoDocuments,
     MongoFilter,
     MongoLogicalOperators,
@@ -100,6 +102,49 @@ class ChatsDAO(MongoDocumentDAO):
             chat["_id"] = str(chat["_id"])
         return chats
 
+    def get_chats_by_ids(
+        self, cids: list[str], requested_user_id: str = None
+    ) -> list[dict]:
+        """
+        Gets conversations matching provided ids within a single query
+
+        :param cids: list of conversation ids
+        :param requested_user_id: id of the requested user (defaults to None) - used to find owned private conversations
+
+        :returns list of found conversations in arbitrary order
+        """
+        ids = []
+        for cid in set(cids):
+            ids.append(cid)
+            if ObjectId.is_valid(cid):
+                ids.append(ObjectId(cid))
+        filters = [MongoFilter("_id", ids, MongoLogicalOperators.IN)]
+        if requested_user_id:
+            filters += self._create_privacy_filters(requested_user_id)
+        chats = self.list_items(filters=filters, result_as_cursor=False)
+        for chat in chats:
+            chat["_id"] = str(chat["_id"])
+        return chats
+
+    def next_sequence(self, cid: str) -> int | None:
+        """
+        Increments sequence number of the conversation, so events of the conversation can be ordered and resumed
+
+        :param cid: target conversation id
+        :returns incremented sequence number, None if conversation does not exist
+        """
+        chat = self._execute_query(
+            command=MongoCommands.FIND_ONE_AND_UPDATE,
+            filters=self._create_matching_chat_filters(
+                lst_search_substr=[cid], query_attributes=["_id"]
+            ),
+            data={"last_seq": 1},
+            data_action="inc",
+            projection={"last_seq": 1},
+            return_document=ReturnDocument.AFTER,
+        )
+        return chat["last_seq"] if chat else None
+
     @staticmethod
     def _create_matching_chat_filters(
         lst_search_substr: list[str],
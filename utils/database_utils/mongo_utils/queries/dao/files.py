@@ -0,0 +1,238 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from time import time
+from typing import Optional
+
+from pymongo import UpdateOne
+
+from chat_server.server_utils.storage.dedup import FileIndex
+from utils.database_utils.mongo_utils import (
+    MongoCommands,
+    MongoDocuments,
+    MongoFilter,
+    MongoLogicalOperators,
+)
+from utils.database_utils.mongo_utils.queries.dao.abc import MongoDocumentDAO
+
+
+class FileBlobsDAO(MongoDocumentDAO):
+    """Content-addressed blobs keyed by SHA-256 of their content along with the number of referencing files"""
+
+    @property
+    def document(self):
+        return MongoDocuments.FILE_BLOBS
+
+    def register(self, sha256: str, size: int) -> bool:
+        """
+        Registers blob, unreferenced blob is protected from collection until grace period since registration passes
+
+        :returns False if blob is leased for collection
+        """
+        now = time()
+        # blob with expired lease is taken over, as its collection is considered failed
+        matched_count = self._execute_query(
+            command=MongoCommands.BULK_WRITE,
+            data=[
+                UpdateOne(
+                    {"_id": sha256, **self._build_not_leased_filter(now=now).to_dict()},
+                    {"$set": {"released_on": now}, "$unset": {"collecting_until": ""}},
+                )
+            ],
+        ).matched_count
+        if matched_count:
+            return True
+        upserted_count = self._execute_query(
+            command=MongoCommands.BULK_WRITE,
+            data=[
+                UpdateOne(
+                    {"_id": sha256},
+                    {
+                        "$setOnInsert": {
+                            "size": size,
+                            "ref_count": 0,
+                            "created_on": int(now),
+                            "released_on": now,
+                        }
+                    },
+                    upsert=True,
+                )
+            ],
+        ).upserted_count
+        return bool(upserted_count)
+
+    def reference(self, sha256: str) -> bool:
+        """
+        Increments number of references to the blob
+
+        :returns False if blob is not registered or is leased for collection
+        """
+        return bool(
+            self.update_item(
+                filters=[
+                    MongoFilter("_id", sha256),
+                    MongoFilter("collecting_until", None),
+                ],
+                data={"ref_count": 1},
+                data_action="inc",
+            ).matched_count
+        )
+
+    def release(self, sha256: str):
+        """Decrements number of references to the blob"""
+        self._execute_query(
+            command=MongoCommands.BULK_WRITE,
+            data=[
+                UpdateOne(
+                    {"_id": sha256},
+                    {"$inc": {"ref_count": -1}, "$set": {"released_on": time()}},
+                )
+            ],
+        )
+
+    @staticmethod
+    def _build_not_leased_filter(now: float) -> MongoFilter:
+        return MongoFilter(
+            value=[
+                {"collecting_until": None},
+                {"collecting_until": {"$lte": now}},
+            ],
+            logical_operator=MongoLogicalOperators.OR,
+        )
+
+    def _build_unreferenced_filters(self, released_before: float) -> list[MongoFilter]:
+        return [
+            MongoFilter("ref_count", 0, MongoLogicalOperators.LTE),
+            MongoFilter("released_on", released_before, MongoLogicalOperators.LT),
+            self._build_not_leased_filter(now=time()),
+        ]
+
+    def list_unreferenced(self, released_before: float, limit: int) -> list[str]:
+        """Lists hashes of the blobs released before provided timestamp and not referenced since"""
+        items = self.list_items(
+            filters=self._build_unreferenced_filters(released_before=released_before),
+            limit=limit,
+            result_as_cursor=False,
+            project_fields=["_id"],
+        )
+        return [item["_id"] for item in items]
+
+    def lease_unreferenced(
+        self, sha256: str, released_before: float, lease_duration: float
+    ) -> Optional[float]:
+        """
+        Leases blob for collection if it is still unreferenced
+
+        :returns timestamp until which blob is leased, None if blob was not leased
+        """
+        leased_until = time() + lease_duration
+        matched_count = self.update_item(
+            filters=[
+                MongoFilter("_id", sha256),
+                *self._build_unreferenced_filters(released_before=released_before),
+            ],
+            data={"collecting_until": leased_until},
+        ).matched_count
+        return leased_until if matched_count else None
+
+    def remove_leased(self, sha256: str, leased_until: float) -> bool:
+        """
+        Removes blob if it is still leased for collection
+
+        :returns True if blob was removed
+        """
+        return bool(
+            self._execute_query(
+                command=MongoCommands.DELETE_ONE,
+                filters=[
+                    MongoFilter("_id", sha256),
+                    MongoFilter("ref_count", 0, MongoLogicalOperators.LTE),
+                    MongoFilter("collecting_until", leased_until),
+                ],
+            ).deleted_count
+        )
+
+
+class FilesDAO(MongoDocumentDAO, FileIndex):
+    """Mapping of logical file locations (e.g. "attachments/<name>") to the content-addressed blobs"""
+
+    @property
+    def document(self):
+        return MongoDocuments.FILES
+
+    @property
+    def blobs(self) -> FileBlobsDAO:
+        return FileBlobsDAO(db_controller=self.db_controller)
+
+    def resolve(self, location: str) -> Optional[str]:
+        item = self.get_item(item_id=location)
+        return item["sha256"] if item else None
+
+    def add_blob(self, sha256: str, size: int) -> bool:
+        return self.blobs.register(sha256=sha256, size=size)
+
+    def add_reference(self, location: str, sha256: str) -> bool:
+        previous_sha256 = self.resolve(location)
+        if previous_sha256 == sha256:
+            return True
+        blobs = self.blobs
+        if not blobs.reference(sha256=sha256):
+            return False
+        self._execute_query(
+            command=MongoCommands.UPDATE_ONE,
+            filters=[MongoFilter("_id", location)],
+            data={"sha256": sha256, "created_on": int(time())},
+            upsert=True,
+        )
+        if previous_sha256:
+            blobs.release(sha256=previous_sha256)
+        return True
+
+    def remove_reference(self, location: str) -> Optional[str]:
+        sha256 = self.resolve(location)
+        if sha256 and self.delete_item(item_id=location).deleted_count:
+            self.blobs.release(sha256=sha256)
+            return sha256
+        return None
+
+    def list_unreferenced_blobs(self, released_before: float, limit: int) -> list[str]:
+        return self.blobs.list_unreferenced(
+            released_before=released_before, limit=limit
+        )
+
+    def lease_blob(
+        self, sha256: str, released_before: float, lease_duration: float
+    ) -> Optional[float]:
+        return self.blobs.lease_unreferenced(
+            sha256=sha256,
+            released_before=released_before,
+            lease_duration=lease_duration,
+        )
+
+    def remove_blob(self, sha256: str, leased_until: float) -> bool:
+        return self.blobs.remove_leased(sha256=sha256, leased_until=leased_until)
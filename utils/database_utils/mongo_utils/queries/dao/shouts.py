@@ -30,7 +30,8 @@ from typing import List, Dict
 from ovos_utils import LOG
 from pymongo import UpdateOne
 
-from utils.common import buffer_to_base64
+from chat_server.services.audio_cache import AudioCache
+from utils.common import audio_data_to_buffer
 from utils.database_utils.mongo_utils import (
     MongoDocuments,
     MongoCommands,
@@ -57,41 +58,95 @@ class ShoutsDAO(MongoDocumentDAO):
             source_set=shout_ids, aggregate_result=False, result_as_cursor=False
         )
 
+    def set_sequence(self, shout_id: str, seq: int):
+        """Sets sequence number of the shout in its conversation"""
+        self.update_item(filters=[MongoFilter("_id", shout_id)], data={"seq": seq})
+
+    def list_since(self, cid: str, seq: int, limit: int) -> List[dict]:
+        """
+        Lists shouts of the conversation ingested after provided sequence number
+
+        :param cid: target conversation id
+        :param seq: sequence number to list shouts after
+        :param limit: max number of shouts to list
+
+        :returns shouts ordered by sequence number
+        """
+        return self.list_items(
+            filters=[
+                MongoFilter("cid", cid),
+                MongoFilter("seq", seq, MongoLogicalOperators.GT),
+            ],
+            limit=limit,
+            ordering_expression={"seq": 1},
+            result_as_cursor=False,
+        )
+
     def fetch_messages_from_prompt(self, prompt: dict):
         """Fetches message ids detected in provided prompt"""
-        prompt_data = prompt["data"]
-        message_ids = []
-        for column in (
-            "proposed_responses",
-            "submind_opinions",
-            "votes",
-        ):
-            message_ids.extend(list(prompt_data.get(column, {}).values()))
-        return self.list_contains(source_set=message_ids)
-
-    def fetch_audio_data(self, message_id: str) -> str | None:
+        return self.fetch_messages_from_prompts(prompts=[prompt])
+
+    def fetch_messages_from_prompts(
+        self, prompts: list[dict], known_messages: dict[str, list] = None
+    ) -> dict[str, list]:
+        """
+        Fetches messages detected in provided prompts within a single query
+
+        :param prompts: list of prompts
+        :param known_messages: mapping of already fetched message id to the list with its data,
+                               only messages missing in it are queried (optional)
+
+        :returns mapping of message id to the list with its data
+        """
+        known_messages = known_messages or {}
+        message_ids = set()
+        for prompt in prompts:
+            for column in (
+                "proposed_responses",
+                "submind_opinions",
+                "votes",
+            ):
+                message_ids.update(prompt["data"].get(column, {}).values())
+        messages = {
+            message_id: known_messages[message_id]
+            for message_id in message_ids
+            if message_id in known_messages
+        }
+        if missing_ids := message_ids.difference(messages):
+            messages.update(self.list_contains(source_set=list(missing_ids)))
+        return messages
+
+    @staticmethod
+    def get_audio_location(shout_data: dict) -> str | None:
+        """Gets location of the audio message in the storage, None for non-audio messages"""
+        if shout_data.get("is_audio") == "1":
+            return f'audio/{shout_data["message_text"]}'
+        return None
+
+    def fetch_audio_data(self, message_id: str) -> bytes | None:
         """
         Fetches audio data from message
         :param message_id: message id to fetch
-        :returns base64 encoded audio data if any
+        :returns raw audio data if any
         """
         shout_data = self.get_item(item_id=message_id)
         if not shout_data:
             LOG.warning("Requested shout does not exist")
-        elif shout_data.get("is_audio") != "1":
+        elif not (audio_location := self.get_audio_location(shout_data)):
             LOG.warning("Failed to fetch audio data from non-audio message")
         else:
-
-            file_location = f'audio/{shout_data["message_text"]}'
-            LOG.info(f"Fetching existing file from: {file_location}")
-            fo = self.sftp_connector.get_file_object(file_location)
-            if fo.getbuffer().nbytes > 0:
-                return buffer_to_base64(fo)
+            audio_bytes = AudioCache.get_or_fetch(
+                storage=self.storage,
+                file_location=audio_location,
+                message_id=message_id,
+            )
+            if audio_bytes:
+                return audio_bytes
             else:
                 LOG.error(
                     f"Empty buffer received while fetching audio of message id = {message_id}"
                 )
-            return ""
+            return b""
 
     def save_translations(self, translation_mapping: dict) -> Dict[str, List[str]]:
         """
@@ -100,64 +155,96 @@ class ShoutsDAO(MongoDocumentDAO):
         :returns dictionary containing updated shouts (those which were translated to English)
         """
         updated_shouts = {}
+        shout_ids = [
+            shout_id
+            for shout_data in translation_mapping.values()
+            for shout_id in shout_data.get("shouts", {})
+        ]
+        if not shout_ids:
+            return updated_shouts
+        shouts = self._execute_query(
+            command=MongoCommands.FIND_ALL,
+            filters=MongoFilter("_id", shout_ids, MongoLogicalOperators.IN),
+            result_as_cursor=False,
+        )
+        shouts = {shout["_id"]: shout for shout in shouts}
+        bulk_update = []
         for cid, shout_data in translation_mapping.items():
-            translations = shout_data.get("shouts", {})
-            bulk_update = []
-            shouts = self._execute_query(
-                command=MongoCommands.FIND_ALL,
-                filters=MongoFilter(
-                    "_id", list(translations), MongoLogicalOperators.IN
-                ),
-                result_as_cursor=False,
-            )
-            for shout_id, translation in translations.items():
-                matching_instance = None
-                for shout in shouts:
-                    if shout["_id"] == shout_id:
-                        matching_instance = shout
-                        break
-                filter_expression = MongoFilter("_id", shout_id)
-                if not matching_instance.get("translations"):
-                    self._execute_query(
-                        command=MongoCommands.UPDATE_MANY,
-                        filters=filter_expression,
-                        data={"translations": {}},
-                    )
+            lang = shout_data.get("lang", "en")
+            for shout_id, translation in shout_data.get("shouts", {}).items():
+                matching_instance = shouts.get(shout_id)
+                if not matching_instance:
+                    LOG.warning(f"Skipping translation of missing shout {shout_id!r}")
+                    continue
                 # English is the default language, so it is treated as message text
-                if shout_data.get("lang", "en") == "en":
+                if lang == "en":
                     updated_shouts.setdefault(cid, []).append(shout_id)
-                    self._execute_query(
-                        command=MongoCommands.UPDATE_MANY,
-                        filters=filter_expression,
-                        data={"message_lang": "en"},
-                    )
                     bulk_update_setter = {
                         "message_text": translation,
                         "message_lang": "en",
                     }
+                    if not matching_instance.get("translations"):
+                        bulk_update_setter["translations"] = {}
+                elif not matching_instance.get("translations"):
+                    bulk_update_setter = {"translations": {lang: translation}}
                 else:
-                    bulk_update_setter = {
-                        f'translations.{shout_data["lang"]}': translation
+                    bulk_update_setter = {f"translations.{lang}": translation}
+                if lang != "en":
+                    # keeps following updates of the same shout consistent with the stored state
+                    matching_instance["translations"] = {
+                        **(matching_instance.get("translations") or {}),
+                        lang: translation,
                     }
-                # TODO: make a convenience wrapper to make bulk insertion easier to follow
                 bulk_update.append(
                     UpdateOne({"_id": shout_id}, {"$set": bulk_update_setter})
                 )
-            if bulk_update:
-                self._execute_query(
-                    command=MongoCommands.BULK_WRITE,
-                    data=bulk_update,
-                )
+        if bulk_update:
+            self._execute_query(
+                command=MongoCommands.BULK_WRITE,
+                data=bulk_update,
+            )
         return updated_shouts
 
+    def backfill_translations(self, translations: Dict[str, str], lang: str):
+        """
+        Sets known translations to the corresponding shouts
+
+        :param translations: mapping of shout id to its translation
+        :param lang: language of translations
+        """
+        bulk_update = []
+        for shout_id, translation in translations.items():
+            # nested field can not be set while translations are null (e.g. legacy or bot shouts)
+            bulk_update += [
+                UpdateOne(
+                    {"_id": shout_id, "translations": {"$type": "object"}},
+                    {"$set": {f"translations.{lang}": translation}},
+                ),
+                UpdateOne(
+                    {"_id": shout_id, "translations": {"$not": {"$type": "object"}}},
+                    {"$set": {"translations": {lang: translation}}},
+                ),
+            ]
+        if bulk_update:
+            # failed update of a single shout does not abort the rest
+            self._execute_query(
+                command=MongoCommands.BULK_WRITE,
+                data=bulk_update,
+                ordered=False,
+            )
+
     def save_tts_response(
-        self, shout_id, audio_data: str, lang: str = "en", gender: str = "female"
+        self,
+        shout_id,
+        audio_data: str | bytes | memoryview,
+        lang: str = "en",
+        gender: str = "female",
     ) -> bool:
         """
         Saves TTS Response under corresponding shout id
 
         :param shout_id: message id to consider
-        :param audio_data: base64 encoded audio data received
+        :param audio_data: raw audio data or its base64 encoded string
         :param lang: language of speech (defaults to English)
         :param gender: language gender (defaults to female)
 
@@ -166,13 +253,22 @@ class ShoutsDAO(MongoDocumentDAO):
 
         audio_file_name = f"{shout_id}_{lang}_{gender}.wav"
         try:
-            self.sftp_connector.put_file_object(
-                file_object=audio_data, save_to=f"audio/{audio_file_name}"
+            audio_buffer = audio_data_to_buffer(audio_data)
+            # regenerated audio replaces the previous one, equal content is stored once
+            self.storage.put(
+                location=f"audio/{audio_file_name}", file_object=audio_buffer
             )
-            self._execute_query(
-                command=MongoCommands.UPDATE_MANY,
-                filters=MongoFilter("_id", shout_id),
-                data={f"audio.{lang}.{gender}": audio_file_name},
+            self.set_tts_audio(
+                shout_id=shout_id,
+                audio_file_name=audio_file_name,
+                lang=lang,
+                gender=gender,
+            )
+            AudioCache.put(
+                data=audio_buffer.getvalue(),
+                message_id=shout_id,
+                lang=lang,
+                gender=gender,
             )
             operation_success = True
         except Exception as ex:
@@ -180,6 +276,23 @@ class ShoutsDAO(MongoDocumentDAO):
             operation_success = False
         return operation_success
 
+    def set_tts_audio(
+        self, shout_id, audio_file_name: str, lang: str = "en", gender: str = "female"
+    ):
+        """
+        Sets stored TTS audio to the corresponding shout
+
+        :param shout_id: message id to consider
+        :param audio_file_name: name of the audio file stored under "audio/"
+        :param lang: language of speech (defaults to English)
+        :param gender: language gender (defaults to female)
+        """
+        self._execute_query(
+            command=MongoCommands.UPDATE_MANY,
+            filters=MongoFilter("_id", shout_id),
+            data={f"audio.{lang}.{gender}": audio_file_name},
+        )
+
     def save_stt_response(self, shout_id, message_text: str, lang: str = "en"):
         """
         Saves STT Response under corresponding shout id
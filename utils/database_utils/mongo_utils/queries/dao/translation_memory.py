@@ -0,0 +1,133 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import unicodedata
+from time import time
+
+from cachetools import LRUCache
+from pymongo import UpdateOne
+
+from utils.common import get_hash
+from utils.database_utils.mongo_utils import MongoDocuments, MongoCommands
+from utils.database_utils.mongo_utils.queries.dao.abc import MongoDocumentDAO
+
+
+class TranslationMemoryDAO(MongoDocumentDAO):
+    """
+    Translation memory shared across messages
+
+    Translations are keyed by the hash of the normalized source text along with source and target languages,
+    so repeated texts (e.g. bot responses or announcements) are translated only once.
+    """
+
+    _memory_cache = LRUCache(maxsize=4096)
+
+    @property
+    def document(self):
+        return MongoDocuments.TRANSLATION_MEMORY
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Normalizes text to match translations regardless of unicode form and whitespaces"""
+        return " ".join(unicodedata.normalize("NFC", text).split())
+
+    @classmethod
+    def build_id(cls, text: str, source_lang: str, target_lang: str) -> str:
+        """Builds translation memory item id"""
+        text_hash = get_hash(cls.normalize_text(text), algo="sha256")
+        return f"{text_hash}_{source_lang}_{target_lang}"
+
+    def get_translations(
+        self, texts: list[str], source_lang: str, target_lang: str
+    ) -> dict[str, str]:
+        """
+        Gets known translations of provided texts
+
+        :param texts: list of source texts
+        :param source_lang: language of source texts
+        :param target_lang: language of translation
+
+        :returns mapping of source text to its translation for the texts present in memory
+        """
+        translations = {}
+        lookup_mapping = {}
+        for text in set(texts):
+            item_id = self.build_id(
+                text=text, source_lang=source_lang, target_lang=target_lang
+            )
+            translation = self._memory_cache.get(item_id)
+            if translation is not None:
+                translations[text] = translation
+            else:
+                lookup_mapping.setdefault(item_id, []).append(text)
+        if lookup_mapping:
+            items = self.list_contains(
+                source_set=list(lookup_mapping),
+                aggregate_result=False,
+                result_as_cursor=False,
+                project_fields=["_id", "translation"],
+            )
+            for item in items:
+                self._memory_cache[item["_id"]] = item["translation"]
+                for text in lookup_mapping.get(item["_id"], []):
+                    translations[text] = item["translation"]
+        return translations
+
+    def save_translations(
+        self, translations: dict[str, str], source_lang: str, target_lang: str
+    ):
+        """
+        Saves translations to the memory
+
+        :param translations: mapping of source text to its translation
+        :param source_lang: language of source texts
+        :param target_lang: language of translation
+        """
+        bulk_update = []
+        for text, translation in translations.items():
+            if not (text and translation):
+                continue
+            item_id = self.build_id(
+                text=text, source_lang=source_lang, target_lang=target_lang
+            )
+            self._memory_cache[item_id] = translation
+            bulk_update.append(
+                UpdateOne(
+                    {"_id": item_id},
+                    {
+                        "$set": {
+                            "source_lang": source_lang,
+                            "target_lang": target_lang,
+                            "translation": translation,
+                        },
+                        "$setOnInsert": {"created_on": int(time())},
+                    },
+                    upsert=True,
+                )
+            )
+        if bulk_update:
+            self._execute_query(command=MongoCommands.BULK_WRITE, data=bulk_update)
@@ -44,6 +44,8 @@ from utils.database_utils.mongo_utils.queries.constants import UserPatterns
 class UsersDAO(MongoDocumentDAO):
 
     _default_user_preferences = {"tts": {}, "chat_language_mapping": {}}
+    # fields of the users exposed along with the prompts they participate in
+    prompt_user_fields = ("nickname", "first_name", "last_name", "is_bot")
 
     @property
     def document(self):
@@ -73,11 +75,16 @@ class UsersDAO(MongoDocumentDAO):
 
     def fetch_users_from_prompt(self, prompt: dict) -> dict[str, list]:
         """Fetches user ids detected in provided prompt"""
-        prompt_data = prompt["data"]
-        user_ids = prompt_data.get("participating_subminds", [])
+        return self.fetch_users_from_prompts(prompts=[prompt])
+
+    def fetch_users_from_prompts(self, prompts: list[dict]) -> dict[str, list]:
+        """Fetches users detected in provided prompts within a single query"""
+        user_ids = set()
+        for prompt in prompts:
+            user_ids.update(prompt["data"].get("participating_subminds", []))
         return self.list_contains(
-            source_set=user_ids,
-            project_fields=["_id", "nickname", "first_name", "last_name", "is_bot"],
+            source_set=list(user_ids),
+            project_fields=["_id", *self.prompt_user_fields],
         )
 
     @staticmethod
@@ -64,6 +64,7 @@ def get_translations(
         shout_lang = "en"
         if len(shout_data) == 1:
             shout_lang = shout_data[0].get("message_lang", "en")
+        untranslated_shouts = []
         for shout in shout_data:
             message_text = shout.get("message_text")
             if shout_lang != "en" and lang == "en":
@@ -75,15 +76,59 @@ def get_translations(
                     shout["_id"]
                 ] = shout_text
             elif message_text:
+                untranslated_shouts.append(shout)
+        memory_translations = {}
+        if lang != "en":
+            memory_translations = get_translation_memory_hits(
+                shouts=untranslated_shouts, lang=lang
+            )
+        for shout in untranslated_shouts:
+            if shout["_id"] in memory_translations:
+                populated_translations.setdefault(cid, {}).setdefault("shouts", {})[
+                    shout["_id"]
+                ] = memory_translations[shout["_id"]]
+            else:
                 missing_translations.setdefault(cid, {}).setdefault("shouts", {})[
                     shout["_id"]
-                ] = message_text
+                ] = shout["message_text"]
+        if memory_translations:
+            MongoDocumentsAPI.SHOUTS.backfill_translations(
+                translations=memory_translations, lang=lang
+            )
         if missing_translations.get(cid):
             missing_translations[cid]["lang"] = lang
             missing_translations[cid]["source_lang"] = shout_lang
     return populated_translations, missing_translations
 
 
+def get_translation_memory_hits(shouts: List[dict], lang: str) -> dict:
+    """
+    Gets translations of provided shouts known to the translation memory
+
+    :param shouts: list of shouts missing translation
+    :param lang: desired translation language
+
+    :returns mapping of shout id to its translation for the shouts found in memory
+    """
+    shouts_by_lang = {}
+    for shout in shouts:
+        shouts_by_lang.setdefault(shout.get("message_lang", "en"), []).append(shout)
+    memory_translations = {}
+    for source_lang, lang_shouts in shouts_by_lang.items():
+        if source_lang == lang:
+            continue
+        known_translations = MongoDocumentsAPI.TRANSLATION_MEMORY.get_translations(
+            texts=[shout["message_text"] for shout in lang_shouts],
+            source_lang=source_lang,
+            target_lang=lang,
+        )
+        for shout in lang_shouts:
+            translation = known_translations.get(shout["message_text"])
+            if translation:
+                memory_translations[shout["_id"]] = translation
+    return memory_translations
+
+
 def fetch_message_data(
     skin: ConversationSkins,
     conversation_data: dict,
@@ -91,10 +136,13 @@ def fetch_message_data(
     fetch_senders: bool = True,
     creation_time_filter: MongoFilter = None,
 ) -> list[dict]:
-    """Fetches message data based on provided conversation skin"""
+    """
+    Fetches message data based on provided conversation skin,
+    senders of the messages and participants of the prompts are fetched within a single query
+    """
     message_data = fetch_shout_data(
         conversation_data=conversation_data,
-        fetch_senders=fetch_senders,
+        fetch_senders=False,
         limit=limit,
         creation_time_filter=creation_time_filter,
     )
@@ -102,32 +150,94 @@ def fetch_message_data(
     for message in message_data:
         message["message_type"] = "plain"
 
+    prompts = []
     if skin == ConversationSkins.PROMPTS:
         detected_prompts = {
             item.get("prompt_id") for item in message_data if item.get("prompt_id")
         }
+        if detected_prompts:
+            prompts = MongoDocumentsAPI.PROMPTS.get_prompts(
+                cid=conversation_data["_id"],
+                prompt_ids=list(detected_prompts),
+            )
+    # messages of the prompts are mostly on the same page
+    known_messages = {
+        message["_id"]: [{k: v for k, v in message.items() if k != "_id"}]
+        for message in message_data
+    }
 
-        prompt_data = fetch_prompt_data(
-            cid=conversation_data["_id"],
-            prompt_ids=list(detected_prompts),
+    users_mapping = None
+    if fetch_senders and message_data:
+        user_ids = {shout["user_id"] for shout in message_data}
+        for prompt in prompts:
+            user_ids.update(prompt["data"].get("participating_subminds", []))
+        users_mapping = MongoDocumentsAPI.USERS.list_contains(source_set=list(user_ids))
+        message_data = _attach_senders_data(
+            shouts=message_data, users_mapping=users_mapping
         )
 
-        if prompt_data:
-            detected_prompt_ids = set()
-            for prompt in prompt_data:
-                prompt["message_type"] = "prompt"
-                detected_prompt_ids.add(prompt["_id"])
+    if prompts:
+        prompt_data = _attach_prompt_data(
+            prompts=prompts,
+            users_mapping=users_mapping,
+            known_messages=known_messages,
+        )
+        detected_prompt_ids = set()
+        for prompt in prompt_data:
+            prompt["message_type"] = "prompt"
+            detected_prompt_ids.add(prompt["_id"])
 
-            message_data = [
-                message
-                for message in message_data
-                if message.get("prompt_id") not in detected_prompt_ids
-            ]
-            message_data.extend(prompt_data)
+        message_data = [
+            message
+            for message in message_data
+            if message.get("prompt_id") not in detected_prompt_ids
+        ]
+        message_data.extend(prompt_data)
 
     return sorted(message_data, key=lambda shout: int(shout["created_on"]))
 
 
+def fetch_conversations_message_data(
+    conversations: list[tuple[dict, ConversationSkins, MongoFilter | None]],
+    limit: int = 100,
+) -> dict[str, list[dict]]:
+    """
+    Fetches message data of multiple conversations, senders of all the messages are fetched within a single query
+
+    :param conversations: list of tuples of conversation data, its skin and creation time filter of its messages
+    :param limit: number of messages to fetch per conversation
+
+    :returns mapping of conversation id to its message data
+    """
+    messages_mapping = {
+        conversation_data["_id"]: fetch_message_data(
+            skin=skin,
+            conversation_data=conversation_data,
+            limit=limit,
+            fetch_senders=False,
+            creation_time_filter=creation_time_filter,
+        )
+        for conversation_data, skin, creation_time_filter in conversations
+    }
+    plain_messages = [
+        message
+        for messages in messages_mapping.values()
+        for message in messages
+        if message["message_type"] == "plain"
+    ]
+    if plain_messages:
+        # messages with senders data are returned in the same order
+        messages_with_senders = iter(_attach_senders_data(shouts=plain_messages))
+        for cid, messages in messages_mapping.items():
+            messages_mapping[cid] = [
+                next(messages_with_senders)
+                if message["message_type"] == "plain"
+                else message
+                for message in messages
+            ]
+    return messages_mapping
+
+
 def fetch_shout_data(
     conversation_data: dict,
     limit: int = 100,
@@ -159,11 +269,13 @@ def fetch_shout_data(
     return sorted(shouts, key=lambda user_shout: int(user_shout["created_on"]))
 
 
-def _attach_senders_data(shouts: list[dict]):
+def _attach_senders_data(shouts: list[dict], users_mapping: dict[str, list] = None):
     result = list()
-    users_from_shouts = MongoDocumentsAPI.USERS.list_contains(
-        source_set=[shout["user_id"] for shout in shouts]
-    )
+    users_from_shouts = users_mapping
+    if users_from_shouts is None:
+        users_from_shouts = MongoDocumentsAPI.USERS.list_contains(
+            source_set=[shout["user_id"] for shout in shouts]
+        )
     for shout in shouts:
         matching_user = users_from_shouts.get(shout["user_id"], {})
         if not matching_user:
@@ -207,11 +319,50 @@ def fetch_prompt_data(
         prompt_ids=prompt_ids,
         created_from=created_from,
     )
-    for prompt in matching_prompts:
-        prompt["user_mapping"] = MongoDocumentsAPI.USERS.fetch_users_from_prompt(prompt)
-        prompt["message_mapping"] = MongoDocumentsAPI.SHOUTS.fetch_messages_from_prompt(
-            prompt
-        )
+    return _attach_prompt_data(
+        prompts=matching_prompts, fetch_user_data=fetch_user_data
+    )
+
+
+def _attach_prompt_data(
+    prompts: List[dict],
+    fetch_user_data: bool = False,
+    users_mapping: dict[str, list] = None,
+    known_messages: dict[str, list] = None,
+) -> List[dict]:
+    """
+    Attaches users and messages to the prompts
+
+    :param prompts: list of prompts
+    :param fetch_user_data: to replace user ids in the prompt data with nicknames
+    :param users_mapping: mapping of already fetched user id to the list with its data (optional)
+    :param known_messages: mapping of already fetched message id to the list with its data (optional)
+
+    :returns list of prompts along with matching messages and users
+    """
+    # users and messages of every prompt are fetched at once to avoid query per prompt
+    if users_mapping is None:
+        users_mapping = MongoDocumentsAPI.USERS.fetch_users_from_prompts(prompts)
+    messages_mapping = MongoDocumentsAPI.SHOUTS.fetch_messages_from_prompts(
+        prompts, known_messages=known_messages
+    )
+    prompt_user_fields = MongoDocumentsAPI.USERS.prompt_user_fields
+    for prompt in prompts:
+        prompt_data = prompt["data"]
+        prompt["user_mapping"] = {
+            user_id: [
+                {key: user[key] for key in prompt_user_fields if key in user}
+                for user in users_mapping[user_id]
+            ]
+            for user_id in prompt_data.get("participating_subminds", [])
+            if user_id in users_mapping
+        }
+        prompt["message_mapping"] = {
+            message_id: messages_mapping[message_id]
+            for column in ("proposed_responses", "submind_opinions", "votes")
+            for message_id in prompt_data.get(column, {}).values()
+            if message_id in messages_mapping
+        }
         if fetch_user_data:
             for user in prompt.get("data", {}).get("participating_subminds", []):
                 try:
@@ -238,7 +389,7 @@ def fetch_prompt_data(
                 prompt["user_mapping"][x][0]["nickname"]
                 for x in prompt["data"]["participating_subminds"]
             ]
-    return sorted(matching_prompts, key=lambda _prompt: int(_prompt["created_on"]))
+    return sorted(prompts, key=lambda _prompt: int(_prompt["created_on"]))
 
 
 def add_shout(data: dict):
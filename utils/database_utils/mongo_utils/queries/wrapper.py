@@ -34,6 +34,10 @@ from utils.database_utils.mongo_utils.queries.dao.chats import ChatsDAO
 from utils.database_utils.mongo_utils.queries.dao.shouts import ShoutsDAO
 from utils.database_utils.mongo_utils.queries.dao.prompts import PromptsDAO
 from utils.database_utils.mongo_utils.queries.dao.personas import PersonasDAO
+from utils.database_utils.mongo_utils.queries.dao.translation_memory import (
+    TranslationMemoryDAO,
+)
+from utils.database_utils.mongo_utils.queries.dao.files import FilesDAO, FileBlobsDAO
 
 
 class MongoDAOGateway(type):
@@ -42,7 +46,9 @@ class MongoDAOGateway(type):
         try:
             if issubclass(item, MongoDocumentDAO):
                 item = item(
-                    db_controller=self.db_controller, sftp_connector=self.sftp_connector
+                    db_controller=self.db_controller,
+                    sftp_connector=self.sftp_connector,
+                    storage=self.storage,
                 )
         except:
             pass
@@ -57,6 +63,7 @@ class MongoDocumentsAPI(metaclass=MongoDAOGateway):
 
     db_controller = None
     sftp_connector = None
+    storage = None
 
     USERS = UsersDAO
     CHATS = ChatsDAO
@@ -64,9 +71,13 @@ class MongoDocumentsAPI(metaclass=MongoDAOGateway):
     PROMPTS = PromptsDAO
     PERSONAS = PersonasDAO
     CONFIGS = ConfigsDAO
+    TRANSLATION_MEMORY = TranslationMemoryDAO
+    FILES = FilesDAO
+    FILE_BLOBS = FileBlobsDAO
 
     @classmethod
-    def init(cls, db_controller, sftp_connector=None):
+    def init(cls, db_controller, sftp_connector=None, storage=None):
         """Inits Singleton with specified database controller"""
         cls.db_controller = db_controller
         cls.sftp_connector = sftp_connector
+        cls.storage = storage
@@ -54,6 +54,7 @@ class MongoCommands(Enum):
     UPDATE = "update_many"
     UPDATE_MANY = "update_many"
     UPDATE_ONE = "update_one"
+    FIND_ONE_AND_UPDATE = "find_one_and_update"
 
 
 class MongoDocuments(Enum):
@@ -66,6 +67,9 @@ class MongoDocuments(Enum):
     PROMPTS = "prompts"
     PERSONAS = "personas"
     CONFIGS = "configs"
+    TRANSLATION_MEMORY = "translation_memory"
+    FILES = "files"
+    FILE_BLOBS = "file_blobs"
     TEST = "test"
 
 
@@ -141,6 +145,7 @@ class MongoQuery:
         if self.command.value in (
             MongoCommands.UPDATE_MANY.value,
             MongoCommands.UPDATE_ONE.value,
+            MongoCommands.FIND_ONE_AND_UPDATE.value,
         ):
             res = {f"${self.data_action.lower()}": self.data}
         elif self.command.value in (
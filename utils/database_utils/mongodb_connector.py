@@ -26,11 +26,15 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import time
+
 from typing import Optional, Union
+from bson import SON
 from pymongo import MongoClient
 
 from utils.database_utils.base_connector import DatabaseConnector, DatabaseTypes
 from utils.database_utils.mongo_utils.structures import MongoQuery, MongoCommands
+from utils.database_utils.slow_query_log import SlowQueryLog
 from utils.logging_utils import LOG
 
 
@@ -78,6 +82,7 @@ class MongoDBConnector(DatabaseConnector):
         if not isinstance(query.get("data"), tuple):
             LOG.debug(f'Casting data from {type(query["data"])} to tuple')
             query["data"] = (query.get("data", {}),)
+        start_time = time.perf_counter()
         try:
             query_output = db_command(*query.get("data"), *args, **kwargs)
         except Exception as e:
@@ -91,4 +96,56 @@ class MongoDBConnector(DatabaseConnector):
                     query_output = getattr(query_output, name)(value)
         if not as_cursor:
             query_output = list(query_output)
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        if SlowQueryLog.is_slow(duration_ms=duration_ms):
+            self._log_slow_query(query=query, duration_ms=duration_ms)
         return query_output
+
+    def _log_slow_query(self, query: dict, duration_ms: float):
+        """
+        Adds query to the slow query log, sampled "find" queries are explained
+
+        :param query: executed query dictionary
+        :param duration_ms: query duration in milliseconds
+        """
+        explain_result = None
+        if query["command"] == "find" and SlowQueryLog.should_explain():
+            try:
+                explain_result = self._explain_find_query(query=query)
+            except Exception as ex:
+                LOG.warning(f"Failed to explain slow query: {ex}")
+        SlowQueryLog.add(
+            document=query["document"],
+            command=query["command"],
+            duration_ms=duration_ms,
+            query_data=query["data"],
+            filters=query.get("filters"),
+            explain_result=explain_result,
+        )
+
+    def _explain_find_query(self, query: dict) -> dict:
+        """
+        Explains "find" query with "executionStats" verbosity
+
+        :param query: executed query dictionary
+
+        :returns explain command output
+        """
+        find_command = {
+            "find": query["document"],
+            "filter": query["data"][0] if query["data"] else {},
+        }
+        if len(query["data"]) > 1 and query["data"][1]:
+            find_command["projection"] = query["data"][1]
+        filters = query.get("filters") or {}
+        sort = filters.get("sort")
+        if sort:
+            if isinstance(sort, str):
+                sort = [(sort, 1)]
+            find_command["sort"] = SON(sort)
+        for name in ("limit", "skip"):
+            if filters.get(name):
+                find_command[name] = filters[name]
+        return self.connection.command(
+            "explain", find_command, verbosity="executionStats"
+        )
@@ -0,0 +1,204 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import os
+import random
+import sys
+from collections import deque
+from threading import Lock
+from time import time
+
+from utils.logging_utils import LOG
+
+# modules considered as internals of the query execution while resolving the calling DAO method
+_QUERY_INTERNALS = (
+    os.path.join("database_utils", "mongodb_connector.py"),
+    os.path.join("database_utils", "db_controller.py"),
+    os.path.join("dao", "abc.py"),
+)
+
+
+class SlowQueryLog:
+    """
+    Ring buffer of the database queries exceeding configured duration threshold
+
+    Sampled slow "find" queries are explained with "executionStats" verbosity
+    to flag collection scans and inefficient index choices.
+    """
+
+    __DEFAULT_THRESHOLD_MS = 100
+    __DEFAULT_EXPLAIN_SAMPLE_RATE = 0.1
+    __DEFAULT_MAX_SIZE = 500
+    # ratio of examined documents to returned documents considered as inefficient index usage
+    __INEFFICIENCY_RATIO = 10
+
+    enabled: bool = True
+    threshold_ms: float = __DEFAULT_THRESHOLD_MS
+    explain_sample_rate: float = __DEFAULT_EXPLAIN_SAMPLE_RATE
+
+    __records: deque = deque(maxlen=__DEFAULT_MAX_SIZE)
+    __lock = Lock()
+
+    @classmethod
+    def init(cls, config: dict = None):
+        """
+        Initialises slow query log from provided configuration
+
+        :param config: slow query log configuration, supported keys:
+            - "ENABLED": to log slow queries (defaults to True)
+            - "THRESHOLD_MS": min query duration in milliseconds to consider query as slow (defaults to 100)
+            - "EXPLAIN_SAMPLE_RATE": fraction of slow queries to explain (defaults to 0.1)
+            - "MAX_SIZE": max number of the kept slow query records (defaults to 500)
+        """
+        config = config or {}
+        with cls.__lock:
+            cls.enabled = bool(config.get("ENABLED", True))
+            cls.threshold_ms = float(
+                config.get("THRESHOLD_MS", cls.__DEFAULT_THRESHOLD_MS)
+            )
+            cls.explain_sample_rate = float(
+                config.get("EXPLAIN_SAMPLE_RATE", cls.__DEFAULT_EXPLAIN_SAMPLE_RATE)
+            )
+            cls.__records = deque(
+                cls.__records,
+                maxlen=int(config.get("MAX_SIZE", cls.__DEFAULT_MAX_SIZE)),
+            )
+
+    @classmethod
+    def is_slow(cls, duration_ms: float) -> bool:
+        """Checks if query of provided duration should be logged"""
+        return cls.enabled and duration_ms >= cls.threshold_ms
+
+    @classmethod
+    def should_explain(cls) -> bool:
+        """Samples slow queries to explain"""
+        return random.random() < cls.explain_sample_rate
+
+    @classmethod
+    def add(
+        cls,
+        document: str,
+        command: str,
+        duration_ms: float,
+        query_data: tuple,
+        filters: dict = None,
+        explain_result: dict = None,
+    ):
+        """
+        Adds slow query record
+
+        :param document: name of the queried document
+        :param command: query command
+        :param duration_ms: query duration in milliseconds
+        :param query_data: arguments of the query command
+        :param filters: filters applied to the query result (e.g. sort, limit)
+        :param explain_result: output of the query explain (optional)
+        """
+        filters = filters or {}
+        record = {
+            "ts": int(time()),
+            "document": document,
+            "command": command,
+            "duration_ms": round(duration_ms, 2),
+            "filters": repr(query_data[0]) if query_data else None,
+            "sort": repr(filters.get("sort")) if filters.get("sort") else None,
+            "limit": filters.get("limit"),
+            "caller": cls.get_caller(),
+        }
+        if explain_result:
+            record["explain"] = cls.summarize_explain(explain_result)
+        LOG.warning(f"Slow query detected: {record}")
+        with cls.__lock:
+            cls.__records.append(record)
+
+    @classmethod
+    def get_records(cls, limit: int = None) -> list[dict]:
+        """
+        Gets slow query records
+
+        :param limit: max number of the most recent records to return (optional)
+
+        :returns list of records starting from the most recent one
+        """
+        with cls.__lock:
+            records = list(reversed(cls.__records))
+        return records[:limit] if limit else records
+
+    @staticmethod
+    def get_caller() -> str:
+        """Resolves the closest caller of the query outside of query execution internals"""
+        frame = sys._getframe(1)
+        while frame:
+            filename = frame.f_code.co_filename
+            if filename != __file__ and not filename.endswith(_QUERY_INTERNALS):
+                return f"{frame.f_code.co_qualname} ({os.path.basename(filename)}:{frame.f_lineno})"
+            frame = frame.f_back
+        return "unknown"
+
+    @classmethod
+    def summarize_explain(cls, explain_result: dict) -> dict:
+        """
+        Summarizes explain output of the query
+
+        :param explain_result: output of the explain command with "executionStats" verbosity
+
+        :returns summary of the winning plan and execution stats with detected issues
+        """
+        stages = []
+        index_names = []
+        plan = explain_result.get("queryPlanner", {}).get("winningPlan", {})
+        plans = [plan]
+        while plans:
+            plan = plans.pop()
+            # SBE plans nest the classic query plan under "queryPlan"
+            plan = plan.get("queryPlan", plan)
+            if plan.get("stage"):
+                stages.append(plan["stage"])
+            if plan.get("indexName"):
+                index_names.append(plan["indexName"])
+            if plan.get("inputStage"):
+                plans.append(plan["inputStage"])
+            plans.extend(plan.get("inputStages", []))
+        execution_stats = explain_result.get("executionStats", {})
+        docs_examined = execution_stats.get("totalDocsExamined", 0)
+        returned = execution_stats.get("nReturned", 0)
+        issues = []
+        if "COLLSCAN" in stages:
+            issues.append("COLLSCAN")
+        elif docs_examined > cls.__INEFFICIENCY_RATIO * max(returned, 1):
+            issues.append("INEFFICIENT_INDEX")
+        if "SORT" in stages:
+            issues.append("IN_MEMORY_SORT")
+        return {
+            "stages": stages,
+            "indexes": index_names,
+            "returned": returned,
+            "docs_examined": docs_examined,
+            "keys_examined": execution_stats.get("totalKeysExamined", 0),
+            "execution_time_ms": execution_stats.get("executionTimeMillis"),
+            "issues": issues,
+        }
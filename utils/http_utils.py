@@ -25,7 +25,15 @@
 # LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import itertools
+import os
+import re
+import time
+from abc import ABC, abstractmethod
+
+from starlette.datastructures import MutableHeaders
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 
 def respond(msg: str, status_code: int = 200) -> JSONResponse:
@@ -41,3 +49,96 @@ def respond(msg: str, status_code: int = 200) -> JSONResponse:
 
 
 response_ok = respond("OK")
+
+
+# process-unique prefix makes request ids distinguishable across workers without per-request randomness
+_REQUEST_ID_PREFIX = os.urandom(3).hex().upper()
+_request_counter = itertools.count(1)
+
+
+def generate_request_id() -> str:
+    """Generates id of the incoming request unique within the running process"""
+    return f"{_REQUEST_ID_PREFIX}{next(_request_counter):06X}"
+
+
+_ENTITY_TAG_PATTERN = re.compile(r'(?:W/)?("[^"]*")')
+
+
+def matches_entity_tag(if_none_match: str, etag: str) -> bool:
+    """
+    Checks if value of the "If-None-Match" header matches entity tag using weak comparison (RFC 9110)
+
+    :param if_none_match: value of the "If-None-Match" header, "*" or comma-separated list of entity tags
+    :param etag: entity tag of the current representation
+
+    :returns True if any of the listed entity tags matches regardless of the weakness indicator
+    """
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag = etag.removeprefix("W/")
+    return opaque_tag in _ENTITY_TAG_PATTERN.findall(if_none_match)
+
+
+class ASGIMiddleware(ABC):
+    """
+    Base class of the pure ASGI middleware handling HTTP requests
+
+    Unlike BaseHTTPMiddleware it does not spawn extra tasks or buffer response streams,
+    subclasses intercept ASGI messages in "handle" and pass response body through untouched.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        return await self.handle(scope, receive, send)
+
+    @abstractmethod
+    async def handle(self, scope: Scope, receive: Receive, send: Send):
+        """Handles HTTP request passing it to the wrapped application"""
+
+
+class RequestTimer:
+    """
+    Tracks processing of the ASGI request: response status, whether response started
+    and time to the response start, appends provided headers to the response start message
+
+    :param send: ASGI send callable to wrap
+    :param headers: headers to append to the response (optional)
+    :param server_timing: to append Server-Timing header with time to the response start (defaults to False)
+    """
+
+    def __init__(
+        self, send: Send, headers: dict[str, str] = None, server_timing: bool = False
+    ):
+        self._send = send
+        self.headers = headers or {}
+        self.server_timing = server_timing
+        self.start_time = time.perf_counter()
+        self.status_code = None
+        self.response_started = False
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.start_time) * 1000
+
+    async def send(self, message: Message):
+        if message["type"] == "http.response.start":
+            self.response_started = True
+            self.status_code = message["status"]
+            if self.headers or self.server_timing:
+                response_headers = MutableHeaders(scope=message)
+                for name, value in self.headers.items():
+                    response_headers.append(name, value)
+                if self.server_timing:
+                    response_headers.append(
+                        "Server-Timing", format_server_timing(self.elapsed_ms)
+                    )
+        await self._send(message)
+
+
+def format_server_timing(duration_ms: float, metric: str = "app") -> str:
+    """Formats value of the Server-Timing header"""
+    return f"{metric};dur={duration_ms:.2f}"
@@ -0,0 +1,226 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+_BYTES_BUCKETS = (
+    1 << 10,
+    16 << 10,
+    128 << 10,
+    1 << 20,
+    4 << 20,
+    16 << 20,
+    64 << 20,
+    float("inf"),
+)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "klat_http_request_duration_seconds",
+    "Duration of HTTP requests",
+    ["method", "route", "status_code"],
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "klat_http_requests_in_progress",
+    "Number of HTTP requests being processed",
+    ["method"],
+)
+HTTP_REQUEST_ERRORS = Counter(
+    "klat_http_request_errors_total",
+    "Number of HTTP requests failed with unhandled exception",
+    ["method", "route"],
+)
+
+SIO_EVENT_DURATION = Histogram(
+    "klat_sio_event_duration_seconds",
+    "Duration of Socket IO event handlers",
+    ["event"],
+)
+SIO_EVENTS_IN_PROGRESS = Gauge(
+    "klat_sio_events_in_progress",
+    "Number of Socket IO events being handled",
+    ["event"],
+)
+SIO_EVENT_ERRORS = Counter(
+    "klat_sio_event_errors_total",
+    "Number of Socket IO event handlers failed with exception",
+    ["event"],
+)
+SIO_CONNECTED_SOCKETS = Gauge(
+    "klat_sio_connected_sockets",
+    "Number of connected Socket IO clients",
+)
+SIO_ROOMS = Gauge(
+    "klat_sio_rooms",
+    "Number of Socket IO rooms excluding personal rooms of the clients",
+)
+SIO_THROTTLED_EVENTS = Counter(
+    "klat_sio_throttled_events_total",
+    "Number of Socket IO events rejected by the rate limits",
+    ["event", "tier", "scope"],
+)
+SIO_INVALID_EVENTS = Counter(
+    "klat_sio_invalid_events_total",
+    "Number of Socket IO events rejected due to malformed payload",
+    ["event"],
+)
+SIO_OUTBOUND_QUEUE_MAX_DEPTH = Gauge(
+    "klat_sio_outbound_queue_max_depth",
+    "Max number of packets queued for a single Socket IO client",
+)
+SIO_OUTBOUND_QUEUED_PACKETS = Gauge(
+    "klat_sio_outbound_queued_packets",
+    "Total number of packets queued for Socket IO clients",
+)
+SIO_SLOW_CONSUMER_DISCONNECTS = Counter(
+    "klat_sio_slow_consumer_disconnects_total",
+    "Number of Socket IO clients disconnected due to exceeded outbound queue size",
+)
+
+ADMISSION_ACTIVE = Gauge(
+    "klat_admission_active_requests",
+    "Number of admitted requests being handled",
+    ["route_class"],
+)
+ADMISSION_QUEUED = Gauge(
+    "klat_admission_queued_requests",
+    "Number of requests waiting for admission",
+    ["route_class"],
+)
+ADMISSION_QUEUE_DURATION = Histogram(
+    "klat_admission_queue_duration_seconds",
+    "Time requests waited for admission",
+    ["route_class"],
+)
+ADMISSION_SHED = Counter(
+    "klat_admission_shed_requests_total",
+    "Number of requests shed by the admission control",
+    ["route_class", "kind"],
+)
+
+DB_QUERY_DURATION = Histogram(
+    "klat_db_query_duration_seconds",
+    "Duration of database queries",
+    ["collection", "command"],
+)
+DB_QUERY_ERRORS = Counter(
+    "klat_db_query_errors_total",
+    "Number of failed database queries",
+    ["collection", "command"],
+)
+
+SFTP_TRANSFER_DURATION = Histogram(
+    "klat_sftp_transfer_duration_seconds",
+    "Duration of SFTP transfers",
+    ["operation"],
+)
+SFTP_TRANSFER_BYTES = Histogram(
+    "klat_sftp_transfer_bytes",
+    "Size of SFTP transfers in bytes",
+    ["operation"],
+    buckets=_BYTES_BUCKETS,
+)
+SFTP_TRANSFER_ERRORS = Counter(
+    "klat_sftp_transfer_errors_total",
+    "Number of failed SFTP transfers",
+    ["operation"],
+)
+SFTP_POOL_CONNECTIONS = Gauge(
+    "klat_sftp_pool_connections",
+    "Number of SFTP connections in the pool",
+    ["state"],
+)
+SFTP_POOL_WAIT_DURATION = Histogram(
+    "klat_sftp_pool_wait_duration_seconds",
+    "Time spent waiting for available SFTP connection",
+)
+SFTP_POOL_RECONNECTS = Counter(
+    "klat_sftp_pool_reconnects_total",
+    "Number of SFTP connections discarded due to failure, expiration or failed health check",
+    ["reason"],
+)
+
+STORAGE_CACHE_REQUESTS = Counter(
+    "klat_storage_cache_requests_total",
+    "Number of file reads served by the storage disk cache",
+    ["result"],
+)
+STORAGE_CACHE_BYTES = Gauge(
+    "klat_storage_cache_bytes",
+    "Number of bytes kept in the storage disk cache",
+)
+STORAGE_CACHE_EVICTIONS = Counter(
+    "klat_storage_cache_evictions_total",
+    "Number of files evicted from the storage disk cache",
+)
+
+
+@contextmanager
+def track_duration(
+    duration: Histogram,
+    errors: Counter = None,
+    in_progress: Gauge = None,
+    **labels,
+):
+    """
+    Tracks duration of the wrapped code block
+
+    :param duration: histogram to observe duration in
+    :param errors: counter to increment on exception (optional)
+    :param in_progress: gauge of the blocks being executed (optional)
+    :param labels: labels of the metrics
+    """
+    if in_progress is not None:
+        in_progress.labels(**labels).inc()
+    start_time = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        if errors is not None:
+            errors.labels(**labels).inc()
+        raise
+    finally:
+        duration.labels(**labels).observe(time.perf_counter() - start_time)
+        if in_progress is not None:
+            in_progress.labels(**labels).dec()
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """
+    Renders collected metrics in Prometheus text format
+
+    :returns tuple of rendered metrics and their content type
+    """
+    return generate_latest(), CONTENT_TYPE_LATEST